@@ -0,0 +1,229 @@
+"""
+Batch Analysis Service
+
+This module provides offline ticket analysis through provider batch jobs.
+Tickets are submitted as one job, the job ID is persisted, and the results
+are collected later (possibly by another process) and saved as
+TicketAnalysis entities.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from src.application.services.ticket_analysis_service import (
+    analysis_from_result,
+    ticket_content,
+)
+from src.domain.entities.ticket import Ticket
+from src.domain.entities.ticket_analysis import TicketAnalysis
+from src.domain.exceptions import EntityNotFoundError
+from src.domain.interfaces.ai_service_interfaces import BatchAIService
+from src.domain.interfaces.repository_interfaces import (
+    AnalysisRepository,
+    BatchJobRepository,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Job statuses
+JOB_SUBMITTED = "submitted"
+JOB_COLLECTED = "collected"
+
+
+class BatchAnalysisService:
+    """
+    Service for analyzing tickets through offline batch jobs.
+
+    Large ticket sets are split into jobs of at most ``max_batch_size``
+    requests. Each job record keeps the ticket metadata needed to build the
+    analyses, so collecting a job does not fetch the tickets again.
+    """
+
+    def __init__(
+        self,
+        batch_ai_service: BatchAIService,
+        analysis_repository: AnalysisRepository,
+        job_repository: BatchJobRepository,
+        max_batch_size: int = 10000
+    ):
+        """
+        Initialize the batch analysis service.
+
+        Args:
+            batch_ai_service: Provider batch backend
+            analysis_repository: Repository the analyses are saved to
+            job_repository: Repository persisting submitted jobs
+            max_batch_size: Maximum number of tickets per job
+        """
+        self.batch_ai_service = batch_ai_service
+        self.analysis_repository = analysis_repository
+        self.job_repository = job_repository
+        self.max_batch_size = max_batch_size
+
+    def submit_tickets(self, tickets: List[Ticket]) -> List[str]:
+        """
+        Submit tickets for offline analysis.
+
+        Args:
+            tickets: Tickets to analyze (duplicates are submitted once)
+
+        Returns:
+            IDs of the submitted jobs
+        """
+        unique_tickets = list({str(ticket.id): ticket for ticket in tickets}.values())
+        job_ids = []
+
+        for start in range(0, len(unique_tickets), self.max_batch_size):
+            chunk = unique_tickets[start:start + self.max_batch_size]
+            contents = {f"ticket-{ticket.id}": ticket_content(ticket) for ticket in chunk}
+
+            job_id = self.batch_ai_service.submit_batch(contents)
+            self.job_repository.save_job({
+                "id": job_id,
+                "status": JOB_SUBMITTED,
+                "created_at": time.time(),
+                "request_count": len(chunk),
+                "tickets": {
+                    f"ticket-{ticket.id}": {
+                        "ticket_id": str(ticket.id),
+                        "subject": ticket.subject,
+                        "source_view_id": ticket.source_view_id,
+                        "source_view_name": ticket.source_view_name
+                    }
+                    for ticket in chunk
+                }
+            })
+            job_ids.append(job_id)
+
+        logger.info(f"Submitted {len(unique_tickets)} tickets in {len(job_ids)} batch job(s)")
+        return job_ids
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Get a submitted job.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Job record
+
+        Raises:
+            EntityNotFoundError: If the job is unknown
+        """
+        job = self.job_repository.get_job(job_id)
+        if job is None:
+            raise EntityNotFoundError(f"Batch job {job_id} not found")
+        return job
+
+    def check_job(self, job_id: str) -> str:
+        """
+        Get the provider status of a job.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            'collected' for jobs already collected, otherwise the provider status
+        """
+        job = self.get_job(job_id)
+        if job["status"] == JOB_COLLECTED:
+            return JOB_COLLECTED
+        return self.batch_ai_service.get_batch_status(job_id)
+
+    def collect_job(self, job_id: str) -> List[TicketAnalysis]:
+        """
+        Save the results of an ended job as ticket analyses.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Analyses saved for the job (empty if it was already collected)
+        """
+        job = self.get_job(job_id)
+        if job["status"] == JOB_COLLECTED:
+            logger.info(f"Batch job {job_id} was already collected")
+            return []
+
+        results = self.batch_ai_service.get_batch_results(job_id)
+        analyses = []
+        failed = 0
+
+        for custom_id, ticket in job["tickets"].items():
+            result = results.get(custom_id)
+            if result is None:
+                logger.warning(f"No result for ticket {ticket['ticket_id']} in batch job {job_id}")
+                failed += 1
+                continue
+
+            analysis = analysis_from_result(
+                ticket["ticket_id"],
+                ticket["subject"],
+                result,
+                source_view_id=ticket.get("source_view_id"),
+                source_view_name=ticket.get("source_view_name")
+            )
+            self.analysis_repository.save(analysis)
+            analyses.append(analysis)
+            if analysis.error:
+                failed += 1
+
+        job.update({
+            "status": JOB_COLLECTED,
+            "collected_at": time.time(),
+            "succeeded": len(analyses) - sum(1 for a in analyses if a.error),
+            "failed": failed
+        })
+        self.job_repository.save_job(job)
+
+        logger.info(f"Collected batch job {job_id}: {job['succeeded']} succeeded, {failed} failed")
+        return analyses
+
+    def collect_completed(self) -> Dict[str, List[TicketAnalysis]]:
+        """
+        Collect every submitted job that has ended.
+
+        Returns:
+            Mapping of collected job IDs to their analyses
+        """
+        collected = {}
+        for job in self.job_repository.list_jobs(status=JOB_SUBMITTED):
+            if self.batch_ai_service.get_batch_status(job["id"]) == "ended":
+                collected[job["id"]] = self.collect_job(job["id"])
+        return collected
+
+    def wait_for_job(
+        self,
+        job_id: str,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None
+    ) -> List[TicketAnalysis]:
+        """
+        Poll a job until it ends, then collect it.
+
+        Args:
+            job_id: ID of the job
+            poll_interval: Seconds between status checks
+            timeout: Optional maximum number of seconds to wait
+
+        Returns:
+            Analyses saved for the job
+
+        Raises:
+            TimeoutError: If the job does not end within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            status = self.check_job(job_id)
+            if status in ("ended", JOB_COLLECTED):
+                return self.collect_job(job_id)
+
+            if deadline is not None and time.monotonic() + poll_interval > deadline:
+                raise TimeoutError(f"Batch job {job_id} did not finish within {timeout} seconds")
+
+            logger.debug(f"Batch job {job_id} is {status}; checking again in {poll_interval}s")
+            time.sleep(poll_interval)
@@ -0,0 +1,70 @@
+"""
+Instrumentation
+
+This module provides the hooks the application services use to instrument
+their work. The implementations are injected into each service through the
+domain interfaces; a service created without them runs uninstrumented.
+"""
+
+import contextlib
+import functools
+from typing import Any, Callable, ContextManager, Optional
+
+from src.domain.interfaces.utility_interfaces import StageTimer, UsageAttribution
+
+
+def traced(name: str, **attributes: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Run every call of a service method in a span of the service's tracer.
+
+    The service keeps its SpanTracer in a 'tracer' attribute; without one the
+    method runs without a span.
+
+    Args:
+        name: Operation name
+        **attributes: Attributes of the span
+
+    Returns:
+        Method decorator
+    """
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.tracer is None:
+                return method(self, *args, **kwargs)
+            with self.tracer.span(name, attributes):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def attributed(usage_attribution: Optional[UsageAttribution], **attributes: Any) -> ContextManager[Any]:
+    """
+    Attribute the AI calls made within a block of code, if attribution is configured.
+
+    Args:
+        usage_attribution: Attribution hook of the service, or None
+        **attributes: Attribution, e.g. ticket_id, view_id or task_id
+
+    Returns:
+        Context manager for the block
+    """
+    if usage_attribution is None:
+        return contextlib.nullcontext()
+    return usage_attribution.attribute(**attributes)
+
+
+def timed_stage(stage_timer: Optional[StageTimer], name: str) -> ContextManager[Any]:
+    """
+    Time a block of code as a stage of the profiled run, if stage timing is configured.
+
+    Args:
+        stage_timer: Stage timer of the service, or None
+        name: Stage name
+
+    Returns:
+        Context manager for the block
+    """
+    if stage_timer is None:
+        return contextlib.nullcontext()
+    return stage_timer.stage(name)
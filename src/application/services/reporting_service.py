@@ -7,9 +7,10 @@ It is responsible for generating various reports based on ticket data.
 
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from src.application.services.instrumentation import timed_stage
 from src.domain.entities.ticket import Ticket
 from src.domain.entities.ticket_analysis import TicketAnalysis
 from src.domain.exceptions import EntityNotFoundError
@@ -20,6 +21,7 @@ from src.domain.interfaces.reporter_interfaces import (
 )
 from src.domain.interfaces.repository_interfaces import (
     AnalysisRepository,
+    AnalysisRollupRepository,
     TicketRepository,
     ViewRepository,
 )
@@ -27,6 +29,14 @@ from src.domain.interfaces.service_interfaces import (
     ReportingService,
     TicketAnalysisService,
 )
+from src.domain.interfaces.utility_interfaces import StageTimer
+from src.domain.value_objects.analysis_frame import AnalysisFrame
+from src.domain.value_objects.sentiment_rollup import (
+    RAW,
+    SentimentRollup,
+    rollup_dimensions,
+    split_period,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -37,6 +47,8 @@ class ReportingServiceImpl(ReportingService):
     Implementation of the ReportingService interface.
 
     This service is responsible for generating various reports based on ticket data.
+    The analyses or tickets of a report are loaded into one AnalysisFrame,
+    which every reporter aggregates.
     """
 
     def __init__(
@@ -47,7 +59,9 @@ class ReportingServiceImpl(ReportingService):
         sentiment_reporter: SentimentReporter,
         hardware_reporter: HardwareReporter,
         pending_reporter: PendingReporter,
-        ticket_analysis_service: Optional[TicketAnalysisService] = None
+        ticket_analysis_service: Optional[TicketAnalysisService] = None,
+        rollup_repository: Optional[AnalysisRollupRepository] = None,
+        stage_timer: Optional[StageTimer] = None
     ):
         """
         Initialize the reporting service.
@@ -60,6 +74,9 @@ class ReportingServiceImpl(ReportingService):
             hardware_reporter: Reporter for hardware component reports
             pending_reporter: Reporter for pending support reports
             ticket_analysis_service: Optional service for ticket analysis
+            rollup_repository: Optional rollups used to build sentiment reports
+                without reading individual analyses
+            stage_timer: Optional timer counting report rendering as the 'render' stage
         """
         self.ticket_repository = ticket_repository
         self.analysis_repository = analysis_repository
@@ -68,6 +85,8 @@ class ReportingServiceImpl(ReportingService):
         self.hardware_reporter = hardware_reporter
         self.pending_reporter = pending_reporter
         self.ticket_analysis_service = ticket_analysis_service
+        self.rollup_repository = rollup_repository
+        self.stage_timer = stage_timer
 
     def generate_sentiment_report(self, time_period: str = "week", view_id: Optional[int] = None) -> str:
         """
@@ -84,41 +103,8 @@ class ReportingServiceImpl(ReportingService):
 
         # Calculate date range based on time period
         end_date = datetime.utcnow()
-
-        if time_period == "day":
-            from datetime import timedelta
-            start_date = end_date - timedelta(days=1)
-            days = 1
-        elif time_period == "week":
-            from datetime import timedelta
-            start_date = end_date - timedelta(days=7)
-            days = 7
-        elif time_period == "month":
-            from datetime import timedelta
-            start_date = end_date - timedelta(days=30)
-            days = 30
-        elif time_period == "year":
-            from datetime import timedelta
-            start_date = end_date - timedelta(days=365)
-            days = 365
-        else:
-            # Default to week
-            from datetime import timedelta
-            start_date = end_date - timedelta(days=7)
-            days = 7
-
-        # Get analyses for the time period
-        analyses = self.analysis_repository.find_between_dates(start_date, end_date)
-
-        # If a view ID is specified, filter analyses by view
-        if view_id is not None:
-            analyses = [a for a in analyses if a.source_view_id == view_id]
-
-            # If no analyses found for the view, try to get the view name
-            if not analyses:
-                view = self.view_repository.get_view_by_id(view_id)
-                view_name = view.get('title', f"View {view_id}") if view else f"View {view_id}"
-                logger.warning(f"No analyses found for view: {view_name}")
+        days = {"day": 1, "week": 7, "month": 30, "year": 365}.get(time_period, 7)
+        start_date = end_date - timedelta(days=days)
 
         # Generate the report using the sentiment reporter
         title = f"Sentiment Analysis Report - Last {days} days"
@@ -127,12 +113,71 @@ class ReportingServiceImpl(ReportingService):
             view_name = view.get('title', f"View {view_id}") if view else f"View {view_id}"
             title += f" - {view_name}"
 
-        report = self.sentiment_reporter.generate_report(analyses, title=title)
+        if self.rollup_repository is not None:
+            rollup = self._compose_rollup(start_date, end_date, view_id)
+            if view_id is not None and not rollup.total:
+                logger.warning(f"No analyses found for view: {view_name}")
+
+            # Only the few high priority tickets are listed, so only they are read individually
+            high_priority = self.analysis_repository.find_high_priority(7, start_date, end_date)
+            if view_id is not None:
+                high_priority = [a for a in high_priority if a.source_view_id == view_id]
+
+            with timed_stage(self.stage_timer, "render"):
+                report = self.sentiment_reporter.generate_rollup_report(
+                    rollup, title=title, high_priority=high_priority
+                )
+            logger.info(f"Generated sentiment report with {rollup.total} analyses from rollups")
+            return report
+
+        # Get analyses for the time period
+        analyses = self.analysis_repository.find_between_dates(start_date, end_date)
+
+        with timed_stage(self.stage_timer, "render"):
+            analyses = AnalysisFrame.from_analyses(analyses)
+
+            # If a view ID is specified, filter analyses by view
+            if view_id is not None:
+                analyses = analyses.filter(analyses.mask("view_id", "==", view_id))
+
+                if not analyses:
+                    logger.warning(f"No analyses found for view: {view_name}")
+
+            report = self.sentiment_reporter.generate_report(analyses, title=title)
 
         logger.info(f"Generated sentiment report with {len(analyses)} analyses")
 
         return report
 
+    def _compose_rollup(self, start_date: datetime, end_date: datetime, view_id: Optional[int] = None) -> SentimentRollup:
+        """
+        Aggregate the rollup buckets covering a period.
+
+        Whole days come from daily buckets and the partial days at either end
+        from hourly buckets, so the cost depends on the number of buckets in
+        the period rather than the number of tickets. Analyses in the partial
+        hours at either end are read individually.
+
+        Args:
+            start_date: Start of the period
+            end_date: End of the period
+            view_id: Optional view ID to filter by
+
+        Returns:
+            Aggregated sentiment totals
+        """
+        rollup = SentimentRollup()
+        for granularity, range_start, range_end in split_period(start_date, end_date):
+            if granularity == RAW:
+                for analysis in self.analysis_repository.find_between_dates(range_start, range_end):
+                    # The range end is exclusive; it starts the next range
+                    if analysis.timestamp < range_end and (view_id is None or analysis.source_view_id == view_id):
+                        rollup.add(rollup_dimensions(analysis), 1)
+                continue
+            for row in self.rollup_repository.get_rollups(granularity, range_start, range_end, view_id):
+                rollup.add(row, row.get("count", 0))
+        return rollup
+
     def generate_hardware_report(self, view_id: Optional[int] = None, limit: Optional[int] = None, format_type: str = "text") -> str:
         """
         Generate a hardware component report.
@@ -168,7 +213,10 @@ class ReportingServiceImpl(ReportingService):
             view_name = view.get('title', f"View {view_id}") if view else f"View {view_id}"
             title += f" - {view_name}"
 
-        report = self.hardware_reporter.generate_report(tickets, title=title, format=format_type)
+        with timed_stage(self.stage_timer, "render"):
+            report = self.hardware_reporter.generate_report(
+                AnalysisFrame.from_tickets(tickets), title=title, format=format_type
+            )
 
         logger.info(f"Generated hardware report with {len(tickets)} tickets")
 
@@ -195,7 +243,8 @@ class ReportingServiceImpl(ReportingService):
             return f"No tickets found for view: {view_name}"
 
         # Generate the report using the pending reporter
-        report = self.pending_reporter.generate_report(tickets, view_name=view_name)
+        with timed_stage(self.stage_timer, "render"):
+            report = self.pending_reporter.generate_report(AnalysisFrame.from_tickets(tickets), view_name=view_name)
 
         logger.info(f"Generated pending report with {len(tickets)} tickets")
 
@@ -257,26 +306,32 @@ class ReportingServiceImpl(ReportingService):
 
                 # Generate the report
                 title = "Multi-View Sentiment Analysis Report"
-                report = self.sentiment_reporter.generate_multi_view_report(analyses, view_map, title)
+                with timed_stage(self.stage_timer, "render"):
+                    report = self.sentiment_reporter.generate_multi_view_report(
+                        AnalysisFrame.from_analyses(analyses), view_map, title
+                    )
             else:
                 logger.error("Ticket analysis service is required for sentiment reports")
                 return "Cannot generate sentiment report without ticket analysis service"
         elif report_type == "hardware":
             # Generate hardware report
             title = "Multi-View Hardware Component Report"
-            report = self.hardware_reporter.generate_multi_view_report(tickets, view_map, title, format=format_type)
+            with timed_stage(self.stage_timer, "render"):
+                report = self.hardware_reporter.generate_multi_view_report(
+                    AnalysisFrame.from_tickets(tickets), view_map, title, format=format_type
+                )
         elif report_type == "pending":
-            # Group tickets by view
-            tickets_by_view = {}
-            for ticket in tickets:
-                if hasattr(ticket, 'source_view_id') and ticket.source_view_id in view_map:
-                    view_name = view_map[ticket.source_view_id]
-                    if view_name not in tickets_by_view:
-                        tickets_by_view[view_name] = []
-                    tickets_by_view[view_name].append(ticket)
-
-            # Generate pending report
-            report = self.pending_reporter.generate_multi_view_report(tickets_by_view)
+            with timed_stage(self.stage_timer, "render"):
+                # Group tickets by view
+                frame = AnalysisFrame.from_tickets(tickets)
+                in_views = frame.mask("view_id", "in", list(view_map))
+                tickets_by_view = {
+                    view_map[view_id]: view_tickets
+                    for view_id, view_tickets in frame.group_by("view_id", where=in_views).items()
+                }
+
+                # Generate pending report
+                report = self.pending_reporter.generate_multi_view_report(tickets_by_view)
         else:
             logger.error(f"Unknown report type: {report_type}")
             return f"Unknown report type: {report_type}"
@@ -0,0 +1,100 @@
+"""
+Scheduled Task Handlers
+
+This module maps the task types offered by the schedule command to the
+application services that carry them out.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from src.domain.interfaces.service_interfaces import (
+    ReportingService,
+    TicketAnalysisService,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _save(reporting_service: ReportingService, report: str, task_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Save a generated report, honouring the task's output directory.
+
+    Args:
+        reporting_service: Reporting service
+        report: Report text
+        task_type: Task type used in the filename
+        parameters: Task parameters
+
+    Returns:
+        Task result with the report path under 'output'
+    """
+    filename = f"{task_type}_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+    output_dir = parameters.get("output_dir")
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        filename = os.path.join(output_dir, filename)
+
+    return {"output": reporting_service.save_report(report, filename)}
+
+
+def register_default_task_handlers(
+    scheduler_service,
+    reporting_service: ReportingService,
+    ticket_analysis_service: Optional[TicketAnalysisService] = None
+) -> None:
+    """
+    Register handlers for the built-in scheduled task types.
+
+    Args:
+        scheduler_service: SchedulerServiceImpl to register the handlers with
+        reporting_service: Reporting service used by the report tasks
+        ticket_analysis_service: Ticket analysis service used by 'analyze-all'
+    """
+    def sentiment_task(time_period: str) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        def handler(parameters: Dict[str, Any]) -> Dict[str, Any]:
+            report = reporting_service.generate_sentiment_report(
+                time_period=parameters.get("time_period", time_period),
+                view_id=parameters.get("view_id")
+            )
+            return _save(reporting_service, report, "sentiment", parameters)
+        return handler
+
+    def hardware_report(parameters: Dict[str, Any]) -> Dict[str, Any]:
+        report = reporting_service.generate_hardware_report(
+            view_id=parameters.get("view_id"),
+            limit=parameters.get("limit"),
+            format_type=parameters.get("format", "text")
+        )
+        return _save(reporting_service, report, "hardware", parameters)
+
+    def pending_report(parameters: Dict[str, Any]) -> Dict[str, Any]:
+        view_name = parameters.get("view_name")
+        if not view_name:
+            raise ValueError("pending-report tasks require a view_name parameter")
+
+        report = reporting_service.generate_pending_report(view_name, parameters.get("limit"))
+        return _save(reporting_service, report, "pending", parameters)
+
+    def analyze_all(parameters: Dict[str, Any]) -> Dict[str, Any]:
+        if ticket_analysis_service is None:
+            raise ValueError("analyze-all tasks require a ticket analysis service")
+
+        view_id = parameters.get("view_id")
+        if view_id is None:
+            raise ValueError("analyze-all tasks require a view_id parameter")
+
+        analyses = ticket_analysis_service.analyze_view(view_id, parameters.get("limit"))
+        return {"output": f"Analyzed {len(analyses)} tickets from view {view_id}"}
+
+    scheduler_service.register_task_handler("sentiment-report", sentiment_task("week"))
+    scheduler_service.register_task_handler("daily-summary", sentiment_task("day"))
+    scheduler_service.register_task_handler("weekly-summary", sentiment_task("week"))
+    scheduler_service.register_task_handler("hardware-report", hardware_report)
+    scheduler_service.register_task_handler("pending-report", pending_report)
+    scheduler_service.register_task_handler("analyze-all", analyze_all)
+
+    logger.debug("Registered default scheduled task handlers")
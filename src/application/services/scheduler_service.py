@@ -5,34 +5,124 @@ This module provides the implementation of the SchedulerService interface.
 It is responsible for scheduling and managing recurring tasks.
 """
 
+import functools
+import heapq
 import logging
-import sched
+import random
 import threading
 import time
-from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from src.application.services.instrumentation import attributed
+from src.domain.interfaces.repository_interfaces import ScheduleRepository
 from src.domain.interfaces.service_interfaces import SchedulerService
+from src.domain.interfaces.utility_interfaces import MetricsCollector, UsageAttribution
+from src.domain.value_objects.cron_expression import CronExpression
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Catch-up policies for runs missed while the scheduler was not running
+CATCH_UP_SKIP = "skip"
+CATCH_UP_RUN_ONCE = "run_once"
+CATCH_UP_RUN_ALL = "run_all"
+CATCH_UP_POLICIES = (CATCH_UP_SKIP, CATCH_UP_RUN_ONCE, CATCH_UP_RUN_ALL)
+
+# Task info keys that are internal to the scheduler and not listed
+_INTERNAL_TASK_KEYS = ('func', 'generation', 'catch_up_runs')
+
+# Task info keys written to the schedule repository
+_PERSISTED_TASK_KEYS = (
+    'id', 'name', 'task', 'parameters', 'schedule', 'cron', 'interval_minutes',
+    'interval_seconds', 'catch_up_policy', 'next_run', 'last_run', 'run_count',
+    'skipped_runs', 'max_lateness', 'active', 'created_at'
+)
+
 
 class SchedulerServiceImpl(SchedulerService):
     """
     Implementation of the SchedulerService interface.
 
-    This service manages scheduled tasks using Python's sched module
-    and provides methods for adding, removing, and listing tasks.
+    Due times are kept on a heap and the scheduler thread sleeps on a
+    condition variable until the earliest one, so it only wakes up when a
+    task is due or the set of tasks changes. Task bodies run on a bounded
+    thread pool; a task that is still running when its next run comes due
+    skips that run instead of overlapping with itself.
+
+    Tasks scheduled by type (interval, daily, weekly or cron) are persisted
+    through an optional ScheduleRepository together with their next run time
+    and run history. Tasks that run an arbitrary function cannot be stored,
+    so they are rejected when a repository is configured. When the scheduler starts, runs missed while it was down are
+    handled according to the task's catch-up policy.
     """
 
-    def __init__(self):
-        """Initialize the scheduler service."""
-        self.scheduler = sched.scheduler(time.time, time.sleep)
-        self.tasks = {}  # task_name -> task_info
+    def __init__(
+        self,
+        max_workers: int = 4,
+        schedule_repository: Optional[ScheduleRepository] = None,
+        catch_up_policy: str = CATCH_UP_RUN_ONCE,
+        jitter_seconds: float = 0.0,
+        max_catch_up_runs: int = 24,
+        metrics: Optional[MetricsCollector] = None,
+        usage_attribution: Optional[UsageAttribution] = None
+    ):
+        """
+        Initialize the scheduler service.
+
+        Args:
+            max_workers: Maximum number of tasks executing at the same time
+            schedule_repository: Optional store for task definitions and run history
+            catch_up_policy: Default policy for missed runs ('skip', 'run_once', 'run_all')
+            jitter_seconds: Maximum random delay added to catch-up runs to spread load
+            max_catch_up_runs: Maximum number of missed runs replayed by 'run_all'
+            metrics: Optional collector receiving run counts, durations and lateness
+            usage_attribution: Optional hook attributing AI calls to the running task
+        """
+        if catch_up_policy not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {catch_up_policy}")
+
+        self.max_workers = max_workers
+        self.schedule_repository = schedule_repository
+        self.catch_up_policy = catch_up_policy
+        self.jitter_seconds = jitter_seconds
+        self.max_catch_up_runs = max_catch_up_runs
+        self.metrics = metrics
+        self.usage_attribution = usage_attribution
+        self.task_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self.tasks = {}  # task_id -> task_info
         self.running = False
         self.scheduler_thread = None
+        self.executor: Optional[ThreadPoolExecutor] = None
         self.lock = threading.RLock()
+        self.condition = threading.Condition(self.lock)
+
+        # Serializes repository writes, which happen outside the scheduler
+        # lock; it is always taken before the lock, never while holding it
+        self._persist_lock = threading.Lock()
+
+        # Heap of (next_run, sequence, task_id); entries whose sequence no
+        # longer matches the task's generation are stale and dropped lazily
+        self._queue: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+
+        if self.schedule_repository is not None:
+            self._load_tasks()
+
+    def register_task_handler(self, task_type: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+        """
+        Register the function that runs tasks of a given type.
+
+        Persisted tasks only store their type and parameters, so the handler
+        is looked up by type whenever such a task runs.
+
+        Args:
+            task_type: Task type (e.g. 'sentiment-report')
+            handler: Function called with the task parameters
+        """
+        self.task_handlers[task_type] = handler
 
     def schedule_task(self, task_name: str, interval_minutes: int, func: Callable, *args, **kwargs) -> bool:
         """
@@ -47,7 +137,19 @@ class SchedulerServiceImpl(SchedulerService):
 
         Returns:
             Success indicator
+
+        Raises:
+            ValueError: If the interval is not positive, or a schedule repository is
+                configured (use schedule_interval_task for tasks that must survive restarts)
         """
+        if interval_minutes <= 0:
+            raise ValueError(f"Interval must be positive, got {interval_minutes} minutes")
+        if self.schedule_repository is not None:
+            raise ValueError(
+                f"Task {task_name} runs a function that cannot be persisted; "
+                f"use schedule_interval_task with a registered task type instead"
+            )
+
         with self.lock:
             if task_name in self.tasks:
                 logger.warning(f"Task {task_name} is already scheduled. Replacing it.")
@@ -57,19 +159,19 @@ class SchedulerServiceImpl(SchedulerService):
             interval_seconds = interval_minutes * 60
 
             # Create task info
-            task_info = {
-                'name': task_name,
+            task_info = self._new_task_info(
+                task_id=task_name,
+                task_name=task_name,
+                schedule=f"every {interval_minutes} minutes",
+                next_run=time.time()  # Schedule to run immediately
+            )
+            task_info.update({
                 'interval_minutes': interval_minutes,
                 'interval_seconds': interval_seconds,
                 'func': func,
                 'args': args,
-                'kwargs': kwargs,
-                'next_run': time.time(),  # Schedule to run immediately
-                'event': None,  # Will be set when scheduled
-                'last_run': None,
-                'run_count': 0,
-                'active': True
-            }
+                'kwargs': kwargs
+            })
 
             # Store the task
             self.tasks[task_name] = task_info
@@ -81,6 +183,228 @@ class SchedulerServiceImpl(SchedulerService):
             logger.info(f"Scheduled task {task_name} to run every {interval_minutes} minutes")
             return True
 
+    def schedule_interval_task(
+        self,
+        task_name: str,
+        interval_minutes: int,
+        parameters: Optional[Dict[str, Any]] = None,
+        catch_up_policy: Optional[str] = None
+    ) -> str:
+        """
+        Schedule a task of a registered type to run at regular intervals.
+
+        The first run is due immediately.
+
+        Args:
+            task_name: Task type (e.g. 'analyze-all')
+            interval_minutes: Interval in minutes
+            parameters: Parameters passed to the task handler
+            catch_up_policy: Optional policy overriding the scheduler default
+
+        Returns:
+            ID of the new task
+
+        Raises:
+            ValueError: If the interval is not positive or the policy is invalid
+        """
+        if interval_minutes <= 0:
+            raise ValueError(f"Interval must be positive, got {interval_minutes} minutes")
+
+        return self._schedule_typed_task(
+            task_name, f"every {interval_minutes} minutes", time.time(),
+            {'interval_minutes': interval_minutes, 'interval_seconds': interval_minutes * 60},
+            parameters, catch_up_policy
+        )
+
+    def schedule_cron_task(
+        self,
+        task_name: str,
+        expression: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        catch_up_policy: Optional[str] = None
+    ) -> str:
+        """
+        Schedule a task of a registered type on a cron expression.
+
+        Args:
+            task_name: Task type (e.g. 'sentiment-report')
+            expression: Five-field cron expression
+            parameters: Parameters passed to the task handler
+            catch_up_policy: Optional policy overriding the scheduler default
+
+        Returns:
+            ID of the new task
+
+        Raises:
+            ValueError: If the expression or policy is invalid
+        """
+        return self._schedule_cron(task_name, CronExpression(expression), f"cron: {expression}", parameters, catch_up_policy)
+
+    def schedule_daily_task(
+        self,
+        task_name: str,
+        hour: int,
+        minute: int,
+        parameters: Optional[Dict[str, Any]] = None,
+        catch_up_policy: Optional[str] = None
+    ) -> str:
+        """
+        Schedule a task of a registered type to run once a day.
+
+        Args:
+            task_name: Task type (e.g. 'sentiment-report')
+            hour: Hour of the day (0-23)
+            minute: Minute of the hour (0-59)
+            parameters: Parameters passed to the task handler
+            catch_up_policy: Optional policy overriding the scheduler default
+
+        Returns:
+            ID of the new task
+        """
+        return self._schedule_cron(
+            task_name, CronExpression.daily(hour, minute), f"daily at {hour:02d}:{minute:02d}",
+            parameters, catch_up_policy
+        )
+
+    def schedule_weekly_task(
+        self,
+        task_name: str,
+        day: str,
+        hour: int,
+        minute: int,
+        parameters: Optional[Dict[str, Any]] = None,
+        catch_up_policy: Optional[str] = None
+    ) -> str:
+        """
+        Schedule a task of a registered type to run once a week.
+
+        Args:
+            task_name: Task type (e.g. 'weekly-summary')
+            day: Day name (e.g. 'monday')
+            hour: Hour of the day (0-23)
+            minute: Minute of the hour (0-59)
+            parameters: Parameters passed to the task handler
+            catch_up_policy: Optional policy overriding the scheduler default
+
+        Returns:
+            ID of the new task
+        """
+        return self._schedule_cron(
+            task_name, CronExpression.weekly(day, hour, minute),
+            f"weekly on {day.capitalize()} at {hour:02d}:{minute:02d}", parameters, catch_up_policy
+        )
+
+    def _schedule_cron(
+        self,
+        task_name: str,
+        cron: CronExpression,
+        schedule: str,
+        parameters: Optional[Dict[str, Any]],
+        catch_up_policy: Optional[str]
+    ) -> str:
+        """
+        Create, persist and schedule a cron-based task.
+
+        Args:
+            task_name: Task type
+            cron: Parsed cron expression
+            schedule: Human-readable schedule description
+            parameters: Parameters passed to the task handler
+            catch_up_policy: Optional policy overriding the scheduler default
+
+        Returns:
+            ID of the new task
+        """
+        next_run = cron.next_after(datetime.now()).timestamp()
+        return self._schedule_typed_task(
+            task_name, schedule, next_run, {'cron': cron.expression}, parameters, catch_up_policy
+        )
+
+    def _schedule_typed_task(
+        self,
+        task_name: str,
+        schedule: str,
+        next_run: float,
+        timing: Dict[str, Any],
+        parameters: Optional[Dict[str, Any]],
+        catch_up_policy: Optional[str]
+    ) -> str:
+        """
+        Create, persist and schedule a task of a registered type.
+
+        Args:
+            task_name: Task type
+            schedule: Human-readable schedule description
+            next_run: Time of the first run
+            timing: Cron expression or interval fields of the task info
+            parameters: Parameters passed to the task handler
+            catch_up_policy: Optional policy overriding the scheduler default
+
+        Returns:
+            ID of the new task
+        """
+        if catch_up_policy is not None and catch_up_policy not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch-up policy: {catch_up_policy}")
+
+        task_id = uuid.uuid4().hex[:8]
+
+        with self.lock:
+            task_info = self._new_task_info(task_id, task_name, schedule, next_run)
+            task_info.update(timing)
+            task_info.update({
+                'task': task_name,
+                'parameters': parameters or {},
+                'catch_up_policy': catch_up_policy
+            })
+            self.tasks[task_id] = task_info
+
+            if self.running:
+                self._schedule_next_run(task_id)
+
+        self._persist_task(task_id)
+
+        logger.info(f"Scheduled task {task_name} ({task_id}) {schedule}")
+        return task_id
+
+    def _new_task_info(self, task_id: str, task_name: str, schedule: str, next_run: float) -> Dict[str, Any]:
+        """
+        Create the task info record shared by all kinds of tasks.
+
+        Args:
+            task_id: ID of the task
+            task_name: Name of the task
+            schedule: Human-readable schedule description
+            next_run: Time of the first run
+
+        Returns:
+            Task info dictionary
+        """
+        return {
+            'id': task_id,
+            'name': task_name,
+            'task': None,
+            'parameters': {},
+            'schedule': schedule,
+            'cron': None,
+            'interval_minutes': None,
+            'interval_seconds': None,
+            'catch_up_policy': None,
+            'func': None,
+            'args': (),
+            'kwargs': {},
+            'next_run': next_run,
+            'generation': 0,
+            'last_run': None,
+            'run_count': 0,
+            'skipped_runs': 0,
+            'last_lateness': None,
+            'max_lateness': 0.0,
+            'last_duration': None,
+            'is_executing': False,
+            'active': True,
+            'created_at': time.time()
+        }
+
     def remove_task(self, task_name: str) -> bool:
         """
         Remove a scheduled task.
@@ -96,20 +420,107 @@ class SchedulerServiceImpl(SchedulerService):
                 logger.warning(f"Task {task_name} not found")
                 return False
 
-            # Cancel any pending events
-            task_info = self.tasks[task_name]
-            if task_info['event'] is not None:
-                try:
-                    self.scheduler.cancel(task_info['event'])
-                except ValueError:
-                    # Event might have already been executed
-                    pass
+            # Any queued entry for the task becomes stale once it is gone
+            task_info = self.tasks.pop(task_name)
+            self.condition.notify()
 
-            # Remove the task
-            del self.tasks[task_name]
+        if task_info['task'] is not None and self.schedule_repository is not None:
+            with self._persist_lock:
+                self.schedule_repository.delete_task(task_info['id'])
 
-            logger.info(f"Removed task {task_name}")
-            return True
+        logger.info(f"Removed task {task_name}")
+        return True
+
+    def enable_task(self, task_id: str) -> bool:
+        """
+        Enable a scheduled task.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            True if the task exists, False otherwise
+        """
+        return self._set_task_active(task_id, True)
+
+    def disable_task(self, task_id: str) -> bool:
+        """
+        Disable a scheduled task without removing it.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            True if the task exists, False otherwise
+        """
+        return self._set_task_active(task_id, False)
+
+    def _set_task_active(self, task_id: str, active: bool) -> bool:
+        """
+        Enable or disable a task and update its schedule.
+
+        Args:
+            task_id: ID of the task
+            active: New state
+
+        Returns:
+            True if the task exists, False otherwise
+        """
+        with self.lock:
+            task_info = self.tasks.get(task_id)
+            if task_info is None:
+                logger.warning(f"Task {task_id} not found")
+                return False
+
+            task_info['active'] = active
+            if active:
+                # Resume from the next regular run rather than replaying the gap
+                now = time.time()
+                if task_info['next_run'] < now:
+                    task_info['next_run'] = self._following_run(task_info, now)
+                self._schedule_next_run(task_id)
+            else:
+                # Invalidate the queued entry
+                task_info['generation'] = 0
+                self.condition.notify()
+
+        self._persist_task(task_id)
+        return True
+
+    def run_task(self, task_id: str) -> Any:
+        """
+        Run a scheduled task immediately on the calling thread.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Result of the task function
+
+        Raises:
+            KeyError: If the task does not exist
+        """
+        with self.lock:
+            task_info = self.tasks.get(task_id)
+        if task_info is None:
+            raise KeyError(f"Task {task_id} not found")
+
+        return self._run_once(task_id, task_info, time.time(), raise_errors=True)
+
+    def get_run_history(self, task_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get the most recent runs of a persisted task, newest first.
+
+        Args:
+            task_id: ID of the task
+            limit: Maximum number of runs to return
+
+        Returns:
+            List of run records (empty without a schedule repository)
+        """
+        if self.schedule_repository is None:
+            return []
+        return self.schedule_repository.get_run_history(task_id, limit)
 
     def list_tasks(self) -> List[Dict[str, Any]]:
         """
@@ -122,10 +533,12 @@ class SchedulerServiceImpl(SchedulerService):
             task_list = []
 
             for task_name, task_info in self.tasks.items():
-                # Create a copy of task info without function objects
-                task_copy = task_info.copy()
-                task_copy.pop('func')
-                task_copy.pop('event')
+                # Create a copy of task info without internal fields
+                task_copy = {
+                    key: value for key, value in task_info.items()
+                    if key not in _INTERNAL_TASK_KEYS
+                }
+                task_copy['enabled'] = task_copy['active']
 
                 # Calculate next run time as a human-readable string
                 if task_copy['next_run']:
@@ -149,8 +562,21 @@ class SchedulerServiceImpl(SchedulerService):
                 return
 
             self.running = True
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="scheduler-task"
+            )
+
+            # Deal with runs missed while the scheduler was not running
+            now = time.time()
+            caught_up = []
+            for task_info in self.tasks.values():
+                if task_info['active'] and task_info['task'] is not None and task_info['next_run'] < now:
+                    self._apply_catch_up(task_info, now)
+                    caught_up.append(task_info['id'])
 
             # Schedule all tasks
+            self._queue = []
             for task_name in self.tasks:
                 self._schedule_next_run(task_name)
 
@@ -160,6 +586,9 @@ class SchedulerServiceImpl(SchedulerService):
 
             logger.info("Scheduler started")
 
+        for task_id in caught_up:
+            self._persist_task(task_id)
+
     def stop(self) -> None:
         """Stop the scheduler."""
         with self.lock:
@@ -168,37 +597,144 @@ class SchedulerServiceImpl(SchedulerService):
                 return
 
             self.running = False
+            self._queue = []
+            self.condition.notify_all()
+
+            executor = self.executor
+            self.executor = None
+            scheduler_thread = self.scheduler_thread
+            self.scheduler_thread = None
+
+        # Wait outside the lock so the scheduler thread can observe the stop
+        if scheduler_thread is not None and scheduler_thread is not threading.current_thread():
+            scheduler_thread.join()
+
+        # Let running tasks finish in the background but drop queued ones
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.info("Scheduler stopped")
+
+    def _load_tasks(self) -> None:
+        """Load persisted tasks from the schedule repository."""
+        for record in self.schedule_repository.list_tasks():
+            task_info = self._new_task_info(
+                record['id'], record.get('name', record.get('task')),
+                record.get('schedule', ''), record['next_run']
+            )
+            task_info.update({key: record[key] for key in _PERSISTED_TASK_KEYS if key in record})
+            self.tasks[task_info['id']] = task_info
+
+        if self.tasks:
+            logger.info(f"Loaded {len(self.tasks)} scheduled tasks")
+
+    def _persist_task(self, task_id: str) -> None:
+        """
+        Write a task of a registered type to the schedule repository, if configured.
 
-            # Cancel all pending events
-            for task_name, task_info in self.tasks.items():
-                if task_info['event'] is not None:
-                    try:
-                        self.scheduler.cancel(task_info['event'])
-                    except ValueError:
-                        # Event might have already been executed
-                        pass
-                    task_info['event'] = None
-
-            # Clear the scheduler
-            for event in self.scheduler.queue:
-                try:
-                    self.scheduler.cancel(event)
-                except ValueError:
-                    pass
+        Must be called without the lock held. The task is read when the write
+        starts, so writes racing each other always leave its latest state.
 
-            logger.info("Scheduler stopped")
+        Args:
+            task_id: ID of the task
+        """
+        if self.schedule_repository is None:
+            return
 
-    def _run_scheduler(self) -> None:
-        """Run the scheduler in a loop."""
-        while self.running:
-            try:
-                # Run the scheduler
-                self.scheduler.run(blocking=False)
+        with self._persist_lock:
+            with self.lock:
+                task_info = self.tasks.get(task_id)
+                if task_info is None or task_info['task'] is None:
+                    return
+                record = {key: task_info[key] for key in _PERSISTED_TASK_KEYS}
 
-                # Sleep for a short time
-                time.sleep(1)
+            try:
+                self.schedule_repository.save_task(record)
             except Exception as e:
-                logger.error(f"Error in scheduler: {str(e)}")
+                logger.error(f"Error persisting task {task_id}: {str(e)}")
+
+    def _apply_catch_up(self, task_info: Dict[str, Any], now: float) -> None:
+        """
+        Apply the catch-up policy to a task whose runs were missed.
+
+        Args:
+            task_info: Task information
+            now: Current time
+        """
+        policy = task_info['catch_up_policy'] or self.catch_up_policy
+
+        # Enumerate the missed run times, capped so a long outage stays cheap
+        missed = [task_info['next_run']]
+        while len(missed) <= self.max_catch_up_runs:
+            following = self._following_run(task_info, missed[-1])
+            if following > now:
+                break
+            missed.append(following)
+
+        if policy == CATCH_UP_SKIP:
+            task_info['next_run'] = self._following_run(task_info, now)
+        else:
+            if policy == CATCH_UP_RUN_ALL:
+                task_info['catch_up_runs'] = missed[-self.max_catch_up_runs:]
+            else:
+                task_info['catch_up_runs'] = missed[-1:]
+            task_info['next_run'] = now + random.uniform(0, self.jitter_seconds)
+
+        logger.info(
+            f"Task {task_info['id']} missed {len(missed)} run(s); applying '{policy}' catch-up policy"
+        )
+
+    def _following_run(self, task_info: Dict[str, Any], after: float) -> float:
+        """
+        Get the first regular run time of a task after a given time.
+
+        Args:
+            task_info: Task information
+            after: Reference time
+
+        Returns:
+            Next run time
+        """
+        if task_info['cron'] is not None:
+            cron = CronExpression(task_info['cron'])
+            return cron.next_after(datetime.fromtimestamp(after)).timestamp()
+
+        interval = task_info['interval_seconds']
+        return after + interval if interval else after
+
+    def _run_scheduler(self) -> None:
+        """Sleep until the earliest due task and dispatch it, until stopped."""
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+
+                try:
+                    if not self._queue:
+                        self.condition.wait()
+                        continue
+
+                    next_run, sequence, task_name = self._queue[0]
+                    task_info = self.tasks.get(task_name)
+
+                    # Drop entries for removed or rescheduled tasks
+                    if task_info is None or task_info['generation'] != sequence:
+                        heapq.heappop(self._queue)
+                        continue
+
+                    delay = next_run - time.time()
+                    if delay > 0:
+                        self.condition.wait(timeout=delay)
+                        continue
+
+                    heapq.heappop(self._queue)
+                    self._dispatch_task(task_name, next_run)
+                except Exception as e:
+                    logger.error(f"Error in scheduler: {str(e)}")
+                    continue
+
+            # Save the new next run time without blocking schedule changes
+            self._persist_task(task_name)
 
     def _schedule_next_run(self, task_name: str) -> None:
         """
@@ -216,48 +752,152 @@ class SchedulerServiceImpl(SchedulerService):
         if not task_info['active']:
             return
 
-        # Calculate the delay
+        # A new sequence number invalidates any entry already queued for the task
+        self._sequence += 1
+        task_info['generation'] = self._sequence
+        heapq.heappush(self._queue, (task_info['next_run'], self._sequence, task_name))
+
+        # Wake the scheduler thread in case this task is now the earliest
+        self.condition.notify()
+
+    def _dispatch_task(self, task_name: str, scheduled_time: float) -> None:
+        """
+        Hand a due task to the executor and schedule its next run.
+
+        Must be called with the lock held; the caller persists the task
+        after releasing it.
+
+        Args:
+            task_name: Name of the task to dispatch
+            scheduled_time: Time the run was due
+        """
+        task_info = self.tasks[task_name]
         now = time.time()
-        delay = max(0, task_info['next_run'] - now)
-
-        # Schedule the task
-        event = self.scheduler.enter(
-            delay,
-            1,  # Priority (1 is highest)
-            self._execute_task,
-            (task_name,)
-        )
+        scheduled_times = task_info.pop('catch_up_runs', None) or [scheduled_time]
+
+        # Advance from the scheduled time, not from now, so runs do not drift;
+        # runs missed while the process was busy are skipped rather than bunched
+        next_run = self._following_run(task_info, scheduled_time)
+        if next_run <= now:
+            interval = task_info['interval_seconds']
+            if task_info['cron'] is None and interval:
+                # Stay aligned to the original interval grid
+                next_run += (int((now - next_run) // interval) + 1) * interval
+            else:
+                next_run = self._following_run(task_info, now)
+        task_info['next_run'] = next_run
+
+        if task_info['is_executing']:
+            task_info['skipped_runs'] += 1
+            if self.metrics:
+                self.metrics.increment("scheduler.task.skipped", tags={"task": task_name})
+            logger.warning(f"Task {task_name} is still running; skipping run due at {datetime.fromtimestamp(scheduled_time)}")
+        else:
+            task_info['is_executing'] = True
+            future = self.executor.submit(self._execute_task, task_name, task_info, scheduled_times)
+            future.add_done_callback(functools.partial(self._release_if_cancelled, task_info))
+
+        self._schedule_next_run(task_name)
+
+    def _release_if_cancelled(self, task_info: Dict[str, Any], future: Future) -> None:
+        """
+        Clear the executing flag of a run that was cancelled before it started.
 
-        # Update task info
-        task_info['event'] = event
+        Args:
+            task_info: Task information captured at dispatch time
+            future: Future of the submitted run
+        """
+        if future.cancelled():
+            with self.lock:
+                task_info['is_executing'] = False
 
-    def _execute_task(self, task_name: str) -> None:
+    def _execute_task(self, task_name: str, task_info: Dict[str, Any], scheduled_times: List[float]) -> None:
         """
-        Execute a task and schedule its next run.
+        Execute a task on an executor thread.
 
         Args:
             task_name: Name of the task to execute
+            task_info: Task information captured at dispatch time
+            scheduled_times: Times the runs were due (more than one when catching up)
         """
-        with self.lock:
-            if task_name not in self.tasks:
-                return
+        try:
+            for scheduled_time in scheduled_times:
+                self._run_once(task_name, task_info, scheduled_time)
+        finally:
+            with self.lock:
+                task_info['is_executing'] = False
+
+    def _run_once(
+        self,
+        task_name: str,
+        task_info: Dict[str, Any],
+        scheduled_time: float,
+        raise_errors: bool = False
+    ) -> Any:
+        """
+        Run a task once and record its timing and outcome.
 
-            task_info = self.tasks[task_name]
+        Args:
+            task_name: Name of the task to execute
+            task_info: Task information
+            scheduled_time: Time the run was due
+            raise_errors: Whether to re-raise errors from the task function
 
-            # Update task info
-            task_info['event'] = None
-            task_info['last_run'] = time.time()
-            task_info['run_count'] += 1
+        Returns:
+            Result of the task function, or None if it failed
+        """
+        started = time.time()
+        lateness = started - scheduled_time
 
-            # Calculate next run time
-            task_info['next_run'] = time.time() + task_info['interval_seconds']
+        with self.lock:
+            task_info['last_run'] = started
+            task_info['run_count'] += 1
+            task_info['last_lateness'] = lateness
+            task_info['max_lateness'] = max(task_info['max_lateness'], lateness)
 
-            # Schedule next run
-            self._schedule_next_run(task_name)
+        logger.debug(f"Task {task_name} started {lateness:.3f}s after it was due")
 
-        # Execute the task outside the lock
+        result = None
+        error = None
         try:
-            task_info['func'](*task_info['args'], **task_info['kwargs'])
+            # AI calls made by the task are attributed to it in the usage ledger
+            with attributed(self.usage_attribution, task_id=task_info.get('id', task_name)):
+                if task_info['func'] is not None:
+                    result = task_info['func'](*task_info['args'], **task_info['kwargs'])
+                else:
+                    handler = self.task_handlers.get(task_info['task'])
+                    if handler is None:
+                        raise KeyError(f"No handler registered for task type {task_info['task']}")
+                    result = handler(dict(task_info['parameters']))
             logger.info(f"Successfully executed task {task_name}")
         except Exception as e:
+            error = e
             logger.error(f"Error executing task {task_name}: {str(e)}")
+        finally:
+            finished = time.time()
+            with self.lock:
+                task_info['last_duration'] = finished - started
+        self._persist_task(task_info['id'])
+
+        if self.metrics:
+            tags = {"task": task_name, "outcome": "ok" if error is None else "error"}
+            self.metrics.increment("scheduler.task.runs", tags=tags)
+            self.metrics.timing("scheduler.task.duration", (finished - started) * 1000, tags)
+            self.metrics.timing("scheduler.task.lateness", lateness * 1000, {"task": task_name})
+
+        if task_info['task'] is not None and self.schedule_repository is not None:
+            try:
+                self.schedule_repository.record_run(task_info['id'], {
+                    'scheduled_time': scheduled_time,
+                    'started': started,
+                    'finished': finished,
+                    'lateness': lateness,
+                    'success': error is None,
+                    'error': str(error) if error else None
+                })
+            except Exception as e:
+                logger.error(f"Error recording run of task {task_name}: {str(e)}")
+
+        if error is not None and raise_errors:
+            raise error
+        return result
@@ -9,20 +9,91 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from src.application.services.instrumentation import attributed, traced
 from src.domain.entities.ticket import Ticket
 from src.domain.entities.ticket_analysis import SentimentAnalysis, TicketAnalysis
 from src.domain.exceptions import EntityNotFoundError
-from src.domain.interfaces.ai_service_interfaces import AIService, AIServiceError
+from src.domain.interfaces.ai_service_interfaces import (
+    AIService,
+    AIServiceError,
+    PackedAIService,
+)
 from src.domain.interfaces.repository_interfaces import (
     AnalysisRepository,
     TicketRepository,
 )
 from src.domain.interfaces.service_interfaces import TicketAnalysisService
+from src.domain.interfaces.utility_interfaces import SpanTracer, UsageAttribution
+from src.domain.value_objects.content_window import (
+    DEFAULT_CONTENT_WINDOW,
+    ContentWindow,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+def ticket_content(ticket: Ticket, window: Optional[ContentWindow] = None) -> str:
+    """
+    Build the text sent to the AI service for a ticket.
+
+    Args:
+        ticket: Ticket entity
+        window: Token budget for the content (defaults to DEFAULT_CONTENT_WINDOW)
+
+    Returns:
+        Subject, first message and most recent comments of the ticket, within the budget
+    """
+    return (window or DEFAULT_CONTENT_WINDOW).build(ticket)
+
+
+def analysis_from_result(
+    ticket_id: str,
+    subject: str,
+    analysis_result: Dict[str, Any],
+    source_view_id: Optional[int] = None,
+    source_view_name: Optional[str] = None
+) -> TicketAnalysis:
+    """
+    Map an AI analysis result onto a TicketAnalysis entity.
+
+    Args:
+        ticket_id: ID of the analyzed ticket
+        subject: Subject of the ticket
+        analysis_result: Result returned by the AI service
+        source_view_id: Optional ID of the view the ticket came from
+        source_view_name: Optional name of the view the ticket came from
+
+    Returns:
+        Ticket analysis entity
+    """
+    # Extract sentiment data
+    sentiment_data = analysis_result.get("sentiment", {})
+    sentiment = SentimentAnalysis(
+        polarity=sentiment_data.get("polarity", "unknown"),
+        urgency_level=sentiment_data.get("urgency_level", 1),
+        frustration_level=sentiment_data.get("frustration_level", 1),
+        emotions=sentiment_data.get("emotions", []),
+        business_impact=sentiment_data.get("business_impact", {"detected": False})
+    )
+
+    return TicketAnalysis(
+        ticket_id=str(ticket_id),
+        subject=subject,
+        category=analysis_result.get("category", "uncategorized"),
+        component=analysis_result.get("component", "none"),
+        priority=analysis_result.get("priority", "low"),
+        sentiment=sentiment,
+        timestamp=datetime.utcnow(),
+        source_view_id=source_view_id,
+        source_view_name=source_view_name,
+        confidence=analysis_result.get("confidence", 0.0),
+        raw_result=analysis_result,
+        error=analysis_result.get("error"),
+        error_type=analysis_result.get("error_type")
+    )
+
+
 class TicketAnalysisServiceImpl(TicketAnalysisService):
     """
     Implementation of the TicketAnalysisService interface.
@@ -34,7 +105,10 @@ class TicketAnalysisServiceImpl(TicketAnalysisService):
         self,
         ticket_repository: TicketRepository,
         analysis_repository: AnalysisRepository,
-        ai_service: AIService
+        ai_service: AIService,
+        content_window: Optional[ContentWindow] = None,
+        tracer: Optional[SpanTracer] = None,
+        usage_attribution: Optional[UsageAttribution] = None
     ):
         """
         Initialize the ticket analysis service.
@@ -43,11 +117,18 @@ class TicketAnalysisServiceImpl(TicketAnalysisService):
             ticket_repository: Repository for ticket data
             analysis_repository: Repository for analysis data
             ai_service: AI service for content analysis
+            content_window: Token budget for ticket content (defaults to DEFAULT_CONTENT_WINDOW)
+            tracer: Optional tracer recording each analysis as a span
+            usage_attribution: Optional hook attributing AI calls to their ticket and view
         """
         self.ticket_repository = ticket_repository
         self.analysis_repository = analysis_repository
         self.ai_service = ai_service
+        self.content_window = content_window or DEFAULT_CONTENT_WINDOW
+        self.tracer = tracer
+        self.usage_attribution = usage_attribution
 
+    @traced("analysis.analyze_ticket")
     def analyze_ticket(self, ticket_id: int) -> TicketAnalysis:
         """
         Analyze a ticket by ID.
@@ -74,6 +155,7 @@ class TicketAnalysisServiceImpl(TicketAnalysisService):
         # Analyze the ticket
         return self.analyze_ticket_content(ticket)
 
+    @traced("analysis.analyze_ticket_content")
     def analyze_ticket_content(self, ticket: Ticket) -> TicketAnalysis:
         """
         Analyze a ticket's content.
@@ -89,36 +171,23 @@ class TicketAnalysisServiceImpl(TicketAnalysisService):
         """
         logger.info(f"Analyzing content for ticket {ticket.id}")
 
-        # Combine subject and description for analysis
-        content = f"Subject: {ticket.subject}\n\nDescription: {ticket.description}"
+        # Combine subject, first message and recent comments within the token budget
+        content = ticket_content(ticket, self.content_window)
+        if self.tracer is not None:
+            self.tracer.set_attributes(ticket_id=str(ticket.id), content_chars=len(content))
 
         try:
             # Use the AI service to analyze the content
-            analysis_result = self.ai_service.analyze_content(content)
-
-            # Extract sentiment data
-            sentiment_data = analysis_result.get("sentiment", {})
-            sentiment = SentimentAnalysis(
-                polarity=sentiment_data.get("polarity", "unknown"),
-                urgency_level=sentiment_data.get("urgency_level", 1),
-                frustration_level=sentiment_data.get("frustration_level", 1),
-                emotions=sentiment_data.get("emotions", []),
-                business_impact=sentiment_data.get("business_impact", {"detected": False})
-            )
+            with attributed(self.usage_attribution, ticket_id=ticket.id, view_id=ticket.source_view_id):
+                analysis_result = self.ai_service.analyze_content(content)
 
             # Create the analysis entity
-            analysis = TicketAnalysis(
-                ticket_id=str(ticket.id),
-                subject=ticket.subject,
-                category=analysis_result.get("category", "uncategorized"),
-                component=analysis_result.get("component", "none"),
-                priority=analysis_result.get("priority", "low"),
-                sentiment=sentiment,
-                timestamp=datetime.utcnow(),
+            analysis = analysis_from_result(
+                ticket.id,
+                ticket.subject,
+                analysis_result,
                 source_view_id=ticket.source_view_id,
-                source_view_name=ticket.source_view_name,
-                confidence=analysis_result.get("confidence", 0.0),
-                raw_result=analysis_result
+                source_view_name=ticket.source_view_name
             )
 
             # Save the analysis to the repository
@@ -172,17 +241,28 @@ class TicketAnalysisServiceImpl(TicketAnalysisService):
         """
         logger.info(f"Analyzing batch of {len(ticket_ids)} tickets")
 
-        analyses = []
-
-        for ticket_id in ticket_ids:
-            try:
-                analysis = self.analyze_ticket(ticket_id)
-                analyses.append(analysis)
-            except EntityNotFoundError:
-                logger.warning(f"Skipping ticket {ticket_id} - not found")
-            except AIServiceError as e:
-                logger.error(f"Error analyzing ticket {ticket_id}: {str(e)}")
-                # Continue with the next ticket
+        if isinstance(self.ai_service, PackedAIService):
+            tickets = []
+            for ticket_id in ticket_ids:
+                ticket = self.ticket_repository.get_ticket(ticket_id)
+                if ticket:
+                    tickets.append(ticket)
+                else:
+                    logger.warning(f"Skipping ticket {ticket_id} - not found")
+
+            analyses = self._analyze_packed(tickets)
+        else:
+            analyses = []
+
+            for ticket_id in ticket_ids:
+                try:
+                    analysis = self.analyze_ticket(ticket_id)
+                    analyses.append(analysis)
+                except EntityNotFoundError:
+                    logger.warning(f"Skipping ticket {ticket_id} - not found")
+                except AIServiceError as e:
+                    logger.error(f"Error analyzing ticket {ticket_id}: {str(e)}")
+                    # Continue with the next ticket
 
         logger.info(f"Successfully analyzed {len(analyses)} tickets in batch")
 
@@ -206,17 +286,62 @@ class TicketAnalysisServiceImpl(TicketAnalysisService):
 
         logger.info(f"Found {len(tickets)} tickets in view {view_id}")
 
+        with attributed(self.usage_attribution, view_id=view_id):
+            if isinstance(self.ai_service, PackedAIService):
+                analyses = self._analyze_packed(tickets)
+            else:
+                analyses = []
+
+                for ticket in tickets:
+                    try:
+                        analysis = self.analyze_ticket_content(ticket)
+                        analyses.append(analysis)
+                    except AIServiceError as e:
+                        logger.error(f"Error analyzing ticket {ticket.id}: {str(e)}")
+                        # Continue with the next ticket
+
+        logger.info(f"Successfully analyzed {len(analyses)} tickets from view {view_id}")
+
+        return analyses
+
+    def _analyze_packed(self, tickets: List[Ticket]) -> List[TicketAnalysis]:
+        """
+        Analyze tickets with a service that packs short tickets into shared requests.
+
+        Failed analyses are saved for tracking but, as with single-ticket
+        analysis, not returned.
+
+        Args:
+            tickets: Tickets to analyze
+
+        Returns:
+            List of successful ticket analysis entities
+        """
+        results = self.ai_service.analyze_contents(
+            {str(ticket.id): ticket_content(ticket, self.content_window) for ticket in tickets}
+        )
+
         analyses = []
 
         for ticket in tickets:
-            try:
-                analysis = self.analyze_ticket_content(ticket)
-                analyses.append(analysis)
-            except AIServiceError as e:
-                logger.error(f"Error analyzing ticket {ticket.id}: {str(e)}")
-                # Continue with the next ticket
+            result = results.get(str(ticket.id))
+            if result is None:
+                logger.error(f"No analysis returned for ticket {ticket.id}")
+                continue
+
+            analysis = analysis_from_result(
+                ticket.id,
+                ticket.subject,
+                result,
+                source_view_id=ticket.source_view_id,
+                source_view_name=ticket.source_view_name
+            )
+            self.analysis_repository.save(analysis)
 
-        logger.info(f"Successfully analyzed {len(analyses)} tickets from view {view_id}")
+            if analysis.error:
+                logger.error(f"Error analyzing ticket {ticket.id}: {analysis.error}")
+            else:
+                analyses.append(analysis)
 
         return analyses
 
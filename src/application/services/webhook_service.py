@@ -8,6 +8,7 @@ It is responsible for handling webhook events from Zendesk.
 import logging
 from typing import Any, Dict, List, Optional
 
+from src.application.services.instrumentation import traced
 from src.domain.exceptions import AIServiceError, EntityNotFoundError
 from src.domain.interfaces.repository_interfaces import (
     AnalysisRepository,
@@ -17,6 +18,7 @@ from src.domain.interfaces.service_interfaces import (
     TicketAnalysisService,
     WebhookService,
 )
+from src.domain.interfaces.utility_interfaces import SpanTracer
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -33,7 +35,8 @@ class WebhookServiceImpl(WebhookService):
         self,
         ticket_repository: TicketRepository,
         analysis_repository: AnalysisRepository,
-        ticket_analysis_service: TicketAnalysisService
+        ticket_analysis_service: TicketAnalysisService,
+        tracer: Optional[SpanTracer] = None
     ):
         """
         Initialize the webhook service.
@@ -42,12 +45,16 @@ class WebhookServiceImpl(WebhookService):
             ticket_repository: Repository for ticket data
             analysis_repository: Repository for analysis data
             ticket_analysis_service: Service for ticket analysis
+            tracer: Optional tracer recording each webhook event as a span
         """
         self.ticket_repository = ticket_repository
         self.analysis_repository = analysis_repository
         self.ticket_analysis_service = ticket_analysis_service
         self.add_comments = False
+        self.add_tags = False
+        self.tracer = tracer
 
+    @traced("webhook_service.ticket_created")
     def handle_ticket_created(self, ticket_data: Dict[str, Any]) -> bool:
         """
         Handle a ticket created webhook event.
@@ -83,16 +90,20 @@ class WebhookServiceImpl(WebhookService):
                 comment = self._generate_analysis_comment(analysis)
                 self.ticket_repository.add_ticket_comment(ticket_id, comment, public=False)
 
-            # Add tags based on analysis
-            tags = self._generate_analysis_tags(analysis)
-            self.ticket_repository.add_ticket_tags(ticket_id, tags)
+            # Add tags based on analysis if enabled
+            if self.add_tags:
+                tags = self._generate_analysis_tags(analysis)
+                self.ticket_repository.add_ticket_tags(ticket_id, tags)
 
             logger.info(f"Successfully processed ticket created event for ticket {ticket_id}")
             return True
         except Exception as e:
             logger.error(f"Error handling ticket created event: {str(e)}")
+            if self.tracer is not None:
+                self.tracer.record_exception(e)
             return False
 
+    @traced("webhook_service.ticket_updated")
     def handle_ticket_updated(self, ticket_data: Dict[str, Any]) -> bool:
         """
         Handle a ticket updated webhook event.
@@ -131,9 +142,10 @@ class WebhookServiceImpl(WebhookService):
                     comment = self._generate_analysis_comment(analysis)
                     self.ticket_repository.add_ticket_comment(ticket_id, comment, public=False)
 
-                # Add tags based on analysis
-                tags = self._generate_analysis_tags(analysis)
-                self.ticket_repository.add_ticket_tags(ticket_id, tags)
+                # Add tags based on analysis if enabled
+                if self.add_tags:
+                    tags = self._generate_analysis_tags(analysis)
+                    self.ticket_repository.add_ticket_tags(ticket_id, tags)
 
                 logger.info(f"Successfully reanalyzed updated ticket {ticket_id}")
             else:
@@ -142,8 +154,11 @@ class WebhookServiceImpl(WebhookService):
             return True
         except Exception as e:
             logger.error(f"Error handling ticket updated event: {str(e)}")
+            if self.tracer is not None:
+                self.tracer.record_exception(e)
             return False
 
+    @traced("webhook_service.comment_created")
     def handle_comment_created(self, comment_data: Dict[str, Any]) -> bool:
         """
         Handle a comment created webhook event.
@@ -186,9 +201,10 @@ class WebhookServiceImpl(WebhookService):
                     response_comment = self._generate_analysis_comment(analysis)
                     self.ticket_repository.add_ticket_comment(ticket_id, response_comment, public=False)
 
-                # Add tags based on analysis
-                tags = self._generate_analysis_tags(analysis)
-                self.ticket_repository.add_ticket_tags(ticket_id, tags)
+                # Add tags based on analysis if enabled
+                if self.add_tags:
+                    tags = self._generate_analysis_tags(analysis)
+                    self.ticket_repository.add_ticket_tags(ticket_id, tags)
 
                 logger.info(f"Successfully processed comment for ticket {ticket_id}")
             else:
@@ -197,6 +213,8 @@ class WebhookServiceImpl(WebhookService):
             return True
         except Exception as e:
             logger.error(f"Error handling comment created event: {str(e)}")
+            if self.tracer is not None:
+                self.tracer.record_exception(e)
             return False
 
     def set_comment_preference(self, add_comments: bool) -> None:
@@ -209,6 +227,16 @@ class WebhookServiceImpl(WebhookService):
         self.add_comments = add_comments
         logger.info(f"Set add_comments preference to {add_comments}")
 
+    def set_tag_preference(self, add_tags: bool) -> None:
+        """
+        Set preference for adding tags to tickets.
+
+        Args:
+            add_tags: Whether to add tags based on analysis results
+        """
+        self.add_tags = add_tags
+        logger.info(f"Set add_tags preference to {add_tags}")
+
     # Helper methods
 
     def _generate_analysis_comment(self, analysis) -> str:
@@ -0,0 +1,69 @@
+"""
+Compact Entity Helpers
+
+This module provides helpers keeping entities small when many are held at
+once, e.g. the tickets and analyses of a multi-view report.
+"""
+
+import dataclasses
+import sys
+from typing import Any, Iterable, List, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """
+    Rebuild a dataclass with __slots__ instead of a per-instance __dict__.
+
+    Equivalent to @dataclass(slots=True), which needs Python 3.10. Apply it
+    above @dataclass. Instances no longer accept attributes that aren't
+    fields.
+
+    Args:
+        cls: Dataclass
+
+    Returns:
+        Slotted copy of the dataclass
+    """
+    field_names = tuple(field.name for field in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    # Field defaults are already in __init__; as class attributes they would clash with the slots
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = field_names
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+def intern_label(value: Optional[str]) -> Optional[str]:
+    """
+    Intern a label, such as a status or category, shared by many entities.
+
+    Labels decoded from JSON are separate string objects per entity;
+    interned, all entities share one.
+
+    Args:
+        value: Label (anything but a str is returned unchanged)
+
+    Returns:
+        The interned label
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_labels(values: Optional[Iterable[Any]]) -> List[Any]:
+    """
+    Intern a list of labels, such as tags or emotions.
+
+    Args:
+        values: Labels (None gives an empty list)
+
+    Returns:
+        New list of the interned labels
+    """
+    return [intern_label(value) for value in values] if values else []
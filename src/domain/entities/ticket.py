@@ -4,17 +4,26 @@ Ticket Entity
 This module defines the Ticket entity for representing Zendesk tickets.
 """
 
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from src.domain.entities.slots import intern_label, intern_labels, slotted
 
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+@slotted
 @dataclass
 class Ticket:
     """
     Entity representing a Zendesk ticket.
 
-    This entity contains ticket data retrieved from the Zendesk API.
+    This entity contains ticket data retrieved from the Zendesk API. It is
+    slotted and shares its status, priority and tag strings with other
+    tickets, as reports may hold tens of thousands of tickets at once.
     """
 
     id: int
@@ -65,51 +74,36 @@ class Ticket:
     source_view_name: Optional[str] = None
     """Name of the view this ticket was retrieved from (if applicable)."""
 
+    def __post_init__(self):
+        """Share one copy of the labels repeated across tickets."""
+        self.status = intern_label(self.status)
+        self.priority = intern_label(self.priority)
+        self.tags = intern_labels(self.tags)
+        self.source_view_name = intern_label(self.source_view_name)
+
     @classmethod
     def from_zendesk_ticket(cls, zendesk_ticket) -> 'Ticket':
         """
         Create a Ticket entity from a Zendesk API ticket object.
 
+        Fields missing from the object keep their defaults. Zendesk ticket
+        listings carry no comment bodies, and the description is not copied
+        into a comment: it is the ticket's first message wherever the thread
+        is read (see ContentWindow).
+
         Args:
             zendesk_ticket: Zendesk API ticket object
 
         Returns:
             Ticket entity
         """
-        # Extract basic ticket data
-        ticket = cls(
-            id=zendesk_ticket.id,
-            subject=zendesk_ticket.subject or "No Subject"
-        )
-
-        # Extract optional fields
-        if hasattr(zendesk_ticket, 'description'):
-            ticket.description = zendesk_ticket.description
-
-        if hasattr(zendesk_ticket, 'status'):
-            ticket.status = zendesk_ticket.status
-
-        if hasattr(zendesk_ticket, 'priority'):
-            ticket.priority = zendesk_ticket.priority
-
-        if hasattr(zendesk_ticket, 'tags'):
-            ticket.tags = list(zendesk_ticket.tags) if zendesk_ticket.tags else []
-
-        if hasattr(zendesk_ticket, 'created_at'):
-            ticket.created_at = zendesk_ticket.created_at
-
-        if hasattr(zendesk_ticket, 'updated_at'):
-            ticket.updated_at = zendesk_ticket.updated_at
+        comments = getattr(zendesk_ticket, 'comments', None)
 
-        if hasattr(zendesk_ticket, 'requester_id'):
-            ticket.requester_id = zendesk_ticket.requester_id
-
-        if hasattr(zendesk_ticket, 'assignee_id'):
-            ticket.assignee_id = zendesk_ticket.assignee_id
-
-        # Extract comments
-        if hasattr(zendesk_ticket, 'comments'):
-            ticket.comments = [
+        return cls(
+            id=zendesk_ticket.id,
+            subject=zendesk_ticket.subject or "No Subject",
+            description=getattr(zendesk_ticket, 'description', None),
+            comments=[
                 {
                     'id': comment.id,
                     'body': comment.body,
@@ -117,53 +111,19 @@ class Ticket:
                     'created_at': comment.created_at,
                     'public': comment.public
                 }
-                for comment in zendesk_ticket.comments
-            ]
-        # For first comment/description if comments not available
-        elif hasattr(zendesk_ticket, 'description') and zendesk_ticket.description:
-            ticket.comments = [
-                {
-                    'id': 0,  # Placeholder ID
-                    'body': zendesk_ticket.description,
-                    'author_id': ticket.requester_id,
-                    'created_at': ticket.created_at,
-                    'public': True
-                }
-            ]
-
-        # Extract custom fields
-        if hasattr(zendesk_ticket, 'custom_fields'):
-            ticket.custom_fields = {}
-            try:
-                # Try handling custom fields as dictionaries with value attribute
-                for custom_field in zendesk_ticket.custom_fields:
-                    if hasattr(custom_field, 'id') and hasattr(custom_field, 'value'):
-                        if custom_field.value is not None:
-                            ticket.custom_fields[custom_field.id] = custom_field.value
-            except AttributeError:
-                # Handle case where custom_fields might be a different structure
-                try:
-                    # Try as a dictionary itself
-                    if isinstance(zendesk_ticket.custom_fields, dict):
-                        ticket.custom_fields = {k: v for k, v in zendesk_ticket.custom_fields.items() if v is not None}
-                    # Handle ProxyDict case
-                    elif hasattr(zendesk_ticket.custom_fields, 'items') and callable(getattr(zendesk_ticket.custom_fields, 'items')):
-                        for k, v in zendesk_ticket.custom_fields.items():
-                            if v is not None:
-                                ticket.custom_fields[k] = v
-                except Exception as e:
-                    # If all else fails, log and continue without custom fields
-                    import logging
-                    logging.getLogger(__name__).warning(f"Could not process custom fields: {e}")
-
-        # Extract source view info if available
-        if hasattr(zendesk_ticket, 'source_view_id'):
-            ticket.source_view_id = zendesk_ticket.source_view_id
-
-        if hasattr(zendesk_ticket, 'source_view_name'):
-            ticket.source_view_name = zendesk_ticket.source_view_name
-
-        return ticket
+                for comment in comments
+            ] if comments else [],
+            status=getattr(zendesk_ticket, 'status', "new"),
+            priority=getattr(zendesk_ticket, 'priority', None),
+            tags=getattr(zendesk_ticket, 'tags', None),
+            created_at=getattr(zendesk_ticket, 'created_at', None),
+            updated_at=getattr(zendesk_ticket, 'updated_at', None),
+            requester_id=getattr(zendesk_ticket, 'requester_id', None),
+            assignee_id=getattr(zendesk_ticket, 'assignee_id', None),
+            custom_fields=_custom_field_values(getattr(zendesk_ticket, 'custom_fields', None)),
+            source_view_id=getattr(zendesk_ticket, 'source_view_id', None),
+            source_view_name=getattr(zendesk_ticket, 'source_view_name', None)
+        )
 
     def to_dict(self) -> dict:
         """
@@ -197,15 +157,47 @@ class Ticket:
         Returns:
             Concatenated ticket content
         """
-        content = f"Subject: {self.subject}\n\n"
+        parts = [f"Subject: {self.subject}\n\n"]
 
         if self.description:
-            content += f"Description:\n{self.description}\n\n"
+            parts.append(f"Description:\n{self.description}\n\n")
 
         if self.comments:
-            content += "Comments:\n"
+            parts.append("Comments:\n")
             for i, comment in enumerate(self.comments):
-                content += f"Comment {i+1} ({'Public' if comment.get('public', True) else 'Private'}):\n"
-                content += f"{comment.get('body', '')}\n\n"
+                parts.append(f"Comment {i+1} ({'Public' if comment.get('public', True) else 'Private'}):\n")
+                parts.append(f"{comment.get('body', '')}\n\n")
 
-        return content
+        return "".join(parts)
+
+
+def _custom_field_values(custom_fields: Any) -> Dict[Any, Any]:
+    """
+    Get the set custom field values of a Zendesk ticket by field ID.
+
+    Args:
+        custom_fields: List of {'id': ..., 'value': ...} items (or objects
+            with id and value attributes), or a mapping of field ID to value
+
+    Returns:
+        Dictionary of field ID to value, without unset fields
+    """
+    if not custom_fields:
+        return {}
+
+    values = {}
+    try:
+        if callable(getattr(custom_fields, 'items', None)):
+            return {field_id: value for field_id, value in custom_fields.items() if value is not None}
+
+        for custom_field in custom_fields:
+            if isinstance(custom_field, dict):
+                field_id, value = custom_field.get('id'), custom_field.get('value')
+            else:
+                field_id, value = getattr(custom_field, 'id', None), getattr(custom_field, 'value', None)
+            if field_id is not None and value is not None:
+                # Values are mostly drop-down options shared by many tickets
+                values[field_id] = intern_label(value)
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"Could not process custom fields: {e}")
+    return values
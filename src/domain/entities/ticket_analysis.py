@@ -9,7 +9,58 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from src.domain.entities.slots import intern_label, intern_labels, slotted
 
+
+def calculate_priority_score(
+    priority: str,
+    polarity: str,
+    urgency_level: int,
+    frustration_level: int,
+    impact_severity: float = 0
+) -> int:
+    """
+    Calculate a priority score based on sentiment and priority.
+
+    Args:
+        priority: Priority ('high', 'medium' or 'low')
+        polarity: Sentiment polarity
+        urgency_level: Urgency level (1-5)
+        frustration_level: Frustration level (1-5)
+        impact_severity: Severity of the detected business impact (0 if none)
+
+    Returns:
+        An integer score from 1-10, with 10 being highest priority
+    """
+    # Base score from priority
+    base_score = {
+        "high": 7,
+        "medium": 5,
+        "low": 3
+    }.get(priority.lower(), 3)
+
+    # Adjust based on sentiment
+    sentiment_adjustment = 0
+
+    # Adjust based on polarity
+    if polarity == "negative":
+        sentiment_adjustment += 1
+    elif polarity == "positive":
+        sentiment_adjustment -= 1
+
+    # Adjust based on urgency and frustration
+    sentiment_adjustment += (urgency_level - 3) / 2
+    sentiment_adjustment += (frustration_level - 3) / 2
+
+    # Adjust based on business impact
+    sentiment_adjustment += impact_severity / 2
+
+    # Calculate final score
+    score = int(min(10, max(1, base_score + sentiment_adjustment)))
+    return score
+
+
+@slotted
 @dataclass
 class SentimentAnalysis:
     """Represents the sentiment analysis of a ticket's content."""
@@ -23,10 +74,21 @@ class SentimentAnalysis:
         "severity": 0
     })
 
+    def __post_init__(self):
+        """Share one copy of the labels repeated across analyses."""
+        self.polarity = intern_label(self.polarity)
+        self.emotions = intern_labels(self.emotions)
 
+
+@slotted
 @dataclass
 class TicketAnalysis:
-    """Represents the analysis of a Zendesk ticket."""
+    """
+    Represents the analysis of a Zendesk ticket.
+
+    Slotted, with its labels shared across analyses, as reports may hold
+    tens of thousands of analyses at once.
+    """
     ticket_id: str
     subject: str
     category: str
@@ -41,6 +103,14 @@ class TicketAnalysis:
     error: Optional[str] = None
     error_type: Optional[str] = None
 
+    def __post_init__(self):
+        """Share one copy of the labels repeated across analyses."""
+        self.category = intern_label(self.category)
+        self.component = intern_label(self.component)
+        self.priority = intern_label(self.priority)
+        self.source_view_name = intern_label(self.source_view_name)
+        self.error_type = intern_label(self.error_type)
+
     @property
     def priority_score(self) -> int:
         """
@@ -49,33 +119,14 @@ class TicketAnalysis:
         Returns:
             An integer score from 1-10, with 10 being highest priority
         """
-        # Base score from priority
-        base_score = {
-            "high": 7,
-            "medium": 5,
-            "low": 3
-        }.get(self.priority.lower(), 3)
-
-        # Adjust based on sentiment
-        sentiment_adjustment = 0
-
-        # Adjust based on polarity
-        if self.sentiment.polarity == "negative":
-            sentiment_adjustment += 1
-        elif self.sentiment.polarity == "positive":
-            sentiment_adjustment -= 1
-
-        # Adjust based on urgency and frustration
-        sentiment_adjustment += (self.sentiment.urgency_level - 3) / 2
-        sentiment_adjustment += (self.sentiment.frustration_level - 3) / 2
-
-        # Adjust based on business impact
-        if self.sentiment.business_impact.get("detected", False):
-            sentiment_adjustment += self.sentiment.business_impact.get("severity", 0) / 2
-
-        # Calculate final score
-        score = int(min(10, max(1, base_score + sentiment_adjustment)))
-        return score
+        business_impact = self.sentiment.business_impact
+        return calculate_priority_score(
+            self.priority,
+            self.sentiment.polarity,
+            self.sentiment.urgency_level,
+            self.sentiment.frustration_level,
+            business_impact.get("severity", 0) if business_impact.get("detected", False) else 0
+        )
 
     @property
     def has_business_impact(self) -> bool:
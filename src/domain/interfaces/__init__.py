@@ -15,10 +15,13 @@ from src.domain.interfaces.utility_interfaces import *
 __all__ = [
     # AI Service Interfaces
     'AIService', 'EnhancedAIService', 'AIServiceError', 'RateLimitError',
-    'TokenLimitError', 'ContentFilterError',
+    'TokenLimitError', 'ContentFilterError', 'BatchAIService',
+    'PackedAIService', 'ProviderUnavailableError', 'EnrichmentAIService',
+    'ENRICHMENT_FACETS', 'ResponseFormatError', 'InvalidRequestError',
 
     # Repository Interfaces
-    'TicketRepository', 'AnalysisRepository', 'ViewRepository',
+    'TicketRepository', 'AnalysisRepository', 'ViewRepository', 'ScheduleRepository',
+    'AnalysisRollupRepository', 'BatchJobRepository', 'UsageRepository',
 
     # Service Interfaces
     'TicketAnalysisService', 'ReportingService', 'WebhookService', 'SchedulerService',
@@ -30,5 +33,7 @@ __all__ = [
     'Cache', 'CacheManager', 'CacheStatistics',
 
     # Utility Interfaces
-    'RetryStrategy', 'ConfigManager', 'LoggingManager', 'MetricsCollector'
+    'RetryStrategy', 'ConfigManager', 'LoggingManager', 'MetricsCollector',
+    'RateLimiter', 'QuotaManager', 'SpanExporter', 'SpanTracer',
+    'UsageAttribution', 'StageTimer'
 ]
@@ -5,7 +5,7 @@ This module defines interfaces for AI services used for ticket analysis.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
 
 class AIServiceError(Exception):
@@ -15,7 +15,17 @@ class AIServiceError(Exception):
 
 class RateLimitError(AIServiceError):
     """Raised when rate limits are hit."""
-    pass
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message
+            retry_after: Seconds the provider asked to wait before calling again, if known
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class TokenLimitError(AIServiceError):
@@ -28,6 +38,21 @@ class ContentFilterError(AIServiceError):
     pass
 
 
+class ResponseFormatError(AIServiceError):
+    """Raised when a response doesn't contain the expected structured output."""
+    pass
+
+
+class InvalidRequestError(AIServiceError):
+    """Raised when a request cannot succeed as sent (a malformed request, a missing package or a client bug)."""
+    pass
+
+
+class ProviderUnavailableError(AIServiceError):
+    """Raised when no AI provider is available to handle a call."""
+    pass
+
+
 class AIService(ABC):
     """Interface for AI services."""
 
@@ -130,3 +155,126 @@ class EnhancedAIService(AIService):
             AIServiceError: If an error occurs during extraction
         """
         pass
+
+
+class PackedAIService(ABC):
+    """
+    Interface for AI services that can analyze several contents in one request.
+
+    Packing amortizes the shared instructions of the analysis prompt over many
+    short contents, cutting the number of requests and input tokens.
+    """
+
+    @abstractmethod
+    def analyze_contents(self, contents: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze several contents, packing short ones into shared requests.
+
+        Args:
+            contents: Mapping of content IDs to the content to analyze
+
+        Returns:
+            Mapping of content IDs to analysis results; contents that could not
+            be analyzed map to a result with 'error' and 'error_type' keys
+
+        Raises:
+            AIServiceError: If the service cannot be used at all
+        """
+        pass
+
+
+# Facets an EnrichmentAIService can return from a single call
+ENRICHMENT_FACETS = (
+    "categorization",
+    "sentiment",
+    "business_impact",
+    "extraction",
+    "response_suggestion",
+)
+
+
+class EnrichmentAIService(ABC):
+    """
+    Interface for AI services that return several analysis facets from one call.
+
+    Asking for the facets together sends the ticket text once instead of once
+    per facet, and lets the service cache each facet on its own.
+    """
+
+    @abstractmethod
+    def enrich(self, content: str, facets: Sequence[str]) -> Dict[str, Any]:
+        """
+        Analyze content for the selected facets with a single model call.
+
+        Args:
+            content: The content to analyze
+            facets: Facets to return, from ENRICHMENT_FACETS
+
+        Returns:
+            Mapping of each requested facet to its result: a dictionary for every
+            facet except 'response_suggestion', which is the suggested reply text.
+            Facets that could not be produced carry 'error' and 'error_type' keys.
+
+        Raises:
+            ValueError: If an unknown facet is requested
+            AIServiceError: If an error occurs during analysis
+        """
+        pass
+
+
+class BatchAIService(ABC):
+    """
+    Interface for AI services that analyze many contents in one offline job.
+
+    Batch jobs trade latency for throughput: results may take hours, but the
+    requests are not subject to the interactive per-minute rate limits.
+    """
+
+    @abstractmethod
+    def submit_batch(self, contents: Dict[str, str]) -> str:
+        """
+        Submit contents for analysis as one batch job.
+
+        Args:
+            contents: Mapping of request IDs to the content to analyze
+
+        Returns:
+            ID of the batch job
+
+        Raises:
+            AIServiceError: If the job cannot be submitted
+        """
+        pass
+
+    @abstractmethod
+    def get_batch_status(self, batch_id: str) -> str:
+        """
+        Get the processing status of a batch job.
+
+        Args:
+            batch_id: ID of the batch job
+
+        Returns:
+            'in_progress', 'canceling' or 'ended'
+
+        Raises:
+            AIServiceError: If the status cannot be retrieved
+        """
+        pass
+
+    @abstractmethod
+    def get_batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the analysis results of an ended batch job.
+
+        Args:
+            batch_id: ID of the batch job
+
+        Returns:
+            Mapping of request IDs to analysis results; failed requests map to
+            a result with 'error' and 'error_type' keys
+
+        Raises:
+            AIServiceError: If the results cannot be retrieved
+        """
+        pass
@@ -5,10 +5,12 @@ This module defines interfaces for reporters that generate reports based on tick
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from src.domain.entities.ticket import Ticket
 from src.domain.entities.ticket_analysis import TicketAnalysis
+from src.domain.value_objects.analysis_frame import AnalysisFrame
+from src.domain.value_objects.sentiment_rollup import SentimentRollup
 
 
 class Reporter(ABC):
@@ -47,12 +49,12 @@ class SentimentReporter(Reporter):
     """Interface for sentiment analysis reporters."""
 
     @abstractmethod
-    def generate_report(self, analyses: List[TicketAnalysis], **kwargs) -> str:
+    def generate_report(self, analyses: Union[List[TicketAnalysis], AnalysisFrame], **kwargs) -> str:
         """
         Generate a sentiment analysis report.
 
         Args:
-            analyses: List of ticket analyses to include in the report
+            analyses: Ticket analyses to include in the report (a list or an AnalysisFrame)
             **kwargs: Additional arguments
 
         Returns:
@@ -61,12 +63,26 @@ class SentimentReporter(Reporter):
         pass
 
     @abstractmethod
-    def calculate_sentiment_distribution(self, analyses: List[TicketAnalysis]) -> Dict[str, int]:
+    def generate_rollup_report(self, rollup: SentimentRollup, **kwargs) -> str:
+        """
+        Generate a sentiment analysis report from pre-aggregated totals.
+
+        Args:
+            rollup: Aggregated sentiment totals
+            **kwargs: Additional arguments
+
+        Returns:
+            Report text
+        """
+        pass
+
+    @abstractmethod
+    def calculate_sentiment_distribution(self, analyses: Union[List[TicketAnalysis], AnalysisFrame]) -> Dict[str, int]:
         """
         Calculate sentiment distribution.
 
         Args:
-            analyses: List of ticket analyses
+            analyses: Ticket analyses (a list or an AnalysisFrame)
 
         Returns:
             Dictionary mapping sentiment polarities to counts
@@ -74,12 +90,12 @@ class SentimentReporter(Reporter):
         pass
 
     @abstractmethod
-    def calculate_priority_distribution(self, analyses: List[TicketAnalysis]) -> Dict[int, int]:
+    def calculate_priority_distribution(self, analyses: Union[List[TicketAnalysis], AnalysisFrame]) -> Dict[int, int]:
         """
         Calculate priority distribution.
 
         Args:
-            analyses: List of ticket analyses
+            analyses: Ticket analyses (a list or an AnalysisFrame)
 
         Returns:
             Dictionary mapping priority scores to counts
@@ -87,12 +103,12 @@ class SentimentReporter(Reporter):
         pass
 
     @abstractmethod
-    def calculate_business_impact_count(self, analyses: List[TicketAnalysis]) -> int:
+    def calculate_business_impact_count(self, analyses: Union[List[TicketAnalysis], AnalysisFrame]) -> int:
         """
         Calculate the number of tickets with business impact.
 
         Args:
-            analyses: List of ticket analyses
+            analyses: Ticket analyses (a list or an AnalysisFrame)
 
         Returns:
             Count of tickets with business impact
@@ -104,12 +120,12 @@ class HardwareReporter(Reporter):
     """Interface for hardware component reporters."""
 
     @abstractmethod
-    def generate_report(self, tickets: List[Ticket], **kwargs) -> str:
+    def generate_report(self, tickets: Union[List[Ticket], AnalysisFrame], **kwargs) -> str:
         """
         Generate a hardware component report.
 
         Args:
-            tickets: List of tickets to include in the report
+            tickets: Tickets to include in the report (a list or an AnalysisFrame)
             **kwargs: Additional arguments
 
         Returns:
@@ -118,12 +134,12 @@ class HardwareReporter(Reporter):
         pass
 
     @abstractmethod
-    def generate_multi_view_report(self, tickets: List[Ticket], view_map: Dict[int, str]) -> str:
+    def generate_multi_view_report(self, tickets: Union[List[Ticket], AnalysisFrame], view_map: Dict[int, str]) -> str:
         """
         Generate a multi-view hardware component report.
 
         Args:
-            tickets: List of tickets to include in the report
+            tickets: Tickets to include in the report (a list or an AnalysisFrame)
             view_map: Dictionary mapping view IDs to view names
 
         Returns:
@@ -132,12 +148,12 @@ class HardwareReporter(Reporter):
         pass
 
     @abstractmethod
-    def calculate_component_distribution(self, tickets: List[Ticket]) -> Dict[str, int]:
+    def calculate_component_distribution(self, tickets: Union[List[Ticket], AnalysisFrame]) -> Dict[str, int]:
         """
         Calculate component distribution.
 
         Args:
-            tickets: List of tickets
+            tickets: Tickets (a list or an AnalysisFrame)
 
         Returns:
             Dictionary mapping component types to counts
@@ -149,12 +165,12 @@ class PendingReporter(Reporter):
     """Interface for pending ticket reporters."""
 
     @abstractmethod
-    def generate_report(self, tickets: List[Ticket], **kwargs) -> str:
+    def generate_report(self, tickets: Union[List[Ticket], AnalysisFrame], **kwargs) -> str:
         """
         Generate a pending ticket report.
 
         Args:
-            tickets: List of tickets to include in the report
+            tickets: Tickets to include in the report (a list or an AnalysisFrame)
             **kwargs: Additional arguments
 
         Returns:
@@ -163,12 +179,12 @@ class PendingReporter(Reporter):
         pass
 
     @abstractmethod
-    def generate_multi_view_report(self, tickets_by_view: Dict[str, List[Ticket]], **kwargs) -> str:
+    def generate_multi_view_report(self, tickets_by_view: Dict[str, Union[List[Ticket], AnalysisFrame]], **kwargs) -> str:
         """
         Generate a multi-view pending ticket report.
 
         Args:
-            tickets_by_view: Dictionary mapping view names to lists of tickets
+            tickets_by_view: Dictionary mapping view names to their tickets
             **kwargs: Additional arguments
 
         Returns:
@@ -177,12 +193,12 @@ class PendingReporter(Reporter):
         pass
 
     @abstractmethod
-    def calculate_age_distribution(self, tickets: List[Ticket]) -> Dict[str, int]:
+    def calculate_age_distribution(self, tickets: Union[List[Ticket], AnalysisFrame]) -> Dict[str, int]:
         """
         Calculate age distribution of pending tickets.
 
         Args:
-            tickets: List of tickets
+            tickets: Tickets (a list or an AnalysisFrame)
 
         Returns:
             Dictionary mapping age ranges to counts
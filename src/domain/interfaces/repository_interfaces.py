@@ -6,7 +6,7 @@ This module defines interfaces for repositories that handle data persistence.
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 from src.domain.entities.ticket import Ticket
 from src.domain.entities.ticket_analysis import TicketAnalysis
@@ -171,12 +171,19 @@ class AnalysisRepository(ABC):
         pass
 
     @abstractmethod
-    def find_high_priority(self, min_score: int = 7) -> List[TicketAnalysis]:
+    def find_high_priority(
+        self,
+        min_score: int = 7,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[TicketAnalysis]:
         """
         Find high priority analyses.
 
         Args:
             min_score: Minimum priority score to consider high priority
+            start_date: Optional start of the period the analyses were made in
+            end_date: Optional end of the period (exclusive)
 
         Returns:
             List of high priority ticket analyses
@@ -258,3 +265,239 @@ class ViewRepository(ABC):
             Dictionary mapping view IDs to view names
         """
         pass
+
+
+class ScheduleRepository(ABC):
+    """Interface for scheduled task persistence."""
+
+    @abstractmethod
+    def save_task(self, task: Dict[str, Any]) -> bool:
+        """
+        Insert or update a scheduled task definition.
+
+        Args:
+            task: Task record (must contain an 'id' key)
+
+        Returns:
+            Success indicator
+        """
+        pass
+
+    @abstractmethod
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a scheduled task by ID.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Task record or None if not found
+        """
+        pass
+
+    @abstractmethod
+    def list_tasks(self) -> List[Dict[str, Any]]:
+        """
+        Get all scheduled tasks.
+
+        Returns:
+            List of task records
+        """
+        pass
+
+    @abstractmethod
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a scheduled task and its run history.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            True if the task existed, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def record_run(self, task_id: str, run: Dict[str, Any]) -> bool:
+        """
+        Append a run to a task's history.
+
+        Args:
+            task_id: ID of the task
+            run: Run record (scheduled_time, started, finished, success, error)
+
+        Returns:
+            Success indicator
+        """
+        pass
+
+    @abstractmethod
+    def get_run_history(self, task_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get the most recent runs of a task, newest first.
+
+        Args:
+            task_id: ID of the task
+            limit: Maximum number of runs to return
+
+        Returns:
+            List of run records
+        """
+        pass
+
+
+class AnalysisRollupRepository(ABC):
+    """
+    Interface for pre-aggregated analysis counts.
+
+    Rollups count analyses per hourly and daily bucket and per combination of
+    view, category, component, polarity, priority score and business impact,
+    so reports can be built from bucket totals instead of individual analyses.
+    """
+
+    @abstractmethod
+    def record(self, analysis: TicketAnalysis, delta: int = 1) -> None:
+        """
+        Add an analysis to (or, with a negative delta, remove it from) its buckets.
+
+        Args:
+            analysis: Ticket analysis
+            delta: Amount to add to the bucket counts
+        """
+        pass
+
+    @abstractmethod
+    def get_rollups(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        view_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the rollup rows of buckets starting in a date range.
+
+        Args:
+            granularity: 'hour' or 'day'
+            start_date: Start of the range
+            end_date: End of the range (exclusive)
+            view_id: Optional view ID to filter by
+
+        Returns:
+            List of rows with the dimension values and a 'count'
+        """
+        pass
+
+    @abstractmethod
+    def rebuild(self, analyses: Iterable[TicketAnalysis]) -> int:
+        """
+        Replace all rollups with ones computed from the given analyses.
+
+        Args:
+            analyses: All stored ticket analyses
+
+        Returns:
+            Number of analyses processed
+        """
+        pass
+
+    @abstractmethod
+    def is_empty(self) -> bool:
+        """
+        Check whether any rollups have been recorded.
+
+        Returns:
+            True if there are no rollups
+        """
+        pass
+
+
+class BatchJobRepository(ABC):
+    """Interface for persisting offline batch analysis jobs."""
+
+    @abstractmethod
+    def save_job(self, job: Dict[str, Any]) -> bool:
+        """
+        Insert or update a batch job record.
+
+        Args:
+            job: Job record (must contain an 'id' key)
+
+        Returns:
+            Success indicator
+        """
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a batch job by ID.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Job record or None if not found
+        """
+        pass
+
+    @abstractmethod
+    def list_jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get batch jobs, optionally filtered by status.
+
+        Args:
+            status: Optional job status to filter by
+
+        Returns:
+            List of job records, oldest first
+        """
+        pass
+
+
+class UsageRepository(ABC):
+    """
+    Interface for the AI usage ledger.
+
+    Every AI call is recorded with its token counts, latency and cost, and
+    the ticket, view, command and scheduled task it was made for.
+    """
+
+    @abstractmethod
+    def record(self, entry: Dict[str, Any]) -> bool:
+        """
+        Record one AI call.
+
+        Args:
+            entry: Usage entry with 'provider', 'model', 'operation', token
+                counts, 'latency_ms', 'cost_usd', 'outcome' and the
+                attribution keys ('ticket_id', 'view_id', 'command', 'task_id')
+
+        Returns:
+            Success indicator
+        """
+        pass
+
+    @abstractmethod
+    def summarize(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        group_by: Sequence[str] = ("day", "view_id")
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate the calls recorded in a date range.
+
+        Args:
+            start_date: Start of the range
+            end_date: End of the range (exclusive)
+            group_by: Columns to group by, e.g. 'day', 'view_id', 'model',
+                'operation', 'command' or 'task_id'
+
+        Returns:
+            One row per group with the group values, 'calls', token totals,
+            'cost_usd' and latency statistics
+        """
+        pass
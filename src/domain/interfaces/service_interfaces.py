@@ -230,6 +230,16 @@ class WebhookService(ABC):
         """
         pass
 
+    @abstractmethod
+    def set_tag_preference(self, add_tags: bool) -> None:
+        """
+        Set preference for adding tags to tickets.
+
+        Args:
+            add_tags: Whether to add tags based on analysis results
+        """
+        pass
+
 
 class SchedulerService(ABC):
     """Interface for scheduler service."""
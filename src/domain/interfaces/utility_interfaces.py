@@ -5,7 +5,7 @@ This module defines interfaces for utility classes and functions.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from typing import Any, Callable, ContextManager, Dict, List, Optional, TypeVar, Union
 
 T = TypeVar('T')
 
@@ -205,3 +205,199 @@ class MetricsCollector(ABC):
             tags: Optional tags for the metric
         """
         pass
+
+
+class RateLimiter(ABC):
+    """Interface for request rate limiters."""
+
+    @abstractmethod
+    def is_rate_limited(self, key: str, limit: int, period: float) -> bool:
+        """
+        Check a request against the limit and record it if allowed.
+
+        Args:
+            key: Identifier for the client (e.g., IP address)
+            limit: Maximum number of requests allowed in the period
+            period: Time period in seconds
+
+        Returns:
+            True if the request should be rejected, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def reset(self, key: Optional[str] = None) -> None:
+        """
+        Forget the recorded state for a key, or for all keys.
+
+        Args:
+            key: Identifier to reset (resets everything if None)
+        """
+        pass
+
+
+class QuotaManager(ABC):
+    """
+    Interface for client-side AI request quotas.
+
+    Quotas are tracked per provider and model as requests per minute and
+    tokens per minute. Callers reserve an estimate before each call and
+    reconcile it with the actual usage afterwards.
+    """
+
+    @abstractmethod
+    def acquire(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int,
+        timeout: Optional[float] = None
+    ) -> float:
+        """
+        Reserve one request and an estimated number of tokens, waiting if needed.
+
+        Args:
+            provider: AI provider name (e.g., 'anthropic')
+            model: Model name
+            estimated_tokens: Estimated tokens of the call
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            Seconds spent waiting for quota
+
+        Raises:
+            RateLimitError: If the quota is not available within the timeout
+        """
+        pass
+
+    @abstractmethod
+    def reconcile(self, provider: str, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct a reservation with the tokens the call actually used.
+
+        Args:
+            provider: AI provider name
+            model: Model name
+            estimated_tokens: Tokens reserved by acquire
+            actual_tokens: Tokens reported by the provider
+        """
+        pass
+
+    @abstractmethod
+    def throttle(self, provider: str, model: str, seconds: float) -> None:
+        """
+        Hold all calls for a model after the provider reported a rate limit.
+
+        Args:
+            provider: AI provider name
+            model: Model name
+            seconds: Seconds to hold calls for
+        """
+        pass
+
+    @abstractmethod
+    def get_utilization(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the current quota utilization.
+
+        Returns:
+            Mapping of 'provider/model' to request and token utilization (0-1)
+        """
+        pass
+
+
+class SpanExporter(ABC):
+    """Interface for exporting finished tracing spans."""
+
+    @abstractmethod
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        """
+        Export finished spans.
+
+        Args:
+            spans: Spans as dictionaries with 'trace_id', 'span_id',
+                'parent_id', 'name', start and end times, 'attributes',
+                'events' and 'status'
+        """
+        pass
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """Flush buffered spans and release resources."""
+        pass
+
+
+class SpanTracer(ABC):
+    """Interface for recording operations as tracing spans."""
+
+    @abstractmethod
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> ContextManager[Any]:
+        """
+        Run a block of code in a new span, a child of the current span if any.
+
+        An exception leaving the block marks the span as failed.
+
+        Args:
+            name: Operation name
+            attributes: Initial attributes
+
+        Returns:
+            Context manager yielding the span
+        """
+        pass
+
+    @abstractmethod
+    def set_attributes(self, **attributes: Any) -> None:
+        """
+        Set attributes on the current span, if any.
+
+        Args:
+            **attributes: Attributes to set
+        """
+        pass
+
+    @abstractmethod
+    def record_exception(self, error: BaseException) -> None:
+        """
+        Mark the current span, if any, as failed by an exception that was handled.
+
+        Args:
+            error: The exception
+        """
+        pass
+
+
+class UsageAttribution(ABC):
+    """Interface for attributing AI usage to the work it was made for."""
+
+    @abstractmethod
+    def attribute(self, **attributes: Any) -> ContextManager[Dict[str, str]]:
+        """
+        Attribute the AI calls made within a block of code.
+
+        Attributes are added to those of enclosing blocks; None values are ignored.
+
+        Args:
+            **attributes: Attribution, e.g. ticket_id, view_id, command or task_id
+
+        Returns:
+            Context manager yielding the attribution in effect within the block
+        """
+        pass
+
+
+class StageTimer(ABC):
+    """Interface for timing the stages (fetch, analyze, persist, render) of a profiled run."""
+
+    @abstractmethod
+    def stage(self, name: str) -> ContextManager[None]:
+        """
+        Time a block of code as a stage of the profiled run, if there is one.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Context manager for the block
+        """
+        pass
@@ -5,8 +5,12 @@ This package contains value objects for the Zendesk AI Integration application.
 Value objects are immutable objects that represent concepts in the domain.
 """
 
+from src.domain.value_objects.analysis_frame import AnalysisFrame
+from src.domain.value_objects.content_window import ContentWindow
+from src.domain.value_objects.cron_expression import CronExpression
 from src.domain.value_objects.hardware_component import HardwareComponent
 from src.domain.value_objects.sentiment_polarity import SentimentPolarity
+from src.domain.value_objects.sentiment_rollup import SentimentRollup
 from src.domain.value_objects.ticket_category import TicketCategory
 from src.domain.value_objects.ticket_priority import TicketPriority
 from src.domain.value_objects.ticket_status import TicketStatus
@@ -16,5 +20,9 @@ __all__ = [
     'TicketPriority',
     'SentimentPolarity',
     'TicketCategory',
-    'HardwareComponent'
+    'HardwareComponent',
+    'CronExpression',
+    'SentimentRollup',
+    'ContentWindow',
+    'AnalysisFrame'
 ]
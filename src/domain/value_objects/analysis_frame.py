@@ -0,0 +1,553 @@
+"""
+Analysis Frame Value Object
+
+This module defines the AnalysisFrame value object, a columnar view of the
+analyses or tickets of a report. Each field is one column: labels are stored
+as categorical codes into the list of their distinct values, numbers as
+arrays. Reports count, group, bin and rank rows with whole-column operations
+instead of looping over entities, and computed values such as priority_score
+are evaluated once, when the frame is built.
+
+Columns are NumPy arrays when NumPy is installed and array.array columns
+otherwise; both give the same results.
+"""
+
+import bisect
+import functools
+import heapq
+import math
+import operator
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import compress
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from src.domain.entities.ticket import Ticket
+from src.domain.entities.ticket_analysis import TicketAnalysis, calculate_priority_score
+
+CATEGORY = "category"
+INTEGER = "integer"
+FLOAT = "float"
+OBJECT = "object"
+COLUMN_KINDS = (CATEGORY, INTEGER, FLOAT, OBJECT)
+
+SECONDS_PER_DAY = 86400.0
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# array.array type codes of the fallback columns
+_TYPECODES = {CATEGORY: "l", INTEGER: "q", FLOAT: "d"}
+
+# Scores only depend on a few labels and levels, so most rows share their inputs
+_cached_priority_score = functools.lru_cache(maxsize=4096)(calculate_priority_score)
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first use; it is optional and slow to import."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _epoch_seconds(value: Any) -> float:
+    """
+    Convert a ticket timestamp to seconds since the epoch.
+
+    Args:
+        value: datetime (naive ones are taken as UTC) or ISO 8601 string
+
+    Returns:
+        Seconds since the epoch, or NaN if the value is missing or unparseable
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return math.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return math.nan
+
+
+class AnalysisFrame:
+    """
+    Columnar, read-mostly view of the analyses or tickets of a report.
+
+    Build it once per report with from_analyses() or from_tickets(), then
+    aggregate it with count_by(), group_by(), histogram() and top_k().
+    Selections are masks from mask(), applied with filter() or passed as
+    'where' to the aggregations. Labels come back decoded, and categorical
+    results are ordered by first appearance, as when counting into a dict.
+    """
+
+    def __init__(self, length: int = 0):
+        """
+        Initialize a frame without columns.
+
+        Args:
+            length: Number of rows of the columns to be added
+        """
+        self._length = length
+        self._np = _numpy()
+        self._kinds: Dict[str, str] = {}
+        self._columns: Dict[str, Any] = {}
+        self._categories: Dict[str, List[Any]] = {}
+
+    @classmethod
+    def from_analyses(cls, analyses: Union[Iterable[TicketAnalysis], 'AnalysisFrame']) -> 'AnalysisFrame':
+        """
+        Build a frame of ticket analyses.
+
+        Columns: ticket_id and subject (object), view_id, category, component,
+        priority and polarity (category), priority_score and business_impact
+        (integer, 0 or 1).
+
+        Args:
+            analyses: Ticket analyses (a frame is returned as is)
+
+        Returns:
+            AnalysisFrame instance
+        """
+        if isinstance(analyses, AnalysisFrame):
+            return analyses
+
+        analyses = list(analyses)
+        frame = cls(len(analyses))
+        frame.add_column("ticket_id", list(map(attrgetter("ticket_id"), analyses)), OBJECT)
+        frame.add_column("subject", list(map(attrgetter("subject"), analyses)), OBJECT)
+        frame.add_column("view_id", map(attrgetter("source_view_id"), analyses), CATEGORY)
+        frame.add_column("category", map(attrgetter("category"), analyses), CATEGORY)
+        frame.add_column("component", map(attrgetter("component"), analyses), CATEGORY)
+        frame.add_column("priority", map(attrgetter("priority"), analyses), CATEGORY)
+        sentiments = list(map(attrgetter("sentiment"), analyses))
+        polarities = list(map(attrgetter("polarity"), sentiments))
+        detected = [bool(impact.get("detected", False)) for impact in map(attrgetter("business_impact"), sentiments)]
+        severities = [
+            impact.get("severity", 0) if has_impact else 0
+            for impact, has_impact in zip(map(attrgetter("business_impact"), sentiments), detected)
+        ]
+        frame.add_column("polarity", polarities, CATEGORY)
+        frame.add_column("priority_score", map(
+            _cached_priority_score,
+            map(attrgetter("priority"), analyses),
+            polarities,
+            map(attrgetter("urgency_level"), sentiments),
+            map(attrgetter("frustration_level"), sentiments),
+            severities
+        ), INTEGER)
+        frame.add_column("business_impact", detected, INTEGER)
+        return frame
+
+    @classmethod
+    def from_tickets(
+        cls,
+        tickets: Union[Iterable[Ticket], 'AnalysisFrame'],
+        now: Optional[datetime] = None
+    ) -> 'AnalysisFrame':
+        """
+        Build a frame of tickets.
+
+        Columns: id, subject and created_at (object, as on the ticket),
+        status, priority, view_id and view_name (category), created (float,
+        seconds since the epoch) and age_days (float, days since creation).
+        Missing or unparseable creation times are NaN.
+
+        Args:
+            tickets: Tickets (a frame is returned as is)
+            now: Time the ages are measured at (default: now)
+
+        Returns:
+            AnalysisFrame instance
+        """
+        if isinstance(tickets, AnalysisFrame):
+            return tickets
+
+        tickets = list(tickets)
+        created_at = list(map(attrgetter("created_at"), tickets))
+        created = list(map(_epoch_seconds, created_at))
+        reference = _epoch_seconds(now) if now is not None else datetime.now(timezone.utc).timestamp()
+
+        frame = cls(len(tickets))
+        frame.add_column("id", list(map(attrgetter("id"), tickets)), OBJECT)
+        frame.add_column("subject", list(map(attrgetter("subject"), tickets)), OBJECT)
+        frame.add_column("created_at", created_at, OBJECT)
+        frame.add_column("status", map(attrgetter("status"), tickets), CATEGORY)
+        frame.add_column("priority", map(attrgetter("priority"), tickets), CATEGORY)
+        frame.add_column("view_id", map(attrgetter("source_view_id"), tickets), CATEGORY)
+        frame.add_column("view_name", map(attrgetter("source_view_name"), tickets), CATEGORY)
+        frame.add_column("created", created, FLOAT)
+        frame.add_column("age_days", [(reference - seconds) / SECONDS_PER_DAY for seconds in created], FLOAT)
+        return frame
+
+    def add_column(self, name: str, values: Iterable[Any], kind: str = CATEGORY) -> None:
+        """
+        Add a column, e.g. one derived from another column.
+
+        Args:
+            name: Column name (an existing column is replaced)
+            values: One value per row
+            kind: 'category' (hashable labels), 'integer', 'float' or 'object'
+
+        Raises:
+            ValueError: If the kind is unknown or the number of values is wrong
+        """
+        if kind not in COLUMN_KINDS:
+            raise ValueError(f"Unknown column kind: {kind} (expected one of {', '.join(COLUMN_KINDS)})")
+
+        values = values if isinstance(values, list) else list(values)
+        if len(values) != self._length:
+            raise ValueError(f"Column {name} has {len(values)} values for {self._length} rows")
+
+        self._categories.pop(name, None)
+        if kind == OBJECT:
+            column = values
+        else:
+            if kind == CATEGORY:
+                categories = list(dict.fromkeys(values))
+                codes = {value: code for code, value in enumerate(categories)}
+                values = list(map(codes.__getitem__, values))
+                self._categories[name] = categories
+            column = self._array(kind, values)
+
+        self._kinds[name] = kind
+        self._columns[name] = column
+
+    def _array(self, kind: str, values: Sequence[Any]) -> Any:
+        """Store numbers as a NumPy array or, without NumPy, an array.array."""
+        if self._np is not None:
+            return self._np.array(values, dtype=self._np.float64 if kind == FLOAT else self._np.int64)
+        return array(_TYPECODES[kind], values)
+
+    @property
+    def columns(self) -> List[str]:
+        """Get the column names."""
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"AnalysisFrame(rows={self._length}, columns={self.columns})"
+
+    def _column(self, name: str, kinds: Sequence[str] = COLUMN_KINDS) -> Any:
+        """Get a column, checking its kind."""
+        if name not in self._columns:
+            raise KeyError(f"No column named {name}")
+        if self._kinds[name] not in kinds:
+            raise ValueError(f"Column {name} is a {self._kinds[name]} column, expected {' or '.join(kinds)}")
+        return self._columns[name]
+
+    def categories(self, name: str) -> List[Any]:
+        """
+        Get the distinct values of a category column.
+
+        Args:
+            name: Column name
+
+        Returns:
+            Distinct values in order of first appearance in the frame the
+            column was built in
+        """
+        self._column(name, (CATEGORY,))
+        return list(self._categories[name])
+
+    def values(self, name: str, rows: Optional[Sequence[int]] = None) -> List[Any]:
+        """
+        Get the values of a column.
+
+        Args:
+            name: Column name
+            rows: Row indices (default: every row)
+
+        Returns:
+            List of values (labels decoded, numbers as Python numbers)
+        """
+        column = self._column(name)
+        if rows is not None:
+            if self._np is not None and self._kinds[name] != OBJECT:
+                column = column[self._np.asarray(rows, dtype=self._np.int64)]
+            else:
+                column = [column[row] for row in rows]
+        if self._kinds[name] == CATEGORY:
+            return list(map(self._categories[name].__getitem__, self._tolist(column)))
+        return self._tolist(column)
+
+    def rows(self, indices: Sequence[int], columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get rows as dictionaries.
+
+        Args:
+            indices: Row indices, e.g. from top_k() or indices()
+            columns: Columns to include (default: all)
+
+        Returns:
+            One dictionary of column name to value per row
+        """
+        names = list(columns) if columns is not None else self.columns
+        values = [self.values(name, indices) for name in names]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    @staticmethod
+    def _tolist(column: Any) -> List[Any]:
+        return column.tolist() if hasattr(column, "tolist") else list(column)
+
+    def mask(self, name: str, op: str, value: Any) -> Any:
+        """
+        Select the rows whose value compares to a value.
+
+        Args:
+            name: Column name
+            op: '==', '!=', '<', '<=', '>', '>=' or 'in' (value is then a
+                collection); category columns only support '==', '!=' and 'in'
+            value: Value to compare to
+
+        Returns:
+            Mask with one true or false item per row
+
+        Raises:
+            ValueError: If the operator is unknown or unsupported for the column
+        """
+        column = self._column(name, (CATEGORY, INTEGER, FLOAT))
+
+        if self._kinds[name] == CATEGORY:
+            if op not in ("==", "!=", "in"):
+                raise ValueError(f"Operator {op} is not supported for category column {name}")
+            wanted = [value] if op != "in" else list(value)
+            codes = [code for code, category in enumerate(self._categories[name]) if category in wanted]
+            mask = self._isin(column, codes)
+            return self._invert(mask) if op == "!=" else mask
+
+        if op == "in":
+            return self._isin(column, list(value))
+        if op not in _OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        if self._np is not None:
+            return _OPERATORS[op](column, value)
+        compare = _OPERATORS[op]
+        return bytearray(compare(item, value) for item in column)
+
+    def _isin(self, column: Any, values: List[Any]) -> Any:
+        if self._np is not None:
+            return self._np.isin(column, values)
+        wanted = set(values)
+        return bytearray(item in wanted for item in column)
+
+    def _invert(self, mask: Any) -> Any:
+        if self._np is not None:
+            return ~mask
+        return bytearray(not item for item in mask)
+
+    def indices(self, where: Optional[Any] = None) -> List[int]:
+        """
+        Get the indices of selected rows.
+
+        Args:
+            where: Mask from mask() (default: every row)
+
+        Returns:
+            Row indices in order
+        """
+        if where is None:
+            return list(range(self._length))
+        if self._np is not None:
+            return self._np.flatnonzero(where).tolist()
+        return list(compress(range(self._length), where))
+
+    def count(self, where: Optional[Any] = None) -> int:
+        """
+        Count rows.
+
+        Args:
+            where: Mask from mask() (default: every row)
+
+        Returns:
+            Number of selected rows
+        """
+        if where is None:
+            return self._length
+        if self._np is not None:
+            return int(self._np.count_nonzero(where))
+        return len(where) - where.count(0)
+
+    def filter(self, where: Any) -> 'AnalysisFrame':
+        """
+        Select rows.
+
+        Args:
+            where: Mask from mask()
+
+        Returns:
+            New frame with the selected rows, in order
+        """
+        if self._np is not None:
+            return self._take(self._np.flatnonzero(where))
+        return self._take(self.indices(where))
+
+    def _take(self, indices: Any) -> 'AnalysisFrame':
+        """Build a frame of the rows at the given indices (categories are shared)."""
+        frame = AnalysisFrame(len(indices))
+        frame._np = self._np
+        frame._kinds = dict(self._kinds)
+        frame._categories = dict(self._categories)
+        for name, column in self._columns.items():
+            if self._kinds[name] == OBJECT:
+                frame._columns[name] = [column[index] for index in self._tolist(indices)]
+            elif self._np is not None:
+                frame._columns[name] = column[indices]
+            else:
+                frame._columns[name] = array(column.typecode, [column[index] for index in indices])
+        return frame
+
+    def count_by(self, name: str, where: Optional[Any] = None) -> Dict[Any, int]:
+        """
+        Count rows by value.
+
+        Args:
+            name: Category or integer column name
+            where: Mask from mask() (default: every row)
+
+        Returns:
+            Dictionary of value to number of rows, in order of first appearance
+        """
+        column = self._column(name, (CATEGORY, INTEGER))
+        if where is not None:
+            column = column[where] if self._np is not None else compress(column, where)
+
+        if self._np is not None:
+            if not len(column):
+                return {}
+            low = int(column.min())
+            span = int(column.max()) - low + 1
+            if span <= 4 * len(column) + 1024:
+                # Codes and small integer ranges: count with one pass over the column
+                offsets = column - low
+                counts = self._np.bincount(offsets, minlength=span)
+                present = self._np.flatnonzero(counts)
+                first = self._np.full(span, len(column), dtype=self._np.int64)
+                self._np.minimum.at(first, offsets, self._np.arange(len(column)))
+                order = present[self._np.argsort(first[present], kind="stable")]
+                pairs = zip((order + low).tolist(), counts[order].tolist())
+            else:
+                keys, first, counts = self._np.unique(column, return_index=True, return_counts=True)
+                order = self._np.argsort(first, kind="stable")
+                pairs = zip(keys[order].tolist(), counts[order].tolist())
+        else:
+            pairs = Counter(column).items()
+
+        if self._kinds[name] == CATEGORY:
+            categories = self._categories[name]
+            return {categories[code]: count for code, count in pairs}
+        return dict(pairs)
+
+    def group_by(self, name: str, where: Optional[Any] = None) -> Dict[Any, 'AnalysisFrame']:
+        """
+        Split rows into one frame per value.
+
+        Args:
+            name: Category or integer column name
+            where: Mask from mask() (default: every row)
+
+        Returns:
+            Dictionary of value to the frame of its rows, in order of first appearance
+        """
+        column = self._column(name, (CATEGORY, INTEGER))
+        rows = self._np.flatnonzero(where) if self._np is not None and where is not None else None
+
+        if self._np is not None:
+            if rows is None:
+                rows = self._np.arange(self._length)
+            keys = column[rows]
+            order = self._np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            bounds = [0] + (self._np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1).tolist() + [len(keys)]
+            groups = [
+                (sorted_keys[start].item(), rows[order[start:end]])
+                for start, end in zip(bounds, bounds[1:])
+                if start < end
+            ]
+            # The sort keeps each group's rows in order; order the groups by their first row
+            groups.sort(key=lambda group: group[1][0])
+        else:
+            by_key: Dict[Any, List[int]] = {}
+            for index in (self.indices(where) if where is not None else range(self._length)):
+                by_key.setdefault(column[index], []).append(index)
+            groups = list(by_key.items())
+
+        categories = self._categories.get(name)
+        return {
+            categories[key] if categories is not None else key: self._take(indices)
+            for key, indices in groups
+        }
+
+    def histogram(self, name: str, edges: Sequence[float], where: Optional[Any] = None) -> List[int]:
+        """
+        Count rows by bin.
+
+        Bin 0 holds values below edges[0], bin i values from edges[i - 1] up
+        to but excluding edges[i], and the last bin values from edges[-1] up.
+        NaN values are not counted.
+
+        Args:
+            name: Integer or float column name
+            edges: Increasing bin edges
+            where: Mask from mask() (default: every row)
+
+        Returns:
+            len(edges) + 1 counts
+        """
+        column = self._column(name, (INTEGER, FLOAT))
+        if self._np is not None:
+            if where is not None:
+                column = column[where]
+            if self._kinds[name] == FLOAT:
+                column = column[~self._np.isnan(column)]
+            bins = self._np.searchsorted(self._np.asarray(edges), column, side="right")
+            return self._np.bincount(bins, minlength=len(edges) + 1).tolist()
+
+        counts = [0] * (len(edges) + 1)
+        for value in (compress(column, where) if where is not None else column):
+            if value == value:
+                counts[bisect.bisect_right(edges, value)] += 1
+        return counts
+
+    def top_k(self, name: str, k: int, where: Optional[Any] = None, largest: bool = True) -> List[int]:
+        """
+        Rank rows by value.
+
+        Args:
+            name: Integer or float column name
+            k: Number of rows
+            where: Mask from mask() (default: every row)
+            largest: Whether to rank the largest values first
+
+        Returns:
+            Indices of up to k rows, best first; ties keep row order and NaN
+            values rank last
+        """
+        column = self._column(name, (INTEGER, FLOAT))
+        if self._np is not None:
+            rows = self._np.flatnonzero(where) if where is not None else self._np.arange(self._length)
+            keys = column[rows]
+            order = self._np.argsort(-keys if largest else keys, kind="stable")[:k]
+            return rows[order].tolist()
+
+        def rank(index: int):
+            value = column[index]
+            return (value != value, -value if largest else value)
+
+        rows = self.indices(where) if where is not None else range(self._length)
+        return heapq.nsmallest(k, rows, key=rank)
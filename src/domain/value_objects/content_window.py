@@ -0,0 +1,166 @@
+"""
+Content Window Value Object
+
+This module defines the ContentWindow value object, which bounds the ticket
+text sent for AI analysis to a token budget. The window keeps the subject,
+the first message and the most recent comments, so long threads analyze on
+the first attempt instead of hitting the model's token limit.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.domain.entities.ticket import Ticket
+
+# Rough characters-per-token ratio used for local token estimates
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = " [...]"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Approximate token count
+    """
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """
+    Cut a text down to an estimated token count.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum estimated tokens of the result
+
+    Returns:
+        The text itself if it fits, otherwise its beginning with a marker
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = max(0, (max_tokens - 1) * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+    return text[:max_chars].rstrip() + TRUNCATION_MARKER
+
+
+@dataclass(frozen=True)
+class ContentWindow:
+    """
+    Token budget for the ticket content sent to the AI service.
+
+    The subject is always included. The first message (the description, or
+    the first comment when there is none) may use up to ``first_message_share``
+    of the remaining budget while there are later comments to show; the most
+    recent ``recent_comments`` comments fill the rest, newest first. Anything
+    that does not fit is truncated or omitted with a note.
+    """
+
+    max_tokens: int = 3000
+    """Maximum estimated tokens of the built content."""
+
+    recent_comments: int = 5
+    """Maximum number of most recent comments to include."""
+
+    first_message_share: float = 0.5
+    """Share of the budget reserved for the first message when comments follow."""
+
+    def build(self, ticket: Ticket) -> str:
+        """
+        Build the bounded content of a ticket.
+
+        Args:
+            ticket: Ticket entity
+
+        Returns:
+            Content text within the token budget
+        """
+        first_message, later_comments, first_number = self._split_thread(ticket)
+
+        subject = _truncate(f"Subject: {ticket.subject}", max(1, self.max_tokens // 10))
+        remaining = self.max_tokens - estimate_tokens(subject)
+        parts = [subject]
+
+        if first_message:
+            limit = remaining
+            if later_comments and self.recent_comments > 0:
+                limit = int(remaining * self.first_message_share)
+            description = _truncate(f"Description: {first_message}", max(1, limit))
+            remaining -= estimate_tokens(description)
+            parts.append(description)
+
+        if later_comments and self.recent_comments > 0:
+            parts.extend(self._comment_parts(later_comments, first_number, remaining))
+
+        return "\n\n".join(parts)
+
+    def _comment_parts(self, comments: List[Dict[str, Any]], first_number: int, budget: int) -> List[str]:
+        """
+        Select the most recent comments that fit a budget.
+
+        Args:
+            comments: Comments after the first message, oldest first
+            first_number: Position of the first of these comments in the thread
+            budget: Estimated tokens available
+
+        Returns:
+            Content parts for the comments section, oldest first
+        """
+        offset = len(comments) - min(len(comments), self.recent_comments)
+        budget -= estimate_tokens(f"Comments ({len(comments)} earlier omitted):")
+        selected: List[str] = []
+
+        for index in range(len(comments) - 1, offset - 1, -1):
+            comment = comments[index]
+            visibility = "Public" if comment.get("public", True) else "Private"
+            text = f"Comment {first_number + index} ({visibility}):\n{comment.get('body') or ''}"
+
+            tokens = estimate_tokens(text)
+            if tokens > budget:
+                # Truncate the newest comment rather than dropping everything
+                if not selected and budget > 1:
+                    selected.append(_truncate(text, budget))
+                break
+
+            selected.append(text)
+            budget -= tokens
+
+        selected.reverse()
+        omitted = len(comments) - len(selected)
+        header = "Comments:" if not omitted else f"Comments ({omitted} earlier omitted):"
+        return [header] + selected if selected else []
+
+    @staticmethod
+    def _split_thread(ticket: Ticket) -> Tuple[Optional[str], List[Dict[str, Any]], int]:
+        """
+        Separate the first message of a ticket from its later comments.
+
+        Zendesk stores the description as the first comment, so that comment
+        is not repeated when it matches the description.
+
+        Args:
+            ticket: Ticket entity
+
+        Returns:
+            Tuple of the first message text, the later comments and the
+            1-based position of the first later comment in the thread
+        """
+        comments = ticket.comments or []
+
+        if ticket.description:
+            if comments and (comments[0].get("body") or "").strip() == ticket.description.strip():
+                return ticket.description, comments[1:], 2
+            return ticket.description, comments, 1
+
+        if comments:
+            return comments[0].get("body") or None, comments[1:], 2
+
+        return None, [], 1
+
+
+DEFAULT_CONTENT_WINDOW = ContentWindow()
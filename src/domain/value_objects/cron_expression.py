@@ -0,0 +1,223 @@
+"""
+Cron Expression Value Object
+
+This module defines the CronExpression value object, which represents a
+standard five-field cron schedule (minute, hour, day of month, month, day of week).
+"""
+
+from datetime import datetime, timedelta
+from typing import FrozenSet, Optional, Tuple
+
+# (name, minimum, maximum) of each cron field
+_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+_WEEKDAY_NAMES = {
+    "sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6
+}
+
+_MONTH_NAMES = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+# Upper bound on the search in next_after; every valid expression fires within it
+_SEARCH_LIMIT_DAYS = 366 * 5
+
+
+class CronExpression:
+    """
+    Represents a five-field cron schedule.
+
+    Fields support ``*``, single values, ranges (``1-5``), steps (``*/15``,
+    ``0-30/10``) and comma-separated lists. Months and weekdays accept
+    three-letter names; weekday 0 and 7 both mean Sunday. As in cron, when
+    both day of month and day of week are restricted (neither field starts
+    with ``*``) a time matches if either one does; otherwise both must match.
+    """
+
+    __slots__ = ("expression", "minutes", "hours", "days", "months", "weekdays",
+                 "_day_restricted", "_weekday_restricted")
+
+    def __init__(self, expression: str):
+        """
+        Parse a cron expression.
+
+        Args:
+            expression: Five whitespace-separated cron fields
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression must have 5 fields, got {len(parts)}: {expression!r}")
+
+        parsed = [
+            self._parse_field(part, name, low, high)
+            for part, (name, low, high) in zip(parts, _FIELDS)
+        ]
+
+        self.expression = " ".join(parts)
+        self.minutes, self.hours, self.days, self.months = parsed[:4]
+        # Fold 7 into 0 so both mean Sunday
+        self.weekdays = frozenset(day % 7 for day in parsed[4])
+        self._day_restricted = not parts[2].startswith("*")
+        self._weekday_restricted = not parts[4].startswith("*")
+
+    @classmethod
+    def daily(cls, hour: int, minute: int) -> 'CronExpression':
+        """
+        Create an expression that fires once a day.
+
+        Args:
+            hour: Hour of the day (0-23)
+            minute: Minute of the hour (0-59)
+
+        Returns:
+            CronExpression instance
+        """
+        return cls(f"{minute} {hour} * * *")
+
+    @classmethod
+    def weekly(cls, day: str, hour: int, minute: int) -> 'CronExpression':
+        """
+        Create an expression that fires once a week.
+
+        Args:
+            day: Day name (e.g. 'monday' or 'mon')
+            hour: Hour of the day (0-23)
+            minute: Minute of the hour (0-59)
+
+        Returns:
+            CronExpression instance
+        """
+        return cls(f"{minute} {hour} * * {day[:3].lower()}")
+
+    @staticmethod
+    def _parse_field(field: str, name: str, low: int, high: int) -> FrozenSet[int]:
+        """
+        Parse one cron field into the set of values it matches.
+
+        Args:
+            field: Field text
+            name: Field name (for error messages)
+            low: Smallest allowed value
+            high: Largest allowed value
+
+        Returns:
+            Set of matching values
+        """
+        names = _WEEKDAY_NAMES if name == "weekday" else _MONTH_NAMES if name == "month" else {}
+
+        def to_int(text: str) -> int:
+            value = names.get(text.lower()) if names else None
+            if value is None:
+                try:
+                    value = int(text)
+                except ValueError:
+                    raise ValueError(f"Invalid {name} value in cron expression: {text!r}")
+            if not low <= value <= high:
+                raise ValueError(f"Cron {name} value {value} out of range {low}-{high}")
+            return value
+
+        values = set()
+        for item in field.split(","):
+            range_part, _, step_part = item.partition("/")
+            step = int(step_part) if step_part else 1
+            if step < 1:
+                raise ValueError(f"Invalid step in cron {name} field: {item!r}")
+
+            if range_part == "*":
+                start, end = low, high
+            elif "-" in range_part:
+                start_text, end_text = range_part.split("-", 1)
+                start, end = to_int(start_text), to_int(end_text)
+            else:
+                start = to_int(range_part)
+                end = high if step_part else start
+
+            if start > end:
+                raise ValueError(f"Invalid range in cron {name} field: {item!r}")
+
+            values.update(range(start, end + 1, step))
+
+        return frozenset(values)
+
+    def _matches_day(self, moment: datetime) -> bool:
+        """Check the day-of-month and day-of-week fields for a date."""
+        # datetime.weekday() is Monday=0; cron is Sunday=0
+        weekday = (moment.weekday() + 1) % 7
+        day_match = moment.day in self.days
+        weekday_match = weekday in self.weekdays
+
+        if self._day_restricted and self._weekday_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Get the first time strictly after a moment that matches the expression.
+
+        Args:
+            moment: Reference time (naive local time)
+
+        Returns:
+            Next matching time, with seconds and microseconds set to zero
+
+        Raises:
+            ValueError: If the expression never matches (e.g. February 30th)
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=_SEARCH_LIMIT_DAYS)
+
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                # Jump to the first minute of the next month
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+
+            if not self._matches_day(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+
+            next_minute = self._first_at_least(self.minutes, candidate.minute)
+            if next_minute is None:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+
+            return candidate.replace(minute=next_minute)
+
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    @staticmethod
+    def _first_at_least(values: FrozenSet[int], minimum: int) -> Optional[int]:
+        """Get the smallest value that is at least minimum, if any."""
+        candidates = [value for value in values if value >= minimum]
+        return min(candidates) if candidates else None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CronExpression) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> Tuple:
+        return (self.minutes, self.hours, self.days, self.months, self.weekdays)
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
@@ -0,0 +1,239 @@
+"""
+Sentiment Rollup Value Object
+
+This module defines the SentimentRollup value object, which holds sentiment
+report totals aggregated from pre-computed time buckets, and the helpers that
+map analyses and report periods onto those buckets.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.domain.entities.ticket_analysis import TicketAnalysis
+from src.domain.value_objects.analysis_frame import AnalysisFrame
+
+HOUR = "hour"
+DAY = "day"
+ROLLUP_GRANULARITIES = (HOUR, DAY)
+
+# Range of a period that no whole bucket covers, read from the analyses themselves
+RAW = "raw"
+
+# Dimensions every rollup bucket is keyed by, besides granularity and bucket start
+ROLLUP_DIMENSIONS = (
+    "view_id", "category", "component", "polarity", "priority_score", "business_impact"
+)
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """
+    Truncate a time to the start of its rollup bucket.
+
+    Args:
+        moment: Time to truncate
+        granularity: 'hour' or 'day'
+
+    Returns:
+        Start of the bucket containing the time
+    """
+    if granularity == HOUR:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if granularity == DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+
+def rollup_dimensions(analysis: TicketAnalysis) -> Dict[str, Any]:
+    """
+    Get the rollup dimension values of an analysis.
+
+    Args:
+        analysis: Ticket analysis
+
+    Returns:
+        Dictionary with a value for each of ROLLUP_DIMENSIONS
+    """
+    return {
+        "view_id": analysis.source_view_id,
+        "category": analysis.category,
+        "component": analysis.component,
+        "polarity": analysis.sentiment.polarity,
+        "priority_score": analysis.priority_score,
+        "business_impact": bool(analysis.has_business_impact)
+    }
+
+
+def split_period(start: datetime, end: datetime) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Cover a period with as few rollup buckets as possible.
+
+    Whole days are read from daily buckets and the whole hours around them
+    from hourly buckets. The partial hours at either end fall inside buckets
+    that extend past the period, so they are returned as RAW ranges, to be
+    read from the analyses themselves.
+
+    Args:
+        start: Start of the period
+        end: End of the period (exclusive)
+
+    Returns:
+        List of (granularity, range start, range end) with exclusive range ends
+    """
+    if start >= end:
+        return []
+
+    first_hour = bucket_start(start, HOUR)
+    if first_hour < start:
+        first_hour += timedelta(hours=1)
+    last_hour = bucket_start(end, HOUR)
+
+    if first_hour >= last_hour:
+        return [(RAW, start, end)]
+
+    ranges = []
+    if start < first_hour:
+        ranges.append((RAW, start, first_hour))
+
+    first_day = bucket_start(first_hour, DAY)
+    if first_day < first_hour:
+        first_day += timedelta(days=1)
+    last_day = bucket_start(last_hour, DAY)
+
+    if first_day >= last_day:
+        ranges.append((HOUR, first_hour, last_hour))
+    else:
+        if first_hour < first_day:
+            ranges.append((HOUR, first_hour, first_day))
+        ranges.append((DAY, first_day, last_day))
+        if last_day < last_hour:
+            ranges.append((HOUR, last_day, last_hour))
+
+    if last_hour < end:
+        ranges.append((RAW, last_hour, end))
+    return ranges
+
+
+class SentimentRollup:
+    """
+    Sentiment report totals aggregated from rollup rows.
+
+    Each row carries the ROLLUP_DIMENSIONS values and the number of analyses
+    that share them, so building the totals costs one step per row rather
+    than one per ticket.
+    """
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self.total = 0
+        self.sentiment_distribution: Dict[str, int] = {
+            "positive": 0, "negative": 0, "neutral": 0, "unknown": 0
+        }
+        self.priority_distribution: Dict[int, int] = {}
+        self.category_distribution: Dict[str, int] = {}
+        self.component_distribution: Dict[str, int] = {}
+        self.business_impact_count = 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> 'SentimentRollup':
+        """
+        Aggregate rollup rows.
+
+        Args:
+            rows: Rollup rows with dimension values and a 'count'
+
+        Returns:
+            SentimentRollup instance
+        """
+        rollup = cls()
+        for row in rows:
+            rollup.add(row, row.get("count", 0))
+        return rollup
+
+    @classmethod
+    def from_analyses(cls, analyses: Iterable[TicketAnalysis]) -> 'SentimentRollup':
+        """
+        Aggregate individual analyses.
+
+        Args:
+            analyses: Ticket analyses
+
+        Returns:
+            SentimentRollup instance
+        """
+        rollup = cls()
+        for analysis in analyses:
+            rollup.add(rollup_dimensions(analysis), 1)
+        return rollup
+
+    @classmethod
+    def from_frame(cls, frame: AnalysisFrame) -> 'SentimentRollup':
+        """
+        Aggregate the analyses of a frame, counting each dimension in one pass.
+
+        Args:
+            frame: Frame built with AnalysisFrame.from_analyses()
+
+        Returns:
+            SentimentRollup instance
+        """
+        rollup = cls()
+        rollup.total = len(frame)
+        for polarity, count in frame.count_by("polarity").items():
+            polarity = polarity or "unknown"
+            rollup.sentiment_distribution[polarity] = rollup.sentiment_distribution.get(polarity, 0) + count
+        rollup.priority_distribution = frame.count_by("priority_score")
+        for category, count in frame.count_by("category").items():
+            category = category or "uncategorized"
+            rollup.category_distribution[category] = rollup.category_distribution.get(category, 0) + count
+        for component, count in frame.count_by("component").items():
+            component = component or "none"
+            rollup.component_distribution[component] = rollup.component_distribution.get(component, 0) + count
+        rollup.business_impact_count = frame.count(frame.mask("business_impact", "==", 1))
+        return rollup
+
+    def add(self, dimensions: Dict[str, Any], count: int) -> None:
+        """
+        Add a number of analyses sharing the same dimension values.
+
+        Args:
+            dimensions: Dimension values
+            count: Number of analyses
+        """
+        if count <= 0:
+            return
+
+        self.total += count
+
+        polarity = dimensions.get("polarity") or "unknown"
+        self.sentiment_distribution[polarity] = self.sentiment_distribution.get(polarity, 0) + count
+
+        score = dimensions.get("priority_score")
+        if score is not None:
+            self.priority_distribution[score] = self.priority_distribution.get(score, 0) + count
+
+        category = dimensions.get("category") or "uncategorized"
+        self.category_distribution[category] = self.category_distribution.get(category, 0) + count
+
+        component = dimensions.get("component") or "none"
+        self.component_distribution[component] = self.component_distribution.get(component, 0) + count
+
+        if dimensions.get("business_impact"):
+            self.business_impact_count += count
+
+    def count_at_least(self, min_score: int) -> int:
+        """
+        Count analyses with a priority score of at least min_score.
+
+        Args:
+            min_score: Minimum priority score
+
+        Returns:
+            Number of analyses
+        """
+        return sum(count for score, count in self.priority_distribution.items() if score >= min_score)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __repr__(self) -> str:
+        return f"SentimentRollup(total={self.total})"
@@ -4,7 +4,10 @@ External Services Package
 This package contains adapters for external services used by the Zendesk AI Integration application.
 """
 
+from src.infrastructure.external_services.claude_batch_service import ClaudeBatchService
 from src.infrastructure.external_services.claude_service import ClaudeService
+from src.infrastructure.external_services.hedged_ai_service import HedgedAIService
 from src.infrastructure.external_services.openai_service import OpenAIService
+from src.infrastructure.external_services.routing_ai_service import RoutingAIService
 
-__all__ = ['OpenAIService', 'ClaudeService']
+__all__ = ['OpenAIService', 'ClaudeService', 'ClaudeBatchService', 'RoutingAIService', 'HedgedAIService']
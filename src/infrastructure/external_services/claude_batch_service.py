@@ -0,0 +1,182 @@
+"""
+Claude Batch Service
+
+This module provides an implementation of the BatchAIService interface using
+the Anthropic Message Batches API. Each request carries the same prompt as
+ClaudeService.analyze_content, but the whole set is processed asynchronously
+as one job instead of one synchronous call per ticket.
+"""
+
+import logging
+import os
+import re
+from typing import Any, Dict, Optional
+
+from src.domain.interfaces.ai_service_interfaces import AIServiceError, BatchAIService
+from src.infrastructure.external_services.claude_service import (
+    ANALYSIS_SYSTEM_PROMPT,
+    ClaudeService,
+    failed_result,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Request IDs accepted by the Message Batches API
+_CUSTOM_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{1,64}$")
+
+
+class ClaudeBatchService(BatchAIService):
+    """
+    Implementation of the BatchAIService interface using Anthropic Message Batches.
+
+    Prompts, model and response parsing are shared with ClaudeService so batch
+    and interactive analyses produce identical results. The API endpoint can be
+    overridden with ``base_url`` (or ANTHROPIC_BATCH_BASE_URL), e.g. to point at
+    a local fake server in tests.
+    """
+
+    def __init__(
+        self,
+        claude_service: Optional[ClaudeService] = None,
+        base_url: Optional[str] = None,
+        max_tokens: int = 4000
+    ):
+        """
+        Initialize the Claude batch service.
+
+        Args:
+            claude_service: Service providing the API key, model, prompt and parsing
+            base_url: Optional API base URL
+            max_tokens: Maximum tokens per response
+        """
+        self.claude_service = claude_service or ClaudeService()
+        self.base_url = base_url or os.getenv("ANTHROPIC_BATCH_BASE_URL")
+        self.max_tokens = max_tokens
+        self._client = None
+
+    @property
+    def client(self):
+        """Get the Anthropic client, initializing it if necessary."""
+        if self._client is None:
+            if not self.base_url:
+                self._client = self.claude_service.client
+            else:
+                try:
+                    from anthropic import Anthropic
+                    self._client = Anthropic(api_key=self.claude_service.api_key, base_url=self.base_url)
+                except ImportError:
+                    logger.error("Anthropic package is not installed. Install it with: pip install anthropic>=0.7.0")
+                    raise AIServiceError("Anthropic package is not installed")
+
+        return self._client
+
+    def submit_batch(self, contents: Dict[str, str]) -> str:
+        """
+        Submit contents for analysis as one batch job.
+
+        Args:
+            contents: Mapping of request IDs to the content to analyze
+
+        Returns:
+            ID of the batch job
+
+        Raises:
+            ValueError: If a request ID is not accepted by the API
+            AIServiceError: If the job cannot be submitted
+        """
+        if not contents:
+            raise ValueError("A batch needs at least one request")
+
+        requests = []
+        for custom_id, content in contents.items():
+            if not _CUSTOM_ID_PATTERN.match(custom_id):
+                raise ValueError(f"Invalid batch request ID: {custom_id!r}")
+
+            requests.append({
+                "custom_id": custom_id,
+                "params": {
+                    "model": self.claude_service.model,
+                    "max_tokens": self.max_tokens,
+                    "temperature": 0.0,
+                    "system": self.claude_service._system_blocks(ANALYSIS_SYSTEM_PROMPT),
+                    "messages": [{
+                        "role": "user",
+                        "content": self.claude_service._build_analysis_prompt(content)
+                    }]
+                }
+            })
+
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
+        except Exception as e:
+            error_msg = f"Error submitting Claude batch: {str(e)}"
+            logger.error(error_msg)
+            raise AIServiceError(error_msg)
+
+        logger.info(f"Submitted Claude batch {batch.id} with {len(requests)} requests")
+        return batch.id
+
+    def get_batch_status(self, batch_id: str) -> str:
+        """
+        Get the processing status of a batch job.
+
+        Args:
+            batch_id: ID of the batch job
+
+        Returns:
+            'in_progress', 'canceling' or 'ended'
+
+        Raises:
+            AIServiceError: If the status cannot be retrieved
+        """
+        try:
+            batch = self.client.messages.batches.retrieve(batch_id)
+        except Exception as e:
+            error_msg = f"Error retrieving Claude batch {batch_id}: {str(e)}"
+            logger.error(error_msg)
+            raise AIServiceError(error_msg)
+
+        return batch.processing_status
+
+    def get_batch_results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the analysis results of an ended batch job.
+
+        Args:
+            batch_id: ID of the batch job
+
+        Returns:
+            Mapping of request IDs to analysis results; failed requests map to
+            a result with 'error' and 'error_type' keys
+
+        Raises:
+            AIServiceError: If the results cannot be retrieved
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            entries = self.client.messages.batches.results(batch_id)
+
+            for entry in entries:
+                outcome = entry.result
+
+                if outcome.type != "succeeded":
+                    error = getattr(outcome, "error", None)
+                    message = str(getattr(error, "error", error)) if error else f"Request {outcome.type}"
+                    results[entry.custom_id] = failed_result(message, outcome.type)
+                    continue
+
+                try:
+                    result = self.claude_service._process_response(outcome.message.content[0].text)
+                    result["confidence"] = 0.95
+                    results[entry.custom_id] = result
+                except AIServiceError as e:
+                    results[entry.custom_id] = failed_result(str(e), type(e).__name__)
+        except Exception as e:
+            error_msg = f"Error fetching results of Claude batch {batch_id}: {str(e)}"
+            logger.error(error_msg)
+            raise AIServiceError(error_msg)
+
+        logger.info(f"Fetched {len(results)} results from Claude batch {batch_id}")
+        return results
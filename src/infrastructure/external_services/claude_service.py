@@ -4,45 +4,363 @@ Claude Service Adapter
 This module provides an implementation of the AIService interface using the Anthropic Claude API.
 """
 
-import json
+import copy
+import hashlib
+import inspect
 import logging
 import os
 import random
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cachetools
 
 from src.domain.interfaces.ai_service_interfaces import (
+    ENRICHMENT_FACETS,
     AIService,
     AIServiceError,
     ContentFilterError,
     EnhancedAIService,
+    EnrichmentAIService,
+    InvalidRequestError,
+    PackedAIService,
     RateLimitError,
+    ResponseFormatError,
     TokenLimitError,
 )
-from src.infrastructure.utils.retry import with_retry
+from src.domain.interfaces.repository_interfaces import UsageRepository
+from src.domain.interfaces.utility_interfaces import MetricsCollector, QuotaManager
+from src.domain.value_objects.content_window import estimate_tokens
+from src.infrastructure.utils.json_stream import (
+    IncrementalJSONParser,
+    parse_json_response,
+)
+from src.infrastructure.utils.quota_manager import retry_after_seconds
+from src.infrastructure.utils.retry_policy import AI_RETRY_POLICY, is_retryable_status
+from src.infrastructure.utils.tracing import set_span_attributes, traced
+from src.infrastructure.utils.usage import usage_entry
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Estimated response tokens per packed analysis, and for the surrounding array
+_PACKED_OUTPUT_TOKENS_PER_ENTRY = 150
+_PACKED_OUTPUT_OVERHEAD_TOKENS = 100
+
+# Keys a packed analysis entry must contain to be accepted
+_REQUIRED_ANALYSIS_KEYS = ("category", "component", "priority", "sentiment")
+
+
+def failed_result(error: str, error_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the analysis result recorded for content that could not be analyzed.
+
+    Args:
+        error: Error message
+        error_type: Error type, if the analysis failed rather than had no content
+
+    Returns:
+        Analysis result with default values and the error details
+    """
+    result = {
+        "sentiment": {
+            "polarity": "unknown",
+            "urgency_level": 1,
+            "frustration_level": 1,
+            "emotions": [],
+            "business_impact": {
+                "detected": False,
+                "impact_areas": [],
+                "severity": 0
+            }
+        },
+        "category": "uncategorized",
+        "component": "none",
+        "priority": "low",
+        "confidence": 0.0,
+        "error": error
+    }
+    if error_type:
+        result["error_type"] = error_type
+    return result
+
+
+# Static system prompts. They never contain ticket data, so they form a stable
+# prefix that can be cached by the API; only the customer message varies.
+_ANALYSIS_SCHEMA = """{
+  "category": "[system/resale_component/hardware_issue/system_component/so_released_to_warehouse/wo_released_to_warehouse/technical_support/rma/software_issue/general_inquiry]",
+  "component": "[gpu/cpu/drive/memory/power_supply/motherboard/cooling/display/network/none]",
+  "priority": "[high/medium/low]",
+  "sentiment": {
+    "polarity": "[positive/negative/neutral/unknown]",
+    "urgency_level": [1-5 scale, where 1 is lowest urgency and 5 is highest],
+    "frustration_level": [1-5 scale, where 1 is not frustrated and 5 is extremely frustrated],
+    "emotions": [array of emotions detected in the message],
+    "business_impact": {
+      "detected": [true/false],
+      "impact_areas": [array of business areas affected, if any],
+      "severity": [0-5 scale, where 0 is no impact and 5 is severe impact]
+    }
+  }
+}"""
+
+_CATEGORIES_EXPLANATION = """Categories explanation:
+- system: Issues related to complete computer systems
+- resale_component: Issues with components being resold
+- hardware_issue: Problems with physical hardware components
+- system_component: Issues specific to system components
+- so_released_to_warehouse: Sales order released to warehouse status
+- wo_released_to_warehouse: Work order released to warehouse status
+- technical_support: General technical assistance requests
+- rma: Return merchandise authorization requests
+- software_issue: Problems with software, OS or drivers
+- general_inquiry: Information seeking that doesn't fit other categories"""
+
+_JSON_ONLY = "Please provide only valid JSON without any additional text, prefixes, or explanation."
+
+ANALYSIS_SYSTEM_PROMPT = f"""Analyze the customer message from Exxact Corporation (a hardware systems manufacturer) and provide a detailed analysis as JSON.
+
+I need you to output a JSON object with the following structure:
+
+{_ANALYSIS_SCHEMA}
+
+{_CATEGORIES_EXPLANATION}
+
+{_JSON_ONLY}"""
+
+PACKED_ANALYSIS_SYSTEM_PROMPT = f"""Analyze each of the customer messages from Exxact Corporation (a hardware systems manufacturer) independently and provide a detailed analysis of each as JSON.
+
+Each message is wrapped in a <message> tag with an id attribute. For every message, produce a JSON object with the following structure, plus an "id" field holding the message's id attribute:
+
+{_ANALYSIS_SCHEMA}
+
+{_CATEGORIES_EXPLANATION}
+
+Please provide only a valid JSON array with exactly one object per message, without any additional text, prefixes, or explanation."""
+
+CATEGORIZATION_SYSTEM_PROMPT = f"""Categorize the customer message from Exxact Corporation (a hardware systems manufacturer).
+
+I need you to output a JSON object with the following structure:
+
+{{
+  "category": "[system/resale_component/hardware_issue/system_component/so_released_to_warehouse/wo_released_to_warehouse/technical_support/rma/software_issue/general_inquiry]",
+  "component": "[gpu/cpu/drive/memory/power_supply/motherboard/cooling/display/network/none]",
+  "priority": "[high/medium/low]",
+  "rationale": "[Brief explanation of the categorization]"
+}}
+
+{_CATEGORIES_EXPLANATION}
+
+{_JSON_ONLY}"""
+
+_EXTRACTION_SCHEMA = """{
+  "entities": [array of named entities like people, companies, products mentioned],
+  "product_mentions": [array of specific product names or models mentioned],
+  "technical_specifications": {
+    "cpu": "[any CPU specifications mentioned]",
+    "gpu": "[any GPU specifications mentioned]",
+    "memory": "[any memory specifications mentioned]",
+    "storage": "[any storage specifications mentioned]",
+    "other": "[any other technical specifications mentioned]"
+  },
+  "request_type": "[inquiry/support/purchase/complaint/return/other]",
+  "action_items": [array of specific actions requested or required]
+}"""
+
+EXTRACTION_SYSTEM_PROMPT = f"""Extract structured data from the customer message sent to Exxact Corporation (a hardware systems manufacturer).
+
+I need you to output a JSON object with the following structure:
+
+{_EXTRACTION_SCHEMA}
+
+{_JSON_ONLY}"""
+
+ENRICHMENT_SYSTEM_PROMPT = f"""Analyze the customer message from Exxact Corporation (a hardware systems manufacturer) for the facets listed before the message.
+
+Output a single JSON object with one key per requested facet, holding the facet's structure below. Leave out facets that were not requested.
+
+"categorization": {{
+  "category": "[system/resale_component/hardware_issue/system_component/so_released_to_warehouse/wo_released_to_warehouse/technical_support/rma/software_issue/general_inquiry]",
+  "component": "[gpu/cpu/drive/memory/power_supply/motherboard/cooling/display/network/none]",
+  "priority": "[high/medium/low]"
+}}
+
+"sentiment": {{
+  "polarity": "[positive/negative/neutral/unknown]",
+  "urgency_level": [1-5 scale, where 1 is lowest urgency and 5 is highest],
+  "frustration_level": [1-5 scale, where 1 is not frustrated and 5 is extremely frustrated],
+  "emotions": [array of emotions detected in the message]
+}}
+
+"business_impact": {{
+  "detected": [true/false],
+  "impact_areas": [array of business areas affected, if any],
+  "severity": [0-5 scale, where 0 is no impact and 5 is severe impact],
+  "explanation": "[Brief explanation of the business impact]",
+  "potential_revenue_impact": [estimated dollar impact if discernible, or "unknown"],
+  "urgency": [1-5 scale, where 1 is lowest urgency and 5 is highest]
+}}
+
+"extraction": {_EXTRACTION_SCHEMA}
+
+"response_suggestion": "[A reply from an Exxact customer support representative: empathetic, clear and accurate, with next steps where appropriate, concise but thorough]"
+
+{_CATEGORIES_EXPLANATION}
+
+{_JSON_ONLY}"""
+
+# Estimated response tokens of each enrichment facet
+_FACET_OUTPUT_TOKENS = {
+    "categorization": 100,
+    "sentiment": 150,
+    "business_impact": 250,
+    "extraction": 400,
+    "response_suggestion": 800,
+}
+
+# Results of each enrichment facet when it can't be produced
+_FACET_DEFAULTS = {
+    "categorization": {"category": "uncategorized", "component": "none", "priority": "low"},
+    "sentiment": {"polarity": "unknown", "urgency_level": 1, "frustration_level": 1, "emotions": []},
+    "business_impact": {
+        "detected": False,
+        "impact_areas": [],
+        "severity": 0,
+        "explanation": "",
+        "potential_revenue_impact": "unknown",
+        "urgency": 1
+    },
+    "extraction": {
+        "entities": [],
+        "product_mentions": [],
+        "technical_specifications": {},
+        "request_type": "unknown",
+        "action_items": []
+    },
+}
+
+
+def accepts_keyword(method: Any, name: str) -> bool:
+    """
+    Check whether an SDK method takes a keyword argument.
+
+    Newer Anthropic SDKs no longer take sampling parameters such as
+    temperature, and reject them instead of ignoring them.
+
+    Args:
+        method: SDK method, e.g. client.messages.create
+        name: Keyword argument name
+
+    Returns:
+        True if the method takes the argument (or any keyword arguments)
+    """
+    try:
+        parameters = inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return True
+    return name in parameters or any(
+        parameter.kind is inspect.Parameter.VAR_KEYWORD for parameter in parameters.values()
+    )
+
+
+def failed_facet(facet: str, error: str, error_type: Optional[str] = None) -> Any:
+    """
+    Build the result of an enrichment facet that could not be produced.
+
+    Args:
+        facet: Facet name
+        error: Error message
+        error_type: Error type, if the facet failed rather than had no content
 
-class ClaudeService(EnhancedAIService):
+    Returns:
+        Default facet result with the error details; for 'response_suggestion'
+        a message explaining why no reply was suggested
+    """
+    if facet == "response_suggestion":
+        return f"Failed to generate response suggestion: {error}"
+
+    result = copy.deepcopy(_FACET_DEFAULTS[facet])
+    result["confidence"] = 0.0
+    result["error"] = error
+    if error_type:
+        result["error_type"] = error_type
+    return result
+
+
+# Usage counters reported by the API for every call
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+class ClaudeService(EnhancedAIService, PackedAIService, EnrichmentAIService):
     """
     Implementation of the EnhancedAIService interface using the Anthropic Claude API.
 
     This service uses the Anthropic Claude API to analyze ticket content and sentiment,
     with enhanced capabilities like business impact analysis and response suggestions.
+    Short contents can be packed several to a request with analyze_contents, and
+    several facets of one content can be requested together with enrich.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-haiku-20240307"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "claude-3-haiku-20240307",
+        pack_token_budget: int = 2000,
+        max_pack_size: int = 20,
+        short_content_tokens: int = 150,
+        prompt_caching: bool = True,
+        quota_manager: Optional[QuotaManager] = None,
+        enrichment_cache_size: int = 1024,
+        enrichment_cache_ttl: float = 3600.0,
+        streaming: bool = False,
+        metrics: Optional[MetricsCollector] = None,
+        usage_repository: Optional[UsageRepository] = None
+    ):
         """
         Initialize the Claude service.
 
         Args:
             api_key: Anthropic API key (optional, defaults to environment variable)
             model: Claude model to use (default: claude-3-haiku-20240307)
+            pack_token_budget: Maximum estimated content tokens per packed request (0 disables packing)
+            max_pack_size: Maximum number of contents per packed request
+            short_content_tokens: Contents estimated above this many tokens are analyzed alone
+            prompt_caching: Mark the static system prompts as cacheable
+            quota_manager: Optional shared client-side quota manager
+            enrichment_cache_size: Maximum number of cached enrichment facets
+            enrichment_cache_ttl: Seconds an enrichment facet stays cached
+            streaming: Stream JSON responses and stop generation once the JSON value is complete
+            metrics: Optional collector receiving call latency and token counts
+            usage_repository: Optional ledger receiving the usage and cost of every call
         """
+
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         self.model = model
+        self.pack_token_budget = pack_token_budget
+        self.max_pack_size = max_pack_size
+        self.short_content_tokens = short_content_tokens
+        self.prompt_caching = prompt_caching
+        self.quota_manager = quota_manager
+        self.streaming = streaming
+        self.metrics = metrics
+        self.usage_repository = usage_repository
+
+        # Token usage of the last call and totals since initialization
+        self.last_usage: Dict[str, int] = {}
+        self._usage_totals: Dict[str, int] = {field: 0 for field in USAGE_FIELDS}
+        self._usage_calls = 0
+        self._usage_lock = threading.Lock()
+
+        # Enrichment facets cached by (content hash, facet)
+        self._enrichment_cache = cachetools.TTLCache(maxsize=enrichment_cache_size, ttl=enrichment_cache_ttl)
+        self._enrichment_lock = threading.Lock()
 
         if not self.api_key:
             logger.warning("Anthropic API key not provided - API calls will fail")
@@ -59,14 +377,14 @@ class ClaudeService(EnhancedAIService):
                 self._client = Anthropic(api_key=self.api_key)
             except ImportError:
                 logger.error("Anthropic package is not installed. Install it with: pip install anthropic>=0.7.0")
-                raise AIServiceError("Anthropic package is not installed")
+                raise InvalidRequestError("Anthropic package is not installed")
             except Exception as e:
                 logger.error(f"Error initializing Anthropic client: {str(e)}")
-                raise AIServiceError(f"Error initializing Anthropic client: {str(e)}")
+                raise InvalidRequestError(f"Error initializing Anthropic client: {str(e)}")
 
         return self._client
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def analyze_content(self, content: str) -> Dict[str, Any]:
         """
         Analyze content to determine sentiment, category, etc.
@@ -82,71 +400,16 @@ class ClaudeService(EnhancedAIService):
         """
         if not content or not content.strip():
             logger.warning("Empty content provided for analysis")
-            return {
-                "sentiment": {
-                    "polarity": "unknown",
-                    "urgency_level": 1,
-                    "frustration_level": 1,
-                    "emotions": [],
-                    "business_impact": {
-                        "detected": False,
-                        "impact_areas": [],
-                        "severity": 0
-                    }
-                },
-                "category": "uncategorized",
-                "component": "none",
-                "priority": "low",
-                "confidence": 0.0,
-                "error": "Empty content provided"
-            }
+            return failed_result("Empty content provided")
 
         logger.info(f"Analyzing content with Claude (length: {len(content)} chars)")
 
         # Craft the prompt for Claude
-        prompt = f"""
-        Analyze the following customer message from Exxact Corporation (a hardware systems manufacturer) and provide a detailed analysis as JSON.
-
-        I need you to output a JSON object with the following structure:
-
-        {{
-          "category": "[system/resale_component/hardware_issue/system_component/so_released_to_warehouse/wo_released_to_warehouse/technical_support/rma/software_issue/general_inquiry]",
-          "component": "[gpu/cpu/drive/memory/power_supply/motherboard/cooling/display/network/none]",
-          "priority": "[high/medium/low]",
-          "sentiment": {{
-            "polarity": "[positive/negative/neutral/unknown]",
-            "urgency_level": [1-5 scale, where 1 is lowest urgency and 5 is highest],
-            "frustration_level": [1-5 scale, where 1 is not frustrated and 5 is extremely frustrated],
-            "emotions": [array of emotions detected in the message],
-            "business_impact": {{
-              "detected": [true/false],
-              "impact_areas": [array of business areas affected, if any],
-              "severity": [0-5 scale, where 0 is no impact and 5 is severe impact]
-            }}
-          }}
-        }}
-
-        Categories explanation:
-        - system: Issues related to complete computer systems
-        - resale_component: Issues with components being resold
-        - hardware_issue: Problems with physical hardware components
-        - system_component: Issues specific to system components
-        - so_released_to_warehouse: Sales order released to warehouse status
-        - wo_released_to_warehouse: Work order released to warehouse status
-        - technical_support: General technical assistance requests
-        - rma: Return merchandise authorization requests
-        - software_issue: Problems with software, OS or drivers
-        - general_inquiry: Information seeking that doesn't fit other categories
-
-        Customer message:
-        {content}
-
-        Please provide only valid JSON without any additional text, prefixes, or explanation.
-        """
+        prompt = self._build_analysis_prompt(content)
 
         try:
             # Call the Claude API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, system=ANALYSIS_SYSTEM_PROMPT, operation="analyze_content")
 
             # Process the response
             result = self._process_response(response)
@@ -163,27 +426,199 @@ class ClaudeService(EnhancedAIService):
         except Exception as e:
             # Log unexpected errors and wrap in a generic AIServiceError
             logger.exception(f"Unexpected error analyzing content: {str(e)}")
-            return {
-                "sentiment": {
-                    "polarity": "unknown",
-                    "urgency_level": 1,
-                    "frustration_level": 1,
-                    "emotions": [],
-                    "business_impact": {
-                        "detected": False,
-                        "impact_areas": [],
-                        "severity": 0
-                    }
-                },
-                "category": "uncategorized",
-                "component": "none",
-                "priority": "low",
-                "confidence": 0.0,
-                "error": str(e),
-                "error_type": type(e).__name__
-            }
+            return failed_result(str(e), type(e).__name__)
+
+    def analyze_contents(self, contents: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze several contents, packing short ones into shared requests.
+
+        Every entry of a packed response is checked for its ID and the required
+        analysis keys; missing or malformed entries, and whole packs whose
+        response cannot be used, are analyzed again one content at a time.
+
+        Args:
+            contents: Mapping of content IDs to the content to analyze
+
+        Returns:
+            Mapping of content IDs to analysis results; contents that could not
+            be analyzed map to a result with 'error' and 'error_type' keys
+        """
+        items = {str(content_id): content for content_id, content in contents.items()}
+        results: Dict[str, Dict[str, Any]] = {}
+        single: List[str] = []
+        short: List[Tuple[str, str]] = []
+
+        for content_id, content in items.items():
+            if (
+                self.pack_token_budget > 0
+                and content and content.strip()
+                and estimate_tokens(content) <= self.short_content_tokens
+            ):
+                short.append((content_id, content))
+            else:
+                single.append(content_id)
+
+        packs = self._pack_contents(short)
+        for pack in packs:
+            if len(pack) == 1:
+                single.append(pack[0][0])
+            else:
+                packed = self._analyze_pack(pack)
+                results.update(packed)
+                single.extend(content_id for content_id, _ in pack if content_id not in packed)
+
+        logger.info(
+            f"Analyzing {len(items)} contents with Claude: "
+            f"{len(short)} packed into {len(packs)} request(s), {len(single)} analyzed alone"
+        )
+
+        for content_id in single:
+            try:
+                results[content_id] = self.analyze_content(items[content_id])
+            except AIServiceError as e:
+                logger.error(f"Error analyzing content {content_id}: {str(e)}")
+                results[content_id] = failed_result(str(e), type(e).__name__)
+
+        return results
+
+    def _pack_contents(self, items: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """
+        Group short contents into packs that fit the token budget.
+
+        A pack is closed when adding the next content would exceed the content
+        token budget, the maximum pack size, or the number of analyses that fit
+        in one response.
+
+        Args:
+            items: List of (content ID, content) pairs
+
+        Returns:
+            List of packs
+        """
+        max_entries = max(1, min(
+            self.max_pack_size,
+            (4000 - _PACKED_OUTPUT_OVERHEAD_TOKENS) // _PACKED_OUTPUT_TOKENS_PER_ENTRY
+        ))
+
+        packs: List[List[Tuple[str, str]]] = []
+        pack: List[Tuple[str, str]] = []
+        pack_tokens = 0
+
+        for content_id, content in items:
+            tokens = estimate_tokens(content)
+            if pack and (pack_tokens + tokens > self.pack_token_budget or len(pack) >= max_entries):
+                packs.append(pack)
+                pack = []
+                pack_tokens = 0
+            pack.append((content_id, content))
+            pack_tokens += tokens
+
+        if pack:
+            packs.append(pack)
+
+        return packs
+
+    def _analyze_pack(self, pack: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze a pack of contents with one API call.
+
+        Args:
+            pack: List of (content ID, content) pairs
+
+        Returns:
+            Mapping of content IDs to the valid analyses found in the response
+            (empty if the response cannot be used)
+        """
+        max_tokens = _PACKED_OUTPUT_OVERHEAD_TOKENS + _PACKED_OUTPUT_TOKENS_PER_ENTRY * len(pack)
+
+        try:
+            response = self._call_api(
+                self._build_packed_prompt(pack),
+                max_tokens=max_tokens,
+                system=PACKED_ANALYSIS_SYSTEM_PROMPT,
+                operation="analyze_contents"
+            )
+            entries = self._process_response(response)
+        except AIServiceError as e:
+            logger.warning(f"Packed analysis of {len(pack)} contents failed, analyzing them alone: {str(e)}")
+            return {}
+
+        if isinstance(entries, dict):
+            entries = entries.get("results", [entries])
+        if not isinstance(entries, list):
+            logger.warning("Packed analysis response is not a JSON array, analyzing contents alone")
+            return {}
+
+        expected = {content_id for content_id, _ in pack}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+
+            content_id = str(entry.pop("id", ""))
+            if content_id in expected and content_id not in results and self._is_valid_analysis(entry):
+                entry["confidence"] = 0.95
+                results[content_id] = entry
+
+        if len(results) < len(pack):
+            logger.warning(
+                f"Packed analysis returned {len(results)} of {len(pack)} valid entries, "
+                f"analyzing the rest alone"
+            )
+
+        return results
+
+    @staticmethod
+    def _is_valid_analysis(entry: Dict[str, Any]) -> bool:
+        """
+        Check that an analysis entry has the required keys.
+
+        Args:
+            entry: Analysis entry from a packed response
+
+        Returns:
+            True if the entry can be used as an analysis result
+        """
+        if any(key not in entry for key in _REQUIRED_ANALYSIS_KEYS):
+            return False
+
+        sentiment = entry["sentiment"]
+        return isinstance(sentiment, dict) and "polarity" in sentiment
+
+    def _build_analysis_prompt(self, content: str) -> str:
+        """
+        Build the per-ticket part of the analyze_content prompt.
+
+        The instructions and schema are sent separately as ANALYSIS_SYSTEM_PROMPT.
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+        Args:
+            content: The content to analyze
+
+        Returns:
+            Prompt text
+        """
+        return f"Customer message:\n{content}"
+
+    def _build_packed_prompt(self, pack: List[Tuple[str, str]]) -> str:
+        """
+        Build the per-pack part of the packed analysis prompt.
+
+        The instructions and schema are sent separately as
+        PACKED_ANALYSIS_SYSTEM_PROMPT, once for the whole pack.
+
+        Args:
+            pack: List of (content ID, content) pairs
+
+        Returns:
+            Prompt text
+        """
+        messages = "\n".join(
+            f'<message id="{content_id}">\n{content}\n</message>' for content_id, content in pack
+        )
+        return f"Customer messages ({len(pack)}):\n{messages}"
+
+    @AI_RETRY_POLICY
     def analyze_sentiment(self, content: str) -> Dict[str, Any]:
         """
         Analyze sentiment of content.
@@ -241,7 +676,7 @@ class ClaudeService(EnhancedAIService):
 
         try:
             # Call the Claude API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, operation="analyze_sentiment")
 
             # Process the response
             result_json = self._process_response(response)
@@ -276,7 +711,7 @@ class ClaudeService(EnhancedAIService):
                 "error_type": type(e).__name__
             }
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def categorize_ticket(self, content: str) -> Dict[str, Any]:
         """
         Categorize a ticket based on its content.
@@ -303,39 +738,11 @@ class ClaudeService(EnhancedAIService):
         logger.info(f"Categorizing ticket with Claude (length: {len(content)} chars)")
 
         # Craft the prompt for Claude
-        prompt = f"""
-        Categorize the following customer message from Exxact Corporation (a hardware systems manufacturer).
-
-        I need you to output a JSON object with the following structure:
-
-        {{
-          "category": "[system/resale_component/hardware_issue/system_component/so_released_to_warehouse/wo_released_to_warehouse/technical_support/rma/software_issue/general_inquiry]",
-          "component": "[gpu/cpu/drive/memory/power_supply/motherboard/cooling/display/network/none]",
-          "priority": "[high/medium/low]",
-          "rationale": "[Brief explanation of the categorization]"
-        }}
-
-        Categories explanation:
-        - system: Issues related to complete computer systems
-        - resale_component: Issues with components being resold
-        - hardware_issue: Problems with physical hardware components
-        - system_component: Issues specific to system components
-        - so_released_to_warehouse: Sales order released to warehouse status
-        - wo_released_to_warehouse: Work order released to warehouse status
-        - technical_support: General technical assistance requests
-        - rma: Return merchandise authorization requests
-        - software_issue: Problems with software, OS or drivers
-        - general_inquiry: Information seeking that doesn't fit other categories
-
-        Customer message:
-        {content}
-
-        Please provide only valid JSON without any additional text, prefixes, or explanation.
-        """
+        prompt = f"Customer message:\n{content}"
 
         try:
             # Call the Claude API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, system=CATEGORIZATION_SYSTEM_PROMPT, operation="categorize_ticket")
 
             # Process the response
             result = self._process_response(response)
@@ -361,7 +768,7 @@ class ClaudeService(EnhancedAIService):
                 "error_type": type(e).__name__
             }
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def analyze_business_impact(self, content: str) -> Dict[str, Any]:
         """
         Analyze the business impact of the content.
@@ -410,7 +817,7 @@ class ClaudeService(EnhancedAIService):
 
         try:
             # Call the Claude API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, operation="analyze_business_impact")
 
             # Process the response
             result = self._process_response(response)
@@ -439,7 +846,7 @@ class ClaudeService(EnhancedAIService):
                 "error_type": type(e).__name__
             }
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def generate_response_suggestion(self, ticket_content: str) -> str:
         """
         Generate a suggested response for a ticket.
@@ -478,7 +885,7 @@ class ClaudeService(EnhancedAIService):
 
         try:
             # Call the Claude API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, json_output=False, operation="generate_response_suggestion")
 
             # Return the raw text (no need to parse as JSON)
             logger.info(f"Generated response suggestion ({len(response)} chars)")
@@ -492,7 +899,7 @@ class ClaudeService(EnhancedAIService):
             logger.exception(f"Unexpected error generating response suggestion: {str(e)}")
             return f"Failed to generate response suggestion: {str(e)}"
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def extract_ticket_data(self, content: str) -> Dict[str, Any]:
         """
         Extract structured data from ticket content.
@@ -520,34 +927,11 @@ class ClaudeService(EnhancedAIService):
         logger.info(f"Extracting structured data with Claude (length: {len(content)} chars)")
 
         # Craft the prompt for Claude
-        prompt = f"""
-        Extract structured data from the following customer message sent to Exxact Corporation (a hardware systems manufacturer).
-
-        I need you to output a JSON object with the following structure:
-
-        {{
-          "entities": [array of named entities like people, companies, products mentioned],
-          "product_mentions": [array of specific product names or models mentioned],
-          "technical_specifications": {{
-            "cpu": "[any CPU specifications mentioned]",
-            "gpu": "[any GPU specifications mentioned]",
-            "memory": "[any memory specifications mentioned]",
-            "storage": "[any storage specifications mentioned]",
-            "other": "[any other technical specifications mentioned]"
-          }},
-          "request_type": "[inquiry/support/purchase/complaint/return/other]",
-          "action_items": [array of specific actions requested or required]
-        }}
-
-        Customer message:
-        {content}
-
-        Please provide only valid JSON without any additional text, prefixes, or explanation.
-        """
+        prompt = f"Customer message:\n{content}"
 
         try:
             # Call the Claude API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, system=EXTRACTION_SYSTEM_PROMPT, operation="extract_ticket_data")
 
             # Process the response
             result = self._process_response(response)
@@ -575,7 +959,156 @@ class ClaudeService(EnhancedAIService):
                 "error_type": type(e).__name__
             }
 
-    def _call_api(self, prompt: str, temperature: float = 0.0, max_tokens: int = 4000) -> str:
+    @AI_RETRY_POLICY
+    def enrich(self, content: str, facets: Sequence[str]) -> Dict[str, Any]:
+        """
+        Analyze content for the selected facets with a single Claude call.
+
+        Facets already cached for the same content are not requested again,
+        so asking for more facets later only pays for the new ones.
+
+        Args:
+            content: The content to analyze
+            facets: Facets to return, from ENRICHMENT_FACETS
+
+        Returns:
+            Mapping of each requested facet to its result
+
+        Raises:
+            ValueError: If an unknown facet is requested
+            AIServiceError: If an error occurs during analysis
+        """
+        requested = list(dict.fromkeys(facets))
+        unknown = [facet for facet in requested if facet not in ENRICHMENT_FACETS]
+        if unknown:
+            raise ValueError(f"Unknown enrichment facets: {', '.join(unknown)}")
+
+        if not content or not content.strip():
+            logger.warning("Empty content provided for enrichment")
+            return {facet: failed_facet(facet, "Empty content provided") for facet in requested}
+
+        content_key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        results: Dict[str, Any] = {}
+        with self._enrichment_lock:
+            for facet in requested:
+                cached = self._enrichment_cache.get((content_key, facet))
+                if cached is not None:
+                    results[facet] = copy.deepcopy(cached)
+
+        missing = [facet for facet in requested if facet not in results]
+        if not missing:
+            logger.info(f"Enrichment served from cache: {', '.join(requested)}")
+            return results
+
+        logger.info(f"Enriching content with Claude (facets: {', '.join(missing)}, length: {len(content)} chars)")
+
+        prompt = f"Facets: {', '.join(missing)}\n\nCustomer message:\n{content}"
+        max_tokens = 50 + sum(_FACET_OUTPUT_TOKENS[facet] for facet in missing)
+
+        try:
+            response = self._call_api(prompt, max_tokens=max_tokens, system=ENRICHMENT_SYSTEM_PROMPT, operation="enrich")
+            result_json = self._process_response(response)
+        except AIServiceError:
+            # Re-raise specific AI service errors
+            raise
+        except Exception as e:
+            # Log unexpected errors and return default facets
+            logger.exception(f"Unexpected error enriching content: {str(e)}")
+            for facet in missing:
+                results[facet] = failed_facet(facet, str(e), type(e).__name__)
+            return results
+
+        with self._enrichment_lock:
+            for facet in missing:
+                value = result_json.get(facet)
+                if facet == "response_suggestion":
+                    valid = isinstance(value, str) and bool(value.strip())
+                else:
+                    valid = isinstance(value, dict)
+                if not valid:
+                    logger.warning(f"Facet {facet} missing from enrichment response")
+                    results[facet] = failed_facet(facet, f"Facet {facet} missing from response", "AIServiceError")
+                    continue
+
+                if isinstance(value, dict):
+                    value["confidence"] = 0.95
+                self._enrichment_cache[(content_key, facet)] = value
+                results[facet] = copy.deepcopy(value)
+
+        logger.info(f"Enrichment complete: {', '.join(requested)}")
+        return results
+
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """
+        Get the token usage recorded since the service was created.
+
+        Returns:
+            Dictionary with the number of calls, the token totals per usage
+            field and the share of input tokens read from the cache
+        """
+        with self._usage_lock:
+            stats: Dict[str, Any] = dict(self._usage_totals)
+            stats["calls"] = self._usage_calls
+
+        cached = stats["cache_read_input_tokens"]
+        prompt_tokens = stats["input_tokens"] + cached + stats["cache_creation_input_tokens"]
+        stats["cache_hit_ratio"] = cached / prompt_tokens if prompt_tokens else 0.0
+        return stats
+
+    def _system_blocks(self, system: str) -> List[Dict[str, Any]]:
+        """
+        Build the system parameter for a static system prompt.
+
+        Args:
+            system: System prompt text
+
+        Returns:
+            System content blocks, marked cacheable when prompt caching is enabled
+        """
+        block: Dict[str, Any] = {"type": "text", "text": system}
+        if self.prompt_caching:
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+
+    def _record_usage(self, usage: Any) -> Dict[str, int]:
+        """
+        Record the token usage reported for a call.
+
+        Args:
+            usage: Usage object of an API response
+
+        Returns:
+            Token counts per usage field
+        """
+        counts = {field: getattr(usage, field, None) or 0 for field in USAGE_FIELDS}
+
+        with self._usage_lock:
+            self.last_usage = counts
+            self._usage_calls += 1
+            for field, count in counts.items():
+                self._usage_totals[field] += count
+
+        if self.metrics:
+            for field, count in counts.items():
+                self.metrics.increment("ai.tokens", count, {"provider": "anthropic", "model": self.model, "type": field})
+
+        logger.debug(
+            f"Claude usage: {counts['input_tokens']} input, {counts['output_tokens']} output, "
+            f"{counts['cache_read_input_tokens']} cache read, "
+            f"{counts['cache_creation_input_tokens']} cache write tokens"
+        )
+        return counts
+
+    @traced("anthropic.messages.create", provider="anthropic")
+    def _call_api(
+        self,
+        prompt: str,
+        temperature: float = 0.0,
+        max_tokens: int = 4000,
+        system: Optional[str] = None,
+        json_output: bool = True,
+        operation: Optional[str] = None
+    ) -> str:
         """
         Call the Claude API with retry and error handling logic.
 
@@ -583,6 +1116,10 @@ class ClaudeService(EnhancedAIService):
             prompt: The text prompt to send to the API
             temperature: Temperature setting (default: 0.0)
             max_tokens: Maximum tokens in the response (default: 4000)
+            system: Optional static system prompt, sent as a cacheable prefix
+            json_output: Whether the response is a JSON value; with streaming
+                enabled, generation then stops as soon as the value is complete
+            operation: Service operation making the call, recorded in the usage ledger
 
         Returns:
             Response text from the API
@@ -591,6 +1128,7 @@ class ClaudeService(EnhancedAIService):
             RateLimitError: If rate limits are exceeded
             TokenLimitError: If token limits are exceeded
             ContentFilterError: If content violates usage policies
+            InvalidRequestError: If the request is rejected and cannot succeed
             AIServiceError: For other API errors
         """
         try:
@@ -598,28 +1136,65 @@ class ClaudeService(EnhancedAIService):
             from anthropic import (
                 APIConnectionError,
                 APIError,
+                APIStatusError,
                 APITimeoutError,
                 BadRequestError,
             )
             from anthropic import RateLimitError as AnthropicRateLimitError
-
+        except ImportError:
+            logger.error("Anthropic package is not installed. Install it with: pip install anthropic>=0.7.0")
+            raise InvalidRequestError("Anthropic package is not installed")
+
+        # Reserve the input estimate plus the full response allowance, then
+        # settle with the reported usage once the call has finished
+        estimated_tokens = estimate_tokens(prompt) + max_tokens
+        if system:
+            estimated_tokens += estimate_tokens(system)
+        actual_tokens = 0
+        counts: Dict[str, int] = {}
+        if self.quota_manager:
+            self.quota_manager.acquire("anthropic", self.model, estimated_tokens)
+
+        start = time.perf_counter()
+        outcome = "error"
+        try:
             # Call the API
             logger.debug(f"Calling Claude API with model {self.model}")
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            request: Dict[str, Any] = {
+                "model": self.model,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}]
+            }
+            if system:
+                request["system"] = self._system_blocks(system)
 
-            # Extract the content from the message
-            content = message.content[0].text
+            stream = self.streaming and json_output
+            if accepts_keyword(self.client.messages.stream if stream else self.client.messages.create, "temperature"):
+                request["temperature"] = temperature
+
+            if stream:
+                content, usage = self._stream_json(request)
+            else:
+                message = self.client.messages.create(**request)
+                usage = getattr(message, "usage", None)
 
+                # Extract the content from the message
+                content = message.content[0].text
+
+            if usage is not None:
+                counts = self._record_usage(usage)
+                actual_tokens = sum(counts.values())
+
+            outcome = "ok"
             return content
         except AnthropicRateLimitError as e:
+            outcome = "rate_limited"
             error_msg = f"Claude rate limit exceeded: {str(e)}"
             logger.error(error_msg)
-            raise RateLimitError(error_msg)
+            retry_after = retry_after_seconds(e)
+            if self.quota_manager:
+                self.quota_manager.throttle("anthropic", self.model, retry_after)
+            raise RateLimitError(error_msg, retry_after=retry_after)
         except BadRequestError as e:
             error_str = str(e).lower()
             # Check if it's a token limit issue
@@ -636,25 +1211,116 @@ class ClaudeService(EnhancedAIService):
             else:
                 error_msg = f"Claude bad request error: {str(e)}"
                 logger.error(error_msg)
-                raise AIServiceError(error_msg)
+                raise InvalidRequestError(error_msg)
         except APITimeoutError as e:
             error_msg = f"Claude API timeout: {str(e)}"
             logger.error(error_msg)
             raise AIServiceError(error_msg)
+        except APIStatusError as e:
+            # Authentication, permission and unknown-model errors fail the same way again
+            if not is_retryable_status(e.status_code):
+                error_msg = f"Claude request rejected ({e.status_code}): {str(e)}"
+                logger.error(error_msg)
+                raise InvalidRequestError(error_msg)
+            error_msg = f"Claude API error: {str(e)}"
+            logger.error(error_msg)
+            raise AIServiceError(error_msg)
         except (APIError, APIConnectionError) as e:
             error_msg = f"Claude API error: {str(e)}"
             logger.error(error_msg)
             raise AIServiceError(error_msg)
+        except AIServiceError:
+            raise
         except Exception as e:
-            # Unexpected error
+            # Unexpected error, a bug rather than a provider failure
             error_msg = f"Unexpected error calling Claude: {str(e)}"
             logger.exception(error_msg)
-            raise AIServiceError(error_msg)
+            raise InvalidRequestError(error_msg)
+        finally:
+            if self.quota_manager:
+                self.quota_manager.reconcile("anthropic", self.model, estimated_tokens, actual_tokens)
+            latency_ms = (time.perf_counter() - start) * 1000
+            set_span_attributes(model=self.model, outcome=outcome, tokens=actual_tokens)
+            if self.metrics:
+                self.metrics.timing(
+                    "ai.request.latency", latency_ms,
+                    {"provider": "anthropic", "model": self.model, "outcome": outcome}
+                )
+            if self.usage_repository:
+                self._record_ledger_entry(operation, counts, latency_ms, outcome)
+
+    def _record_ledger_entry(self, operation: Optional[str], counts: Dict[str, int], latency_ms: float, outcome: str) -> None:
+        """
+        Write a call to the usage ledger; a failing ledger never fails the call.
+
+        Args:
+            operation: Service operation that made the call
+            counts: Token counts per usage field
+            latency_ms: Call latency in milliseconds
+            outcome: 'ok', 'rate_limited' or 'error'
+        """
+        try:
+            self.usage_repository.record(usage_entry(
+                "anthropic", self.model, operation,
+                input_tokens=counts.get("input_tokens", 0),
+                output_tokens=counts.get("output_tokens", 0),
+                cache_read_tokens=counts.get("cache_read_input_tokens", 0),
+                cache_write_tokens=counts.get("cache_creation_input_tokens", 0),
+                latency_ms=latency_ms,
+                outcome=outcome
+            ))
+        except Exception as e:
+            logger.warning(f"Could not record AI usage: {e}")
+
+    def _stream_json(self, request: Dict[str, Any]) -> Tuple[str, Any]:
+        """
+        Stream a response and stop reading once its JSON value is complete.
+
+        Leaving the stream early closes the connection, which ends generation
+        on the server, so trailing prose isn't generated or paid for.
+
+        Args:
+            request: Keyword arguments of the messages request
+
+        Returns:
+            Tuple of the JSON text and the token usage of the call
+        """
+        parser = IncrementalJSONParser()
+        input_usage = None
+        output_tokens = None
+        stopped_early = False
+
+        with self.client.messages.stream(**request) as stream:
+            for event in stream:
+                if event.type == "message_start":
+                    input_usage = getattr(event.message, "usage", None)
+                elif event.type == "message_delta":
+                    output_tokens = getattr(event.usage, "output_tokens", output_tokens)
+                elif event.type == "content_block_delta" and getattr(event.delta, "type", "") == "text_delta":
+                    if parser.feed(event.delta.text):
+                        stopped_early = True
+                        break
+
+        text = parser.text
+        if stopped_early:
+            logger.debug(f"Stopped Claude stream after complete JSON value ({len(text)} chars)")
+
+        usage = None
+        if input_usage is not None:
+            counts = {field: getattr(input_usage, field, None) or 0 for field in USAGE_FIELDS}
+            # The final output count is only reported when the stream runs to its end
+            counts["output_tokens"] = output_tokens if output_tokens is not None else estimate_tokens(text)
+            usage = SimpleNamespace(**counts)
+        return text, usage
 
     def _process_response(self, response_text: str) -> Dict[str, Any]:
         """
         Process the response from the Claude API.
 
+        Prose or markdown fences around the JSON value are skipped, and a value
+        cut off by the token limit is closed at its last complete member
+        instead of failing the call.
+
         Args:
             response_text: Text response from the API
 
@@ -662,33 +1328,11 @@ class ClaudeService(EnhancedAIService):
             Parsed JSON response as a dictionary
 
         Raises:
-            AIServiceError: If the response cannot be parsed as JSON
+            AIServiceError: If the response contains no usable JSON
         """
         try:
-            # First try direct JSON parsing
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            # Check if JSON is wrapped in a code block
-            if '```json' in response_text and '```' in response_text.split('```json', 1)[1]:
-                # Extract content between ```json and the next ```
-                json_content = response_text.split('```json', 1)[1].split('```', 1)[0].strip()
-                try:
-                    return json.loads(json_content)
-                except json.JSONDecodeError as e:
-                    error_msg = f"Error parsing JSON in code block: {str(e)}"
-                    logger.error(error_msg)
-                    raise AIServiceError(error_msg)
-            elif '```' in response_text and '```' in response_text.split('```', 1)[1]:
-                # Try extracting content from a generic code block
-                json_content = response_text.split('```', 1)[1].split('```', 1)[0].strip()
-                try:
-                    return json.loads(json_content)
-                except json.JSONDecodeError as e:
-                    error_msg = f"Error parsing JSON in generic code block: {str(e)}"
-                    logger.error(error_msg)
-                    raise AIServiceError(error_msg)
-            else:
-                # If not valid JSON and not in code block, raise an error
-                error_msg = "Response is not valid JSON"
-                logger.error(f"{error_msg}: {response_text}")
-                raise AIServiceError(error_msg)
+            return parse_json_response(response_text)
+        except ValueError as e:
+            error_msg = f"Response is not valid JSON: {str(e)}"
+            logger.error(f"{error_msg}: {response_text}")
+            raise ResponseFormatError(error_msg)
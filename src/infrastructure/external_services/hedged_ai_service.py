@@ -0,0 +1,276 @@
+"""
+Hedged AI Service
+
+This module provides an AIService that cuts tail latency with hedged
+requests. When a call has not returned within the recent p95 latency, a second
+request is sent to the same or an alternate provider and the first valid
+response wins. A hedge budget caps the share of calls that are duplicated.
+"""
+
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Optional
+
+from src.domain.interfaces.ai_service_interfaces import AIService
+from src.domain.interfaces.utility_interfaces import MetricsCollector
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class HedgedAIService(AIService):
+    """
+    AIService that hedges slow calls with a second request.
+
+    The hedge delay is the configured percentile of the latencies of recent
+    primary calls, and ``initial_delay`` until ``min_samples`` calls have
+    completed. Each primary call runs on a thread of its own, started at
+    once, so the number of concurrent calls is not capped and the latencies
+    don't include queueing; only hedges share the worker pool. Python threads
+    can't be interrupted, so the losing request is cancelled only if it has
+    not started yet; otherwise its result is discarded when it completes.
+    """
+
+    def __init__(
+        self,
+        primary: AIService,
+        hedge: Optional[AIService] = None,
+        budget: float = 0.05,
+        percentile: float = 0.95,
+        initial_delay: float = 10.0,
+        min_delay: float = 1.0,
+        min_samples: int = 20,
+        window_size: int = 200,
+        max_workers: int = 8,
+        metrics: Optional[MetricsCollector] = None
+    ):
+        """
+        Initialize the hedged service.
+
+        Args:
+            primary: Service receiving every call
+            hedge: Service receiving hedged calls (defaults to the primary)
+            budget: Maximum share of calls that may be hedged (0-1)
+            percentile: Latency percentile after which a call is hedged
+            initial_delay: Hedge delay in seconds until enough latencies are known
+            min_delay: Lower bound of the hedge delay in seconds
+            min_samples: Primary latencies needed before the percentile is used
+            window_size: Number of recent primary latencies kept
+            max_workers: Threads available to hedged calls
+            metrics: Optional collector receiving hedge counters
+        """
+        self.primary = primary
+        self.hedge = hedge or primary
+        self.budget = budget
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.metrics = metrics
+
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+        self._calls = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-hedge")
+
+    @classmethod
+    def from_env(
+        cls,
+        primary: AIService,
+        hedge: Optional[AIService] = None,
+        metrics: Optional[MetricsCollector] = None
+    ) -> 'HedgedAIService':
+        """
+        Create a hedged service configured by AI_HEDGE_BUDGET and AI_HEDGE_PERCENTILE.
+
+        Args:
+            primary: Service receiving every call
+            hedge: Service receiving hedged calls (defaults to the primary)
+            metrics: Optional metrics collector
+
+        Returns:
+            Configured hedged service
+        """
+        return cls(
+            primary,
+            hedge=hedge,
+            budget=float(os.getenv("AI_HEDGE_BUDGET", "0.05")),
+            percentile=float(os.getenv("AI_HEDGE_PERCENTILE", "0.95")),
+            metrics=metrics
+        )
+
+    def analyze_content(self, content: str) -> Dict[str, Any]:
+        """
+        Analyze content, hedging the call if it is slow.
+
+        Args:
+            content: The content to analyze
+
+        Returns:
+            First valid analysis result
+        """
+        return self._call("analyze_content", content)
+
+    def analyze_sentiment(self, content: str) -> Dict[str, Any]:
+        """
+        Analyze sentiment, hedging the call if it is slow.
+
+        Args:
+            content: The content to analyze
+
+        Returns:
+            First valid sentiment result
+        """
+        return self._call("analyze_sentiment", content)
+
+    def categorize_ticket(self, content: str) -> Dict[str, Any]:
+        """
+        Categorize a ticket, hedging the call if it is slow.
+
+        Args:
+            content: The ticket content to categorize
+
+        Returns:
+            First valid categorization result
+        """
+        return self._call("categorize_ticket", content)
+
+    def hedge_delay(self) -> float:
+        """
+        Get the current hedge delay.
+
+        Returns:
+            Seconds a call may run before it is hedged
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+            index = max(0, math.ceil(self.percentile * len(ordered)) - 1)
+            return max(self.min_delay, ordered[index])
+
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """
+        Get hedging statistics.
+
+        Returns:
+            Dictionary with calls, hedged calls, hedge rate, hedge wins and the current delay
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "hedged": self._hedged,
+                "hedge_rate": self._hedged / self._calls if self._calls else 0.0,
+                "hedge_wins": self._hedge_wins,
+                "hedge_delay": delay
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once running calls finished."""
+        self._executor.shutdown(wait=False)
+
+    def _call(self, method: str, content: str) -> Dict[str, Any]:
+        """
+        Call a method on the primary and hedge it if it is slower than the delay.
+
+        Args:
+            method: Name of the AIService method to call
+            content: The content to process
+
+        Returns:
+            First valid result; if neither request produced one, the primary's
+            result or exception
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            self._calls += 1
+        self._increment("ai_hedge.calls")
+
+        primary = self._start_primary(method, content)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_budget():
+            return primary.result()
+
+        logger.info(f"Hedging {method} after {delay:.1f}s")
+        self._increment("ai_hedge.hedged")
+        hedge = self._submit(self.hedge, method, content)
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if self._is_valid(future):
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        with self._lock:
+                            self._hedge_wins += 1
+                        self._increment("ai_hedge.wins")
+                    return future.result()
+
+        # Neither request produced a valid result
+        return primary.result()
+
+    def _start_primary(self, method: str, content: str) -> Future:
+        """Run a primary service method on a new thread, so it never waits for a pool worker."""
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        # Run in a copy of the caller's context so its retry deadline applies
+        context = contextvars.copy_context()
+        call = getattr(self.primary, method)
+
+        def run() -> None:
+            started = time.monotonic()
+            try:
+                result = context.run(call, content)
+            except BaseException as e:
+                self._record_latency(time.monotonic() - started)
+                future.set_exception(e)
+            else:
+                # Record slow calls even when the hedge wins, so the percentile stays honest
+                self._record_latency(time.monotonic() - started)
+                future.set_result(result)
+
+        threading.Thread(target=run, name=f"ai-primary-{method}", daemon=True).start()
+        return future
+
+    def _submit(self, service: AIService, method: str, content: str) -> Future:
+        """Run a hedged service method on the worker pool."""
+        # Run in a copy of the caller's context so its retry deadline applies
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, getattr(service, method), content)
+
+    def _record_latency(self, duration: float) -> None:
+        """Add a primary call duration to the latency window."""
+        with self._lock:
+            self._latencies.append(duration)
+
+    def _take_budget(self) -> bool:
+        """Check the hedge budget and count a hedge if it allows one."""
+        with self._lock:
+            if self._hedged + 1 > self.budget * self._calls:
+                return False
+            self._hedged += 1
+            return True
+
+    @staticmethod
+    def _is_valid(future: Future) -> bool:
+        """Check whether a completed request produced a usable result."""
+        if future.cancelled() or future.exception() is not None:
+            return False
+        result = future.result()
+        return not (isinstance(result, dict) and result.get("error_type"))
+
+    def _increment(self, metric_name: str) -> None:
+        """Increment a hedge counter."""
+        if self.metrics:
+            self.metrics.increment(metric_name)
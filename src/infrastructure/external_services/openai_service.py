@@ -4,7 +4,6 @@ OpenAI Service Adapter
 This module provides an implementation of the AIService interface using the OpenAI API.
 """
 
-import json
 import logging
 import os
 import random
@@ -15,14 +14,26 @@ from src.domain.interfaces.ai_service_interfaces import (
     AIService,
     AIServiceError,
     ContentFilterError,
+    InvalidRequestError,
     RateLimitError,
+    ResponseFormatError,
     TokenLimitError,
 )
-from src.infrastructure.utils.retry import with_retry
+from src.domain.interfaces.repository_interfaces import UsageRepository
+from src.domain.interfaces.utility_interfaces import MetricsCollector, QuotaManager
+from src.domain.value_objects.content_window import estimate_tokens
+from src.infrastructure.utils.json_stream import parse_json_response
+from src.infrastructure.utils.quota_manager import retry_after_seconds
+from src.infrastructure.utils.retry_policy import AI_RETRY_POLICY, is_retryable_status
+from src.infrastructure.utils.tracing import set_span_attributes, traced
+from src.infrastructure.utils.usage import usage_entry
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Response tokens reserved per call against the tokens-per-minute quota
+_ESTIMATED_RESPONSE_TOKENS = 1000
+
 
 class OpenAIService(AIService):
     """
@@ -31,16 +42,29 @@ class OpenAIService(AIService):
     This service uses the OpenAI API to analyze ticket content and sentiment.
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        quota_manager: Optional[QuotaManager] = None,
+        metrics: Optional[MetricsCollector] = None,
+        usage_repository: Optional[UsageRepository] = None
+    ):
         """
         Initialize the OpenAI service.
 
         Args:
             api_key: OpenAI API key (optional, defaults to environment variable)
             model: OpenAI model to use (default: gpt-4o-mini)
+            quota_manager: Optional shared client-side quota manager
+            metrics: Optional collector receiving call latency and token counts
+            usage_repository: Optional ledger receiving the usage and cost of every call
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model
+        self.quota_manager = quota_manager
+        self.metrics = metrics
+        self.usage_repository = usage_repository
 
         if not self.api_key:
             logger.warning("OpenAI API key not provided - API calls will fail")
@@ -57,14 +81,14 @@ class OpenAIService(AIService):
                 self._client = OpenAI(api_key=self.api_key)
             except ImportError:
                 logger.error("OpenAI package is not installed. Install it with: pip install openai>=1.0.0")
-                raise AIServiceError("OpenAI package is not installed")
+                raise InvalidRequestError("OpenAI package is not installed")
             except Exception as e:
                 logger.error(f"Error initializing OpenAI client: {str(e)}")
-                raise AIServiceError(f"Error initializing OpenAI client: {str(e)}")
+                raise InvalidRequestError(f"Error initializing OpenAI client: {str(e)}")
 
         return self._client
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def analyze_content(self, content: str) -> Dict[str, Any]:
         """
         Analyze content to determine sentiment, category, etc.
@@ -136,7 +160,7 @@ class OpenAIService(AIService):
 
         try:
             # Call the OpenAI API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, operation="analyze_content")
 
             # Process the response
             result = self._process_response(response)
@@ -168,7 +192,7 @@ class OpenAIService(AIService):
                 "error_type": type(e).__name__
             }
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def analyze_sentiment(self, content: str) -> Dict[str, Any]:
         """
         Analyze sentiment of content.
@@ -218,7 +242,7 @@ class OpenAIService(AIService):
 
         try:
             # Call the OpenAI API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, operation="analyze_sentiment")
 
             # Process the response
             result_json = self._process_response(response)
@@ -253,7 +277,7 @@ class OpenAIService(AIService):
                 "error_type": type(e).__name__
             }
 
-    @with_retry(max_retries=3, retry_on=[Exception])
+    @AI_RETRY_POLICY
     def categorize_ticket(self, content: str) -> Dict[str, Any]:
         """
         Categorize a ticket based on its content.
@@ -309,7 +333,7 @@ class OpenAIService(AIService):
 
         try:
             # Call the OpenAI API
-            response = self._call_api(prompt)
+            response = self._call_api(prompt, operation="categorize_ticket")
 
             # Process the response
             result = self._process_response(response)
@@ -335,7 +359,14 @@ class OpenAIService(AIService):
                 "error_type": type(e).__name__
             }
 
-    def _call_api(self, prompt: str, temperature: float = 0.0, timeout: float = 30.0) -> str:
+    @traced("openai.chat.completions.create", provider="openai")
+    def _call_api(
+        self,
+        prompt: str,
+        temperature: float = 0.0,
+        timeout: float = 30.0,
+        operation: Optional[str] = None
+    ) -> str:
         """
         Call the OpenAI API with retry and error handling logic.
 
@@ -343,6 +374,7 @@ class OpenAIService(AIService):
             prompt: The text prompt to send to the API
             temperature: Temperature setting (default: 0.0)
             timeout: Request timeout in seconds (default: 30)
+            operation: Service operation making the call, recorded in the usage ledger
 
         Returns:
             Response text from the API
@@ -351,6 +383,7 @@ class OpenAIService(AIService):
             RateLimitError: If rate limits are exceeded
             TokenLimitError: If token limits are exceeded
             ContentFilterError: If content violates usage policies
+            InvalidRequestError: If the request is rejected and cannot succeed
             AIServiceError: For other API errors
         """
         try:
@@ -358,11 +391,26 @@ class OpenAIService(AIService):
             from openai import (
                 APIConnectionError,
                 APIError,
+                APIStatusError,
                 APITimeoutError,
                 BadRequestError,
             )
             from openai import RateLimitError as OpenAIRateLimitError
-
+        except ImportError:
+            logger.error("OpenAI package is not installed. Install it with: pip install openai>=1.0.0")
+            raise InvalidRequestError("OpenAI package is not installed")
+
+        # Without max_tokens the response size is unknown; reserve a typical
+        # analysis response and settle with the reported usage afterwards
+        estimated_tokens = estimate_tokens(prompt) + _ESTIMATED_RESPONSE_TOKENS
+        actual_tokens = 0
+        usage = None
+        if self.quota_manager:
+            self.quota_manager.acquire("openai", self.model, estimated_tokens)
+
+        start = time.perf_counter()
+        outcome = "error"
+        try:
             # Call the API
             logger.debug(f"Calling OpenAI API with model {self.model}")
             response = self.client.chat.completions.create(
@@ -372,14 +420,24 @@ class OpenAIService(AIService):
                 timeout=timeout
             )
 
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                actual_tokens = getattr(usage, "total_tokens", None) or 0
+                self._record_token_metrics(usage)
+
             # Extract the content from the first choice
             content = response.choices[0].message.content
 
+            outcome = "ok"
             return content
         except OpenAIRateLimitError as e:
+            outcome = "rate_limited"
             error_msg = f"OpenAI rate limit exceeded: {str(e)}"
             logger.error(error_msg)
-            raise RateLimitError(error_msg)
+            retry_after = retry_after_seconds(e)
+            if self.quota_manager:
+                self.quota_manager.throttle("openai", self.model, retry_after)
+            raise RateLimitError(error_msg, retry_after=retry_after)
         except BadRequestError as e:
             error_str = str(e).lower()
             # Check if it's a token limit issue
@@ -396,25 +454,92 @@ class OpenAIService(AIService):
             else:
                 error_msg = f"OpenAI bad request error: {str(e)}"
                 logger.error(error_msg)
-                raise AIServiceError(error_msg)
+                raise InvalidRequestError(error_msg)
         except APITimeoutError as e:
             error_msg = f"OpenAI API timeout: {str(e)}"
             logger.error(error_msg)
             raise AIServiceError(error_msg)
+        except APIStatusError as e:
+            # Authentication, permission and unknown-model errors fail the same way again
+            if not is_retryable_status(e.status_code):
+                error_msg = f"OpenAI request rejected ({e.status_code}): {str(e)}"
+                logger.error(error_msg)
+                raise InvalidRequestError(error_msg)
+            error_msg = f"OpenAI API error: {str(e)}"
+            logger.error(error_msg)
+            raise AIServiceError(error_msg)
         except (APIError, APIConnectionError) as e:
             error_msg = f"OpenAI API error: {str(e)}"
             logger.error(error_msg)
             raise AIServiceError(error_msg)
+        except AIServiceError:
+            raise
         except Exception as e:
-            # Unexpected error
+            # Unexpected error, a bug rather than a provider failure
             error_msg = f"Unexpected error calling OpenAI: {str(e)}"
             logger.exception(error_msg)
-            raise AIServiceError(error_msg)
+            raise InvalidRequestError(error_msg)
+        finally:
+            if self.quota_manager:
+                self.quota_manager.reconcile("openai", self.model, estimated_tokens, actual_tokens)
+            latency_ms = (time.perf_counter() - start) * 1000
+            set_span_attributes(model=self.model, outcome=outcome, tokens=actual_tokens)
+            if self.metrics:
+                self.metrics.timing(
+                    "ai.request.latency", latency_ms,
+                    {"provider": "openai", "model": self.model, "outcome": outcome}
+                )
+            if self.usage_repository:
+                self._record_ledger_entry(operation, usage, latency_ms, outcome)
+
+    def _record_token_metrics(self, usage: Any) -> None:
+        """
+        Count the tokens reported for a call.
+
+        Args:
+            usage: Usage object of an API response
+        """
+        if not self.metrics:
+            return
+        for field, token_type in (("prompt_tokens", "input_tokens"), ("completion_tokens", "output_tokens")):
+            count = getattr(usage, field, None) or 0
+            self.metrics.increment("ai.tokens", count, {"provider": "openai", "model": self.model, "type": token_type})
+
+    def _record_ledger_entry(self, operation: Optional[str], usage: Any, latency_ms: float, outcome: str) -> None:
+        """
+        Write a call to the usage ledger; a failing ledger never fails the call.
+
+        Prompt tokens served from OpenAI's prompt cache are recorded as cache
+        reads, the remaining prompt tokens as input tokens.
+
+        Args:
+            operation: Service operation that made the call
+            usage: Usage object of the API response, or None if the call failed
+            latency_ms: Call latency in milliseconds
+            outcome: 'ok', 'rate_limited' or 'error'
+        """
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+        try:
+            self.usage_repository.record(usage_entry(
+                "openai", self.model, operation,
+                input_tokens=prompt_tokens - cached_tokens,
+                output_tokens=getattr(usage, "completion_tokens", None) or 0,
+                cache_read_tokens=cached_tokens,
+                cache_write_tokens=0,
+                latency_ms=latency_ms,
+                outcome=outcome
+            ))
+        except Exception as e:
+            logger.warning(f"Could not record AI usage: {e}")
 
     def _process_response(self, response_text: str) -> Dict[str, Any]:
         """
         Process the response from the OpenAI API.
 
+        Prose or markdown fences around the JSON value are skipped, and a value
+        cut off by the token limit is closed at its last complete member.
+
         Args:
             response_text: Text response from the API
 
@@ -422,33 +547,11 @@ class OpenAIService(AIService):
             Parsed JSON response as a dictionary
 
         Raises:
-            AIServiceError: If the response cannot be parsed as JSON
+            AIServiceError: If the response contains no usable JSON
         """
         try:
-            # First try direct JSON parsing
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            # Check if JSON is wrapped in a code block
-            if '```json' in response_text and '```' in response_text.split('```json', 1)[1]:
-                # Extract content between ```json and the next ```
-                json_content = response_text.split('```json', 1)[1].split('```', 1)[0].strip()
-                try:
-                    return json.loads(json_content)
-                except json.JSONDecodeError as e:
-                    error_msg = f"Error parsing JSON in code block: {str(e)}"
-                    logger.error(error_msg)
-                    raise AIServiceError(error_msg)
-            elif '```' in response_text and '```' in response_text.split('```', 1)[1]:
-                # Try extracting content from a generic code block
-                json_content = response_text.split('```', 1)[1].split('```', 1)[0].strip()
-                try:
-                    return json.loads(json_content)
-                except json.JSONDecodeError as e:
-                    error_msg = f"Error parsing JSON in generic code block: {str(e)}"
-                    logger.error(error_msg)
-                    raise AIServiceError(error_msg)
-            else:
-                # If not valid JSON and not in code block, raise an error
-                error_msg = "Response is not valid JSON"
-                logger.error(f"{error_msg}: {response_text}")
-                raise AIServiceError(error_msg)
+            return parse_json_response(response_text)
+        except ValueError as e:
+            error_msg = f"Response is not valid JSON: {str(e)}"
+            logger.error(f"{error_msg}: {response_text}")
+            raise ResponseFormatError(error_msg)
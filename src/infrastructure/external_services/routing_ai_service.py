@@ -0,0 +1,329 @@
+"""
+Routing AI Service
+
+This module provides an AIService that routes calls across several AI
+providers in priority order. Every provider sits behind its own circuit
+breaker: while a provider's breaker is open its calls go straight to the next
+provider, and results from every provider are normalized to one schema.
+Providers are called without their own retries, so a failing provider fails
+over at once instead of backing off first.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.domain.interfaces.ai_service_interfaces import (
+    AIService,
+    AIServiceError,
+    ContentFilterError,
+    PackedAIService,
+    ProviderUnavailableError,
+    TokenLimitError,
+)
+from src.infrastructure.external_services.claude_service import failed_result
+from src.infrastructure.utils.circuit_breaker import CircuitBreaker
+from src.infrastructure.utils.retry_policy import single_attempt
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Errors caused by the content rather than the provider; they are raised
+# without failing over and don't count against the provider's health
+CONTENT_ERRORS = (TokenLimitError, ContentFilterError)
+
+POLARITIES = ("positive", "negative", "neutral", "unknown")
+PRIORITIES = ("high", "medium", "low")
+
+
+def _choice(value: Any, allowed: Optional[Tuple[str, ...]], default: str) -> str:
+    """Normalize a label to lower case, falling back to a default."""
+    if not isinstance(value, str) or not value.strip():
+        return default
+    value = value.strip().lower()
+    if allowed is not None and value not in allowed:
+        return default
+    return value
+
+
+def _scale(value: Any, low: int, high: int) -> int:
+    """Coerce a value to an integer within a scale."""
+    try:
+        return min(high, max(low, int(round(float(value)))))
+    except (TypeError, ValueError):
+        return low
+
+
+def normalize_sentiment(sentiment: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a sentiment result to the shared schema.
+
+    Args:
+        sentiment: Sentiment result of any provider
+
+    Returns:
+        Sentiment with every schema key present and in range
+    """
+    impact = sentiment.get("business_impact")
+    if not isinstance(impact, dict):
+        impact = {}
+    emotions = sentiment.get("emotions")
+    impact_areas = impact.get("impact_areas")
+
+    normalized = dict(sentiment)
+    normalized.update({
+        "polarity": _choice(sentiment.get("polarity"), POLARITIES, "unknown"),
+        "urgency_level": _scale(sentiment.get("urgency_level", 1), 1, 5),
+        "frustration_level": _scale(sentiment.get("frustration_level", 1), 1, 5),
+        "emotions": list(emotions) if isinstance(emotions, list) else [],
+        "business_impact": {
+            "detected": bool(impact.get("detected", False)),
+            "impact_areas": list(impact_areas) if isinstance(impact_areas, list) else [],
+            "severity": _scale(impact.get("severity", 0), 0, 5)
+        }
+    })
+    return normalized
+
+
+def normalize_categorization(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a categorization result to the shared schema.
+
+    Args:
+        result: Categorization result of any provider
+
+    Returns:
+        Result with category, component, priority and confidence normalized
+    """
+    normalized = dict(result)
+    normalized.update({
+        "category": _choice(result.get("category"), None, "uncategorized"),
+        "component": _choice(result.get("component"), None, "none"),
+        "priority": _choice(result.get("priority"), PRIORITIES, "low"),
+        "confidence": float(result.get("confidence") or 0.0)
+    })
+    return normalized
+
+
+def normalize_analysis(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a full analysis result to the shared schema.
+
+    Args:
+        result: Analysis result of any provider
+
+    Returns:
+        Result with categorization and sentiment normalized
+    """
+    normalized = normalize_categorization(result)
+    sentiment = result.get("sentiment")
+    normalized["sentiment"] = normalize_sentiment(sentiment if isinstance(sentiment, dict) else {})
+    return normalized
+
+
+class RoutingAIService(AIService, PackedAIService):
+    """
+    AIService that fails over between providers behind circuit breakers.
+
+    Providers are tried in the given order. A provider is skipped while its
+    breaker is open; a call that raises an AIServiceError, or returns a result
+    marked with an 'error_type', is recorded as a failure and retried on the
+    next provider; the providers' own retry policies are turned off for the
+    call. Token-limit and content-filter errors are raised as-is.
+    """
+
+    def __init__(
+        self,
+        providers: List[Tuple[str, AIService]],
+        breaker_factory: Optional[Callable[[str], CircuitBreaker]] = None
+    ):
+        """
+        Initialize the routing service.
+
+        Args:
+            providers: (name, service) pairs in priority order
+            breaker_factory: Optional factory creating the breaker of a provider by name
+        """
+        if not providers:
+            raise ValueError("RoutingAIService needs at least one provider")
+
+        breaker_factory = breaker_factory or CircuitBreaker
+        self.providers = [(name, service, breaker_factory(name)) for name, service in providers]
+
+    def analyze_content(self, content: str) -> Dict[str, Any]:
+        """
+        Analyze content with the first healthy provider.
+
+        Args:
+            content: The content to analyze
+
+        Returns:
+            Normalized analysis result with a 'provider' key
+
+        Raises:
+            ProviderUnavailableError: If every provider's breaker is open
+            AIServiceError: If every available provider failed
+        """
+        return self._route("analyze_content", normalize_analysis, content)
+
+    def analyze_sentiment(self, content: str) -> Dict[str, Any]:
+        """
+        Analyze sentiment with the first healthy provider.
+
+        Args:
+            content: The content to analyze
+
+        Returns:
+            Normalized sentiment result with a 'provider' key
+
+        Raises:
+            ProviderUnavailableError: If every provider's breaker is open
+            AIServiceError: If every available provider failed
+        """
+        return self._route("analyze_sentiment", normalize_sentiment, content)
+
+    def categorize_ticket(self, content: str) -> Dict[str, Any]:
+        """
+        Categorize a ticket with the first healthy provider.
+
+        Args:
+            content: The ticket content to categorize
+
+        Returns:
+            Normalized categorization result with a 'provider' key
+
+        Raises:
+            ProviderUnavailableError: If every provider's breaker is open
+            AIServiceError: If every available provider failed
+        """
+        return self._route("categorize_ticket", normalize_categorization, content)
+
+    def analyze_contents(self, contents: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze several contents, packing them on the first healthy packing provider.
+
+        Contents the packing provider could not analyze, or all of them when no
+        packing provider is available, are routed one at a time.
+
+        Args:
+            contents: Mapping of content IDs to the content to analyze
+
+        Returns:
+            Mapping of content IDs to normalized analysis results; contents no
+            provider could analyze map to a result with 'error' and 'error_type'
+        """
+        items = {str(content_id): content for content_id, content in contents.items()}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for name, service, breaker in self.providers:
+            if not isinstance(service, PackedAIService) or not breaker.allow_request():
+                continue
+
+            started = time.monotonic()
+            try:
+                with single_attempt():
+                    packed = service.analyze_contents(items)
+            except AIServiceError as e:
+                breaker.record_failure(time.monotonic() - started)
+                logger.warning(f"Packed analysis on {name} failed: {str(e)}")
+                continue
+
+            # Judge latency per content so large packs don't count as slow calls
+            duration = (time.monotonic() - started) / max(1, len(items))
+            succeeded = {
+                content_id: result for content_id, result in packed.items()
+                if not result.get("error_type")
+            }
+            if packed and not succeeded:
+                breaker.record_failure(duration)
+            else:
+                breaker.record_success(duration)
+
+            for content_id, result in succeeded.items():
+                results[content_id] = self._tag(normalize_analysis(result), name)
+            break
+
+        for content_id, content in items.items():
+            if content_id in results:
+                continue
+            try:
+                results[content_id] = self.analyze_content(content)
+            except AIServiceError as e:
+                logger.error(f"Error analyzing content {content_id}: {str(e)}")
+                results[content_id] = failed_result(str(e), type(e).__name__)
+
+        return results
+
+    def get_provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the circuit breaker statistics of every provider.
+
+        Returns:
+            Mapping of provider names to breaker statistics
+        """
+        return {name: breaker.get_stats() for name, _, breaker in self.providers}
+
+    def _route(
+        self,
+        method: str,
+        normalize: Callable[[Dict[str, Any]], Dict[str, Any]],
+        *args: Any
+    ) -> Dict[str, Any]:
+        """
+        Call a method on the first provider that is available and succeeds.
+
+        Args:
+            method: Name of the AIService method to call
+            normalize: Function normalizing the provider's result
+            *args: Arguments of the method
+
+        Returns:
+            Normalized result tagged with the provider name
+
+        Raises:
+            ProviderUnavailableError: If every provider's breaker is open
+            AIServiceError: If every available provider failed
+        """
+        last_error: Optional[AIServiceError] = None
+        degraded: Optional[Tuple[str, Dict[str, Any]]] = None
+
+        for name, service, breaker in self.providers:
+            if not breaker.allow_request():
+                logger.debug(f"Skipping {name} for {method}: circuit {breaker.state}")
+                continue
+
+            started = time.monotonic()
+            try:
+                with single_attempt():
+                    result = getattr(service, method)(*args)
+            except CONTENT_ERRORS:
+                breaker.record_success(time.monotonic() - started)
+                raise
+            except AIServiceError as e:
+                breaker.record_failure(time.monotonic() - started)
+                logger.warning(f"{method} failed on {name}, failing over: {str(e)}")
+                last_error = e
+                continue
+
+            duration = time.monotonic() - started
+            if isinstance(result, dict) and result.get("error_type"):
+                # The provider swallowed an unexpected error into a default result
+                breaker.record_failure(duration)
+                logger.warning(f"{method} on {name} returned an error result, failing over: {result.get('error')}")
+                degraded = degraded or (name, result)
+                continue
+
+            breaker.record_success(duration)
+            return self._tag(normalize(result), name)
+
+        if degraded is not None:
+            return self._tag(normalize(degraded[1]), degraded[0])
+        if last_error is not None:
+            raise last_error
+        raise ProviderUnavailableError(f"No AI provider available for {method}: all circuits are open")
+
+    @staticmethod
+    def _tag(result: Dict[str, Any], provider: str) -> Dict[str, Any]:
+        """Record which provider produced a result."""
+        result["provider"] = provider
+        return result
@@ -4,7 +4,18 @@ Repositories Package
 This package contains repositories for data persistence in the Zendesk AI Integration application.
 """
 
+from src.infrastructure.repositories.analysis_rollup_repository import (
+    InMemoryAnalysisRollupRepository,
+    MongoDBAnalysisRollupRepository,
+)
+from src.infrastructure.repositories.batch_job_repository import SQLiteBatchJobRepository
 from src.infrastructure.repositories.mongodb_repository import MongoDBRepository
+from src.infrastructure.repositories.schedule_repository import SQLiteScheduleRepository
+from src.infrastructure.repositories.usage_repository import SQLiteUsageRepository
 from src.infrastructure.repositories.zendesk_repository import ZendeskRepository
 
-__all__ = ['ZendeskRepository', 'MongoDBRepository']
+__all__ = [
+    'ZendeskRepository', 'MongoDBRepository', 'SQLiteScheduleRepository',
+    'MongoDBAnalysisRollupRepository', 'InMemoryAnalysisRollupRepository',
+    'SQLiteBatchJobRepository', 'SQLiteUsageRepository'
+]
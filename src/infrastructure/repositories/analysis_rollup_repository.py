@@ -0,0 +1,302 @@
+"""
+Analysis Rollup Repository Implementations
+
+This module provides implementations of the AnalysisRollupRepository
+interface: a MongoDB collection of bucket counters maintained with ``$inc``
+upserts, and an equivalent in-memory store.
+"""
+
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.domain.entities.ticket_analysis import TicketAnalysis
+from src.domain.exceptions import PersistenceError, QueryError
+from src.domain.interfaces.repository_interfaces import AnalysisRollupRepository
+from src.domain.value_objects.sentiment_rollup import (
+    ROLLUP_DIMENSIONS,
+    ROLLUP_GRANULARITIES,
+    bucket_start,
+    rollup_dimensions,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# (granularity, bucket start, dimension values in ROLLUP_DIMENSIONS order)
+RollupKey = Tuple[str, datetime, Tuple[Any, ...]]
+
+
+def _rollup_keys(analysis: TicketAnalysis) -> List[RollupKey]:
+    """
+    Get the bucket keys an analysis is counted under.
+
+    Args:
+        analysis: Ticket analysis
+
+    Returns:
+        One key per rollup granularity
+    """
+    dimensions = rollup_dimensions(analysis)
+    values = tuple(dimensions[name] for name in ROLLUP_DIMENSIONS)
+    return [
+        (granularity, bucket_start(analysis.timestamp, granularity), values)
+        for granularity in ROLLUP_GRANULARITIES
+    ]
+
+
+def _key_to_row(key: RollupKey) -> Dict[str, Any]:
+    """Convert a bucket key into a row without a count."""
+    granularity, bucket, values = key
+    row = {"granularity": granularity, "bucket": bucket}
+    row.update(zip(ROLLUP_DIMENSIONS, values))
+    return row
+
+
+class InMemoryAnalysisRollupRepository(AnalysisRollupRepository):
+    """
+    In-memory implementation of the AnalysisRollupRepository interface.
+
+    Intended for tests and single-process use; counts are lost when the
+    process exits.
+    """
+
+    def __init__(self):
+        """Initialize an empty rollup store."""
+        self._counts: "Counter[RollupKey]" = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, analysis: TicketAnalysis, delta: int = 1) -> None:
+        """
+        Add an analysis to (or, with a negative delta, remove it from) its buckets.
+
+        Args:
+            analysis: Ticket analysis
+            delta: Amount to add to the bucket counts
+        """
+        keys = _rollup_keys(analysis)
+        with self._lock:
+            for key in keys:
+                self._counts[key] += delta
+                if self._counts[key] <= 0:
+                    del self._counts[key]
+
+    def get_rollups(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        view_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the rollup rows of buckets starting in a date range.
+
+        Args:
+            granularity: 'hour' or 'day'
+            start_date: Start of the range
+            end_date: End of the range (exclusive)
+            view_id: Optional view ID to filter by
+
+        Returns:
+            List of rows with the dimension values and a 'count'
+        """
+        with self._lock:
+            items = list(self._counts.items())
+
+        rows = []
+        for key, count in items:
+            if key[0] != granularity or not start_date <= key[1] < end_date:
+                continue
+
+            row = _key_to_row(key)
+            if view_id is not None and row["view_id"] != view_id:
+                continue
+
+            row["count"] = count
+            rows.append(row)
+
+        return rows
+
+    def rebuild(self, analyses: Iterable[TicketAnalysis]) -> int:
+        """
+        Replace all rollups with ones computed from the given analyses.
+
+        Args:
+            analyses: All stored ticket analyses
+
+        Returns:
+            Number of analyses processed
+        """
+        counts: "Counter[RollupKey]" = Counter()
+        processed = 0
+        for analysis in analyses:
+            counts.update(_rollup_keys(analysis))
+            processed += 1
+
+        with self._lock:
+            self._counts = counts
+
+        return processed
+
+    def is_empty(self) -> bool:
+        """
+        Check whether any rollups have been recorded.
+
+        Returns:
+            True if there are no rollups
+        """
+        return not self._counts
+
+
+class MongoDBAnalysisRollupRepository(AnalysisRollupRepository):
+    """
+    Implementation of the AnalysisRollupRepository interface using MongoDB.
+
+    Each document holds the count of one bucket and dimension combination.
+    Recording an analysis is a single unordered bulk write of ``$inc``
+    upserts, one per granularity, against a unique compound index.
+    """
+
+    def __init__(self, database, collection_name: Optional[str] = None):
+        """
+        Initialize the rollup repository.
+
+        Args:
+            database: PyMongo database holding the rollup collection
+            collection_name: Collection name (defaults to MONGODB_ROLLUP_COLLECTION_NAME
+                or 'ticket_analysis_rollups')
+        """
+        self.collection_name = collection_name or os.getenv(
+            "MONGODB_ROLLUP_COLLECTION_NAME", "ticket_analysis_rollups"
+        )
+        self.collection = database[self.collection_name]
+        self._ensure_indexes()
+
+    def _ensure_indexes(self) -> None:
+        """Create the unique bucket index if it doesn't exist."""
+        try:
+            self.collection.create_index(
+                [("granularity", 1), ("bucket", 1)] + [(name, 1) for name in ROLLUP_DIMENSIONS],
+                unique=True,
+                name="rollup_bucket_unique",
+                background=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to create rollup indexes: {str(e)}")
+            raise PersistenceError(f"Failed to create rollup indexes: {str(e)}")
+
+    def record(self, analysis: TicketAnalysis, delta: int = 1) -> None:
+        """
+        Add an analysis to (or, with a negative delta, remove it from) its buckets.
+
+        Args:
+            analysis: Ticket analysis
+            delta: Amount to add to the bucket counts
+
+        Raises:
+            PersistenceError: If the update fails
+        """
+        # Import pymongo on-demand to avoid making it a domain dependency
+        from pymongo import UpdateOne
+
+        operations = [
+            UpdateOne(_key_to_row(key), {"$inc": {"count": delta}}, upsert=True)
+            for key in _rollup_keys(analysis)
+        ]
+
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Error updating rollups for ticket {analysis.ticket_id}: {str(e)}")
+            raise PersistenceError(f"Error updating rollups: {str(e)}")
+
+    def get_rollups(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        view_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the rollup rows of buckets starting in a date range.
+
+        Args:
+            granularity: 'hour' or 'day'
+            start_date: Start of the range
+            end_date: End of the range (exclusive)
+            view_id: Optional view ID to filter by
+
+        Returns:
+            List of rows with the dimension values and a 'count'
+
+        Raises:
+            QueryError: If the query fails
+        """
+        query: Dict[str, Any] = {
+            "granularity": granularity,
+            "bucket": {"$gte": start_date, "$lt": end_date},
+            "count": {"$gt": 0}
+        }
+        if view_id is not None:
+            query["view_id"] = view_id
+
+        try:
+            return list(self.collection.find(query, {"_id": 0}))
+        except Exception as e:
+            logger.error(f"Error fetching rollups: {str(e)}")
+            raise QueryError(f"Error fetching rollups: {str(e)}")
+
+    def rebuild(self, analyses: Iterable[TicketAnalysis]) -> int:
+        """
+        Replace all rollups with ones computed from the given analyses.
+
+        Args:
+            analyses: All stored ticket analyses
+
+        Returns:
+            Number of analyses processed
+
+        Raises:
+            PersistenceError: If writing the rollups fails
+        """
+        counts: "Counter[RollupKey]" = Counter()
+        processed = 0
+        for analysis in analyses:
+            counts.update(_rollup_keys(analysis))
+            processed += 1
+
+        documents = []
+        for key, count in counts.items():
+            document = _key_to_row(key)
+            document["count"] = count
+            documents.append(document)
+
+        try:
+            self.collection.delete_many({})
+            if documents:
+                self.collection.insert_many(documents, ordered=False)
+        except Exception as e:
+            logger.error(f"Error rebuilding rollups: {str(e)}")
+            raise PersistenceError(f"Error rebuilding rollups: {str(e)}")
+
+        logger.info(f"Rebuilt {len(documents)} rollup buckets from {processed} analyses")
+        return processed
+
+    def is_empty(self) -> bool:
+        """
+        Check whether any rollups have been recorded.
+
+        Returns:
+            True if there are no rollups
+
+        Raises:
+            QueryError: If the query fails
+        """
+        try:
+            return self.collection.find_one({}, {"_id": 1}) is None
+        except Exception as e:
+            logger.error(f"Error checking rollups: {str(e)}")
+            raise QueryError(f"Error checking rollups: {str(e)}")
@@ -0,0 +1,155 @@
+"""
+Batch Job Repository Implementation
+
+This module provides an implementation of the BatchJobRepository interface
+using a local SQLite database, so submitted batch analysis jobs can be polled
+and collected by a later process.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.domain.exceptions import ConnectionError, PersistenceError, QueryError
+from src.domain.interfaces.repository_interfaces import BatchJobRepository
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_JOB_DB_PATH = os.path.join(os.path.expanduser("~"), ".zendesk_ai", "batch_jobs.db")
+
+
+class SQLiteBatchJobRepository(BatchJobRepository):
+    """
+    Implementation of the BatchJobRepository interface using SQLite.
+
+    Job records are stored as JSON documents keyed by job ID, with the status
+    and creation time in their own indexed columns for listing.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the batch job repository.
+
+        Args:
+            db_path: Path to the SQLite database (defaults to BATCH_JOB_DB_PATH or ~/.zendesk_ai/batch_jobs.db)
+
+        Raises:
+            ConnectionError: If the database cannot be opened
+        """
+        self.db_path = db_path or os.getenv("BATCH_JOB_DB_PATH", DEFAULT_BATCH_JOB_DB_PATH)
+        self._lock = threading.Lock()
+
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._initialize_schema()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to open batch job database {self.db_path}: {str(e)}")
+            raise ConnectionError(f"Failed to open batch job database: {str(e)}")
+
+    def _initialize_schema(self) -> None:
+        """Create the table and index if they don't exist."""
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS batch_jobs ("
+                "id TEXT PRIMARY KEY, "
+                "status TEXT NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "data TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_batch_jobs_status ON batch_jobs (status, created_at)"
+            )
+
+    def save_job(self, job: Dict[str, Any]) -> bool:
+        """
+        Insert or update a batch job record.
+
+        Args:
+            job: Job record (must contain an 'id' key)
+
+        Returns:
+            Success indicator
+
+        Raises:
+            PersistenceError: If the save operation fails
+        """
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO batch_jobs (id, status, created_at, data) VALUES (?, ?, ?, ?)",
+                    (
+                        job["id"],
+                        job.get("status", "submitted"),
+                        job.get("created_at", time.time()),
+                        json.dumps(job, default=str)
+                    )
+                )
+            return True
+        except (sqlite3.Error, TypeError, KeyError) as e:
+            logger.error(f"Error saving batch job: {str(e)}")
+            raise PersistenceError(f"Error saving batch job: {str(e)}")
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a batch job by ID.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Job record or None if not found
+
+        Raises:
+            QueryError: If the query fails
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT data FROM batch_jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching batch job {job_id}: {str(e)}")
+            raise QueryError(f"Error fetching batch job: {str(e)}")
+
+    def list_jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get batch jobs, optionally filtered by status.
+
+        Args:
+            status: Optional job status to filter by
+
+        Returns:
+            List of job records, oldest first
+
+        Raises:
+            QueryError: If the query fails
+        """
+        try:
+            with self._lock:
+                if status is None:
+                    rows = self._connection.execute(
+                        "SELECT data FROM batch_jobs ORDER BY created_at"
+                    ).fetchall()
+                else:
+                    rows = self._connection.execute(
+                        "SELECT data FROM batch_jobs WHERE status = ? ORDER BY created_at", (status,)
+                    ).fetchall()
+            return [json.loads(row[0]) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error listing batch jobs: {str(e)}")
+            raise QueryError(f"Error listing batch jobs: {str(e)}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
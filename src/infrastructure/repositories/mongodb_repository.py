@@ -7,13 +7,19 @@ using MongoDB for persistence.
 
 import logging
 import os
+import threading
 import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from src.domain.entities.ticket_analysis import SentimentAnalysis, TicketAnalysis
 from src.domain.exceptions import ConnectionError, PersistenceError, QueryError
-from src.domain.interfaces.repository_interfaces import AnalysisRepository
+from src.domain.interfaces.repository_interfaces import (
+    AnalysisRepository,
+    AnalysisRollupRepository,
+)
+from src.domain.interfaces.utility_interfaces import MetricsCollector
+from src.infrastructure.utils.metrics import instrumented
 from src.infrastructure.utils.retry import with_retry
 
 # Set up logging
@@ -28,24 +34,127 @@ class MongoDBRepository(AnalysisRepository):
     store ticket analysis results.
     """
 
-    def __init__(self, mongo_client=None):
+    def __init__(self, mongo_client=None, rollups: bool = False, metrics: Optional[MetricsCollector] = None):
         """
         Initialize the MongoDB repository.
 
         Args:
             mongo_client: Optional pre-configured MongoDB client
+            rollups: Whether to enable rollups once the repository connects
+            metrics: Optional collector receiving operation latency and errors
         """
         # MongoDB connection details
         self.mongodb_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
         self.db_name = os.getenv("MONGODB_DB_NAME", "zendesk_analytics")
         self.collection_name = os.getenv("MONGODB_COLLECTION_NAME", "ticket_analysis")
 
-        self.client = mongo_client or self._create_mongo_client()
-        self.db = self.client[self.db_name]
-        self.collection = self.db[self.collection_name]
+        # Connect and ensure indexes on first use, so commands that never
+        # touch stored analyses don't pay for the connection
+        self._client = mongo_client
+        self._db = None
+        self._collection = None
+        self._collection_ready = False
+        self._collection_lock = threading.RLock()
+
+        # Pre-aggregated report counts, maintained on writes once enabled
+        self.rollup_repository: Optional[AnalysisRollupRepository] = None
+        self._rollups_on_connect = rollups
+        self.metrics = metrics
+
+    @property
+    def client(self):
+        """Get the MongoDB client, connecting on first use."""
+        if self._client is None:
+            self._client = self._create_mongo_client()
+        return self._client
+
+    @property
+    def db(self):
+        """Get the analytics database."""
+        if self._db is None:
+            self._db = self.client[self.db_name]
+        return self._db
+
+    @property
+    def collection(self):
+        """Get the analysis collection, ensuring its indexes on first use."""
+        if not self._collection_ready:
+            # Other threads wait until the indexes (and rollups) are set up;
+            # the setup itself reads the collection, hence the reentrant lock
+            with self._collection_lock:
+                if self._collection is None:
+                    self._collection = self.db[self.collection_name]
+                    self._ensure_indexes()
+                    if self._rollups_on_connect:
+                        self.enable_rollups()
+                    self._collection_ready = True
+        return self._collection
+
+    def enable_rollups(self, rollup_repository: Optional[AnalysisRollupRepository] = None) -> AnalysisRollupRepository:
+        """
+        Maintain rollups of every analysis saved or updated from now on.
+
+        If the rollup store is empty it is first backfilled from the stored
+        analyses, so enabling rollups on an existing database is safe.
+        Without a rollup store, enabling rollups again returns the store
+        already in use.
+
+        Args:
+            rollup_repository: Rollup store (default: a rollup collection in the same database)
+
+        Returns:
+            The rollup repository in use
+        """
+        self._rollups_on_connect = False
+        if rollup_repository is None and self.rollup_repository is not None:
+            return self.rollup_repository
+        if rollup_repository is None:
+            from src.infrastructure.repositories.analysis_rollup_repository import (
+                MongoDBAnalysisRollupRepository,
+            )
+            rollup_repository = MongoDBAnalysisRollupRepository(self.db)
+
+        if rollup_repository.is_empty():
+            self.rebuild_rollups(rollup_repository)
+
+        self.rollup_repository = rollup_repository
+        return rollup_repository
+
+    def rebuild_rollups(self, rollup_repository: Optional[AnalysisRollupRepository] = None) -> int:
+        """
+        Recompute all rollups from the stored analyses.
+
+        Args:
+            rollup_repository: Rollup store to rebuild (default: the enabled one)
+
+        Returns:
+            Number of analyses processed
+        """
+        rollup_repository = rollup_repository or self.rollup_repository
+        if rollup_repository is None:
+            raise ValueError("Rollups are not enabled")
+
+        cursor = self.collection.find({}, {"raw_result": 0})
+        return rollup_repository.rebuild(self._dict_to_entity(doc) for doc in cursor)
+
+    def _update_rollups(self, analysis: TicketAnalysis, delta: int) -> None:
+        """
+        Apply an analysis to the rollups, if enabled.
+
+        Rollups are derived data, so a failure is logged rather than failing
+        the write of the analysis itself; rebuild_rollups() repairs drift.
+
+        Args:
+            analysis: Ticket analysis
+            delta: Amount to add to the bucket counts
+        """
+        if self.rollup_repository is None:
+            return
 
-        # Ensure indexes
-        self._ensure_indexes()
+        try:
+            self.rollup_repository.record(analysis, delta)
+        except Exception as e:
+            logger.error(f"Failed to update rollups for ticket {analysis.ticket_id}: {str(e)}")
 
     def _create_mongo_client(self):
         """
@@ -127,6 +236,7 @@ class MongoDBRepository(AnalysisRepository):
             raise ConnectionError(f"Failed to create indexes: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("mongodb.operation", operation="save")
     def save(self, analysis: TicketAnalysis) -> str:
         """
         Save a ticket analysis.
@@ -147,7 +257,6 @@ class MongoDBRepository(AnalysisRepository):
         try:
             result = self.collection.insert_one(analysis_dict)
             logger.debug(f"Inserted document with ID: {result.inserted_id}")
-            return str(result.inserted_id)
         except Exception as e:
             error_str = str(e).lower()
 
@@ -158,7 +267,11 @@ class MongoDBRepository(AnalysisRepository):
                 logger.error(f"Error saving analysis to MongoDB: {str(e)}")
                 raise PersistenceError(f"Error saving analysis: {str(e)}")
 
+        self._update_rollups(analysis, 1)
+        return str(result.inserted_id)
+
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("mongodb.operation", operation="get_by_ticket_id")
     def get_by_ticket_id(self, ticket_id: str) -> Optional[TicketAnalysis]:
         """
         Get the most recent analysis for a ticket.
@@ -195,6 +308,7 @@ class MongoDBRepository(AnalysisRepository):
                 raise QueryError(f"Error fetching analysis: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("mongodb.operation", operation="find_between_dates")
     def find_between_dates(self, start_date: datetime, end_date: datetime) -> List[TicketAnalysis]:
         """
         Find analyses between two dates.
@@ -234,6 +348,7 @@ class MongoDBRepository(AnalysisRepository):
                 raise QueryError(f"Error finding analyses by date: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("mongodb.operation", operation="find_by_category")
     def find_by_category(self, category: str) -> List[TicketAnalysis]:
         """
         Find analyses by category.
@@ -267,12 +382,20 @@ class MongoDBRepository(AnalysisRepository):
                 raise QueryError(f"Error finding analyses by category: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
-    def find_high_priority(self, min_score: int = 7) -> List[TicketAnalysis]:
+    @instrumented("mongodb.operation", operation="find_high_priority")
+    def find_high_priority(
+        self,
+        min_score: int = 7,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[TicketAnalysis]:
         """
         Find high priority analyses.
 
         Args:
             min_score: Minimum priority score to consider high priority
+            start_date: Optional start of the period the analyses were made in
+            end_date: Optional end of the period (exclusive)
 
         Returns:
             List of high priority ticket analyses
@@ -288,7 +411,7 @@ class MongoDBRepository(AnalysisRepository):
 
             # First, we need all the documents that might match our criteria
             # This could be inefficient for large collections
-            cursor = self.collection.find({
+            query: Dict[str, Any] = {
                 "$or": [
                     {"priority": "high"},
                     {"priority": "urgent"},
@@ -297,7 +420,15 @@ class MongoDBRepository(AnalysisRepository):
                     {"sentiment.frustration_level": {"$gte": 4}},
                     {"sentiment.business_impact.detected": True}
                 ]
-            })
+            }
+            period = {}
+            if start_date is not None:
+                period["$gte"] = start_date
+            if end_date is not None:
+                period["$lt"] = end_date
+            if period:
+                query["timestamp"] = period
+            cursor = self.collection.find(query)
 
             # Convert to entities and filter by priority_score
             all_analyses = [self._dict_to_entity(doc) for doc in cursor]
@@ -317,6 +448,7 @@ class MongoDBRepository(AnalysisRepository):
                 raise QueryError(f"Error finding high priority analyses: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("mongodb.operation", operation="find_with_business_impact")
     def find_with_business_impact(self) -> List[TicketAnalysis]:
         """
         Find analyses with business impact.
@@ -349,6 +481,7 @@ class MongoDBRepository(AnalysisRepository):
                 raise QueryError(f"Error finding analyses with business impact: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("mongodb.operation", operation="update")
     def update(self, analysis: TicketAnalysis) -> bool:
         """
         Update an existing analysis.
@@ -367,16 +500,33 @@ class MongoDBRepository(AnalysisRepository):
         analysis_dict = self._entity_to_dict(analysis)
 
         try:
-            # Find and update the document with matching ticket_id
-            result = self.collection.replace_one(
-                {"ticket_id": analysis.ticket_id},
-                analysis_dict
-            )
-
-            success = result.matched_count > 0
+            previous = None
+            if self.rollup_repository is None:
+                # Find and update the document with matching ticket_id
+                result = self.collection.replace_one(
+                    {"ticket_id": analysis.ticket_id},
+                    analysis_dict
+                )
+                success = result.matched_count > 0
+            else:
+                from pymongo import ReturnDocument
+
+                # The previous version is needed to move its rollup counts; read
+                # and replace it atomically so a concurrent update cannot be
+                # subtracted in its place
+                previous = self.collection.find_one_and_replace(
+                    {"ticket_id": analysis.ticket_id},
+                    analysis_dict,
+                    projection={"raw_result": 0},
+                    return_document=ReturnDocument.BEFORE
+                )
+                success = previous is not None
 
             if success:
                 logger.info(f"Updated analysis for ticket {analysis.ticket_id}")
+                if previous is not None:
+                    self._update_rollups(self._dict_to_entity(previous), -1)
+                    self._update_rollups(analysis, 1)
             else:
                 logger.warning(f"No matching document found for ticket {analysis.ticket_id}")
 
@@ -393,8 +543,8 @@ class MongoDBRepository(AnalysisRepository):
 
     def close(self):
         """Close the MongoDB client connection."""
-        if self.client:
-            self.client.close()
+        if self._client:
+            self._client.close()
             logger.info("Closed MongoDB connection")
 
     # Helper methods
@@ -0,0 +1,228 @@
+"""
+Schedule Repository Implementation
+
+This module provides an implementation of the ScheduleRepository interface
+using a local SQLite database, so scheduled tasks, their next run times and
+run history survive scheduler restarts.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.domain.exceptions import ConnectionError, PersistenceError, QueryError
+from src.domain.interfaces.repository_interfaces import ScheduleRepository
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEDULE_DB_PATH = os.path.join(os.path.expanduser("~"), ".zendesk_ai", "schedules.db")
+
+
+class SQLiteScheduleRepository(ScheduleRepository):
+    """
+    Implementation of the ScheduleRepository interface using SQLite.
+
+    Task definitions are stored as JSON documents keyed by task ID. Run
+    history is kept in a separate table and trimmed to the most recent
+    ``max_history`` runs per task.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_history: int = 100):
+        """
+        Initialize the schedule repository.
+
+        Args:
+            db_path: Path to the SQLite database (defaults to SCHEDULE_DB_PATH or ~/.zendesk_ai/schedules.db)
+            max_history: Number of runs to keep per task
+
+        Raises:
+            ConnectionError: If the database cannot be opened
+        """
+        self.db_path = db_path or os.getenv("SCHEDULE_DB_PATH", DEFAULT_SCHEDULE_DB_PATH)
+        self.max_history = max_history
+        self._lock = threading.Lock()
+
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._initialize_schema()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to open schedule database {self.db_path}: {str(e)}")
+            raise ConnectionError(f"Failed to open schedule database: {str(e)}")
+
+    def _initialize_schema(self) -> None:
+        """Create the tables and indexes if they don't exist."""
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS scheduled_tasks ("
+                "id TEXT PRIMARY KEY, "
+                "data TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS task_runs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "task_id TEXT NOT NULL, "
+                "data TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_task_runs_task_id ON task_runs (task_id, id)"
+            )
+
+    def save_task(self, task: Dict[str, Any]) -> bool:
+        """
+        Insert or update a scheduled task definition.
+
+        Args:
+            task: Task record (must contain an 'id' key)
+
+        Returns:
+            Success indicator
+
+        Raises:
+            PersistenceError: If the save operation fails
+        """
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO scheduled_tasks (id, data) VALUES (?, ?)",
+                    (task["id"], json.dumps(task, default=str))
+                )
+            return True
+        except (sqlite3.Error, TypeError, KeyError) as e:
+            logger.error(f"Error saving scheduled task: {str(e)}")
+            raise PersistenceError(f"Error saving scheduled task: {str(e)}")
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a scheduled task by ID.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Task record or None if not found
+
+        Raises:
+            QueryError: If the query fails
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT data FROM scheduled_tasks WHERE id = ?", (task_id,)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching scheduled task {task_id}: {str(e)}")
+            raise QueryError(f"Error fetching scheduled task: {str(e)}")
+
+    def list_tasks(self) -> List[Dict[str, Any]]:
+        """
+        Get all scheduled tasks.
+
+        Returns:
+            List of task records
+
+        Raises:
+            QueryError: If the query fails
+        """
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT data FROM scheduled_tasks ORDER BY id"
+                ).fetchall()
+            return [json.loads(row[0]) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error listing scheduled tasks: {str(e)}")
+            raise QueryError(f"Error listing scheduled tasks: {str(e)}")
+
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a scheduled task and its run history.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            True if the task existed, False otherwise
+
+        Raises:
+            PersistenceError: If the delete operation fails
+        """
+        try:
+            with self._lock, self._connection:
+                cursor = self._connection.execute(
+                    "DELETE FROM scheduled_tasks WHERE id = ?", (task_id,)
+                )
+                self._connection.execute("DELETE FROM task_runs WHERE task_id = ?", (task_id,))
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"Error deleting scheduled task {task_id}: {str(e)}")
+            raise PersistenceError(f"Error deleting scheduled task: {str(e)}")
+
+    def record_run(self, task_id: str, run: Dict[str, Any]) -> bool:
+        """
+        Append a run to a task's history.
+
+        Args:
+            task_id: ID of the task
+            run: Run record (scheduled_time, started, finished, success, error)
+
+        Returns:
+            Success indicator
+
+        Raises:
+            PersistenceError: If the save operation fails
+        """
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT INTO task_runs (task_id, data) VALUES (?, ?)",
+                    (task_id, json.dumps(run, default=str))
+                )
+                # Keep only the most recent runs of this task
+                self._connection.execute(
+                    "DELETE FROM task_runs WHERE task_id = ? AND id NOT IN ("
+                    "SELECT id FROM task_runs WHERE task_id = ? ORDER BY id DESC LIMIT ?)",
+                    (task_id, task_id, self.max_history)
+                )
+            return True
+        except (sqlite3.Error, TypeError) as e:
+            logger.error(f"Error recording run of task {task_id}: {str(e)}")
+            raise PersistenceError(f"Error recording task run: {str(e)}")
+
+    def get_run_history(self, task_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get the most recent runs of a task, newest first.
+
+        Args:
+            task_id: ID of the task
+            limit: Maximum number of runs to return
+
+        Returns:
+            List of run records
+
+        Raises:
+            QueryError: If the query fails
+        """
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT data FROM task_runs WHERE task_id = ? ORDER BY id DESC LIMIT ?",
+                    (task_id, limit)
+                ).fetchall()
+            return [json.loads(row[0]) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error fetching run history of task {task_id}: {str(e)}")
+            raise QueryError(f"Error fetching run history: {str(e)}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,233 @@
+"""
+Usage Repository Implementation
+
+This module provides an implementation of the UsageRepository interface
+using a local SQLite database, a compact ledger of every AI call that can be
+aggregated by day, view, model, operation, command or scheduled task.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.domain.exceptions import ConnectionError, PersistenceError, QueryError
+from src.domain.interfaces.repository_interfaces import UsageRepository
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_USAGE_DB_PATH = os.path.join(os.path.expanduser("~"), ".zendesk_ai", "usage.db")
+
+# Columns usage can be grouped by
+GROUP_COLUMNS = (
+    "day", "provider", "model", "operation", "outcome",
+    "ticket_id", "view_id", "command", "task_id"
+)
+
+_ENTRY_COLUMNS = (
+    "timestamp", "day", "provider", "model", "operation", "outcome",
+    "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens",
+    "latency_ms", "cost_usd", "ticket_id", "view_id", "command", "task_id"
+)
+
+
+def _timestamp(value: datetime) -> float:
+    """Convert a datetime to a Unix timestamp, reading naive datetimes as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SQLiteUsageRepository(UsageRepository):
+    """
+    Implementation of the UsageRepository interface using SQLite.
+
+    Each call is one row of counts and short labels, indexed by time, so a
+    month of calls stays small and aggregates quickly.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the usage repository.
+
+        Args:
+            db_path: Path to the SQLite database (defaults to USAGE_DB_PATH or ~/.zendesk_ai/usage.db)
+
+        Raises:
+            ConnectionError: If the database cannot be opened
+        """
+        self.db_path = db_path or os.getenv("USAGE_DB_PATH", DEFAULT_USAGE_DB_PATH)
+        self._lock = threading.Lock()
+
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._initialize_schema()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to open usage database {self.db_path}: {str(e)}")
+            raise ConnectionError(f"Failed to open usage database: {str(e)}")
+
+    def _initialize_schema(self) -> None:
+        """Create the table and index if they don't exist."""
+        # Writes happen on the AI call path; WAL keeps each commit cheap
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS ai_usage ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "timestamp REAL NOT NULL, "
+                "day TEXT NOT NULL, "
+                "provider TEXT NOT NULL, "
+                "model TEXT NOT NULL, "
+                "operation TEXT NOT NULL, "
+                "outcome TEXT NOT NULL, "
+                "input_tokens INTEGER NOT NULL DEFAULT 0, "
+                "output_tokens INTEGER NOT NULL DEFAULT 0, "
+                "cache_read_tokens INTEGER NOT NULL DEFAULT 0, "
+                "cache_write_tokens INTEGER NOT NULL DEFAULT 0, "
+                "latency_ms REAL NOT NULL DEFAULT 0, "
+                "cost_usd REAL, "
+                "ticket_id TEXT, "
+                "view_id TEXT, "
+                "command TEXT, "
+                "task_id TEXT)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ai_usage_timestamp ON ai_usage (timestamp)"
+            )
+
+    def record(self, entry: Dict[str, Any]) -> bool:
+        """
+        Record one AI call.
+
+        Args:
+            entry: Usage entry (see src.infrastructure.utils.usage.usage_entry)
+
+        Returns:
+            Success indicator
+
+        Raises:
+            PersistenceError: If the entry cannot be written
+        """
+        timestamp = entry.get("timestamp") or time.time()
+        row = {
+            **entry,
+            "timestamp": timestamp,
+            "day": datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d"),
+            "operation": entry.get("operation") or "unknown",
+            "outcome": entry.get("outcome") or "ok"
+        }
+
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    f"INSERT INTO ai_usage ({', '.join(_ENTRY_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in _ENTRY_COLUMNS)})",
+                    tuple(
+                        row.get(column, 0 if column.endswith(("_tokens", "_ms")) else None)
+                        for column in _ENTRY_COLUMNS
+                    )
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error recording AI usage: {str(e)}")
+            raise PersistenceError(f"Error recording AI usage: {str(e)}")
+
+    def summarize(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        group_by: Sequence[str] = ("day", "view_id")
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate the calls recorded in a date range.
+
+        Args:
+            start_date: Start of the range (naive datetimes are UTC)
+            end_date: End of the range, exclusive (naive datetimes are UTC)
+            group_by: Columns to group by (see GROUP_COLUMNS)
+
+        Returns:
+            One row per group with the group values, 'calls', token totals,
+            'cost_usd', 'avg_latency_ms' and 'max_latency_ms', ordered by the
+            group values
+
+        Raises:
+            ValueError: If a group column is unknown
+            QueryError: If the query fails
+        """
+        unknown = [column for column in group_by if column not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Cannot group usage by {', '.join(unknown)}")
+
+        columns = list(group_by)
+        select = ", ".join(columns + [
+            "COUNT(*)",
+            "SUM(input_tokens)",
+            "SUM(output_tokens)",
+            "SUM(cache_read_tokens)",
+            "SUM(cache_write_tokens)",
+            "SUM(cost_usd)",
+            "AVG(latency_ms)",
+            "MAX(latency_ms)"
+        ])
+        query = f"SELECT {select} FROM ai_usage WHERE timestamp >= ? AND timestamp < ?"
+        if columns:
+            query += f" GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}"
+
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    query, (_timestamp(start_date), _timestamp(end_date))
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error summarizing AI usage: {str(e)}")
+            raise QueryError(f"Error summarizing AI usage: {str(e)}")
+
+        summary = []
+        for row in rows:
+            calls, input_tokens, output_tokens, cache_read, cache_write, cost, avg_latency, max_latency = row[len(columns):]
+            if not calls:
+                continue
+            summary.append({
+                **dict(zip(columns, row[:len(columns)])),
+                "calls": calls,
+                "input_tokens": input_tokens or 0,
+                "output_tokens": output_tokens or 0,
+                "cache_read_tokens": cache_read or 0,
+                "cache_write_tokens": cache_write or 0,
+                "cost_usd": round(cost or 0.0, 8),
+                "avg_latency_ms": round(avg_latency or 0.0, 1),
+                "max_latency_ms": round(max_latency or 0.0, 1)
+            })
+        return summary
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def create_usage_repository() -> Optional[SQLiteUsageRepository]:
+    """
+    Open the usage ledger unless it is disabled with AI_USAGE_LEDGER=false.
+
+    Returns:
+        The usage repository, or None if the ledger is disabled or cannot be
+        opened (AI calls then go unrecorded rather than failing)
+    """
+    if os.getenv("AI_USAGE_LEDGER", "true").lower() != "true":
+        return None
+    try:
+        return SQLiteUsageRepository()
+    except ConnectionError as e:
+        logger.warning(f"AI usage ledger disabled: {e}")
+        return None
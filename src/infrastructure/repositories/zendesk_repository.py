@@ -7,6 +7,7 @@ using the Zendesk API.
 
 import logging
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union, cast
 
@@ -14,13 +15,23 @@ from src.domain.entities.ticket import Ticket
 from src.domain.exceptions import ConnectionError, EntityNotFoundError, QueryError
 from src.domain.interfaces.repository_interfaces import TicketRepository, ViewRepository
 from src.domain.value_objects.ticket_status import TicketStatus
+from src.domain.interfaces.utility_interfaces import MetricsCollector
 from src.infrastructure.cache.zendesk_cache_adapter import ZendeskCacheManager
+from src.infrastructure.utils.metrics import instrumented
 from src.infrastructure.utils.retry import with_retry
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+def _zendesk_error_kind(error: Exception) -> str:
+    """Name the kind of a Zendesk error for metrics, telling rate limiting (429) apart."""
+    error_str = str(error).lower()
+    if "429" in error_str or "rate limit" in error_str:
+        return "rate_limited"
+    return type(error).__name__
+
+
 class ZendeskRepository(TicketRepository, ViewRepository):
     """
     Implementation of the TicketRepository and ViewRepository interfaces using the Zendesk API.
@@ -29,19 +40,40 @@ class ZendeskRepository(TicketRepository, ViewRepository):
     caching to reduce API calls.
     """
 
-    def __init__(self, zenpy_client=None, cache_manager=None):
+    def __init__(self, zenpy_client=None, cache_manager=None, metrics: Optional[MetricsCollector] = None):
         """
         Initialize the Zendesk repository.
 
         Args:
             zenpy_client: Optional pre-configured Zenpy client
             cache_manager: Optional cache manager
+            metrics: Optional collector receiving per-endpoint latency and errors
         """
-        self.client = zenpy_client or self._create_zenpy_client()
+        # The client is created and its connection checked on first use
+        self._client = zenpy_client
+        self._connection_checked = False
+        self._client_lock = threading.RLock()
         self.cache = cache_manager or ZendeskCacheManager()
-
-        # Check if we have a valid client
-        self._check_client_connection()
+        self.metrics = metrics
+
+    @property
+    def client(self):
+        """Get the Zenpy client, creating it and checking the connection on first use."""
+        if not self._connection_checked:
+            # Concurrent first calls (e.g. webhook threads) share one connection check
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_zenpy_client()
+                if not self._connection_checked:
+                    self._check_client_connection()
+                    self._connection_checked = True
+        return self._client
+
+    @client.setter
+    def client(self, zenpy_client) -> None:
+        """Replace the Zenpy client."""
+        self._client = zenpy_client
+        self._connection_checked = True
 
     def _create_zenpy_client(self):
         """
@@ -88,13 +120,14 @@ class ZendeskRepository(TicketRepository, ViewRepository):
         """
         try:
             # Try a simple API call to check if the connection works
-            _ = self.client.users.me()
+            _ = self._client.users.me()
             logger.info("Successfully connected to Zendesk API")
         except Exception as e:
             logger.error(f"Zendesk API connection test failed: {str(e)}")
             raise ConnectionError(f"Failed to connect to Zendesk API: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_ticket")
     def get_ticket(self, ticket_id: int) -> Optional[Ticket]:
         """
         Get a ticket by ID.
@@ -148,6 +181,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching ticket {ticket_id}: {error_str}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_tickets")
     def get_tickets(self, status: str = "open", limit: Optional[int] = None) -> List[Ticket]:
         """
         Get tickets with the specified status.
@@ -204,6 +238,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching tickets: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_tickets_from_view")
     def get_tickets_from_view(self, view_id: int, limit: Optional[int] = None) -> List[Ticket]:
         """
         Get tickets from a specific view.
@@ -276,6 +311,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching tickets from view: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_tickets_from_view_name")
     def get_tickets_from_view_name(self, view_name: str, limit: Optional[int] = None) -> List[Ticket]:
         """
         Get tickets from a view by name.
@@ -316,6 +352,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching tickets by view name: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_tickets_from_multiple_views")
     def get_tickets_from_multiple_views(self, view_ids: List[int], limit: Optional[int] = None) -> List[Ticket]:
         """
         Get tickets from multiple views.
@@ -405,6 +442,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching tickets from multiple views: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="add_ticket_tags")
     def add_ticket_tags(self, ticket_id: int, tags: List[str]) -> bool:
         """
         Add tags to a ticket.
@@ -473,6 +511,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error adding tags to ticket: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="add_ticket_comment")
     def add_ticket_comment(self, ticket_id: int, comment: str, public: bool = False) -> bool:
         """
         Add a comment to a ticket.
@@ -535,6 +574,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
     # ViewRepository interface implementation
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_all_views")
     def get_all_views(self) -> List[Dict[str, Any]]:
         """
         Get all available views.
@@ -576,6 +616,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching views: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_view_by_id")
     def get_view_by_id(self, view_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a view by ID.
@@ -623,6 +664,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching view: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_view_by_name")
     def get_view_by_name(self, view_name: str) -> Optional[Dict[str, Any]]:
         """
         Get a view by name.
@@ -699,6 +741,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error fetching view by name: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_view_names_by_ids")
     def get_view_names_by_ids(self, view_ids: List[int]) -> Dict[int, str]:
         """
         Get a mapping of view IDs to their names.
@@ -750,6 +793,7 @@ class ZendeskRepository(TicketRepository, ViewRepository):
                 raise QueryError(f"Error getting view names: {str(e)}")
 
     @with_retry(max_retries=3, retry_on=Exception)
+    @instrumented("zendesk.request", error_kind=_zendesk_error_kind, endpoint="get_view_ids_by_names")
     def get_view_ids_by_names(self, view_names: List[str]) -> Dict[str, int]:
         """
         Get view IDs by their names.
@@ -18,7 +18,9 @@ from src.domain.interfaces.ai_service_interfaces import AIService, EnhancedAISer
 from src.domain.interfaces.cache_interfaces import CacheManager
 from src.domain.interfaces.repository_interfaces import (
     AnalysisRepository,
+    AnalysisRollupRepository,
     TicketRepository,
+    UsageRepository,
     ViewRepository,
 )
 from src.domain.interfaces.service_interfaces import (
@@ -27,16 +29,32 @@ from src.domain.interfaces.service_interfaces import (
     TicketAnalysisService,
     WebhookService,
 )
+from src.domain.interfaces.utility_interfaces import (
+    MetricsCollector,
+    QuotaManager,
+    SpanTracer,
+    StageTimer,
+    UsageAttribution,
+)
 from src.infrastructure.cache.zendesk_cache_adapter import ZendeskCacheManager
 from src.infrastructure.external_services.claude_service import ClaudeService
+from src.infrastructure.external_services.hedged_ai_service import HedgedAIService
 from src.infrastructure.external_services.openai_service import OpenAIService
+from src.infrastructure.external_services.routing_ai_service import RoutingAIService
 from src.infrastructure.repositories.mongodb_repository import MongoDBRepository
+from src.infrastructure.repositories.usage_repository import create_usage_repository
 from src.infrastructure.repositories.zendesk_repository import ZendeskRepository
+from src.infrastructure.utils.circuit_breaker import CircuitBreaker
 from src.infrastructure.utils.config_manager import (
     EnvironmentConfigManager,
     JsonFileConfigManager,
 )
 from src.infrastructure.utils.dependency_injection import container
+from src.infrastructure.utils.metrics import metrics_collector
+from src.infrastructure.utils.profiling import ContextStageTimer
+from src.infrastructure.utils.quota_manager import AIQuotaManager
+from src.infrastructure.utils.tracing import tracer
+from src.infrastructure.utils.usage import ContextUsageAttribution
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -89,7 +107,11 @@ class ServiceProvider:
         return env_config
 
     def _initialize_container(self) -> None:
-        """Initialize the dependency injection container."""
+        """
+        Initialize the dependency injection container.
+
+        Services are registered as factories and created on first resolve.
+        """
         if self._initialized:
             return
 
@@ -116,96 +138,146 @@ class ServiceProvider:
 
     def _register_repositories(self) -> None:
         """Register repository implementations."""
-        # Create cache manager
-        cache_manager = ZendeskCacheManager()
-        container.register_instance(CacheManager, cache_manager)
+        container.register_instance(MetricsCollector, metrics_collector)
+        container.register_factory(CacheManager, lambda c: ZendeskCacheManager())
 
-        # Create ZendeskRepository
-        zendesk_repository = ZendeskRepository(cache_manager=cache_manager)
-        container.register_instance(TicketRepository, zendesk_repository)
-        container.register_instance(ViewRepository, zendesk_repository)
+        # ZendeskRepository implements both ticket and view repositories
+        container.register_factory(
+            TicketRepository,
+            lambda c: ZendeskRepository(cache_manager=c.resolve(CacheManager), metrics=c.resolve(MetricsCollector))
+        )
+        container.register_factory(ViewRepository, lambda c: c.resolve(TicketRepository))
 
-        # Create MongoDBRepository
-        mongodb_repository = MongoDBRepository()
-        container.register_instance(AnalysisRepository, mongodb_repository)
+        # MongoDB connects (and enables rollups) on first use
+        container.register_factory(
+            AnalysisRepository, lambda c: MongoDBRepository(rollups=True, metrics=c.resolve(MetricsCollector))
+        )
+        container.register_factory(
+            AnalysisRollupRepository, lambda c: c.resolve(AnalysisRepository).enable_rollups()
+        )
+
+        # Ledger of AI usage and cost; None when disabled with AI_USAGE_LEDGER=false
+        container.register_factory(UsageRepository, lambda c: create_usage_repository())
 
     def _register_external_services(self) -> None:
         """Register external service implementations."""
-        # Create OpenAIService
-        openai_service = OpenAIService()
-        container.register_instance(AIService, openai_service, "openai")
-
-        # Create ClaudeService
-        claude_service = ClaudeService()
-        container.register_instance(AIService, claude_service, "claude")
-        container.register_instance(EnhancedAIService, claude_service)
+        # Share one client-side quota manager between the AI services
+        container.register_factory(QuotaManager, lambda c: AIQuotaManager.from_env(metrics=c.resolve(MetricsCollector)))
+
+        container.register_factory(
+            AIService,
+            lambda c: OpenAIService(
+                quota_manager=c.resolve(QuotaManager),
+                metrics=c.resolve(MetricsCollector),
+                usage_repository=c.resolve(UsageRepository)
+            ),
+            "openai"
+        )
+        container.register_factory(
+            AIService,
+            lambda c: ClaudeService(
+                quota_manager=c.resolve(QuotaManager),
+                streaming=os.getenv("CLAUDE_STREAMING", "true").lower() == "true",
+                metrics=c.resolve(MetricsCollector),
+                usage_repository=c.resolve(UsageRepository)
+            ),
+            "claude"
+        )
+        container.register_factory(EnhancedAIService, lambda c: c.resolve(AIService, "claude"))
+
+        # Route analysis through Claude, failing over to OpenAI
+        container.register_factory(
+            AIService,
+            lambda c: RoutingAIService(
+                [("claude", c.resolve(AIService, "claude")), ("openai", c.resolve(AIService, "openai"))],
+                breaker_factory=CircuitBreaker.from_env
+            ),
+            "routing"
+        )
 
     def _register_application_services(self) -> None:
         """Register application service implementations."""
-        # Get repositories
-        ticket_repository = container.resolve(TicketRepository)
-        analysis_repository = container.resolve(AnalysisRepository)
-        view_repository = container.resolve(ViewRepository)
-
-        # Get AI service
-        claude_service = container.resolve(AIService, "claude")
-
-        # Create TicketAnalysisService
-        ticket_analysis_service = TicketAnalysisServiceImpl(
-            ticket_repository=ticket_repository,
-            analysis_repository=analysis_repository,
-            ai_service=claude_service
+        container.register_factory(
+            TicketAnalysisService,
+            lambda c: TicketAnalysisServiceImpl(
+                ticket_repository=c.resolve(TicketRepository),
+                analysis_repository=c.resolve(AnalysisRepository),
+                ai_service=c.resolve(AIService, "routing"),
+                tracer=c.resolve(SpanTracer),
+                usage_attribution=c.resolve(UsageAttribution)
+            )
         )
-        container.register_instance(TicketAnalysisService, ticket_analysis_service)
-
-        # Create ReportingService
-        reporting_service = ReportingServiceImpl(
-            ticket_repository=ticket_repository,
-            analysis_repository=analysis_repository,
-            view_repository=view_repository,
-            sentiment_reporter=None,  # TODO: Implement reporters
-            hardware_reporter=None,
-            pending_reporter=None,
-            ticket_analysis_service=ticket_analysis_service
+
+        container.register_factory(
+            ReportingService,
+            lambda c: ReportingServiceImpl(
+                ticket_repository=c.resolve(TicketRepository),
+                analysis_repository=c.resolve(AnalysisRepository),
+                view_repository=c.resolve(ViewRepository),
+                sentiment_reporter=None,  # TODO: Implement reporters
+                hardware_reporter=None,
+                pending_reporter=None,
+                ticket_analysis_service=c.resolve(TicketAnalysisService),
+                rollup_repository=c.resolve(AnalysisRollupRepository),
+                stage_timer=c.resolve(StageTimer)
+            )
         )
-        container.register_instance(ReportingService, reporting_service)
 
-        # Create WebhookService
-        webhook_service = WebhookServiceImpl(
-            ticket_repository=ticket_repository,
-            analysis_repository=analysis_repository,
-            ticket_analysis_service=ticket_analysis_service
+        container.register_factory(WebhookService, self._create_webhook_service)
+        container.register_factory(
+            SchedulerService,
+            lambda c: SchedulerServiceImpl(
+                metrics=c.resolve(MetricsCollector),
+                usage_attribution=c.resolve(UsageAttribution)
+            )
         )
-        container.register_instance(WebhookService, webhook_service)
 
-        # Create SchedulerService
-        scheduler_service = SchedulerServiceImpl()
-        container.register_instance(SchedulerService, scheduler_service)
+    def _create_webhook_service(self, c) -> WebhookService:
+        """Create the webhook service, hedging slow AI calls if enabled."""
+        webhook_analysis_service = c.resolve(TicketAnalysisService)
+        if os.getenv("AI_HEDGE_ENABLED", "false").lower() == "true":
+            webhook_analysis_service = TicketAnalysisServiceImpl(
+                ticket_repository=c.resolve(TicketRepository),
+                analysis_repository=c.resolve(AnalysisRepository),
+                ai_service=HedgedAIService.from_env(
+                    c.resolve(AIService, "routing"),
+                    hedge=c.resolve(AIService, "openai"),
+                    metrics=c.resolve(MetricsCollector)
+                ),
+                tracer=c.resolve(SpanTracer),
+                usage_attribution=c.resolve(UsageAttribution)
+            )
+        return WebhookServiceImpl(
+            ticket_repository=c.resolve(TicketRepository),
+            analysis_repository=c.resolve(AnalysisRepository),
+            ticket_analysis_service=webhook_analysis_service,
+            tracer=c.resolve(SpanTracer)
+        )
 
     def _register_use_cases(self) -> None:
         """Register use case implementations."""
-        # Get dependencies
-        ticket_repository = container.resolve(TicketRepository)
-        ticket_analysis_service = container.resolve(TicketAnalysisService)
-        reporting_service = container.resolve(ReportingService)
-
-        # Create AnalyzeTicketUseCase
-        analyze_ticket_use_case = AnalyzeTicketUseCase(
-            ticket_repository=ticket_repository,
-            ticket_analysis_service=ticket_analysis_service
+        container.register_factory(
+            AnalyzeTicketUseCase,
+            lambda c: AnalyzeTicketUseCase(
+                ticket_repository=c.resolve(TicketRepository),
+                ticket_analysis_service=c.resolve(TicketAnalysisService)
+            )
         )
-        container.register_instance(AnalyzeTicketUseCase, analyze_ticket_use_case)
-
-        # Create GenerateReportUseCase
-        generate_report_use_case = GenerateReportUseCase(
-            reporting_service=reporting_service
+        container.register_factory(
+            GenerateReportUseCase,
+            lambda c: GenerateReportUseCase(reporting_service=c.resolve(ReportingService))
         )
-        container.register_instance(GenerateReportUseCase, generate_report_use_case)
 
     def _register_utilities(self) -> None:
         """Register utility implementations."""
-        # TODO: Register any utility implementations
-        pass
+        # Process-wide tracer, configured from the environment
+        container.register_instance(SpanTracer, tracer)
+
+        # AI calls are attributed to their ticket, view or task in the usage ledger
+        container.register_factory(UsageAttribution, lambda c: ContextUsageAttribution())
+
+        # Report rendering counts as the 'render' stage of profiled runs
+        container.register_factory(StageTimer, lambda c: ContextStageTimer())
 
     def get_config(self) -> Any:
         """
@@ -5,12 +5,38 @@ This module exports the utility classes for use in the infrastructure layer,
 making them easier to import from other modules.
 """
 
+from src.infrastructure.utils.circuit_breaker import CircuitBreaker
 from src.infrastructure.utils.config_manager import (
     EnvironmentConfigManager,
     JsonFileConfigManager,
 )
 from src.infrastructure.utils.dependency_injection import DependencyContainer, container
+from src.infrastructure.utils.ip_allowlist import IPAllowlist
+from src.infrastructure.utils.metrics import (
+    InMemoryMetricsCollector,
+    instrumented,
+    metrics_collector,
+)
+from src.infrastructure.utils.quota_manager import AIQuotaManager, ModelQuota
+from src.infrastructure.utils.rate_limiter import (
+    SQLiteRateLimiter,
+    TokenBucketRateLimiter,
+)
 from src.infrastructure.utils.retry import ExponentialBackoffRetryStrategy, with_retry
+from src.infrastructure.utils.retry_policy import (
+    AI_RETRY_POLICY,
+    ExceptionClassifier,
+    RetryBudget,
+    RetryPolicy,
+    deadline,
+)
+from src.infrastructure.utils.tracing import (
+    JsonlSpanExporter,
+    OTLPSpanExporter,
+    Tracer,
+    traced,
+    tracer,
+)
 
 __all__ = [
     'DependencyContainer',
@@ -18,5 +44,24 @@ __all__ = [
     'EnvironmentConfigManager',
     'JsonFileConfigManager',
     'ExponentialBackoffRetryStrategy',
-    'with_retry'
+    'with_retry',
+    'TokenBucketRateLimiter',
+    'SQLiteRateLimiter',
+    'IPAllowlist',
+    'AIQuotaManager',
+    'ModelQuota',
+    'CircuitBreaker',
+    'RetryPolicy',
+    'RetryBudget',
+    'ExceptionClassifier',
+    'AI_RETRY_POLICY',
+    'deadline',
+    'InMemoryMetricsCollector',
+    'metrics_collector',
+    'instrumented',
+    'Tracer',
+    'JsonlSpanExporter',
+    'OTLPSpanExporter',
+    'tracer',
+    'traced'
 ]
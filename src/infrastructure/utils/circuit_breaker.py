@@ -0,0 +1,224 @@
+"""
+Circuit Breaker
+
+This module provides a circuit breaker that stops calling a dependency once
+too many recent calls failed or were too slow, and lets a few probe calls
+through after a cool-down to find out whether it recovered.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Count-based sliding-window circuit breaker.
+
+    The breaker keeps the outcome of the last ``window_size`` calls. Once at
+    least ``minimum_calls`` are recorded it opens when the failure rate or the
+    slow-call rate reaches its threshold. After ``open_seconds`` it becomes
+    half-open and admits ``half_open_probes`` calls: if all of them succeed it
+    closes again, and any failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 2,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Name of the protected dependency (used in logs)
+            failure_rate_threshold: Failure share of the window that opens the breaker
+            slow_call_seconds: Duration above which a successful call counts as slow
+            slow_call_rate_threshold: Slow-call share of the window that opens the breaker
+            window_size: Number of recent calls considered
+            minimum_calls: Calls needed in the window before rates are evaluated
+            open_seconds: Seconds to stay open before admitting probes
+            half_open_probes: Successful probes needed to close the breaker
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+
+        # (failed, slow) outcome of each recent call
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> 'CircuitBreaker':
+        """
+        Create a circuit breaker configured by AI_CIRCUIT_* environment variables.
+
+        Reads AI_CIRCUIT_FAILURE_RATE, AI_CIRCUIT_SLOW_CALL_SECONDS and
+        AI_CIRCUIT_OPEN_SECONDS; unset variables keep the defaults.
+
+        Args:
+            name: Name of the protected dependency
+
+        Returns:
+            Configured circuit breaker
+        """
+        return cls(
+            name,
+            failure_rate_threshold=float(os.getenv("AI_CIRCUIT_FAILURE_RATE", "0.5")),
+            slow_call_seconds=float(os.getenv("AI_CIRCUIT_SLOW_CALL_SECONDS", "30")),
+            open_seconds=float(os.getenv("AI_CIRCUIT_OPEN_SECONDS", "30"))
+        )
+
+    @property
+    def state(self) -> str:
+        """Get the current state, moving from open to half-open when the cool-down ended."""
+        with self._lock:
+            self._check_cool_down()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be made now.
+
+        In the half-open state every admitted call counts as a probe, so the
+        caller must record its outcome.
+
+        Returns:
+            True if the call may proceed
+        """
+        with self._lock:
+            self._check_cool_down()
+
+            if self._state == CLOSED:
+                return True
+
+            if self._state == HALF_OPEN and self._probes_started < self.half_open_probes:
+                self._probes_started += 1
+                return True
+
+            return False
+
+    def record_success(self, duration: float) -> None:
+        """
+        Record a successful call.
+
+        Args:
+            duration: Call duration in seconds
+        """
+        slow = duration >= self.slow_call_seconds
+
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if slow:
+                    self._open("slow probe")
+                    return
+
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self._close()
+                return
+
+            self._window.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self, duration: float) -> None:
+        """
+        Record a failed call.
+
+        Args:
+            duration: Call duration in seconds
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open("failed probe")
+                return
+
+            self._window.append((True, duration >= self.slow_call_seconds))
+            self._evaluate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the breaker state and window statistics.
+
+        Returns:
+            Dictionary with state, call count, failure rate, slow-call rate and open count
+        """
+        with self._lock:
+            self._check_cool_down()
+            failure_rate, slow_rate = self._rates()
+            return {
+                "state": self._state,
+                "calls": len(self._window),
+                "failure_rate": failure_rate,
+                "slow_call_rate": slow_rate,
+                "times_opened": self._times_opened
+            }
+
+    def _rates(self) -> Tuple[float, float]:
+        """Compute the failure and slow-call rates of the window."""
+        if not self._window:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        return failures / len(self._window), slow / len(self._window)
+
+    def _evaluate(self) -> None:
+        """Open the breaker if the window exceeds a threshold."""
+        if self._state != CLOSED or len(self._window) < self.minimum_calls:
+            return
+
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.failure_rate_threshold:
+            self._open(f"failure rate {failure_rate:.0%}")
+        elif slow_rate >= self.slow_call_rate_threshold:
+            self._open(f"slow-call rate {slow_rate:.0%}")
+
+    def _check_cool_down(self) -> None:
+        """Move an open breaker to half-open once its cool-down has passed."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_started = 0
+            self._probes_succeeded = 0
+            logger.info(f"Circuit {self.name} half-open, admitting {self.half_open_probes} probe(s)")
+
+    def _open(self, reason: str) -> None:
+        """Open the breaker."""
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._times_opened += 1
+        logger.warning(f"Circuit {self.name} opened ({reason}) for {self.open_seconds:.0f}s")
+
+    def _close(self) -> None:
+        """Close the breaker and start a fresh window."""
+        self._state = CLOSED
+        self._window.clear()
+        logger.info(f"Circuit {self.name} closed")
@@ -0,0 +1,152 @@
+"""
+IP Allowlist
+
+This module provides a compiled IP allowlist for the webhook security checks.
+
+Addresses and CIDR networks are converted once into sorted, merged integer
+intervals per IP version, so a lookup is a single binary search instead of a
+scan over every configured entry.
+"""
+
+import bisect
+import ipaddress
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class _CompiledRanges:
+    """Immutable sorted, non-overlapping [start, end] intervals of one IP version."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, networks: Iterable[IPNetwork]):
+        intervals = sorted(
+            (int(network.network_address), int(network.broadcast_address))
+            for network in networks
+        )
+
+        starts: List[int] = []
+        ends: List[int] = []
+        for start, end in intervals:
+            # Merge overlapping and adjacent ranges
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+
+        self.starts = starts
+        self.ends = ends
+
+    def contains(self, value: int) -> bool:
+        """Check whether an integer address falls inside any interval."""
+        index = bisect.bisect_right(self.starts, value) - 1
+        return index >= 0 and value <= self.ends[index]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+class IPAllowlist:
+    """
+    Compiled allowlist of IPv4 and IPv6 addresses and networks.
+
+    Single addresses are stored as /32 or /128 networks. Reloading builds a
+    new compiled table and swaps it in with one assignment, so lookups running
+    on other threads never see a half-built table.
+    """
+
+    def __init__(self, entries: Optional[Iterable[str]] = None):
+        """
+        Initialize the allowlist.
+
+        Args:
+            entries: IP addresses or CIDR networks (invalid entries are logged and skipped)
+        """
+        self._reload_lock = threading.Lock()
+        self._tables: Dict[int, _CompiledRanges] = {}
+        self.networks: List[IPNetwork] = []
+        self.reload(entries or [])
+
+    @staticmethod
+    def parse_entries(entries: Iterable[str]) -> List[IPNetwork]:
+        """
+        Parse allowlist entries into networks.
+
+        Args:
+            entries: IP addresses or CIDR networks
+
+        Returns:
+            List of parsed networks
+        """
+        networks = []
+        for entry in entries:
+            entry = entry.strip()
+            if not entry:
+                continue
+
+            try:
+                # Strict: a network with host bits set (10.0.0.5/8) is a typo, not 10.0.0.0/8
+                networks.append(ipaddress.ip_network(entry))
+            except ValueError as e:
+                logger.error(f"Invalid IP or network: {entry} - {e}")
+
+        return networks
+
+    def reload(self, entries: Iterable[str]) -> None:
+        """
+        Replace the allowlist contents.
+
+        Args:
+            entries: IP addresses or CIDR networks
+        """
+        networks = self.parse_entries(entries)
+        tables = {
+            4: _CompiledRanges(n for n in networks if n.version == 4),
+            6: _CompiledRanges(n for n in networks if n.version == 6)
+        }
+
+        with self._reload_lock:
+            self.networks = networks
+            self._tables = tables
+
+        logger.info(
+            f"IP allowlist compiled: {len(tables[4])} IPv4 and {len(tables[6])} IPv6 ranges"
+        )
+
+    def is_allowed(self, client_ip: Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]) -> bool:
+        """
+        Check whether an address is covered by the allowlist.
+
+        IPv4-mapped IPv6 addresses (``::ffff:a.b.c.d``) are checked against the
+        IPv4 ranges.
+
+        Args:
+            client_ip: Address to check
+
+        Returns:
+            True if the address is allowed, False otherwise (including unparsable input)
+        """
+        try:
+            ip = ipaddress.ip_address(client_ip)
+        except ValueError:
+            return False
+
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+
+        return self._tables[ip.version].contains(int(ip))
+
+    def is_empty(self) -> bool:
+        """Check whether the allowlist has no entries."""
+        return not self.networks
+
+    def __len__(self) -> int:
+        return len(self.networks)
@@ -0,0 +1,190 @@
+"""
+Streaming JSON Parsing
+
+This module provides an incremental JSON scanner for model output that
+arrives in chunks. It skips prose and markdown fences before the JSON value,
+tells when the top-level value is complete so generation can stop early, and
+repairs values cut off by the token limit by closing them at the last
+complete member.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+_CLOSERS = {"{": "}", "[": "]"}
+_LITERAL_CHARS = set("0123456789+-.eEtrufalsn")
+
+
+class IncrementalJSONParser:
+    """
+    Incremental scanner for the first JSON object or array in a text stream.
+
+    Feed chunks as they arrive; ``complete`` turns true once the top-level
+    value has closed, after which further input is ignored. ``value()``
+    parses the scanned text, repairing it if it was cut off.
+    """
+
+    def __init__(self):
+        """Initialize the parser."""
+        self._chars: List[str] = []
+        self._started = False
+        self.complete = False
+
+        # Open containers, with whether an object currently expects a key
+        self._stack: List[str] = []
+        self._expect_key: List[bool] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        self._in_literal = False
+
+        # Last position after a complete member, with the containers open there
+        self._safe_point: Optional[Tuple[int, str]] = None
+
+    @property
+    def text(self) -> str:
+        """Get the JSON text scanned so far."""
+        return "".join(self._chars)
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scan a chunk of the stream.
+
+        Args:
+            chunk: Next piece of model output
+
+        Returns:
+            True once the top-level JSON value is complete
+        """
+        if self.complete:
+            return True
+
+        for char in chunk:
+            if not self._started:
+                # Skip prose and fences before the value
+                if char in _CLOSERS:
+                    self._started = True
+                    self._open(char)
+                    self._chars.append(char)
+                continue
+
+            self._chars.append(char)
+            self._scan(char)
+            if self.complete:
+                return True
+
+        return False
+
+    def value(self) -> Any:
+        """
+        Parse the scanned JSON value, repairing it if it was cut off.
+
+        Returns:
+            The parsed value
+
+        Raises:
+            ValueError: If no JSON value was found or it can't be repaired
+        """
+        if not self._started:
+            raise ValueError("No JSON value found in response")
+
+        text = self.text
+        if self.complete:
+            return json.loads(text)
+
+        candidates = []
+        if self._in_string and not self._string_is_key:
+            # Keep a cut-off string value such as a suggested reply
+            candidates.append(text + ('\\"' if self._escape else '"') + self._closing(self._stack))
+        if self._in_literal:
+            candidates.append(text + self._closing(self._stack))
+        if self._safe_point is not None:
+            position, open_containers = self._safe_point
+            candidates.append(text[:position] + self._closing(list(open_containers)))
+
+        for candidate in candidates:
+            try:
+                return json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+        raise ValueError("Truncated JSON value could not be repaired")
+
+    def _scan(self, char: str) -> None:
+        """Advance the scanner state by one character of the JSON text."""
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if not self._string_is_key:
+                    self._mark_safe()
+            return
+
+        if self._in_literal:
+            if char in _LITERAL_CHARS:
+                return
+            self._in_literal = False
+            # The literal ended just before this character
+            self._mark_safe(offset=-1)
+
+        if char == '"':
+            self._in_string = True
+            self._string_is_key = bool(self._expect_key) and self._stack[-1] == "{" and self._expect_key[-1]
+        elif char in _CLOSERS:
+            self._open(char)
+        elif char in "}]":
+            self._stack.pop()
+            self._expect_key.pop()
+            if not self._stack:
+                self.complete = True
+                return
+            self._mark_safe()
+        elif char == ":":
+            self._expect_key[-1] = False
+        elif char == ",":
+            if self._stack[-1] == "{":
+                self._expect_key[-1] = True
+        elif char in _LITERAL_CHARS:
+            self._in_literal = True
+
+    def _open(self, char: str) -> None:
+        """Open a container."""
+        self._stack.append(char)
+        self._expect_key.append(char == "{")
+
+    def _mark_safe(self, offset: int = 0) -> None:
+        """Remember the current position as the end of a complete member."""
+        self._safe_point = (len(self._chars) + offset, "".join(self._stack))
+
+    @staticmethod
+    def _closing(open_containers: List[str]) -> str:
+        """Build the text closing the given open containers."""
+        return "".join(_CLOSERS[container] for container in reversed(open_containers))
+
+
+def parse_json_response(text: str) -> Any:
+    """
+    Parse the JSON value in a model response.
+
+    Tolerates prose or markdown fences around the value and repairs values
+    cut off by the token limit.
+
+    Args:
+        text: Model response text
+
+    Returns:
+        The parsed value
+
+    Raises:
+        ValueError: If the response contains no usable JSON value
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.value()
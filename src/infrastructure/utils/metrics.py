@@ -0,0 +1,328 @@
+"""
+Metrics
+
+This module provides an in-process implementation of the MetricsCollector
+interface with counters, gauges and fixed-bucket histograms, all labelled by
+tags, and renders them in the Prometheus text exposition format.
+
+Recording a value is a dictionary update under one lock, so metrics can be
+recorded on hot paths. Timings are recorded into histograms in milliseconds.
+"""
+
+import bisect
+import functools
+import math
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.domain.interfaces.utility_interfaces import MetricsCollector
+from src.infrastructure.utils.profiling import stage, stage_for
+from src.infrastructure.utils.tracing import tracer
+
+# Histogram bucket upper bounds, suited to latencies in milliseconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000
+)
+
+_LabelSet = Tuple[Tuple[str, str], ...]
+_SeriesKey = Tuple[str, _LabelSet]
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _label_set(tags: Optional[Dict[str, str]]) -> _LabelSet:
+    """Turn tags into a hashable, ordered label set."""
+    if not tags:
+        return ()
+    return tuple(sorted((str(key), str(value)) for key, value in tags.items()))
+
+
+def _metric_name(name: str, namespace: str) -> str:
+    """Turn a dotted metric name into a valid Prometheus metric name."""
+    name = _INVALID_NAME_CHARS.sub("_", name)
+    if namespace:
+        name = f"{namespace}_{name}"
+    if name[0].isdigit():
+        name = f"_{name}"
+    return name
+
+
+def _format_labels(labels: _LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as {key="value",...}."""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        f'{_INVALID_NAME_CHARS.sub("_", key)}="{_escape(value)}"' for key, value in pairs
+    )
+    return "{" + rendered + "}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Histogram:
+    """Bucket counts, sum and count of one histogram series."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class InMemoryMetricsCollector(MetricsCollector):
+    """
+    Metrics collector keeping counters, gauges and histograms in memory.
+
+    Series are identified by metric name and tags. Histograms use the
+    default buckets unless buckets were configured for the metric.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "zendesk_ai",
+        buckets: Optional[Dict[str, Sequence[float]]] = None,
+        default_buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """
+        Initialize the collector.
+
+        Args:
+            namespace: Prefix of the metric names in the Prometheus exposition
+            buckets: Bucket upper bounds per metric name
+            default_buckets: Bucket upper bounds of other histograms
+        """
+        self.namespace = namespace
+        self.default_buckets = tuple(sorted(default_buckets))
+        self._buckets = {name: tuple(sorted(bounds)) for name, bounds in (buckets or {}).items()}
+
+        self._counters: Dict[_SeriesKey, float] = {}
+        self._gauges: Dict[_SeriesKey, float] = {}
+        self._histograms: Dict[_SeriesKey, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, metric_name: str, value: float = 1.0, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Increment a counter metric.
+
+        Args:
+            metric_name: Name of the metric
+            value: Value to increment by
+            tags: Optional tags for the metric
+        """
+        key = (metric_name, _label_set(tags))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def timing(self, metric_name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Record a timing metric.
+
+        Args:
+            metric_name: Name of the metric
+            value: Timing value in milliseconds
+            tags: Optional tags for the metric
+        """
+        self.histogram(metric_name, value, tags)
+
+    def gauge(self, metric_name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Set a gauge metric.
+
+        Args:
+            metric_name: Name of the metric
+            value: Gauge value
+            tags: Optional tags for the metric
+        """
+        key = (metric_name, _label_set(tags))
+        with self._lock:
+            self._gauges[key] = value
+
+    def histogram(self, metric_name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """
+        Record a histogram value.
+
+        Args:
+            metric_name: Name of the metric
+            value: Histogram value
+            tags: Optional tags for the metric
+        """
+        key = (metric_name, _label_set(tags))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(
+                    self._buckets.get(metric_name, self.default_buckets)
+                )
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        """Forget all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the current values of all series.
+
+        Returns:
+            Dictionary with 'counters', 'gauges' and 'histograms', each a list
+            of series with 'name', 'tags' and their values
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "tags": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            gauges = [
+                {"name": name, "tags": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._gauges.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "tags": dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": dict(zip(
+                        [*map(str, histogram.bounds), "+Inf"],
+                        _cumulative(histogram.counts)
+                    ))
+                }
+                for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0])
+            ]
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def render_prometheus(self) -> str:
+        """
+        Render all series in the Prometheus text exposition format (0.0.4).
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = [
+                (key, histogram.bounds, list(histogram.counts), histogram.sum, histogram.count)
+                for key, histogram in sorted(self._histograms.items(), key=lambda item: item[0])
+            ]
+
+        lines: List[str] = []
+
+        for metric_name, series in _group(counters):
+            name = _metric_name(metric_name, self.namespace)
+            if not name.endswith("_total"):
+                name += "_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in series)
+
+        for metric_name, series in _group(gauges):
+            name = _metric_name(metric_name, self.namespace)
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in series)
+
+        for metric_name, series in _group([(key, rest) for key, *rest in histograms]):
+            name = _metric_name(metric_name, self.namespace)
+            lines.append(f"# TYPE {name} histogram")
+            for labels, (bounds, counts, total, count) in series:
+                for bound, cumulative in zip([*bounds, math.inf], _cumulative(counts)):
+                    le = ("le", _format_value(bound))
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _cumulative(counts: List[int]) -> List[int]:
+    """Turn per-bucket counts into cumulative counts."""
+    total = 0
+    cumulative = []
+    for count in counts:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def _group(items: List[Tuple[_SeriesKey, Any]]) -> List[Tuple[str, List[Tuple[_LabelSet, Any]]]]:
+    """Group sorted (name, labels) series by metric name."""
+    groups: Dict[str, List[Tuple[_LabelSet, Any]]] = {}
+    for (name, labels), value in items:
+        groups.setdefault(name, []).append((labels, value))
+    return list(groups.items())
+
+
+def instrumented(
+    metric_name: str,
+    error_kind: Optional[Callable[[Exception], str]] = None,
+    **tags: str
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Record the latency and errors of a method in its instance's collector.
+
+    Latency is recorded as timing '<metric_name>.latency' and errors are
+    counted in '<metric_name>.errors', tagged with the error kind. Nothing is
+    recorded when the instance's 'metrics' attribute is None. Each call also
+    runs in a tracing span named metric_name, with the tags as attributes,
+    and in the profiling stage of metric_name, if any.
+
+    Args:
+        metric_name: Base name of the metrics
+        error_kind: Function naming the kind of an error (default: its class name)
+        **tags: Tags of both metrics
+
+    Returns:
+        Method decorator
+    """
+    stage_name = stage_for(metric_name)
+
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, "metrics", None)
+            if metrics is None and not tracer.enabled:
+                with stage(stage_name):
+                    return method(self, *args, **kwargs)
+
+            with stage(stage_name), tracer.start_span(metric_name, tags):
+                start = time.perf_counter()
+                try:
+                    return method(self, *args, **kwargs)
+                except Exception as e:
+                    if metrics is not None:
+                        kind = error_kind(e) if error_kind else type(e).__name__
+                        metrics.increment(f"{metric_name}.errors", tags={**tags, "error": kind})
+                    raise
+                finally:
+                    if metrics is not None:
+                        metrics.timing(f"{metric_name}.latency", (time.perf_counter() - start) * 1000, tags)
+        return wrapper
+    return decorator
+
+
+# Process-wide collector shared by the services and exposed by the CLI and webhook
+metrics_collector = InMemoryMetricsCollector()
@@ -0,0 +1,370 @@
+"""
+Profiling
+
+This module provides built-in profiling of commands and webhook requests: a
+profile of the whole run, saved for later analysis, and a breakdown of its
+time by stage.
+
+A ProfileSession runs a block of code under cProfile, saved as a pstats file
+(for pstats, snakeviz or gprof2dot), or under a sampling profiler, saved as
+collapsed stacks (for flamegraph.pl or speedscope). The sampling profiler
+adds little overhead, so its timings stay close to an unprofiled run.
+
+Stages group the work of a run: fetch (Zendesk), analyze (AI), persist
+(MongoDB) and render (reports). The instrumented and traced calls are
+assigned a stage by the prefix of their name. Stage times are exclusive: a
+ticket fetched during an analysis counts as fetch, not analyze. Like tracing
+spans, stages follow the current context, so only the profiled command or
+request is timed.
+
+Profiles are saved in ZENDESK_AI_PROFILE_DIR (default: ./profiles).
+"""
+
+import contextlib
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Set
+
+from src.domain.interfaces.utility_interfaces import StageTimer
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+
+STAGES = ("fetch", "analyze", "persist", "render")
+
+# Stage of an instrumented or traced call, by the prefix of its name
+_STAGE_PREFIXES = (
+    ("zendesk.", "fetch"),
+    ("analysis.", "analyze"),
+    ("anthropic.", "analyze"),
+    ("openai.", "analyze"),
+    ("mongodb.", "persist"),
+)
+
+# cProfile can't profile two runs at once in Python 3.12+
+_cprofile_lock = threading.Lock()
+
+
+def stage_for(name: str) -> Optional[str]:
+    """
+    Get the stage of an instrumented or traced call.
+
+    Args:
+        name: Metric or span name, e.g. 'zendesk.request'
+
+    Returns:
+        Stage name, or None if the call belongs to no stage
+    """
+    for prefix, stage_name in _STAGE_PREFIXES:
+        if name.startswith(prefix):
+            return stage_name
+    return None
+
+
+class StageTimes:
+    """Exclusive wall and CPU time of each stage of a profiled run."""
+
+    def __init__(self):
+        """Initialize empty stage times."""
+        self._lock = threading.Lock()
+        self.wall: Dict[str, float] = {}
+        self.cpu: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def add(self, name: str, wall: float, cpu: float) -> None:
+        """
+        Add one timed block of a stage.
+
+        Args:
+            name: Stage name
+            wall: Exclusive wall time in seconds
+            cpu: Exclusive CPU time in seconds
+        """
+        with self._lock:
+            self.wall[name] = self.wall.get(name, 0.0) + wall
+            self.cpu[name] = self.cpu.get(name, 0.0) + cpu
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def rows(self, total_wall: float, total_cpu: float) -> List[Dict[str, Any]]:
+        """
+        Get the breakdown of a run.
+
+        Args:
+            total_wall: Wall time of the run in seconds
+            total_cpu: CPU time of the run in seconds
+
+        Returns:
+            One row per stage with 'stage', 'calls', 'wall' and 'cpu', in
+            pipeline order, then an 'other' row with the time outside any stage
+        """
+        with self._lock:
+            names = [name for name in STAGES if name in self.wall]
+            names += sorted(name for name in self.wall if name not in STAGES)
+            rows = [
+                {"stage": name, "calls": self.calls[name], "wall": self.wall[name], "cpu": self.cpu[name]}
+                for name in names
+            ]
+        rows.append({
+            "stage": "other",
+            "calls": None,
+            "wall": max(total_wall - sum(row["wall"] for row in rows), 0.0),
+            "cpu": max(total_cpu - sum(row["cpu"] for row in rows), 0.0)
+        })
+        return rows
+
+
+class _StageFrame:
+    """A running stage and the time spent in stages nested in it."""
+
+    __slots__ = ("name", "child_wall", "child_cpu")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+
+_stage_times: ContextVar[Optional[StageTimes]] = ContextVar("profile_stage_times", default=None)
+_current_stage: ContextVar[Optional[_StageFrame]] = ContextVar("profile_current_stage", default=None)
+
+
+@contextlib.contextmanager
+def stage(name: Optional[str]) -> Iterator[None]:
+    """
+    Time a block of code as a stage of the profiled run, if there is one.
+
+    A block nested in a block of the same stage (e.g. a retried call) is
+    counted once.
+
+    Args:
+        name: Stage name; None times nothing
+    """
+    times = _stage_times.get()
+    parent = _current_stage.get()
+    if times is None or name is None or (parent is not None and parent.name == name):
+        yield
+        return
+
+    frame = _StageFrame(name)
+    token = _current_stage.set(frame)
+    start_wall = time.perf_counter()
+    start_cpu = time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start_wall
+        cpu = time.thread_time() - start_cpu
+        _current_stage.reset(token)
+        times.add(name, wall - frame.child_wall, cpu - frame.child_cpu)
+        if parent is not None:
+            parent.child_wall += wall
+            parent.child_cpu += cpu
+
+
+class ContextStageTimer(StageTimer):
+    """Times stages with stage(), for injection into services."""
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """
+        Time a block of code as a stage of the profiled run, if there is one.
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Context manager for the block
+        """
+        return stage(name)
+
+
+class _StackSampler:
+    """Samples the stacks of running threads into collapsed-stack counts."""
+
+    def __init__(self, interval: float, thread_ids: Optional[Set[int]] = None):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+            thread_ids: Threads to sample (default: all but the sampler)
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.counts: Dict[str, int] = {}
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _label(self, code) -> str:
+        """Get the flame graph label of a code object, e.g. 'get_ticket (src/.../zendesk_repository.py:128)'."""
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            with contextlib.suppress(ValueError):
+                relative = os.path.relpath(filename)
+                if not relative.startswith(".."):
+                    filename = relative
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+
+class ProfileSession:
+    """
+    Profiles a block of code and times its stages.
+
+    Use as a context manager, then save() the profile and print
+    format_stages().
+    """
+
+    def __init__(self, mode: str = "cprofile", sample_interval: float = 0.005, all_threads: bool = True):
+        """
+        Initialize the session.
+
+        Args:
+            mode: 'cprofile' (deterministic, every call) or 'sample' (stack sampling)
+            sample_interval: Seconds between samples in sample mode
+            all_threads: Whether sample mode samples every thread or only the
+                one entering the session (cProfile only profiles that thread)
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.all_threads = all_threads
+        self.stages = StageTimes()
+        self.wall = 0.0
+        self.cpu = 0.0
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._tokens: List[Any] = []
+
+    @property
+    def extension(self) -> str:
+        """Get the file extension of the saved profile."""
+        return ".pstats" if self.mode == "cprofile" else ".collapsed"
+
+    def __enter__(self) -> "ProfileSession":
+        if self.mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                raise RuntimeError("Another cProfile session is running")
+            self._profiler = cProfile.Profile()
+        else:
+            self._sampler = _StackSampler(
+                self.sample_interval, None if self.all_threads else {threading.get_ident()}
+            )
+
+        self._tokens = [_stage_times.set(self.stages), _current_stage.set(None)]
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time() if self.all_threads else time.thread_time()
+        if self._profiler is not None:
+            self._profiler.enable()
+        else:
+            self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._profiler is not None:
+            self._profiler.disable()
+            _cprofile_lock.release()
+        else:
+            self._sampler.stop()
+        self.wall = time.perf_counter() - self._start_wall
+        self.cpu = (time.process_time() if self.all_threads else time.thread_time()) - self._start_cpu
+        _current_stage.reset(self._tokens[1])
+        _stage_times.reset(self._tokens[0])
+
+    def save(self, path: str) -> str:
+        """
+        Save the profile.
+
+        Args:
+            path: File path (a pstats file in cprofile mode, collapsed
+                stacks, one 'frame;frame;... count' line per stack, in sample mode)
+
+        Returns:
+            Absolute path of the saved file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self._profiler is not None:
+            self._profiler.dump_stats(path)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(self._sampler.counts.items()):
+                    f.write(f"{stack} {count}\n")
+        return os.path.abspath(path)
+
+    def format_stages(self, title: str = "Profile") -> str:
+        """
+        Format the stage breakdown as a text table.
+
+        Args:
+            title: First line of the table
+
+        Returns:
+            Text table of the calls, wall and CPU time of each stage
+        """
+        lines = [
+            f"{title}: {self.wall:.3f} s wall, {self.cpu:.3f} s CPU",
+            f"{'Stage':<10} {'Calls':>7} {'Wall (s)':>10} {'Wall %':>7} {'CPU (s)':>10}"
+        ]
+        for row in self.stages.rows(self.wall, self.cpu):
+            share = row["wall"] / self.wall * 100 if self.wall else 0.0
+            calls = "" if row["calls"] is None else str(row["calls"])
+            lines.append(f"{row['stage']:<10} {calls:>7} {row['wall']:>10.3f} {share:>6.1f}% {row['cpu']:>10.3f}")
+        return "\n".join(lines)
+
+
+def default_profile_path(name: str, extension: str) -> str:
+    """
+    Get a new profile file path in the profile directory.
+
+    Args:
+        name: Name of the profiled run, e.g. the command
+        extension: File extension (see ProfileSession.extension)
+
+    Returns:
+        Path like profiles/generatereport-20240501-120000-123456.pstats
+    """
+    directory = os.getenv("ZENDESK_AI_PROFILE_DIR", "profiles")
+    return os.path.join(directory, f"{name}-{datetime.now():%Y%m%d-%H%M%S-%f}{extension}")
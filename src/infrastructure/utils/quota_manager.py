@@ -0,0 +1,357 @@
+"""
+AI Quota Manager
+
+This module provides a client-side quota manager that keeps AI calls within
+the provider's requests-per-minute and tokens-per-minute limits.
+
+Each provider/model pair gets two token buckets refilled continuously over a
+minute. Callers reserve one request and an estimated number of tokens before
+a call, waiting in FIFO order when the buckets are short, and reconcile the
+estimate with the reported usage afterwards. A provider rate-limit response
+holds every caller of the model instead of letting each retry on its own.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+from src.domain.interfaces.ai_service_interfaces import RateLimitError
+from src.domain.interfaces.utility_interfaces import MetricsCollector, QuotaManager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Providers configurable through AI_QUOTA_<PROVIDER>_RPM / AI_QUOTA_<PROVIDER>_TPM
+QUOTA_PROVIDERS = ("anthropic", "openai")
+
+
+def retry_after_seconds(error: Exception, default: float = 10.0) -> float:
+    """
+    Read the retry-after delay of a provider rate-limit error.
+
+    Args:
+        error: Rate-limit exception raised by a provider SDK
+        default: Delay used when the response has no usable header
+
+    Returns:
+        Seconds to wait before calling the provider again
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class ModelQuota:
+    """Per-minute limits of a provider or model; None leaves a dimension unlimited."""
+
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+
+class _QuotaState:
+    """Bucket levels and waiting callers of a single provider/model pair."""
+
+    __slots__ = ("quota", "requests", "tokens", "updated", "blocked_until", "queue")
+
+    def __init__(self, quota: ModelQuota, now: float):
+        self.quota = quota
+        self.requests = float(quota.requests_per_minute or 0)
+        self.tokens = float(quota.tokens_per_minute or 0)
+        self.updated = now
+        self.blocked_until = 0.0
+        self.queue: Deque[object] = deque()
+
+
+class AIQuotaManager(QuotaManager):
+    """
+    In-process implementation of the QuotaManager interface.
+
+    Quotas are looked up by 'provider/model' first and 'provider' second;
+    calls to models without a quota are never delayed. One instance should be
+    shared by every AI service of the process so concurrent callers draw from
+    the same buckets.
+    """
+
+    def __init__(
+        self,
+        quotas: Optional[Dict[str, ModelQuota]] = None,
+        metrics: Optional[MetricsCollector] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the quota manager.
+
+        Args:
+            quotas: Mapping of 'provider' or 'provider/model' to its quota
+            metrics: Optional collector receiving utilization and wait metrics
+            clock: Monotonic time source
+        """
+        self.quotas = dict(quotas or {})
+        self.metrics = metrics
+        self._clock = clock
+        self._states: Dict[str, _QuotaState] = {}
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_env(cls, metrics: Optional[MetricsCollector] = None) -> 'AIQuotaManager':
+        """
+        Create a quota manager from AI_QUOTA_<PROVIDER>_RPM and AI_QUOTA_<PROVIDER>_TPM.
+
+        Args:
+            metrics: Optional metrics collector
+
+        Returns:
+            Quota manager with a provider-wide quota for every configured provider
+        """
+        quotas = {}
+        for provider in QUOTA_PROVIDERS:
+            rpm = os.getenv(f"AI_QUOTA_{provider.upper()}_RPM")
+            tpm = os.getenv(f"AI_QUOTA_{provider.upper()}_TPM")
+            if rpm or tpm:
+                quotas[provider] = ModelQuota(
+                    requests_per_minute=int(rpm) if rpm else None,
+                    tokens_per_minute=int(tpm) if tpm else None
+                )
+        return cls(quotas, metrics=metrics)
+
+    def acquire(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int,
+        timeout: Optional[float] = None
+    ) -> float:
+        """
+        Reserve one request and an estimated number of tokens, waiting if needed.
+
+        Callers of the same model are served in arrival order.
+
+        Args:
+            provider: AI provider name (e.g., 'anthropic')
+            model: Model name
+            estimated_tokens: Estimated tokens of the call
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            Seconds spent waiting for quota
+
+        Raises:
+            RateLimitError: If the quota is not available within the timeout
+        """
+        start = self._clock()
+        deadline = None if timeout is None else start + timeout
+
+        with self._condition:
+            state = self._get_state(provider, model, start)
+            if state is None:
+                return 0.0
+
+            ticket = object()
+            state.queue.append(ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(state, now)
+
+                    wait: Optional[float] = None
+                    if state.queue[0] is ticket:
+                        wait = self._wait_time(state, estimated_tokens, now)
+                        if wait <= 0:
+                            self._take(state, estimated_tokens)
+                            break
+
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self._increment("ai_quota.timeouts", provider, model)
+                            raise RateLimitError(
+                                f"Client-side quota for {provider}/{model} not available within {timeout}s"
+                            )
+                        wait = remaining if wait is None else min(wait, remaining)
+
+                    self._condition.wait(wait)
+            finally:
+                state.queue.remove(ticket)
+                self._condition.notify_all()
+
+            self._report(provider, model, state)
+
+        waited = self._clock() - start
+        if waited > 0:
+            logger.debug(f"Waited {waited:.2f}s for {provider}/{model} quota")
+            if self.metrics:
+                self.metrics.timing("ai_quota.wait", waited * 1000, {"provider": provider, "model": model})
+        return waited
+
+    def reconcile(self, provider: str, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct a reservation with the tokens the call actually used.
+
+        Overestimates are returned to the bucket; underestimates are taken
+        from it, possibly leaving it in debt until it refills.
+
+        Args:
+            provider: AI provider name
+            model: Model name
+            estimated_tokens: Tokens reserved by acquire
+            actual_tokens: Tokens reported by the provider
+        """
+        with self._condition:
+            state = self._get_state(provider, model, self._clock())
+            if state is None or not state.quota.tokens_per_minute:
+                return
+
+            state.tokens = min(
+                float(state.quota.tokens_per_minute),
+                state.tokens + estimated_tokens - actual_tokens
+            )
+            self._condition.notify_all()
+
+    def throttle(self, provider: str, model: str, seconds: float) -> None:
+        """
+        Hold all calls for a model after the provider reported a rate limit.
+
+        Args:
+            provider: AI provider name
+            model: Model name
+            seconds: Seconds to hold calls for
+        """
+        with self._condition:
+            now = self._clock()
+            state = self._get_state(provider, model, now, create_unlimited=True)
+            state.blocked_until = max(state.blocked_until, now + seconds)
+
+        logger.warning(f"Holding {provider}/{model} calls for {seconds:.1f}s after a provider rate limit")
+        self._increment("ai_quota.throttled", provider, model)
+
+    def get_utilization(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the current quota utilization.
+
+        Returns:
+            Mapping of 'provider/model' to request and token utilization (0-1)
+            and the number of queued callers
+        """
+        with self._condition:
+            now = self._clock()
+            utilization = {}
+            for key, state in self._states.items():
+                self._refill(state, now)
+                utilization[key] = self._utilization(state)
+            return utilization
+
+    def _get_state(
+        self,
+        provider: str,
+        model: str,
+        now: float,
+        create_unlimited: bool = False
+    ) -> Optional[_QuotaState]:
+        """
+        Get the bucket state of a model, creating it on first use.
+
+        Args:
+            provider: AI provider name
+            model: Model name
+            now: Current time
+            create_unlimited: Create a state even if no quota is configured
+
+        Returns:
+            Quota state, or None for models without a quota
+        """
+        key = f"{provider}/{model}"
+        state = self._states.get(key)
+        if state is None:
+            quota = self.quotas.get(key) or self.quotas.get(provider)
+            if quota is None:
+                if not create_unlimited:
+                    return None
+                quota = ModelQuota()
+            state = _QuotaState(quota, now)
+            self._states[key] = state
+        return state
+
+    @staticmethod
+    def _refill(state: _QuotaState, now: float) -> None:
+        """Refill both buckets for the time elapsed since the last update."""
+        elapsed = max(0.0, now - state.updated)
+        state.updated = now
+
+        rpm = state.quota.requests_per_minute
+        if rpm:
+            state.requests = min(float(rpm), state.requests + elapsed * rpm / 60.0)
+
+        tpm = state.quota.tokens_per_minute
+        if tpm:
+            state.tokens = min(float(tpm), state.tokens + elapsed * tpm / 60.0)
+
+    @staticmethod
+    def _wait_time(state: _QuotaState, estimated_tokens: int, now: float) -> float:
+        """
+        Compute how long until a reservation fits.
+
+        Args:
+            state: Quota state, refilled up to now
+            estimated_tokens: Tokens to reserve
+            now: Current time
+
+        Returns:
+            Seconds to wait (0 or less when the reservation fits now)
+        """
+        wait = state.blocked_until - now
+
+        rpm = state.quota.requests_per_minute
+        if rpm and state.requests < 1:
+            wait = max(wait, (1 - state.requests) * 60.0 / rpm)
+
+        tpm = state.quota.tokens_per_minute
+        if tpm:
+            # A call larger than the whole bucket only waits for a full bucket
+            needed = min(float(estimated_tokens), float(tpm))
+            if state.tokens < needed:
+                wait = max(wait, (needed - state.tokens) * 60.0 / tpm)
+
+        return wait
+
+    @staticmethod
+    def _take(state: _QuotaState, estimated_tokens: int) -> None:
+        """Take one request and the estimated tokens from the buckets."""
+        if state.quota.requests_per_minute:
+            state.requests -= 1
+        if state.quota.tokens_per_minute:
+            state.tokens -= estimated_tokens
+
+    @staticmethod
+    def _utilization(state: _QuotaState) -> Dict[str, float]:
+        """Compute the utilization figures of a quota state."""
+        rpm = state.quota.requests_per_minute
+        tpm = state.quota.tokens_per_minute
+        return {
+            "requests": min(1.0, max(0.0, 1 - state.requests / rpm)) if rpm else 0.0,
+            "tokens": min(1.0, max(0.0, 1 - state.tokens / tpm)) if tpm else 0.0,
+            "queued": float(len(state.queue))
+        }
+
+    def _report(self, provider: str, model: str, state: _QuotaState) -> None:
+        """Publish the utilization of a quota state as gauges."""
+        if not self.metrics:
+            return
+
+        tags = {"provider": provider, "model": model}
+        utilization = self._utilization(state)
+        self.metrics.gauge("ai_quota.requests_utilization", utilization["requests"], tags)
+        self.metrics.gauge("ai_quota.tokens_utilization", utilization["tokens"], tags)
+        self.metrics.gauge("ai_quota.queued", utilization["queued"], tags)
+
+    def _increment(self, metric_name: str, provider: str, model: str) -> None:
+        """Increment a counter tagged with the provider and model."""
+        if self.metrics:
+            self.metrics.increment(metric_name, tags={"provider": provider, "model": model})
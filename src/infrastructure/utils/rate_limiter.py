@@ -0,0 +1,246 @@
+"""
+Rate Limiters
+
+This module provides token-bucket rate limiters used to protect the webhook
+endpoints against abuse.
+
+Each check costs O(1): a bucket is refilled lazily from the time elapsed since
+it was last touched instead of scanning stored request timestamps.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from src.domain.interfaces.utility_interfaces import RateLimiter
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class _Bucket:
+    """Token count of a single client and the time it was last refilled."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+def _refill(tokens: float, updated: float, now: float, limit: int, period: float) -> float:
+    """
+    Compute the token count of a bucket after refilling it up to now.
+
+    Args:
+        tokens: Token count at the last update
+        updated: Time of the last update
+        now: Current time
+        limit: Bucket capacity
+        period: Time in seconds to refill an empty bucket
+
+    Returns:
+        Refilled token count, capped at the bucket capacity
+    """
+    elapsed = max(0.0, now - updated)
+    return min(float(limit), tokens + elapsed * limit / period)
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    In-memory token-bucket rate limiter.
+
+    Every key gets a bucket holding up to ``limit`` tokens that refills at
+    ``limit / period`` tokens per second; a request is allowed when it can
+    take a whole token. Buckets are kept in LRU order and the least recently
+    seen key is dropped once ``max_keys`` is reached, so memory stays bounded
+    no matter how many distinct clients call in.
+    """
+
+    def __init__(self, max_keys: int = 10000, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_keys: Maximum number of tracked keys
+            clock: Time source returning seconds
+        """
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_rate_limited(self, key: str, limit: int, period: float) -> bool:
+        """
+        Check a request against the limit and record it if allowed.
+
+        Args:
+            key: Identifier for the client (e.g., IP address)
+            limit: Maximum number of requests allowed in the period
+            period: Time period in seconds
+
+        Returns:
+            True if rate limited, False otherwise
+        """
+        with self._lock:
+            now = self._clock()
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = _Bucket(float(limit), now)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                bucket.tokens = _refill(bucket.tokens, bucket.updated, now, limit, period)
+                bucket.updated = now
+                self._buckets.move_to_end(key)
+
+            if bucket.tokens < 1.0:
+                return True
+
+            bucket.tokens -= 1.0
+            return False
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """
+        Forget the recorded state for a key, or for all keys.
+
+        Args:
+            key: Identifier to reset (resets everything if None)
+        """
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        """Get the number of tracked keys."""
+        return len(self._buckets)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Token-bucket rate limiter backed by a SQLite database.
+
+    All processes pointing at the same database file share their buckets, so
+    several webhook workers enforce one global limit. Each check runs in a
+    single ``BEGIN IMMEDIATE`` transaction. Rows whose bucket would be full
+    again are purged every ``cleanup_interval`` checks through an index on
+    that time, which keeps the table bounded by the number of active clients.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        cleanup_interval: int = 1000,
+        timeout: float = 5.0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            db_path: Path to the SQLite database file
+            cleanup_interval: Number of checks between purges of idle buckets
+            timeout: Seconds to wait for a lock held by another process
+            clock: Time source returning seconds (must agree across processes)
+        """
+        self.db_path = db_path
+        self.cleanup_interval = cleanup_interval
+        self._clock = clock
+        self._checks = 0
+        self._lock = threading.Lock()
+
+        self._connection = sqlite3.connect(
+            db_path,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._initialize_schema()
+
+    def _initialize_schema(self) -> None:
+        """Create the bucket table and its index if they do not exist."""
+        if self.db_path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, "
+            "tokens REAL NOT NULL, "
+            "updated REAL NOT NULL, "
+            "full_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rate_limits_full_at ON rate_limits (full_at)"
+        )
+
+    def is_rate_limited(self, key: str, limit: int, period: float) -> bool:
+        """
+        Check a request against the limit and record it if allowed.
+
+        Args:
+            key: Identifier for the client (e.g., IP address)
+            limit: Maximum number of requests allowed in the period
+            period: Time period in seconds
+
+        Returns:
+            True if rate limited, False otherwise
+        """
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                now = self._clock()
+                row = cursor.execute(
+                    "SELECT tokens, updated FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    tokens = float(limit)
+                else:
+                    tokens = _refill(row[0], row[1], now, limit, period)
+
+                limited = tokens < 1.0
+                if not limited:
+                    tokens -= 1.0
+
+                full_at = now + (limit - tokens) * period / limit
+                cursor.execute(
+                    "INSERT OR REPLACE INTO rate_limits (key, tokens, updated, full_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, full_at)
+                )
+
+                self._checks += 1
+                if self._checks >= self.cleanup_interval:
+                    self._checks = 0
+                    cursor.execute("DELETE FROM rate_limits WHERE full_at <= ?", (now,))
+
+                cursor.execute("COMMIT")
+                return limited
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """
+        Forget the recorded state for a key, or for all keys.
+
+        Args:
+            key: Identifier to reset (resets everything if None)
+        """
+        with self._lock:
+            if key is None:
+                self._connection.execute("DELETE FROM rate_limits")
+            else:
+                self._connection.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -11,6 +11,7 @@ import time
 from typing import Callable, List, Optional, Type, TypeVar, Union
 
 from src.domain.interfaces.utility_interfaces import RetryStrategy
+from src.infrastructure.utils.tracing import tracer
 
 T = TypeVar('T')
 
@@ -90,7 +91,8 @@ class ExponentialBackoffRetryStrategy(RetryStrategy):
                 )
 
                 # Wait before retrying
-                time.sleep(delay)
+                with tracer.start_span("retry.sleep", {"attempt": attempt + 1, "delay_seconds": delay, "error": type(e).__name__}):
+                    time.sleep(delay)
 
         # If we've exhausted all retries
         if last_exception:
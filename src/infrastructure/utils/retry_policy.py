@@ -0,0 +1,476 @@
+"""
+Retry Policies
+
+This module provides a retry policy engine that decides per exception whether
+a failed call is retried. Exceptions are classified as retryable,
+non-retryable or retry-after (the error says when to come back). Retries
+draw from a retry budget shared by every caller of the policy, never sleep
+past the caller's deadline, and are counted per cause.
+
+Deadlines are propagated with a context variable, so they follow the call
+through nested functions, threads started with a copied context, and asyncio
+tasks. Callers that handle failures themselves, such as a router failing over
+to another provider, can turn retries off the same way with single_attempt().
+"""
+
+import contextlib
+import functools
+import inspect
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from src.domain.interfaces.ai_service_interfaces import (
+    AIServiceError,
+    ContentFilterError,
+    InvalidRequestError,
+    RateLimitError,
+    ResponseFormatError,
+    TokenLimitError,
+)
+from src.domain.interfaces.utility_interfaces import MetricsCollector, RetryStrategy
+from src.infrastructure.utils.metrics import metrics_collector
+from src.infrastructure.utils.tracing import tracer
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Exception classifications
+RETRYABLE = "retryable"
+NON_RETRYABLE = "non_retryable"
+RETRY_AFTER = "retry_after"
+
+# Absolute monotonic deadline of the current call chain, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("retry_deadline", default=None)
+
+# Whether calls in the current call chain are attempted only once
+_single_attempt: ContextVar[bool] = ContextVar("retry_single_attempt", default=False)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Bound the time of everything called within the block.
+
+    Nested deadlines can only shorten the deadline of the enclosing block.
+
+    Args:
+        seconds: Seconds the block may take
+
+    Yields:
+        The absolute monotonic deadline in effect
+    """
+    current = _deadline.get()
+    new_deadline = time.monotonic() + seconds
+    if current is not None:
+        new_deadline = min(current, new_deadline)
+
+    token = _deadline.set(new_deadline)
+    try:
+        yield new_deadline
+    finally:
+        _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def single_attempt() -> Iterator[None]:
+    """
+    Attempt everything called within the block only once.
+
+    Retry policies give up on the first failure within the block, so the
+    caller sees it at once and can handle it, e.g. by failing over.
+    """
+    token = _single_attempt.set(True)
+    try:
+        yield
+    finally:
+        _single_attempt.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Get the time left until the current deadline.
+
+    Returns:
+        Seconds left (0 once passed), or None without a deadline
+    """
+    current = _deadline.get()
+    if current is None:
+        return None
+    return max(0.0, current - time.monotonic())
+
+
+@dataclass(frozen=True)
+class RetryDecision:
+    """Classification of an exception, with the delay a retry-after error asked for."""
+
+    kind: str
+    delay: Optional[float] = None
+
+
+class ExceptionClassifier:
+    """
+    Classifies exceptions by ordered rules.
+
+    The first rule whose exception types match decides; exceptions matching
+    no rule get the default classification.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[Tuple[Type[BaseException], ...], str]],
+        default: str = NON_RETRYABLE
+    ):
+        """
+        Initialize the classifier.
+
+        Args:
+            rules: (exception types, classification) pairs, most specific first
+            default: Classification of exceptions matching no rule
+        """
+        self.rules = list(rules)
+        self.default = default
+
+    def classify(self, error: BaseException) -> RetryDecision:
+        """
+        Classify an exception.
+
+        Args:
+            error: The exception raised by the call
+
+        Returns:
+            Retry decision for the exception
+        """
+        for exception_types, kind in self.rules:
+            if isinstance(error, exception_types):
+                if kind == RETRY_AFTER:
+                    return RetryDecision(kind, getattr(error, "retry_after", None))
+                return RetryDecision(kind)
+        return RetryDecision(self.default)
+
+    def retryable_types(self) -> List[Type[BaseException]]:
+        """
+        Get the exception types classified as retryable or retry-after.
+
+        Returns:
+            List of exception types
+        """
+        return [
+            exception_type
+            for exception_types, kind in self.rules if kind != NON_RETRYABLE
+            for exception_type in exception_types
+        ]
+
+
+class RetryBudget:
+    """
+    Caps the number of retries within a sliding time window.
+
+    A budget shared by every caller of a dependency keeps retries from
+    multiplying the load while the dependency is failing.
+    """
+
+    def __init__(self, max_retries: int = 20, window_seconds: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the retry budget.
+
+        Args:
+            max_retries: Retries allowed within the window
+            window_seconds: Length of the window in seconds
+            clock: Monotonic time source
+        """
+        self.max_retries = max_retries
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """
+        Take one retry from the budget.
+
+        Returns:
+            True if the retry is within budget
+        """
+        with self._lock:
+            now = self._clock()
+            while self._retries and now - self._retries[0] >= self.window_seconds:
+                self._retries.popleft()
+            if len(self._retries) >= self.max_retries:
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RetryPolicy(RetryStrategy):
+    """
+    Retry strategy driven by exception classification.
+
+    Non-retryable exceptions are raised at once. Retryable ones are retried
+    with exponential backoff and jitter; retry-after ones wait the delay the
+    error asked for. Every retry takes one unit of the budget, and a retry is
+    abandoned when its delay would pass the current deadline. Instances can
+    be used as decorators on both regular and async functions.
+    """
+
+    def __init__(
+        self,
+        classifier: ExceptionClassifier,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: bool = True,
+        budget: Optional[RetryBudget] = None,
+        name: str = "default",
+        metrics: Optional[MetricsCollector] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            classifier: Classifier deciding which exceptions are retried
+            max_retries: Maximum number of retries per call
+            base_delay: Base backoff delay in seconds
+            max_delay: Maximum backoff delay in seconds
+            jitter: Whether to add jitter to backoff delays
+            budget: Optional retry budget shared by the policy's callers
+            name: Policy name used in logs and metric tags
+            metrics: Optional collector receiving retry counters
+            sleep: Function used to wait between attempts
+        """
+        self.classifier = classifier
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.budget = budget
+        self.name = name
+        self.metrics = metrics
+        self._sleep = sleep
+
+        self._retries: Dict[str, int] = {}
+        self._give_ups: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Decorate a function so its calls follow the policy.
+
+        Args:
+            func: Regular or async function
+
+        Returns:
+            Decorated function
+        """
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.execute_async(func, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.execute(func, *args, **kwargs)
+        return wrapper
+
+    def execute(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Execute a function with retry logic.
+
+        Args:
+            func: Function to execute
+            *args: Arguments to pass to the function
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            Result of the function
+
+        Raises:
+            Exception: The last error once the call is not retried any more
+        """
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                with tracer.start_span("retry.sleep", {"attempt": attempt, "delay_seconds": delay, "error": type(e).__name__}):
+                    self._sleep(delay)
+
+    async def execute_async(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Execute an async function with retry logic.
+
+        Args:
+            func: Async function to execute
+            *args: Arguments to pass to the function
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            Result of the function
+
+        Raises:
+            Exception: The last error once the call is not retried any more
+        """
+        import asyncio  # Only async callers pay for importing asyncio
+
+        attempt = 0
+        while True:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                with tracer.start_span("retry.sleep", {"attempt": attempt, "delay_seconds": delay, "error": type(e).__name__}):
+                    await asyncio.sleep(delay)
+
+    def get_retry_count(self) -> int:
+        """
+        Get the maximum number of retries.
+
+        Returns:
+            Maximum retry count
+        """
+        return self.max_retries
+
+    def get_retry_exceptions(self) -> List[type]:
+        """
+        Get the exceptions that trigger a retry.
+
+        Returns:
+            List of exception types
+        """
+        return self.classifier.retryable_types()
+
+    def get_retry_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get retry counts per cause.
+
+        Returns:
+            Dictionary with 'retries' per exception type and 'give_ups' per
+            reason ('non_retryable', 'single_attempt', 'max_retries',
+            'budget', 'deadline')
+        """
+        with self._lock:
+            return {"retries": dict(self._retries), "give_ups": dict(self._give_ups)}
+
+    def _next_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Decide whether and after how long a failed attempt is retried.
+
+        Args:
+            error: Exception raised by the attempt
+            attempt: Number of retries made so far
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        cause = type(error).__name__
+        decision = self.classifier.classify(error)
+
+        if decision.kind == NON_RETRYABLE:
+            return self._give_up("non_retryable", cause, error)
+        if _single_attempt.get():
+            return self._give_up("single_attempt", cause, error)
+        if attempt >= self.max_retries:
+            return self._give_up("max_retries", cause, error)
+
+        if decision.kind == RETRY_AFTER and decision.delay is not None:
+            delay = decision.delay
+        else:
+            delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+            if self.jitter:
+                delay += random.uniform(0, delay / 2)
+
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            return self._give_up("deadline", cause, error)
+        if self.budget is not None and not self.budget.try_acquire():
+            return self._give_up("budget", cause, error)
+
+        with self._lock:
+            self._retries[cause] = self._retries.get(cause, 0) + 1
+        if self.metrics:
+            self.metrics.increment("retry.attempts", tags={"policy": self.name, "cause": cause})
+
+        logger.warning(f"Retry {attempt + 1}/{self.max_retries} of {self.name} call after {delay:.2f}s due to {cause}: {error}")
+        return delay
+
+    def _give_up(self, reason: str, cause: str, error: Exception) -> None:
+        """Count a call that is not retried any more."""
+        with self._lock:
+            self._give_ups[reason] = self._give_ups.get(reason, 0) + 1
+        if self.metrics:
+            self.metrics.increment("retry.give_ups", tags={"policy": self.name, "reason": reason, "cause": cause})
+
+        if reason not in ("non_retryable", "single_attempt"):
+            logger.error(f"Giving up {self.name} call ({reason}) after {cause}: {error}")
+        return None
+
+
+# HTTP statuses of client errors that can succeed when the request is repeated:
+# request timeout, conflict and too many requests
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 409, 429})
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """
+    Check whether a provider error response can succeed when the request is repeated.
+
+    Server errors are transient; other client errors, such as an invalid API
+    key, a missing permission or an unknown model, fail the same way again.
+
+    Args:
+        status_code: HTTP status code of the error response
+
+    Returns:
+        True if the request is worth retrying, False otherwise
+    """
+    return status_code >= 500 or status_code in RETRYABLE_CLIENT_STATUSES
+
+
+# AI provider errors: content and response-format problems fail the same way
+# again, provider rate limits say when to come back, and other provider errors
+# (timeouts, overload, connection resets) are transient. Anything else is a
+# bug in the caller and is not retried; the services raise InvalidRequestError
+# for the ones they catch (malformed or rejected requests, a missing SDK,
+# unexpected errors).
+AI_ERROR_CLASSIFIER = ExceptionClassifier([
+    ((TokenLimitError, ContentFilterError, ResponseFormatError, InvalidRequestError), NON_RETRYABLE),
+    ((RateLimitError,), RETRY_AFTER),
+    ((AIServiceError,), RETRYABLE),
+])
+
+# Shared by every AI service method, so the budget limits retries process-wide
+AI_RETRY_POLICY = RetryPolicy(
+    AI_ERROR_CLASSIFIER,
+    max_retries=3,
+    budget=RetryBudget(max_retries=30, window_seconds=60.0),
+    name="ai",
+    metrics=metrics_collector
+)
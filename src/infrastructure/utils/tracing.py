@@ -0,0 +1,597 @@
+"""
+Tracing
+
+This module provides lightweight span tracing. Spans form parent/child trees
+within a trace; the current span is propagated with a context variable, so
+it follows the call through nested functions, threads started with a copied
+context, and asyncio tasks.
+
+Whether a trace is recorded is decided once, at its root span, with the
+tracer's sample rate. Unsampled traces create no spans below the root, and
+with no exporter configured tracing costs one attribute check per call.
+
+Tracing is configured from the environment:
+
+- ZENDESK_AI_TRACE_FILE: JSONL file the spans are appended to
+- ZENDESK_AI_OTLP_ENDPOINT: OTLP/HTTP collector the spans are sent to
+  (e.g. http://localhost:4318)
+- ZENDESK_AI_TRACE_SAMPLE_RATE: Fraction of traces recorded (default: 1.0)
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from src.domain.interfaces.utility_interfaces import SpanExporter, SpanTracer
+from src.infrastructure.utils.profiling import stage, stage_for
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+class SpanContext(NamedTuple):
+    """Identity of a span, as propagated to its children."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "sampled",
+        "start_time_ns", "end_time_ns", "attributes", "events", "status", "status_message"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        sampled: bool = True,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize and start the span.
+
+        Args:
+            name: Operation name
+            trace_id: ID of the trace the span belongs to
+            parent_id: ID of the parent span, if any
+            sampled: Whether the span is recorded
+            attributes: Initial attributes
+        """
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_OK
+        self.status_message: Optional[str] = None
+
+    @property
+    def context(self) -> SpanContext:
+        """Get the span's identity."""
+        return SpanContext(self.trace_id, self.span_id, self.sampled)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """Get the duration in milliseconds, once the span has ended."""
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Set an attribute.
+
+        Args:
+            key: Attribute name
+            value: Attribute value (string, number or boolean)
+        """
+        if self.sampled:
+            self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        """
+        Record a point-in-time event within the span.
+
+        Args:
+            name: Event name
+            **attributes: Event attributes
+        """
+        if self.sampled:
+            self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+
+    def record_exception(self, error: BaseException) -> None:
+        """
+        Mark the span as failed by an exception.
+
+        Args:
+            error: The exception
+        """
+        if self.sampled:
+            self.status = STATUS_ERROR
+            self.status_message = f"{type(error).__name__}: {error}"
+            self.add_event("exception", type=type(error).__name__, message=str(error))
+
+    def end(self) -> None:
+        """End the span."""
+        if self.end_time_ns is None:
+            self.end_time_ns = time.time_ns()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the span to a dictionary.
+
+        Returns:
+            Dictionary representation of the span
+        """
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": self.status,
+            "status_message": self.status_message
+        }
+
+
+# Span of the operation currently running, if any
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+# Span handed out while tracing is disabled; it records nothing
+_DISABLED_SPAN = Span("disabled", trace_id="0" * 32, sampled=False)
+
+
+def current_span() -> Optional[Span]:
+    """
+    Get the span of the operation currently running.
+
+    Returns:
+        The current span, or None outside of a trace
+    """
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """
+    Get the ID of the current trace, e.g. to correlate log lines.
+
+    Returns:
+        The trace ID, or None outside of a sampled trace
+    """
+    span = _current_span.get()
+    return span.trace_id if span is not None and span.sampled else None
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """
+    Set attributes on the current span, if any.
+
+    Args:
+        **attributes: Attributes to set
+    """
+    span = _current_span.get()
+    if span is not None and span.sampled:
+        span.attributes.update(attributes)
+
+
+def record_exception(error: BaseException) -> None:
+    """
+    Mark the current span, if any, as failed by an exception that was handled.
+
+    Args:
+        error: The exception
+    """
+    span = _current_span.get()
+    if span is not None:
+        span.record_exception(error)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """
+    Parse a W3C traceparent header, e.g. from an incoming HTTP request.
+
+    Args:
+        header: Header value like '00-<trace id>-<span id>-01'
+
+    Returns:
+        The remote span context, or None if the header is missing or invalid
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3][:2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 1))
+
+
+class Tracer(SpanTracer):
+    """
+    Creates spans and hands finished, sampled spans to the exporters.
+
+    Tracing is enabled as long as at least one exporter is configured.
+    """
+
+    def __init__(self, exporters: Optional[Sequence[SpanExporter]] = None, sample_rate: float = 1.0):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporters: Exporters receiving finished spans
+            sample_rate: Fraction of traces recorded (0-1)
+        """
+        self.exporters: List[SpanExporter] = []
+        self.sample_rate = 1.0
+        self.enabled = False
+        self.configure(exporters, sample_rate)
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """
+        Create a tracer configured from the environment.
+
+        Returns:
+            Tracer exporting to ZENDESK_AI_TRACE_FILE and ZENDESK_AI_OTLP_ENDPOINT,
+            disabled if neither is set
+        """
+        exporters: List[SpanExporter] = []
+        trace_file = os.getenv("ZENDESK_AI_TRACE_FILE")
+        if trace_file:
+            exporters.append(JsonlSpanExporter(trace_file))
+        otlp_endpoint = os.getenv("ZENDESK_AI_OTLP_ENDPOINT")
+        if otlp_endpoint:
+            exporters.append(OTLPSpanExporter(otlp_endpoint))
+
+        try:
+            sample_rate = float(os.getenv("ZENDESK_AI_TRACE_SAMPLE_RATE", "1.0"))
+        except ValueError:
+            logger.warning("Invalid ZENDESK_AI_TRACE_SAMPLE_RATE, recording every trace")
+            sample_rate = 1.0
+
+        return cls(exporters, sample_rate)
+
+    def configure(self, exporters: Optional[Sequence[SpanExporter]] = None, sample_rate: Optional[float] = None) -> None:
+        """
+        Replace the exporters and optionally the sample rate.
+
+        Args:
+            exporters: Exporters receiving finished spans; none disables tracing
+            sample_rate: Fraction of traces recorded (0-1)
+        """
+        self.exporters = list(exporters or [])
+        if sample_rate is not None:
+            self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.enabled = bool(self.exporters)
+
+    @contextlib.contextmanager
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None
+    ) -> Iterator[Span]:
+        """
+        Run a block of code in a new span.
+
+        The span is a child of the current span, or of the given remote
+        parent. An exception leaving the block marks the span as failed.
+
+        Args:
+            name: Operation name
+            attributes: Initial attributes
+            parent: Remote parent, e.g. from parse_traceparent(); ignored
+                inside a trace
+
+        Yields:
+            The span
+        """
+        if not self.enabled:
+            yield _DISABLED_SPAN
+            return
+
+        current = _current_span.get()
+        if current is not None and not current.sampled:
+            # Nothing is recorded for an unsampled trace
+            yield current
+            return
+
+        if current is not None:
+            span = Span(name, current.trace_id, current.span_id, True, attributes)
+        elif parent is not None:
+            span = Span(name, parent.trace_id, parent.span_id, parent.sampled, attributes)
+        else:
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+            span = Span(name, f"{random.getrandbits(128):032x}", None, sampled, attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            if span.sampled:
+                self._export(span)
+
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        """
+        Run a block of code in a new span, and in the profiling stage of the
+        span name, if any.
+
+        Args:
+            name: Operation name
+            attributes: Initial attributes
+
+        Yields:
+            The span
+        """
+        with stage(stage_for(name)), self.start_span(name, attributes) as span:
+            yield span
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """
+        Set attributes on the current span, if any.
+
+        Args:
+            **attributes: Attributes to set
+        """
+        set_span_attributes(**attributes)
+
+    def record_exception(self, error: BaseException) -> None:
+        """
+        Mark the current span, if any, as failed by an exception that was handled.
+
+        Args:
+            error: The exception
+        """
+        record_exception(error)
+
+    def shutdown(self) -> None:
+        """Flush and shut down the exporters."""
+        for exporter in self.exporters:
+            try:
+                exporter.shutdown()
+            except Exception as e:
+                logger.warning(f"Error shutting down span exporter: {e}")
+
+    def _export(self, span: Span) -> None:
+        """Hand a finished span to the exporters."""
+        data = [span.to_dict()]
+        for exporter in self.exporters:
+            try:
+                exporter.export(data)
+            except Exception as e:
+                logger.warning(f"Error exporting span: {e}")
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends each finished span as one JSON line to a local file."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File to append the spans to
+        """
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        """
+        Append spans to the file.
+
+        Args:
+            spans: Spans to export
+        """
+        lines = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(lines)
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        """Close the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class OTLPSpanExporter(SpanExporter):
+    """
+    Sends spans to an OpenTelemetry collector over OTLP/HTTP with JSON encoding.
+
+    Spans are sent in batches; the last batch is sent at shutdown.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "zendesk-ai-integration",
+        batch_size: int = 64,
+        timeout: float = 5.0,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            endpoint: Collector base URL (e.g. http://localhost:4318) or full
+                traces URL ending in /v1/traces
+            service_name: service.name resource attribute
+            batch_size: Number of spans sent per request
+            timeout: Request timeout in seconds
+            headers: Extra request headers, e.g. for authentication
+        """
+        endpoint = endpoint.rstrip("/")
+        self.url = endpoint if endpoint.endswith("/v1/traces") else f"{endpoint}/v1/traces"
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        """
+        Buffer spans, sending a batch once it is full.
+
+        Args:
+            spans: Spans to export
+        """
+        with self._lock:
+            self._buffer.extend(spans)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._send(batch)
+
+    def shutdown(self) -> None:
+        """Send the buffered spans."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._send(batch)
+
+    def encode(self, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Encode spans as an OTLP ExportTraceServiceRequest.
+
+        Args:
+            spans: Spans to encode
+
+        Returns:
+            Request body
+        """
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [_otlp_span(span) for span in spans]
+                }]
+            }]
+        }
+
+    def _send(self, spans: List[Dict[str, Any]]) -> None:
+        """Post a batch of spans to the collector."""
+        from urllib.request import Request, urlopen
+
+        body = json.dumps(self.encode(spans), default=str).encode("utf-8")
+        request = Request(self.url, data=body, headers={"Content-Type": "application/json", **self.headers})
+        try:
+            with urlopen(request, timeout=self.timeout):
+                pass
+        except Exception as e:
+            logger.warning(f"Could not send {len(spans)} spans to {self.url}: {e}")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Encode attributes as OTLP KeyValues."""
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_span(span: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode a span as an OTLP Span."""
+    encoded = {
+        "traceId": span["trace_id"],
+        "spanId": span["span_id"],
+        "name": span["name"],
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span["start_time_ns"]),
+        "endTimeUnixNano": str(span["end_time_ns"]),
+        "attributes": _otlp_attributes(span["attributes"]),
+        "events": [
+            {
+                "name": event["name"],
+                "timeUnixNano": str(event["time_ns"]),
+                "attributes": _otlp_attributes(event["attributes"])
+            }
+            for event in span["events"]
+        ],
+        "status": {"code": 2, "message": span["status_message"] or ""}
+        if span["status"] == STATUS_ERROR else {"code": 1}
+    }
+    if span["parent_id"]:
+        encoded["parentSpanId"] = span["parent_id"]
+    return encoded
+
+
+def traced(name: str, **attributes: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Run every call of a function in a span of the process-wide tracer, and
+    in the profiling stage of the span name, if any.
+
+    Args:
+        name: Operation name
+        **attributes: Attributes of the span
+
+    Returns:
+        Function decorator
+    """
+    stage_name = stage_for(name)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                with stage(stage_name):
+                    return func(*args, **kwargs)
+            with stage(stage_name), tracer.start_span(name, attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Process-wide tracer, configured from the environment
+tracer = Tracer.from_env()
+atexit.register(tracer.shutdown)
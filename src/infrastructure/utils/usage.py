@@ -0,0 +1,200 @@
+"""
+AI Usage Accounting
+
+This module attributes AI calls to the work they were made for and prices
+them. Attribution (ticket, view, command, scheduled task) is set with
+usage_attribution() where the work starts and propagated with a context
+variable, so the AI services can label each call without the attribution
+being passed through every layer in between.
+
+Prices are in USD per million tokens and can be overridden with the
+AI_MODEL_PRICES environment variable, a JSON object mapping model names (or
+name prefixes) to {"input": ..., "output": ..., "cache_read": ...,
+"cache_write": ...}.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+from src.domain.interfaces.utility_interfaces import UsageAttribution
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Keys an AI call can be attributed to
+ATTRIBUTION_KEYS = ("ticket_id", "view_id", "command", "task_id")
+
+# USD per million tokens, matched by the longest model name prefix
+DEFAULT_MODEL_PRICES: Dict[str, Dict[str, float]] = {
+    "claude-3-haiku": {"input": 0.25, "output": 1.25, "cache_read": 0.03, "cache_write": 0.30},
+    "claude-3-5-haiku": {"input": 0.80, "output": 4.00, "cache_read": 0.08, "cache_write": 1.00},
+    "claude-3-5-sonnet": {"input": 3.00, "output": 15.00, "cache_read": 0.30, "cache_write": 3.75},
+    "claude-3-7-sonnet": {"input": 3.00, "output": 15.00, "cache_read": 0.30, "cache_write": 3.75},
+    "claude-3-opus": {"input": 15.00, "output": 75.00, "cache_read": 1.50, "cache_write": 18.75},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60, "cache_read": 0.075},
+    "gpt-4o": {"input": 2.50, "output": 10.00, "cache_read": 1.25},
+    "gpt-4-turbo": {"input": 10.00, "output": 30.00},
+    "gpt-4": {"input": 30.00, "output": 60.00},
+    "gpt-3.5-turbo": {"input": 0.50, "output": 1.50},
+}
+
+# Attribution of the work currently running
+_attribution: ContextVar[Dict[str, str]] = ContextVar("usage_attribution", default={})
+
+_prices: Optional[Dict[str, Dict[str, float]]] = None
+
+
+@contextlib.contextmanager
+def usage_attribution(**attributes: Any) -> Iterator[Dict[str, str]]:
+    """
+    Attribute the AI calls made within a block of code.
+
+    Attributes are added to those of enclosing blocks; None values are ignored.
+
+    Args:
+        **attributes: Attribution, e.g. ticket_id, view_id, command or task_id
+
+    Yields:
+        The attribution in effect within the block
+    """
+    attribution = {**_attribution.get(), **{k: str(v) for k, v in attributes.items() if v is not None}}
+    token = _attribution.set(attribution)
+    try:
+        yield attribution
+    finally:
+        _attribution.reset(token)
+
+
+class ContextUsageAttribution(UsageAttribution):
+    """Attributes AI calls with usage_attribution(), for injection into services."""
+
+    def attribute(self, **attributes: Any) -> ContextManager[Dict[str, str]]:
+        """
+        Attribute the AI calls made within a block of code.
+
+        Args:
+            **attributes: Attribution, e.g. ticket_id, view_id, command or task_id
+
+        Returns:
+            Context manager yielding the attribution in effect within the block
+        """
+        return usage_attribution(**attributes)
+
+
+def current_attribution() -> Dict[str, str]:
+    """
+    Get the attribution of the work currently running.
+
+    Returns:
+        Dictionary of attribution keys to values
+    """
+    return dict(_attribution.get())
+
+
+def model_prices() -> Dict[str, Dict[str, float]]:
+    """
+    Get the token prices per model, including overrides from AI_MODEL_PRICES.
+
+    Returns:
+        Mapping of model name prefixes to USD prices per million tokens
+    """
+    global _prices
+    if _prices is None:
+        prices = dict(DEFAULT_MODEL_PRICES)
+        overrides = os.getenv("AI_MODEL_PRICES")
+        if overrides:
+            try:
+                prices.update(json.loads(overrides))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Ignoring invalid AI_MODEL_PRICES: {e}")
+        _prices = prices
+    return _prices
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0
+) -> Optional[float]:
+    """
+    Estimate the cost of a call.
+
+    Cache reads and writes are charged at the input price when the model has
+    no cache prices.
+
+    Args:
+        model: Model name
+        input_tokens: Uncached input tokens
+        output_tokens: Output tokens
+        cache_read_tokens: Input tokens read from the prompt cache
+        cache_write_tokens: Input tokens written to the prompt cache
+
+    Returns:
+        Cost in USD, or None if the model's prices are unknown
+    """
+    prices = model_prices()
+    matches = [prefix for prefix in prices if model.startswith(prefix)]
+    if not matches:
+        return None
+    price = prices[max(matches, key=len)]
+
+    input_price = price.get("input", 0.0)
+    cost = (
+        input_tokens * input_price
+        + output_tokens * price.get("output", 0.0)
+        + cache_read_tokens * price.get("cache_read", input_price)
+        + cache_write_tokens * price.get("cache_write", input_price)
+    )
+    return round(cost / 1_000_000, 8)
+
+
+def usage_entry(
+    provider: str,
+    model: str,
+    operation: Optional[str],
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int,
+    cache_write_tokens: int,
+    latency_ms: float,
+    outcome: str
+) -> Dict[str, Any]:
+    """
+    Build a usage ledger entry for a call, attributed and priced.
+
+    Args:
+        provider: AI provider ('anthropic' or 'openai')
+        model: Model name
+        operation: Service operation that made the call, e.g. 'analyze_content'
+        input_tokens: Uncached input tokens
+        output_tokens: Output tokens
+        cache_read_tokens: Input tokens read from the prompt cache
+        cache_write_tokens: Input tokens written to the prompt cache
+        latency_ms: Call latency in milliseconds
+        outcome: 'ok', 'rate_limited' or 'error'
+
+    Returns:
+        Usage entry for UsageRepository.record
+    """
+    attribution = _attribution.get()
+    return {
+        "timestamp": time.time(),
+        "provider": provider,
+        "model": model,
+        "operation": operation or "unknown",
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_tokens": cache_read_tokens,
+        "cache_write_tokens": cache_write_tokens,
+        "latency_ms": round(latency_ms, 1),
+        "cost_usd": estimate_cost(model, input_tokens, output_tokens, cache_read_tokens, cache_write_tokens),
+        "outcome": outcome,
+        **{key: attribution.get(key) for key in ATTRIBUTION_KEYS}
+    }
@@ -19,15 +19,8 @@ load_dotenv()
 # Add src directory to the Python path to enable imports
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
-from src.infrastructure.service_provider import ServiceProvider
-from src.presentation.cli.command import Command
+# Commands are imported by the handler when selected, keeping startup fast
 from src.presentation.cli.command_handler import CommandHandler
-from src.presentation.cli.commands.analyze_ticket_command import AnalyzeTicketCommand
-from src.presentation.cli.commands.generate_report_command import GenerateReportCommand
-from src.presentation.cli.commands.interactive_command import InteractiveCommand
-from src.presentation.cli.commands.list_views_command import ListViewsCommand
-from src.presentation.cli.commands.schedule_command import ScheduleCommand
-from src.presentation.cli.commands.webhook_command import WebhookCommand
 
 
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> None:
@@ -65,7 +58,8 @@ def main() -> int:
         Exit code
     """
     # Parse command-line arguments for logging configuration
-    parser = argparse.ArgumentParser(description="Zendesk AI Integration")
+    # (without -h, so help is shown by the command handler)
+    parser = argparse.ArgumentParser(description="Zendesk AI Integration", add_help=False)
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -80,18 +74,41 @@ def main() -> int:
         "--config-file",
         help="Path to configuration file"
     )
+    parser.add_argument(
+        "--via-daemon",
+        action="store_true",
+        help="Run the command in the CLI daemon if it is running (or set ZENDESK_AI_USE_DAEMON=true)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the command (always run locally, not in the CLI daemon)"
+    )
 
     # Parse arguments without consuming them (so they're available to commands)
     args, _ = parser.parse_known_args()
+    command_args = [arg for arg in sys.argv[1:] if arg != "--via-daemon"]
 
     # Set up logging
     setup_logging(args.log_level, args.log_file)
 
     try:
-        # Create service provider (not used directly by CommandHandler)
-        service_provider = ServiceProvider(args.config_file)
-
-        # Create command handler
+        # Thin client mode: forward the command to the warm daemon
+        # (profiled commands run locally, so the profile covers the whole run)
+        use_daemon = args.via_daemon or os.getenv("ZENDESK_AI_USE_DAEMON", "false").lower() == "true"
+        if use_daemon and not args.profile:
+            from src.presentation.cli.daemon import (
+                LOCAL_ONLY_COMMANDS,
+                command_name,
+                forward_command,
+            )
+            if command_name(command_args) not in LOCAL_ONLY_COMMANDS:
+                exit_code = forward_command(command_args)
+                if exit_code is not None:
+                    return exit_code
+                logging.warning("CLI daemon is not running or can't run the command, running it locally")
+
+        # Create command handler (services are built when a command first needs them)
         command_handler = CommandHandler()
 
         # Commands are already registered in the CommandHandler's __init__ method
@@ -107,7 +124,7 @@ def main() -> int:
         # command_handler.register_commands(command_classes)
 
         # Run the command handler
-        result = command_handler.handle_command()
+        result = command_handler.handle_command(command_args)
 
         # Return exit code (handle_command returns the exit code directly)
         return result
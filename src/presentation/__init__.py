@@ -3,45 +3,44 @@ Presentation Package
 
 This package contains the presentation layer for the Zendesk AI Integration application.
 It includes CLI and webhook interfaces for interacting with the application.
+
+Exported classes are imported on first access, so importing one CLI module
+doesn't load the whole presentation layer.
 """
 
-from src.presentation.cli.command import Command
-from src.presentation.cli.command_handler import CommandHandler
-
-# Import command classes
-from src.presentation.cli.commands import (
-    AnalyzeTicketCommand,
-    GenerateReportCommand,
-    InteractiveCommand,
-    ListViewsCommand,
-    ScheduleCommand,
-    WebhookCommand,
-)
-from src.presentation.cli.response_formatter import ResponseFormatter
-from src.presentation.reporters.hardware_reporter import HardwareReporterImpl
-from src.presentation.reporters.pending_reporter import PendingReporterImpl
-from src.presentation.reporters.sentiment_reporter import SentimentReporterImpl
-from src.presentation.webhook.webhook_handler import WebhookHandler
-
-__all__ = [
+import importlib
+
+_EXPORT_MODULES = {
     # CLI components
-    'CommandHandler',
-    'Command',
-    'ResponseFormatter',
+    'CommandHandler': 'src.presentation.cli.command_handler',
+    'Command': 'src.presentation.cli.command',
+    'ResponseFormatter': 'src.presentation.cli.response_formatter',
 
     # Webhook components
-    'WebhookHandler',
+    'WebhookHandler': 'src.presentation.webhook.webhook_handler',
 
     # Reporter implementations
-    'SentimentReporterImpl',
-    'HardwareReporterImpl',
-    'PendingReporterImpl',
+    'SentimentReporterImpl': 'src.presentation.reporters.sentiment_reporter',
+    'HardwareReporterImpl': 'src.presentation.reporters.hardware_reporter',
+    'PendingReporterImpl': 'src.presentation.reporters.pending_reporter',
 
     # Command classes
-    'AnalyzeTicketCommand',
-    'GenerateReportCommand',
-    'ListViewsCommand',
-    'InteractiveCommand',
-    'ScheduleCommand',
-    'WebhookCommand'
-]
+    'AnalyzeTicketCommand': 'src.presentation.cli.commands',
+    'GenerateReportCommand': 'src.presentation.cli.commands',
+    'ListViewsCommand': 'src.presentation.cli.commands',
+    'InteractiveCommand': 'src.presentation.cli.commands',
+    'ScheduleCommand': 'src.presentation.cli.commands',
+    'WebhookCommand': 'src.presentation.cli.commands',
+    'DaemonCommand': 'src.presentation.cli.commands',
+    'MetricsCommand': 'src.presentation.cli.commands',
+    'UsageCommand': 'src.presentation.cli.commands',
+}
+
+__all__ = list(_EXPORT_MODULES)
+
+
+def __getattr__(name):
+    """Import an exported class on first access."""
+    if name in _EXPORT_MODULES:
+        return getattr(importlib.import_module(_EXPORT_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,8 +5,7 @@ This package contains the command-line interface for the Zendesk AI Integration
 It uses the command pattern to handle different types of commands.
 """
 
-from src.presentation.cli.command_handler import CommandHandler
-from src.presentation.cli.commands import *
+import importlib
 
 __all__ = [
     'CommandHandler',
@@ -15,5 +14,18 @@ __all__ = [
     'ListViewsCommand',
     'WebhookCommand',
     'ScheduleCommand',
-    'InteractiveCommand'
+    'InteractiveCommand',
+    'DaemonCommand',
+    'MetricsCommand',
+    'UsageCommand'
 ]
+
+
+def __getattr__(name):
+    """Import exported classes on first access."""
+    if name == 'CommandHandler':
+        from src.presentation.cli.command_handler import CommandHandler
+        return CommandHandler
+    if name in __all__:
+        return getattr(importlib.import_module('src.presentation.cli.commands'), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
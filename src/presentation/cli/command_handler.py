@@ -6,25 +6,42 @@ and execution in the CLI interface.
 """
 
 import argparse
+import importlib
 import logging
 import os
 import sys
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from src.presentation.cli.command import Command
-
-# Import commands
-from src.presentation.cli.commands.analyze_ticket_command import AnalyzeTicketCommand
-from src.presentation.cli.commands.generate_report_command import GenerateReportCommand
-from src.presentation.cli.commands.interactive_command import InteractiveCommand
-from src.presentation.cli.commands.list_views_command import ListViewsCommand
-from src.presentation.cli.commands.schedule_command import ScheduleCommand
-from src.presentation.cli.commands.webhook_command import WebhookCommand
 from src.presentation.cli.response_formatter import ResponseFormatter
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Built-in commands as (name, description, "module:Class"). A command's module
+# is only imported when the command is selected, so startup and top-level
+# help don't pay for every command and its dependencies.
+BUILTIN_COMMANDS: List[Tuple[str, str, str]] = [
+    ("analyzeticket", "Analyze tickets using AI and return analysis results",
+     "src.presentation.cli.commands.analyze_ticket_command:AnalyzeTicketCommand"),
+    ("generatereport", "Generate various reports based on ticket analysis",
+     "src.presentation.cli.commands.generate_report_command:GenerateReportCommand"),
+    ("views", "List all available Zendesk views",
+     "src.presentation.cli.commands.list_views_command:ListViewsCommand"),
+    ("interactive", "Start interactive menu for easier navigation of Zendesk views and actions",
+     "src.presentation.cli.commands.interactive_command:InteractiveCommand"),
+    ("schedule", "Set up and manage scheduled analysis jobs",
+     "src.presentation.cli.commands.schedule_command:ScheduleCommand"),
+    ("webhook", "Manage webhook server for real-time ticket analysis",
+     "src.presentation.cli.commands.webhook_command:WebhookCommand"),
+    ("daemon", "Run a local daemon that keeps services warm for CLI commands",
+     "src.presentation.cli.commands.daemon_command:DaemonCommand"),
+    ("metrics", "Dump the collected metrics in Prometheus text or JSON format",
+     "src.presentation.cli.commands.metrics_command:MetricsCommand"),
+    ("usage", "Report AI token usage, cost and latency by day and view",
+     "src.presentation.cli.commands.usage_command:UsageCommand"),
+]
+
 
 class CommandHandler:
     """
@@ -62,7 +79,9 @@ Examples:
 
         # Create subparsers for commands
         self.subparsers = self.parser.add_subparsers(dest="command", help="Command to execute")
-        self.commands: Dict[str, Type[Command]] = {}
+        # Registered commands: a command class, or a "module:Class" path until loaded
+        self.commands: Dict[str, Union[Type[Command], str]] = {}
+        self._subparsers: Dict[str, argparse.ArgumentParser] = {}
         self.response_formatter = ResponseFormatter()
 
         # Register all commands
@@ -82,139 +101,311 @@ Examples:
             help="Logging level"
         )
 
+        self.parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Profile the command: save the profile and print the time spent "
+                 "fetching, analyzing, persisting and rendering to stderr"
+        )
+
+        self.parser.add_argument(
+            "--profile-mode",
+            choices=["cprofile", "sample"],
+            default="cprofile",
+            help="Profiler: cprofile (pstats file) or sample (collapsed stacks for "
+                 "flame graphs, lower overhead) (default: cprofile)"
+        )
+
+        self.parser.add_argument(
+            "--profile-output",
+            help="Profile file path (default: a new file in ZENDESK_AI_PROFILE_DIR or ./profiles)"
+        )
+
     def _initialize_services(self):
-        """Initialize all required services."""
-        try:
-            # Initialize repositories
-            from src.application.services.reporting_service import ReportingServiceImpl
-            from src.application.services.scheduler_service import SchedulerServiceImpl
-            from src.application.services.ticket_analysis_service import (
-                TicketAnalysisServiceImpl,
+        """
+        Register factories for all services.
+
+        Nothing is created here: each component is built on its first resolve,
+        together with only the dependencies it needs, so a command pays for
+        the services it uses rather than for the whole graph.
+        """
+        from src.domain.interfaces.ai_service_interfaces import (
+            AIService,
+            EnhancedAIService,
+        )
+        from src.domain.interfaces.reporter_interfaces import (
+            HardwareReporter,
+            PendingReporter,
+            SentimentReporter,
+        )
+        from src.domain.interfaces.repository_interfaces import (
+            AnalysisRepository,
+            AnalysisRollupRepository,
+            TicketRepository,
+            UsageRepository,
+            ViewRepository,
+        )
+        from src.domain.interfaces.service_interfaces import (
+            ReportingService,
+            SchedulerService,
+            TicketAnalysisService,
+            WebhookService,
+        )
+        from src.domain.interfaces.utility_interfaces import (
+            MetricsCollector,
+            QuotaManager,
+            SpanTracer,
+            StageTimer,
+            UsageAttribution,
+        )
+        from src.infrastructure.utils.metrics import metrics_collector
+
+        container = self.dependency_container
+
+        # Process-wide tracer, configured from the environment
+        def create_tracer(container):
+            from src.infrastructure.utils.tracing import tracer
+            return tracer
+
+        # AI calls are attributed to their ticket, view or task in the usage ledger
+        def create_usage_attribution(container):
+            from src.infrastructure.utils.usage import ContextUsageAttribution
+            return ContextUsageAttribution()
+
+        # Report rendering counts as the 'render' stage of profiled runs
+        def create_stage_timer(container):
+            from src.infrastructure.utils.profiling import ContextStageTimer
+            return ContextStageTimer()
+
+        # Repositories connect on first use, not when they are created
+        def create_ticket_repository(container):
+            from src.infrastructure.repositories.zendesk_repository import (
+                ZendeskRepository,
             )
-            from src.application.services.webhook_service import WebhookServiceImpl
+            return ZendeskRepository(metrics=container.resolve(MetricsCollector))
 
-            # Initialize use cases
-            from src.application.use_cases.analyze_ticket_use_case import (
-                AnalyzeTicketUseCase,
+        def create_analysis_repository(container):
+            from src.infrastructure.repositories.mongodb_repository import (
+                MongoDBRepository,
             )
-            from src.application.use_cases.generate_report_use_case import (
-                GenerateReportUseCase,
+            return MongoDBRepository(rollups=True, metrics=container.resolve(MetricsCollector))
+
+        # Ledger of every AI call's tokens, latency and cost (AI_USAGE_LEDGER=false disables it)
+        def create_usage_repository(container):
+            from src.infrastructure.repositories.usage_repository import (
+                create_usage_repository,
             )
+            return create_usage_repository()
 
-            # Initialize services
+        # One quota manager shared by both providers' services
+        def create_quota_manager(container):
+            from src.infrastructure.utils.quota_manager import AIQuotaManager
+            return AIQuotaManager.from_env(metrics=container.resolve(MetricsCollector))
+
+        def create_claude_service(container):
             from src.infrastructure.external_services.claude_service import (
                 ClaudeService,
             )
+            return ClaudeService(
+                quota_manager=container.resolve(QuotaManager),
+                streaming=os.getenv("CLAUDE_STREAMING", "true").lower() == "true",
+                metrics=container.resolve(MetricsCollector),
+                usage_repository=container.resolve(UsageRepository)
+            )
+
+        def create_openai_service(container):
             from src.infrastructure.external_services.openai_service import (
                 OpenAIService,
             )
-            from src.infrastructure.repositories.mongodb_repository import (
-                MongoDBRepository,
+            return OpenAIService(
+                quota_manager=container.resolve(QuotaManager),
+                metrics=container.resolve(MetricsCollector),
+                usage_repository=container.resolve(UsageRepository)
             )
-            from src.infrastructure.repositories.zendesk_repository import (
-                ZendeskRepository,
+
+        # Claude first, failing over to OpenAI while Claude's circuit is open
+        def create_routing_service(container):
+            from src.infrastructure.external_services.routing_ai_service import (
+                RoutingAIService,
             )
-            from src.presentation.reporters.hardware_reporter import (
-                HardwareReporterImpl,
+            from src.infrastructure.utils.circuit_breaker import CircuitBreaker
+            return RoutingAIService(
+                [("claude", container.resolve(AIService, "claude")),
+                 ("openai", container.resolve(AIService, "openai"))],
+                breaker_factory=CircuitBreaker.from_env
             )
-            from src.presentation.reporters.pending_reporter import PendingReporterImpl
 
-            # Initialize reporters
+        def create_ticket_analysis_service(container, ai_service=None):
+            from src.application.services.ticket_analysis_service import (
+                TicketAnalysisServiceImpl,
+            )
+            from src.domain.value_objects.content_window import ContentWindow
+            content_window = ContentWindow(
+                max_tokens=int(os.getenv("ANALYSIS_CONTENT_MAX_TOKENS", "3000")),
+                recent_comments=int(os.getenv("ANALYSIS_RECENT_COMMENTS", "5"))
+            )
+            return TicketAnalysisServiceImpl(
+                container.resolve(TicketRepository),
+                container.resolve(AnalysisRepository),
+                ai_service or container.resolve(AIService, "routing"),
+                content_window=content_window,
+                tracer=container.resolve(SpanTracer),
+                usage_attribution=container.resolve(UsageAttribution)
+            )
+
+        def create_webhook_service(container):
+            from src.application.services.webhook_service import WebhookServiceImpl
+
+            # Webhook analysis can hedge slow calls to cut tail latency (opt-in)
+            webhook_analysis_service = container.resolve(TicketAnalysisService)
+            if os.getenv("AI_HEDGE_ENABLED", "false").lower() == "true":
+                from src.infrastructure.external_services.hedged_ai_service import (
+                    HedgedAIService,
+                )
+                webhook_analysis_service = create_ticket_analysis_service(
+                    container,
+                    HedgedAIService.from_env(
+                        container.resolve(AIService, "routing"),
+                        hedge=container.resolve(AIService, "openai"),
+                        metrics=container.resolve(MetricsCollector)
+                    )
+                )
+            return WebhookServiceImpl(
+                container.resolve(TicketRepository),
+                container.resolve(AnalysisRepository),
+                webhook_analysis_service,
+                tracer=container.resolve(SpanTracer)
+            )
+
+        def create_sentiment_reporter(container):
             from src.presentation.reporters.sentiment_reporter import (
                 SentimentReporterImpl,
             )
+            return SentimentReporterImpl()
 
-            # Create instances and register with dependency container
-            ticket_repo = ZendeskRepository()
-            analysis_repo = MongoDBRepository()
-
-            claude_service = ClaudeService()
-            openai_service = OpenAIService()
-
-            ticket_analysis_service = TicketAnalysisServiceImpl(ticket_repo, analysis_repo, openai_service)
-            webhook_service = WebhookServiceImpl(ticket_repo, analysis_repo, ticket_analysis_service)
-            # Create reporters
-            sentiment_reporter = SentimentReporterImpl()
-            hardware_reporter = HardwareReporterImpl()
-            pending_reporter = PendingReporterImpl()
-
-            reporting_service = ReportingServiceImpl(
-                ticket_repository=ticket_repo,
-                analysis_repository=analysis_repo,
-                view_repository=ticket_repo,  # ZendeskRepository also implements ViewRepository
-                sentiment_reporter=sentiment_reporter,
-                hardware_reporter=hardware_reporter,
-                pending_reporter=pending_reporter,
-                ticket_analysis_service=ticket_analysis_service
+        def create_hardware_reporter(container):
+            from src.presentation.reporters.hardware_reporter import (
+                HardwareReporterImpl,
             )
-            scheduler_service = SchedulerServiceImpl()
+            return HardwareReporterImpl()
 
-            analyze_ticket_use_case = AnalyzeTicketUseCase(ticket_repo, ticket_analysis_service)
-            generate_report_use_case = GenerateReportUseCase(reporting_service)
+        def create_pending_reporter(container):
+            from src.presentation.reporters.pending_reporter import PendingReporterImpl
+            return PendingReporterImpl()
 
-            # Register all services with the dependency container
-            from src.domain.interfaces.ai_service_interfaces import (
-                AIService,
-                EnhancedAIService,
+        def create_reporting_service(container):
+            from src.application.services.reporting_service import ReportingServiceImpl
+            return ReportingServiceImpl(
+                ticket_repository=container.resolve(TicketRepository),
+                analysis_repository=container.resolve(AnalysisRepository),
+                view_repository=container.resolve(ViewRepository),
+                sentiment_reporter=container.resolve(SentimentReporter),
+                hardware_reporter=container.resolve(HardwareReporter),
+                pending_reporter=container.resolve(PendingReporter),
+                ticket_analysis_service=container.resolve(TicketAnalysisService),
+                rollup_repository=container.resolve(AnalysisRollupRepository),
+                stage_timer=container.resolve(StageTimer)
             )
-            from src.domain.interfaces.reporter_interfaces import (
-                HardwareReporter,
-                PendingReporter,
-                SentimentReporter,
+
+        def create_scheduler_service(container):
+            from src.application.services.scheduled_tasks import (
+                register_default_task_handlers,
             )
-            from src.domain.interfaces.repository_interfaces import (
-                AnalysisRepository,
-                TicketRepository,
-                ViewRepository,
+            from src.application.services.scheduler_service import SchedulerServiceImpl
+            from src.infrastructure.repositories.schedule_repository import (
+                SQLiteScheduleRepository,
             )
-            from src.domain.interfaces.service_interfaces import (
-                ReportingService,
-                SchedulerService,
-                TicketAnalysisService,
-                WebhookService,
+            scheduler_service = SchedulerServiceImpl(
+                schedule_repository=SQLiteScheduleRepository(),
+                catch_up_policy=os.getenv("SCHEDULE_CATCH_UP_POLICY", "run_once"),
+                jitter_seconds=float(os.getenv("SCHEDULE_JITTER_SECONDS", "0")),
+                metrics=container.resolve(MetricsCollector),
+                usage_attribution=container.resolve(UsageAttribution)
             )
+            register_default_task_handlers(
+                scheduler_service,
+                container.resolve(ReportingService),
+                container.resolve(TicketAnalysisService)
+            )
+            return scheduler_service
 
-            # Register repositories and services by interface
-            self.dependency_container.register_instance(TicketRepository, ticket_repo)
-            self.dependency_container.register_instance(AnalysisRepository, analysis_repo)
-            self.dependency_container.register_instance(ViewRepository, ticket_repo)  # ZendeskRepository implements ViewRepository too
-
-            # Register AI services
-            self.dependency_container.register_instance(AIService, claude_service, "claude")
-            self.dependency_container.register_instance(AIService, openai_service, "openai")
-            self.dependency_container.register_instance(EnhancedAIService, claude_service)
-
-            # Register application services
-            self.dependency_container.register_instance(TicketAnalysisService, ticket_analysis_service)
-            self.dependency_container.register_instance(WebhookService, webhook_service)
-            self.dependency_container.register_instance(ReportingService, reporting_service)
-            self.dependency_container.register_instance(SchedulerService, scheduler_service)
-
-            # Register reporters
-            self.dependency_container.register_instance(SentimentReporter, sentiment_reporter)
-            self.dependency_container.register_instance(HardwareReporter, hardware_reporter)
-            self.dependency_container.register_instance(PendingReporter, pending_reporter)
+        def create_analyze_ticket_use_case(container):
+            from src.application.use_cases.analyze_ticket_use_case import (
+                AnalyzeTicketUseCase,
+            )
+            return AnalyzeTicketUseCase(
+                container.resolve(TicketRepository),
+                container.resolve(TicketAnalysisService)
+            )
 
-            # Register use cases by name (not interfaces)
-            self.dependency_container.register_instance("analyze_ticket_use_case", analyze_ticket_use_case)
-            self.dependency_container.register_instance("generate_report_use_case", generate_report_use_case)
+        def create_generate_report_use_case(container):
+            from src.application.use_cases.generate_report_use_case import (
+                GenerateReportUseCase,
+            )
+            return GenerateReportUseCase(container.resolve(ReportingService))
 
-            logger.debug("Services initialized successfully")
+        # Offline batch analysis also opens its job store only when needed
+        def create_batch_analysis_service(container):
+            from src.application.services.batch_analysis_service import (
+                BatchAnalysisService,
+            )
+            from src.infrastructure.external_services.claude_batch_service import (
+                ClaudeBatchService,
+            )
+            from src.infrastructure.repositories.batch_job_repository import (
+                SQLiteBatchJobRepository,
+            )
+            return BatchAnalysisService(
+                ClaudeBatchService(container.resolve(AIService, "claude")),
+                container.resolve(AnalysisRepository),
+                SQLiteBatchJobRepository()
+            )
 
-        except Exception as e:
-            logger.exception(f"Error initializing services: {e}")
-            raise
+        # One process-wide metrics collector, also exposed by the metrics command and webhook server
+        container.register_instance(MetricsCollector, metrics_collector)
+        container.register_factory(SpanTracer, create_tracer)
+        container.register_factory(UsageAttribution, create_usage_attribution)
+        container.register_factory(StageTimer, create_stage_timer)
+
+        # Register repositories by interface
+        container.register_factory(TicketRepository, create_ticket_repository)
+        # ZendeskRepository implements ViewRepository too
+        container.register_factory(ViewRepository, lambda c: c.resolve(TicketRepository))
+        container.register_factory(AnalysisRepository, create_analysis_repository)
+        container.register_factory(AnalysisRollupRepository, lambda c: c.resolve(AnalysisRepository).enable_rollups())
+        container.register_factory(UsageRepository, create_usage_repository)
+
+        # Register AI services
+        container.register_factory(QuotaManager, create_quota_manager)
+        container.register_factory(AIService, create_claude_service, "claude")
+        container.register_factory(AIService, create_openai_service, "openai")
+        container.register_factory(AIService, create_routing_service, "routing")
+        container.register_factory(EnhancedAIService, lambda c: c.resolve(AIService, "claude"))
+
+        # Register application services
+        container.register_factory(TicketAnalysisService, create_ticket_analysis_service)
+        container.register_factory(WebhookService, create_webhook_service)
+        container.register_factory("webhook_service", lambda c: c.resolve(WebhookService))
+        container.register_factory(ReportingService, create_reporting_service)
+        container.register_factory(SchedulerService, create_scheduler_service)
+        container.register_factory("scheduler_service", lambda c: c.resolve(SchedulerService))
+
+        # Register reporters
+        container.register_factory(SentimentReporter, create_sentiment_reporter)
+        container.register_factory(HardwareReporter, create_hardware_reporter)
+        container.register_factory(PendingReporter, create_pending_reporter)
+
+        # Register use cases by name (not interfaces)
+        container.register_factory("analyze_ticket_use_case", create_analyze_ticket_use_case)
+        container.register_factory("generate_report_use_case", create_generate_report_use_case)
+        container.register_factory("batch_analysis_service", create_batch_analysis_service)
+
+        logger.debug("Service factories registered")
 
     def _register_all_commands(self):
         """Register all available commands."""
-        self.register_commands([
-            AnalyzeTicketCommand,
-            GenerateReportCommand,
-            ListViewsCommand,
-            InteractiveCommand,
-            ScheduleCommand,
-            WebhookCommand
-        ])
+        for name, description, class_path in BUILTIN_COMMANDS:
+            self.register_lazy_command(name, description, class_path)
 
     def register_command(self, command_class: Type[Command]) -> None:
         """
@@ -247,6 +438,56 @@ Examples:
             logger.exception(f"Error registering command {command_class.__name__}: {e}")
             raise
 
+    def register_lazy_command(self, name: str, description: str, class_path: str) -> None:
+        """
+        Register a command without importing it.
+
+        The command's module is imported, and its arguments added, when the
+        command is selected on the command line.
+
+        Args:
+            name: Command name
+            description: Command description shown in the help
+            class_path: Command class as "module:Class"
+        """
+        self._subparsers[name] = self.subparsers.add_parser(name, help=description)
+        self.commands[name] = class_path
+        logger.debug(f"Registered lazy command: {name}")
+
+    def _load_command(self, name: str) -> Optional[Type[Command]]:
+        """
+        Get a command class, importing it and adding its arguments on first use.
+
+        Args:
+            name: Command name
+
+        Returns:
+            Command class, or None if no such command is registered
+        """
+        command_class = self.commands.get(name)
+        if not isinstance(command_class, str):
+            return command_class
+
+        module_name, class_name = command_class.split(":")
+        command_class = getattr(importlib.import_module(module_name), class_name)
+        command_class(self.dependency_container).add_arguments(self._subparsers[name])
+        self.commands[name] = command_class
+
+        logger.debug(f"Loaded command: {name}")
+        return command_class
+
+    def _load_selected_command(self, args: Optional[List[str]]) -> None:
+        """
+        Load the command selected by the arguments before they are parsed.
+
+        Args:
+            args: Command-line arguments (defaults to sys.argv[1:])
+        """
+        for arg in sys.argv[1:] if args is None else args:
+            if arg in self.commands:
+                self._load_command(arg)
+                return
+
     def register_commands(self, command_classes: List[Type[Command]]) -> None:
         """
         Register multiple commands with the handler.
@@ -287,6 +528,9 @@ Examples:
             Exit code (0 for success, non-zero for failure)
         """
         try:
+            # Import the selected command so its arguments can be parsed
+            self._load_selected_command(args)
+
             # Parse arguments
             parsed_args = self.parser.parse_args(args)
 
@@ -307,7 +551,7 @@ Examples:
             args_dict = vars(parsed_args)
 
             # Get the command class
-            command_class = self.commands.get(parsed_args.command)
+            command_class = self._load_command(parsed_args.command)
             if not command_class:
                 print(f"Error: Command not found: {parsed_args.command}")
                 return 1
@@ -315,7 +559,12 @@ Examples:
             # Create and execute the command
             command = command_class(self.dependency_container)
             logger.info(f"Executing command: {parsed_args.command}")
-            result = command.execute(args_dict)
+            from src.infrastructure.utils.usage import usage_attribution
+            with usage_attribution(command=parsed_args.command):
+                if getattr(parsed_args, "profile", False):
+                    result = self._execute_profiled(command, args_dict)
+                else:
+                    result = command.execute(args_dict)
 
             # Check result and determine exit code
             if isinstance(result, dict) and 'success' in result:
@@ -332,6 +581,34 @@ Examples:
             print(f"Error: {e}")
             return 1
 
+    def _execute_profiled(self, command: Command, args: Dict[str, Any]) -> Any:
+        """
+        Execute a command under the profiler.
+
+        The profile is saved and the stage breakdown printed to stderr, also
+        when the command fails.
+
+        Args:
+            command: Command to execute
+            args: Dictionary of command-line arguments
+
+        Returns:
+            The command's result
+        """
+        from src.infrastructure.utils.profiling import ProfileSession, default_profile_path
+
+        session = ProfileSession(args.get("profile_mode") or "cprofile")
+        try:
+            with session:
+                return command.execute(args)
+        finally:
+            print(session.format_stages(f"Profile of '{args['command']}'"), file=sys.stderr)
+            path = args.get("profile_output") or default_profile_path(args["command"], session.extension)
+            try:
+                print(f"Profile saved to: {session.save(path)}", file=sys.stderr)
+            except OSError as e:
+                logger.error(f"Failed to save profile to {path}: {e}")
+
     def _load_configuration(self, config_path: str) -> None:
         """
         Load configuration from a file.
@@ -2,14 +2,24 @@
 CLI Commands
 
 This package contains implementations of CLI commands.
+
+Command classes are imported on first access, so importing the package
+doesn't load every command module.
 """
 
-from src.presentation.cli.commands.analyze_ticket_command import AnalyzeTicketCommand
-from src.presentation.cli.commands.generate_report_command import GenerateReportCommand
-from src.presentation.cli.commands.interactive_command import InteractiveCommand
-from src.presentation.cli.commands.list_views_command import ListViewsCommand
-from src.presentation.cli.commands.schedule_command import ScheduleCommand
-from src.presentation.cli.commands.webhook_command import WebhookCommand
+import importlib
+
+_COMMAND_MODULES = {
+    'AnalyzeTicketCommand': 'src.presentation.cli.commands.analyze_ticket_command',
+    'GenerateReportCommand': 'src.presentation.cli.commands.generate_report_command',
+    'ListViewsCommand': 'src.presentation.cli.commands.list_views_command',
+    'InteractiveCommand': 'src.presentation.cli.commands.interactive_command',
+    'ScheduleCommand': 'src.presentation.cli.commands.schedule_command',
+    'WebhookCommand': 'src.presentation.cli.commands.webhook_command',
+    'DaemonCommand': 'src.presentation.cli.commands.daemon_command',
+    'MetricsCommand': 'src.presentation.cli.commands.metrics_command',
+    'UsageCommand': 'src.presentation.cli.commands.usage_command',
+}
 
 __all__ = [
     'AnalyzeTicketCommand',
@@ -17,5 +27,15 @@ __all__ = [
     'ListViewsCommand',
     'InteractiveCommand',
     'ScheduleCommand',
-    'WebhookCommand'
+    'WebhookCommand',
+    'DaemonCommand',
+    'MetricsCommand',
+    'UsageCommand'
 ]
+
+
+def __getattr__(name):
+    """Import a command class on first access."""
+    if name in _COMMAND_MODULES:
+        return getattr(importlib.import_module(_COMMAND_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
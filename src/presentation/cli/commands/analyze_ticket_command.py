@@ -8,6 +8,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+from src.domain.value_objects.analysis_frame import AnalysisFrame
 from src.presentation.cli.command import Command
 
 # Set up logging
@@ -94,10 +95,28 @@ class AnalyzeTicketCommand(Command):
             help="Reanalyze tickets that have already been analyzed"
         )
 
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help="Submit view tickets as an offline batch job instead of analyzing them now"
+        )
+
+        parser.add_argument(
+            "--collect-batch",
+            metavar="JOB_ID",
+            help="Collect the results of a batch job ('all' collects every finished job)"
+        )
+
         parser.add_argument(
             "--use-openai",
             action="store_true",
-            help="Use OpenAI instead of Claude for analysis (default is Claude)"
+            help="Use only OpenAI for analysis (default is Claude with automatic failover to OpenAI)"
+        )
+
+        parser.add_argument(
+            "--use-claude",
+            action="store_true",
+            help="Use only Claude for analysis, without failover"
         )
 
     def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -123,6 +142,12 @@ class AnalyzeTicketCommand(Command):
             # Try to get it by class name
             analyze_ticket_use_case = self.dependency_container.resolve(AnalyzeTicketUseCase)
 
+        # Offline batch jobs bypass the interactive AI service
+        if args.get("collect_batch"):
+            return self._collect_batch(args)
+        if args.get("batch") and (args.get("view_id") or args.get("view_name")):
+            return self._submit_batch(args)
+
         # Configure AI service based on arguments
         self._configure_ai_service(args)
 
@@ -160,8 +185,9 @@ class AnalyzeTicketCommand(Command):
         Args:
             args: Command-line arguments
         """
-        # By default, use Claude unless OpenAI is explicitly requested
+        # By default, route through Claude with failover to OpenAI; the flags pin one provider
         use_openai = args.get("use_openai", False)
+        use_claude = args.get("use_claude", False)
 
         try:
             # Get the required services using their interface types
@@ -171,15 +197,20 @@ class AnalyzeTicketCommand(Command):
             ticket_analysis_service = self.dependency_container.resolve(TicketAnalysisService)
 
             if use_openai:
-                # Use OpenAI
+                # Use OpenAI only
                 openai_service = self.dependency_container.resolve(AIService, "openai")
                 ticket_analysis_service.ai_service = openai_service
                 logger.info("Using OpenAI for analysis")
-            else:
-                # Use Claude (default)
+            elif use_claude:
+                # Use Claude only
                 claude_service = self.dependency_container.resolve(AIService, "claude")
                 ticket_analysis_service.ai_service = claude_service
                 logger.info("Using Claude for analysis")
+            else:
+                # Use Claude with circuit-breaker failover to OpenAI (default)
+                routing_service = self.dependency_container.resolve(AIService, "routing")
+                ticket_analysis_service.ai_service = routing_service
+                logger.info("Using Claude with OpenAI failover for analysis")
         except Exception as e:
             logger.error(f"Error configuring AI service: {e}")
             raise
@@ -279,6 +310,25 @@ class AnalyzeTicketCommand(Command):
             print(f"Error analyzing ticket {ticket_id}: {e}")
             return {"success": False, "error": str(e), "ticket_id": ticket_id}
 
+    def _print_distributions(self, analyses: AnalysisFrame) -> None:
+        """
+        Print the sentiment, category and priority distributions of analyses.
+
+        Args:
+            analyses: Frame of the analyses
+        """
+        print("\nSentiment distribution:")
+        for sentiment, count in analyses.count_by("polarity").items():
+            print(f"  {sentiment}: {count}")
+
+        print("\nCategory distribution:")
+        for category, count in sorted(analyses.count_by("category").items(), key=lambda x: x[1], reverse=True):
+            print(f"  {category}: {count}")
+
+        print("\nPriority distribution:")
+        for priority, count in sorted(analyses.count_by("priority").items(), key=lambda x: str(x[0]), reverse=True):
+            print(f"  {priority}: {count}")
+
     def _analyze_view(self, args: Dict[str, Any], analyze_ticket_use_case) -> Dict[str, Any]:
         """
         Analyze all tickets in a view.
@@ -307,6 +357,8 @@ class AnalyzeTicketCommand(Command):
                 add_tags=add_tags
             )
 
+            frame = AnalysisFrame.from_analyses(analyses)
+
             # Format and display results
             if output_format == "json":
                 import json
@@ -316,35 +368,7 @@ class AnalyzeTicketCommand(Command):
                 # Text format (default)
                 print(f"Analyzed {len(analyses)} tickets in view {view_id}")
 
-                # Print distribution of sentiments
-                sentiment_counts = {}
-                for analysis in analyses:
-                    sentiment = analysis.sentiment
-                    sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-
-                print("\nSentiment distribution:")
-                for sentiment, count in sentiment_counts.items():
-                    print(f"  {sentiment}: {count}")
-
-                # Print distribution of categories
-                category_counts = {}
-                for analysis in analyses:
-                    category = analysis.category
-                    category_counts[category] = category_counts.get(category, 0) + 1
-
-                print("\nCategory distribution:")
-                for category, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True):
-                    print(f"  {category}: {count}")
-
-                # Print distribution of priorities
-                priority_counts = {}
-                for analysis in analyses:
-                    priority = analysis.priority
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-
-                print("\nPriority distribution:")
-                for priority, count in sorted(priority_counts.items(), key=lambda x: x[0], reverse=True):
-                    print(f"  {priority}: {count}")
+                self._print_distributions(frame)
 
                 if add_comment:
                     print(f"\nAdded comments to tickets: Yes")
@@ -356,7 +380,7 @@ class AnalyzeTicketCommand(Command):
                 "success": True,
                 "view_id": view_id,
                 "analyses_count": len(analyses),
-                "sentiment_distribution": sentiment_counts,
+                "sentiment_distribution": frame.count_by("polarity"),
                 "add_comment": add_comment,
                 "add_tags": add_tags
             }
@@ -394,6 +418,8 @@ class AnalyzeTicketCommand(Command):
                 add_tags=add_tags
             )
 
+            frame = AnalysisFrame.from_analyses(analyses)
+
             # Format and display results
             if output_format == "json":
                 import json
@@ -403,35 +429,7 @@ class AnalyzeTicketCommand(Command):
                 # Text format (default)
                 print(f"Analyzed {len(analyses)} tickets in view '{view_name}'")
 
-                # Print distribution of sentiments
-                sentiment_counts = {}
-                for analysis in analyses:
-                    sentiment = analysis.sentiment
-                    sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-
-                print("\nSentiment distribution:")
-                for sentiment, count in sentiment_counts.items():
-                    print(f"  {sentiment}: {count}")
-
-                # Print distribution of categories
-                category_counts = {}
-                for analysis in analyses:
-                    category = analysis.category
-                    category_counts[category] = category_counts.get(category, 0) + 1
-
-                print("\nCategory distribution:")
-                for category, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True):
-                    print(f"  {category}: {count}")
-
-                # Print distribution of priorities
-                priority_counts = {}
-                for analysis in analyses:
-                    priority = analysis.priority
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-
-                print("\nPriority distribution:")
-                for priority, count in sorted(priority_counts.items(), key=lambda x: x[0], reverse=True):
-                    print(f"  {priority}: {count}")
+                self._print_distributions(frame)
 
                 if add_comment:
                     print(f"\nAdded comments to tickets: Yes")
@@ -443,7 +441,7 @@ class AnalyzeTicketCommand(Command):
                 "success": True,
                 "view_name": view_name,
                 "analyses_count": len(analyses),
-                "sentiment_distribution": sentiment_counts,
+                "sentiment_distribution": frame.count_by("polarity"),
                 "add_comment": add_comment,
                 "add_tags": add_tags
             }
@@ -481,6 +479,8 @@ class AnalyzeTicketCommand(Command):
                 add_tags=add_tags
             )
 
+            frame = AnalysisFrame.from_analyses(analyses)
+
             # Format and display results
             if output_format == "json":
                 import json
@@ -490,35 +490,7 @@ class AnalyzeTicketCommand(Command):
                 # Text format (default)
                 print(f"Analyzed {len(analyses)} tickets matching query '{ticket_query}'")
 
-                # Print distribution of sentiments
-                sentiment_counts = {}
-                for analysis in analyses:
-                    sentiment = analysis.sentiment
-                    sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-
-                print("\nSentiment distribution:")
-                for sentiment, count in sentiment_counts.items():
-                    print(f"  {sentiment}: {count}")
-
-                # Print distribution of categories
-                category_counts = {}
-                for analysis in analyses:
-                    category = analysis.category
-                    category_counts[category] = category_counts.get(category, 0) + 1
-
-                print("\nCategory distribution:")
-                for category, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True):
-                    print(f"  {category}: {count}")
-
-                # Print distribution of priorities
-                priority_counts = {}
-                for analysis in analyses:
-                    priority = analysis.priority
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-
-                print("\nPriority distribution:")
-                for priority, count in sorted(priority_counts.items(), key=lambda x: x[0], reverse=True):
-                    print(f"  {priority}: {count}")
+                self._print_distributions(frame)
 
                 if add_comment:
                     print(f"\nAdded comments to tickets: Yes")
@@ -530,7 +502,7 @@ class AnalyzeTicketCommand(Command):
                 "success": True,
                 "ticket_query": ticket_query,
                 "analyses_count": len(analyses),
-                "sentiment_distribution": sentiment_counts,
+                "sentiment_distribution": frame.count_by("polarity"),
                 "add_comment": add_comment,
                 "add_tags": add_tags
             }
@@ -573,6 +545,8 @@ class AnalyzeTicketCommand(Command):
                 add_tags=add_tags
             )
 
+            frame = AnalysisFrame.from_analyses(analyses)
+
             # Format and display results
             if output_format == "json":
                 import json
@@ -582,35 +556,7 @@ class AnalyzeTicketCommand(Command):
                 # Text format (default)
                 print(f"Reanalyzed {len(analyses)} tickets from the last {days} days")
 
-                # Print distribution of sentiments
-                sentiment_counts = {}
-                for analysis in analyses:
-                    sentiment = analysis.sentiment
-                    sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-
-                print("\nSentiment distribution:")
-                for sentiment, count in sentiment_counts.items():
-                    print(f"  {sentiment}: {count}")
-
-                # Print distribution of categories
-                category_counts = {}
-                for analysis in analyses:
-                    category = analysis.category
-                    category_counts[category] = category_counts.get(category, 0) + 1
-
-                print("\nCategory distribution:")
-                for category, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True):
-                    print(f"  {category}: {count}")
-
-                # Print distribution of priorities
-                priority_counts = {}
-                for analysis in analyses:
-                    priority = analysis.priority
-                    priority_counts[priority] = priority_counts.get(priority, 0) + 1
-
-                print("\nPriority distribution:")
-                for priority, count in sorted(priority_counts.items(), key=lambda x: x[0], reverse=True):
-                    print(f"  {priority}: {count}")
+                self._print_distributions(frame)
 
                 if add_comment:
                     print(f"\nAdded comments to tickets: Yes")
@@ -622,7 +568,7 @@ class AnalyzeTicketCommand(Command):
                 "success": True,
                 "days": days,
                 "analyses_count": len(analyses),
-                "sentiment_distribution": sentiment_counts,
+                "sentiment_distribution": frame.count_by("polarity"),
                 "add_comment": add_comment,
                 "add_tags": add_tags
             }
@@ -631,3 +577,78 @@ class AnalyzeTicketCommand(Command):
             logger.exception(f"Error reanalyzing tickets: {e}")
             print(f"Error reanalyzing tickets: {e}")
             return {"success": False, "error": str(e), "days": days}
+
+    def _submit_batch(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Submit the tickets of a view as offline batch jobs.
+
+        Args:
+            args: Command-line arguments
+
+        Returns:
+            Submission results
+        """
+        from src.domain.interfaces.repository_interfaces import TicketRepository
+
+        ticket_repository = self.dependency_container.resolve(TicketRepository)
+        batch_analysis_service = self.dependency_container.resolve("batch_analysis_service")
+        limit = args.get("limit")
+
+        try:
+            if args.get("view_id"):
+                tickets = ticket_repository.get_tickets_from_view(args["view_id"], limit)
+            else:
+                tickets = ticket_repository.get_tickets_from_view_name(args["view_name"], limit)
+
+            if not tickets:
+                print("No tickets found to submit.")
+                return {"success": True, "job_ids": [], "tickets_count": 0}
+
+            job_ids = batch_analysis_service.submit_tickets(tickets)
+
+            print(f"Submitted {len(tickets)} tickets in {len(job_ids)} batch job(s):")
+            for job_id in job_ids:
+                print(f"  {job_id}")
+            print("Collect the results later with --collect-batch <JOB_ID> or --collect-batch all")
+
+            return {"success": True, "job_ids": job_ids, "tickets_count": len(tickets)}
+        except Exception as e:
+            logger.exception(f"Error submitting batch analysis: {e}")
+            print(f"Error submitting batch analysis: {e}")
+            return {"success": False, "error": str(e)}
+
+    def _collect_batch(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Collect the results of offline batch jobs.
+
+        Args:
+            args: Command-line arguments
+
+        Returns:
+            Collection results
+        """
+        batch_analysis_service = self.dependency_container.resolve("batch_analysis_service")
+        job_id = args.get("collect_batch")
+
+        try:
+            if job_id == "all":
+                collected = batch_analysis_service.collect_completed()
+            else:
+                status = batch_analysis_service.check_job(job_id)
+                if status != "ended":
+                    print(f"Batch job {job_id} is {status}.")
+                    return {"success": True, "job_id": job_id, "status": status, "analyses_count": 0}
+                collected = {job_id: batch_analysis_service.collect_job(job_id)}
+
+            analyses_count = sum(len(analyses) for analyses in collected.values())
+            print(f"Collected {analyses_count} analyses from {len(collected)} batch job(s)")
+
+            return {
+                "success": True,
+                "job_ids": list(collected),
+                "analyses_count": analyses_count
+            }
+        except Exception as e:
+            logger.exception(f"Error collecting batch analysis: {e}")
+            print(f"Error collecting batch analysis: {e}")
+            return {"success": False, "error": str(e), "job_id": job_id}
@@ -0,0 +1,164 @@
+"""
+Daemon Command
+
+This module defines the DaemonCommand class for managing the local CLI daemon
+that keeps services, caches and connections warm between invocations.
+"""
+
+import logging
+from typing import Any, Dict
+
+from src.presentation.cli.command import Command
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class DaemonCommand(Command):
+    """Command for managing the CLI daemon."""
+
+    @property
+    def name(self) -> str:
+        """Get the command name."""
+        return "daemon"
+
+    @property
+    def description(self) -> str:
+        """Get the command description."""
+        return "Run a local daemon that keeps services warm for CLI commands"
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-specific arguments to the parser.
+
+        Args:
+            parser: ArgumentParser to add arguments to
+        """
+        subparsers = parser.add_subparsers(dest="subcommand", help="Subcommand")
+
+        start_parser = subparsers.add_parser("start", help="Run the daemon in the foreground")
+        start_parser.add_argument(
+            "--no-warm-up",
+            action="store_true",
+            help="Don't connect to Zendesk and MongoDB until the first command needs them"
+        )
+
+        subparsers.add_parser("stop", help="Stop the daemon")
+        subparsers.add_parser("status", help="Show daemon status")
+
+        for subparser in subparsers.choices.values():
+            subparser.add_argument(
+                "--socket",
+                help="Unix socket path (default: ZENDESK_AI_DAEMON_SOCKET or ~/.zendesk_ai/daemon.sock)"
+            )
+
+    def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the command.
+
+        Args:
+            args: Dictionary of command-line arguments
+
+        Returns:
+            Dictionary with execution results
+        """
+        subcommand = args.get("subcommand") or "status"
+
+        if subcommand == "start":
+            return self._start_daemon(args)
+        elif subcommand == "stop":
+            return self._stop_daemon(args)
+        else:
+            return self._daemon_status(args)
+
+    def _start_daemon(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the daemon until it is stopped.
+
+        Args:
+            args: Command-line arguments
+
+        Returns:
+            Dictionary with execution results
+        """
+        from src.presentation.cli.command_handler import CommandHandler
+        from src.presentation.cli.daemon import CLIDaemon
+
+        command_handler = CommandHandler()
+        if not args.get("no_warm_up"):
+            self._warm_up(command_handler.dependency_container)
+
+        try:
+            daemon = CLIDaemon(args.get("socket"), command_handler=command_handler)
+            daemon.start()
+        except (OSError, RuntimeError) as e:
+            print(f"Error: {e}")
+            return {"success": False, "error": str(e)}
+
+        print(f"Daemon listening on {daemon.socket_path} (Ctrl+C to stop)")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            print("\nDaemon stopped")
+
+        return {"success": True, "requests_served": daemon.requests_served}
+
+    def _warm_up(self, container) -> None:
+        """
+        Open the Zendesk and MongoDB connections up front.
+
+        Args:
+            container: Dependency container of the daemon's command handler
+        """
+        from src.domain.interfaces.repository_interfaces import (
+            AnalysisRepository,
+            TicketRepository,
+        )
+
+        for interface, attribute in ((TicketRepository, "client"), (AnalysisRepository, "collection")):
+            try:
+                getattr(container.resolve(interface), attribute)
+            except Exception as e:
+                logger.warning(f"Could not warm up {interface.__name__}: {e}")
+
+    def _stop_daemon(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stop a running daemon.
+
+        Args:
+            args: Command-line arguments
+
+        Returns:
+            Dictionary with execution results
+        """
+        from src.presentation.cli.daemon import daemon_request
+
+        if daemon_request("stop", args.get("socket")) is None:
+            print("Daemon is not running.")
+            return {"success": False, "error": "Daemon is not running"}
+
+        print("Daemon stopped.")
+        return {"success": True}
+
+    def _daemon_status(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Show the status of the daemon.
+
+        Args:
+            args: Command-line arguments
+
+        Returns:
+            Dictionary with execution results
+        """
+        from src.presentation.cli.daemon import daemon_request
+
+        reply = daemon_request("status", args.get("socket"))
+        if reply is None:
+            print("Daemon is not running.")
+            return {"success": True, "running": False}
+
+        status = reply["status"]
+        print(f"Daemon running (PID {status['pid']}) on {status['socket']}")
+        print(f"  Uptime: {status['uptime_seconds']}s")
+        print(f"  Commands served: {status['requests_served']}")
+        return {"success": True, "running": True, **status}
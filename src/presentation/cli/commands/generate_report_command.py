@@ -177,7 +177,7 @@ class GenerateReportCommand(Command):
                 default_filename = f"{report_type}_report_{timestamp}.{file_extension}"
 
                 # Save to reports directory
-                reports_dir = "reports"
+                reports_dir = os.environ.get("REPORTS_DIR", "reports")
                 os.makedirs(reports_dir, exist_ok=True)
                 default_path = os.path.join(reports_dir, default_filename)
 
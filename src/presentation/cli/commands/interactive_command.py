@@ -476,15 +476,18 @@ class InteractiveMenu:
             print("\nActions:")
             print("1. Add Comments to Ticket")
             print("2. Add Tags to Ticket")
-            print("3. Back to Main Menu")
+            print("3. Show Business Impact, Extracted Data and Suggested Response")
+            print("4. Back to Main Menu")
 
             # Get user choice
-            choice = self._get_input("\nEnter your choice (1-3): ", r"^[1-3]$")
+            choice = self._get_input("\nEnter your choice (1-4): ", r"^[1-4]$")
 
             if choice == "1":
                 self._add_comments_to_ticket(ticket_id, analysis)
             elif choice == "2":
                 self._add_tags_to_ticket(ticket_id, analysis)
+            elif choice == "3":
+                self._show_ticket_enrichment(ticket_id)
 
             self._wait_for_input()
 
@@ -1439,6 +1442,60 @@ class InteractiveMenu:
         print(f"\nOpening {url} in browser...")
         self._wait_for_input()
 
+    def _show_ticket_enrichment(self, ticket_id: int) -> None:
+        """
+        Show the business impact, extracted data and a suggested response for a ticket.
+
+        Services supporting enrichment return all three from one model call;
+        others are asked once per facet.
+
+        Args:
+            ticket_id: ID of the ticket
+        """
+        from src.application.services.ticket_analysis_service import ticket_content
+        from src.domain.interfaces.ai_service_interfaces import (
+            EnhancedAIService,
+            EnrichmentAIService,
+        )
+        from src.domain.interfaces.repository_interfaces import TicketRepository
+
+        try:
+            ticket = self.dependency_container.resolve(TicketRepository).get_ticket(ticket_id)
+            if not ticket:
+                print(f"\nTicket {ticket_id} not found.")
+                return
+
+            content = ticket_content(ticket)
+            ai_service = self.dependency_container.resolve(EnhancedAIService)
+
+            print("\nEnriching ticket...")
+            if isinstance(ai_service, EnrichmentAIService):
+                enrichment = ai_service.enrich(content, ["business_impact", "extraction", "response_suggestion"])
+            else:
+                enrichment = {
+                    "business_impact": ai_service.analyze_business_impact(content),
+                    "extraction": ai_service.extract_ticket_data(content),
+                    "response_suggestion": ai_service.generate_response_suggestion(content)
+                }
+
+            impact = enrichment["business_impact"]
+            print(f"\nBusiness impact: {'detected' if impact.get('detected') else 'none detected'}"
+                  f" (severity {impact.get('severity', 0)}/5)")
+            if impact.get("explanation"):
+                print(f"  {impact['explanation']}")
+
+            extraction = enrichment["extraction"]
+            print(f"Request type: {extraction.get('request_type', 'unknown')}")
+            if extraction.get("product_mentions"):
+                print(f"Products: {', '.join(str(p) for p in extraction['product_mentions'])}")
+            for item in extraction.get("action_items", []):
+                print(f"  - {item}")
+
+            print(f"\nSuggested response:\n{enrichment['response_suggestion']}")
+
+        except Exception as e:
+            print(f"\nError enriching ticket: {e}")
+
     def _add_comments_to_ticket(self, ticket_id: int, analysis) -> None:
         """
         Add analysis as comments to a ticket.
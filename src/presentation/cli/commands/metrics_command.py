@@ -0,0 +1,189 @@
+"""
+Metrics Command
+
+This module defines the MetricsCommand class for dumping the collected metrics.
+"""
+
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from src.presentation.cli.command import Command
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Metrics endpoint read when neither --url nor a CLI daemon is available
+DEFAULT_METRICS_URL = "http://127.0.0.1:5000/metrics"
+
+
+class MetricsCommand(Command):
+    """Command for dumping metrics."""
+
+    @property
+    def name(self) -> str:
+        """Get the command name."""
+        return "metrics"
+
+    @property
+    def description(self) -> str:
+        """Get the command description."""
+        return "Dump the collected metrics in Prometheus text or JSON format"
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-specific arguments to the parser.
+
+        Args:
+            parser: ArgumentParser to add arguments to
+        """
+        parser.add_argument(
+            "--format",
+            choices=["prometheus", "json"],
+            default="prometheus",
+            help="Output format (default: prometheus)"
+        )
+
+        parser.add_argument(
+            "--url",
+            help="Read the metrics of a running webhook server, e.g. http://127.0.0.1:5000/metrics "
+                 "(default: the CLI daemon's metrics if it is running, else ZENDESK_AI_METRICS_URL "
+                 f"or {DEFAULT_METRICS_URL})"
+        )
+
+        parser.add_argument(
+            "--output",
+            help="Output file path (default: print to console)"
+        )
+
+    def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the command.
+
+        Metrics are collected per process, and a fresh CLI process has none.
+        With --url this reads a webhook server's metrics. Otherwise it shows
+        the CLI daemon's metrics, or reads the webhook server at
+        ZENDESK_AI_METRICS_URL (default: the local one) when no daemon runs.
+
+        Args:
+            args: Dictionary of command-line arguments
+
+        Returns:
+            Dictionary with execution results
+        """
+        output_format = args.get("format") or "prometheus"
+        url = args.get("url")
+
+        try:
+            if url:
+                text = self._fetch_prometheus(url, output_format)
+            elif self._in_daemon():
+                from src.domain.interfaces.utility_interfaces import MetricsCollector
+                collector = self.dependency_container.resolve(MetricsCollector)
+                if output_format == "json":
+                    text = json.dumps(collector.snapshot(), indent=2) + "\n"
+                else:
+                    text = collector.render_prometheus()
+            else:
+                text = self._from_daemon(output_format)
+                if text is None:
+                    text = self._from_webhook_server(output_format)
+        except Exception as e:
+            logger.error(f"Error reading metrics: {e}")
+            print(f"Error: {e}")
+            return {"success": False, "error": str(e)}
+
+        output_file = args.get("output")
+        if output_file:
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(text)
+            print(f"Metrics written to {output_file}")
+        else:
+            print(text, end="")
+
+        return {"success": True, "format": output_format}
+
+    @staticmethod
+    def _in_daemon() -> bool:
+        """Check whether the command runs in the CLI daemon."""
+        from src.presentation.cli.daemon import in_daemon
+        return in_daemon()
+
+    def _from_daemon(self, output_format: str) -> Optional[str]:
+        """
+        Read the metrics of the running CLI daemon.
+
+        Args:
+            output_format: 'prometheus' or 'json'
+
+        Returns:
+            Metrics text, or None if no daemon is running
+        """
+        from src.presentation.cli.daemon import forward_command
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = forward_command(["metrics", "--format", output_format], stdout=stdout, stderr=stderr)
+        if exit_code is None:
+            return None
+        if exit_code != 0:
+            raise RuntimeError(f"CLI daemon could not read its metrics: {(stdout.getvalue() + stderr.getvalue()).strip()}")
+        return stdout.getvalue()
+
+    def _from_webhook_server(self, output_format: str) -> str:
+        """
+        Read the metrics of the webhook server at ZENDESK_AI_METRICS_URL or the default URL.
+
+        Args:
+            output_format: 'prometheus' or 'json'
+
+        Returns:
+            Exposition text
+
+        Raises:
+            RuntimeError: If the metrics can't be read, saying where metrics are available
+        """
+        url = os.getenv("ZENDESK_AI_METRICS_URL") or DEFAULT_METRICS_URL
+        no_source = "This CLI process collects no metrics of its own and no CLI daemon is running"
+        if output_format != "prometheus":
+            raise RuntimeError(f"{no_source}. Start the CLI daemon for JSON metrics, or read a webhook "
+                               f"server's metrics in Prometheus format with --url")
+        try:
+            return self._fetch(url)
+        except OSError as e:
+            raise RuntimeError(f"{no_source}, and {url} can't be read ({e}). Start the webhook server or the "
+                               f"CLI daemon, or pass --url with the /metrics endpoint of a webhook server")
+
+    def _fetch_prometheus(self, url: str, output_format: str) -> str:
+        """
+        Read the metrics exposed by a webhook server.
+
+        Args:
+            url: URL of the /metrics endpoint
+            output_format: Requested format; only 'prometheus' is available
+
+        Returns:
+            Exposition text
+
+        Raises:
+            ValueError: If another format is requested
+        """
+        if output_format != "prometheus":
+            raise ValueError("Metrics read from a webhook server are only available in Prometheus format")
+        return self._fetch(url)
+
+    def _fetch(self, url: str) -> str:
+        """
+        Read the metrics exposed by a webhook server.
+
+        Args:
+            url: URL of the /metrics endpoint
+
+        Returns:
+            Exposition text
+        """
+        from urllib.request import urlopen
+
+        with urlopen(url, timeout=10) as response:
+            return response.read().decode("utf-8")
@@ -7,6 +7,7 @@ This module defines the ScheduleCommand class for managing scheduled tasks.
 import json
 import logging
 import os
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -46,12 +47,15 @@ class ScheduleCommand(Command):
         schedule_type_group = add_parser.add_mutually_exclusive_group(required=True)
         schedule_type_group.add_argument("--daily", action="store_true", help="Schedule daily task")
         schedule_type_group.add_argument("--weekly", action="store_true", help="Schedule weekly task")
+        schedule_type_group.add_argument("--cron", help="Schedule task with a cron expression (e.g. '0 9 * * 1-5')")
 
         # Time options
         add_parser.add_argument("--daily-time", help="Time to run daily analysis (format: HH:MM)")
         add_parser.add_argument("--weekly-day", type=int, choices=range(0, 7),
                               help="Day of week to run weekly analysis (0=Monday, 6=Sunday)")
         add_parser.add_argument("--weekly-time", help="Time to run weekly analysis (format: HH:MM)")
+        add_parser.add_argument("--catch-up", choices=["skip", "run_once", "run_all"],
+                              help="What to do with runs missed while the scheduler was stopped")
 
         # Task options
         add_parser.add_argument("--task", required=True, choices=[
@@ -166,9 +170,16 @@ class ScheduleCommand(Command):
 
         # Determine schedule type
         is_daily = args.get("daily", False)
+        cron_expression = args.get("cron")
 
         # Get schedule parameters
-        if is_daily:
+        if cron_expression:
+            schedule_type = "cron"
+            schedule_time = cron_expression
+            schedule_day = None
+
+            logger.info(f"Scheduling cron task {task_name} with expression '{cron_expression}'")
+        elif is_daily:
             # Get daily time
             daily_time = args.get("daily_time")
 
@@ -239,13 +250,23 @@ class ScheduleCommand(Command):
             **additional_params
         }
 
+        catch_up_policy = args.get("catch_up")
+
         # Schedule the task
-        if is_daily:
+        if cron_expression:
+            task_id = scheduler_service.schedule_cron_task(
+                task_name=task_name,
+                expression=cron_expression,
+                parameters=task_params,
+                catch_up_policy=catch_up_policy
+            )
+        elif is_daily:
             task_id = scheduler_service.schedule_daily_task(
                 task_name=task_name,
                 hour=hour,
                 minute=minute,
-                parameters=task_params
+                parameters=task_params,
+                catch_up_policy=catch_up_policy
             )
         else:
             task_id = scheduler_service.schedule_weekly_task(
@@ -253,11 +274,14 @@ class ScheduleCommand(Command):
                 day=schedule_day.lower(),
                 hour=hour,
                 minute=minute,
-                parameters=task_params
+                parameters=task_params,
+                catch_up_policy=catch_up_policy
             )
 
         # Print success message
-        if is_daily:
+        if cron_expression:
+            print(f"Task '{task_name}' scheduled with cron expression '{cron_expression}'.")
+        elif is_daily:
             print(f"Daily task '{task_name}' scheduled at {schedule_time}.")
         else:
             print(f"Weekly task '{task_name}' scheduled on {schedule_day} at {schedule_time}.")
@@ -310,7 +334,7 @@ class ScheduleCommand(Command):
                     task_id = task.get("id", "Unknown")
                     task_name = task.get("task", "Unknown")
                     schedule = task.get("schedule", "Unknown")
-                    next_run = task.get("next_run", "Unknown")
+                    next_run = task.get("next_run_time", "Unknown")
                     enabled = task.get("enabled", True)
                     parameters = task.get("parameters", {})
 
@@ -477,8 +501,11 @@ class ScheduleCommand(Command):
             print("Starting scheduler in interactive mode...")
             print("Press Ctrl+C to stop")
 
+            scheduler_service.start()
             try:
-                scheduler_service.start()
+                # The scheduler runs on a background thread; keep the process alive
+                while True:
+                    time.sleep(60)
             except KeyboardInterrupt:
                 print("\nStopping scheduler...")
                 scheduler_service.stop()
@@ -0,0 +1,240 @@
+"""
+Usage Command
+
+This module defines the UsageCommand class for reporting the AI token usage,
+cost and latency recorded in the usage ledger.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from src.presentation.cli.command import Command
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+_COLUMN_TITLES = {
+    "day": "Day",
+    "provider": "Provider",
+    "model": "Model",
+    "operation": "Operation",
+    "outcome": "Outcome",
+    "ticket_id": "Ticket",
+    "view_id": "View",
+    "command": "Command",
+    "task_id": "Task",
+}
+
+_VALUE_COLUMNS = [
+    ("calls", "Calls"),
+    ("input_tokens", "Input"),
+    ("output_tokens", "Output"),
+    ("cache_read_tokens", "Cache read"),
+    ("cache_write_tokens", "Cache write"),
+    ("cost_usd", "Cost (USD)"),
+    ("avg_latency_ms", "Avg ms"),
+    ("max_latency_ms", "Max ms"),
+]
+
+
+class UsageCommand(Command):
+    """Command for reporting AI usage and cost."""
+
+    @property
+    def name(self) -> str:
+        """Get the command name."""
+        return "usage"
+
+    @property
+    def description(self) -> str:
+        """Get the command description."""
+        return "Report AI token usage, cost and latency by day and view"
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-specific arguments to the parser.
+
+        Args:
+            parser: ArgumentParser to add arguments to
+        """
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Number of days to report, up to today (default: 30)"
+        )
+
+        parser.add_argument(
+            "--group-by",
+            default="day,view_id",
+            help="Comma-separated columns to group by: day, view_id, model, operation, "
+                 "command, task_id, ticket_id, provider, outcome (default: day,view_id)"
+        )
+
+        parser.add_argument(
+            "--format",
+            choices=["text", "json", "csv"],
+            default="text",
+            help="Output format (default: text)"
+        )
+
+        parser.add_argument(
+            "--output",
+            help="Output file path (default: print to console)"
+        )
+
+    def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the command.
+
+        Args:
+            args: Dictionary of command-line arguments
+
+        Returns:
+            Dictionary with execution results
+        """
+        from src.domain.interfaces.repository_interfaces import UsageRepository
+
+        format_type = args.get("format") or "text"
+        output_file = args.get("output")
+        days = args.get("days") or 30
+        group_by = [column.strip() for column in (args.get("group_by") or "").split(",") if column.strip()]
+        group_by = group_by or ["day", "view_id"]
+
+        try:
+            usage_repository = self.dependency_container.resolve(UsageRepository)
+            if usage_repository is None:
+                raise ValueError("The AI usage ledger is disabled (AI_USAGE_LEDGER=false)")
+
+            end_date = datetime.utcnow()
+            start_date = (end_date - timedelta(days=days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            rows = usage_repository.summarize(start_date, end_date + timedelta(seconds=1), group_by)
+
+            if format_type == "json":
+                output = json.dumps({
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                    "group_by": group_by,
+                    "rows": rows,
+                    "totals": self._totals(rows)
+                }, indent=2)
+            elif format_type == "csv":
+                output = self._format_csv(rows, group_by)
+            else:
+                output = self._format_text(rows, group_by, start_date, end_date)
+        except Exception as e:
+            logger.exception(f"Error reporting AI usage: {e}")
+            print(f"Error reporting AI usage: {e}")
+            return {"success": False, "error": str(e)}
+
+        if output_file:
+            output_dir = os.path.dirname(output_file)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(output)
+            print(f"Usage report saved to: {os.path.abspath(output_file)}")
+        else:
+            print(output)
+
+        return {"success": True, "rows": len(rows), "format": format_type, "output_file": output_file}
+
+    def _totals(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Sum the rows of a usage summary.
+
+        Args:
+            rows: Summary rows
+
+        Returns:
+            Totals of the calls, tokens and cost, and the overall latency statistics
+        """
+        calls = sum(row["calls"] for row in rows)
+        totals: Dict[str, Any] = {
+            key: sum(row[key] for row in rows)
+            for key, _ in _VALUE_COLUMNS
+            if key not in ("cost_usd", "avg_latency_ms", "max_latency_ms")
+        }
+        totals["cost_usd"] = round(sum(row["cost_usd"] for row in rows), 8)
+        totals["avg_latency_ms"] = round(
+            sum(row["avg_latency_ms"] * row["calls"] for row in rows) / calls, 1
+        ) if calls else 0.0
+        totals["max_latency_ms"] = max((row["max_latency_ms"] for row in rows), default=0.0)
+        return totals
+
+    def _format_text(
+        self,
+        rows: List[Dict[str, Any]],
+        group_by: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> str:
+        """
+        Format a usage summary as a text table.
+
+        Args:
+            rows: Summary rows
+            group_by: Group columns
+            start_date: Start of the reported range
+            end_date: End of the reported range
+
+        Returns:
+            Text report
+        """
+        headers = [_COLUMN_TITLES.get(column, column) for column in group_by] + [title for _, title in _VALUE_COLUMNS]
+        table = [
+            [str(row.get(column) or "-") for column in group_by] + [self._format_value(key, row[key]) for key, _ in _VALUE_COLUMNS]
+            for row in rows
+        ]
+        totals = self._totals(rows)
+        table.append(
+            ["TOTAL"] + [""] * (len(group_by) - 1) + [self._format_value(key, totals[key]) for key, _ in _VALUE_COLUMNS]
+        )
+
+        widths = [max(len(cells[i]) for cells in [headers] + table) for i in range(len(headers))]
+        lines = [
+            f"AI usage {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d} (UTC)",
+            "",
+            "  ".join(header.ljust(width) for header, width in zip(headers, widths)),
+            "  ".join("-" * width for width in widths)
+        ]
+        for i, cells in enumerate(table):
+            if i == len(table) - 1:
+                lines.append("  ".join("-" * width for width in widths))
+            lines.append("  ".join(
+                cell.ljust(width) if j < len(group_by) else cell.rjust(width)
+                for j, (cell, width) in enumerate(zip(cells, widths))
+            ))
+        return "\n".join(lines)
+
+    def _format_csv(self, rows: List[Dict[str, Any]], group_by: List[str]) -> str:
+        """
+        Format a usage summary as CSV.
+
+        Args:
+            rows: Summary rows
+            group_by: Group columns
+
+        Returns:
+            CSV text
+        """
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(group_by + [key for key, _ in _VALUE_COLUMNS])
+        for row in rows:
+            writer.writerow([row.get(column) for column in group_by] + [row[key] for key, _ in _VALUE_COLUMNS])
+        return output.getvalue()
+
+    @staticmethod
+    def _format_value(key: str, value: Any) -> str:
+        """Format a summary value for the text table."""
+        if key == "cost_usd":
+            return f"{value:.4f}"
+        if key.endswith("_ms"):
+            return f"{value:.0f}"
+        return f"{value:,}"
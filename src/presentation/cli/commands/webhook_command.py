@@ -183,7 +183,11 @@ class WebhookCommand(Command):
             from src.presentation.webhook.webhook_handler import WebhookHandler
 
             # Create webhook handler
-            webhook_handler = WebhookHandler(webhook_service)
+            webhook_handler = WebhookHandler(
+                webhook_service,
+                deadline_seconds=float(os.getenv("WEBHOOK_DEADLINE_SECONDS", "0")) or None,
+                profile_every=int(os.getenv("WEBHOOK_PROFILE_EVERY", "0"))
+            )
             WebhookCommand.webhook_server = webhook_handler
 
             # Run in daemon mode if requested
@@ -0,0 +1,412 @@
+"""
+CLI Daemon
+
+This module provides an optional long-lived local daemon that keeps the
+service graph, the Zendesk cache and the open connections warm between CLI
+invocations, and the thin client that forwards subcommands to it over a Unix
+domain socket.
+
+Messages are newline-delimited JSON. The client sends one request, e.g.
+{"argv": ["views", "--flat"], "cwd": "/home/me", "env": {...}}; the daemon
+runs the command in the caller's working directory and environment, and
+streams back output frames ({"stream": "stdout", "data": "..."}) followed by
+{"exit_code": 0}. A caller whose credentials or connection settings differ
+from the ones the daemon's services were built with gets {"run_locally": ...}
+and runs the command itself.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".zendesk_ai", "daemon.sock")
+
+# Commands that need a terminal or run their own server are always run locally
+LOCAL_ONLY_COMMANDS = {"interactive", "webhook", "daemon"}
+
+# Environment variables the daemon's warm services are built from; callers
+# with other values can't use them
+SERVICE_ENVIRONMENT = (
+    "ZENDESK_EMAIL",
+    "ZENDESK_API_TOKEN",
+    "ZENDESK_SUBDOMAIN",
+    "MONGODB_URI",
+    "MONGODB_DB_NAME",
+    "MONGODB_COLLECTION_NAME",
+    "OPENAI_API_KEY",
+    "ANTHROPIC_API_KEY",
+)
+
+
+# Whether this process is a CLI daemon serving commands
+_serving = False
+
+
+def in_daemon() -> bool:
+    """
+    Check whether commands run in a CLI daemon in this process.
+
+    Returns:
+        True once a daemon in this process has started listening
+    """
+    return _serving
+
+
+def command_name(argv: List[str]) -> Optional[str]:
+    """
+    Get the subcommand selected by command-line arguments.
+
+    Args:
+        argv: Command-line arguments
+
+    Returns:
+        The first positional argument that isn't the value of a global option
+    """
+    previous = None
+    for arg in argv:
+        if not arg.startswith("-") and previous not in ("--config", "--log-level"):
+            return arg
+        previous = arg
+    return None
+
+
+def get_socket_path(socket_path: Optional[str] = None) -> str:
+    """
+    Get the daemon socket path.
+
+    Args:
+        socket_path: Explicit socket path
+
+    Returns:
+        The explicit path, ZENDESK_AI_DAEMON_SOCKET, or the default path
+    """
+    return os.path.expanduser(socket_path or os.getenv("ZENDESK_AI_DAEMON_SOCKET") or DEFAULT_SOCKET_PATH)
+
+
+@contextlib.contextmanager
+def _caller_context(cwd: Optional[str], env: Optional[Dict[str, str]]):
+    """Run the block in the caller's working directory and environment, restoring the daemon's afterwards."""
+    previous_cwd = os.getcwd()
+    previous_env = dict(os.environ)
+    try:
+        if env is not None:
+            os.environ.clear()
+            os.environ.update(env)
+        if cwd is not None:
+            os.chdir(cwd)
+        yield
+    finally:
+        os.chdir(previous_cwd)
+        if env is not None:
+            os.environ.clear()
+            os.environ.update(previous_env)
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that sends everything written to it as output frames."""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], stream: str):
+        self._send = send
+        self._stream = stream
+
+    def writable(self) -> bool:
+        """The stream is writable."""
+        return True
+
+    def write(self, data: str) -> int:
+        """Send the data as an output frame."""
+        if data:
+            self._send({"stream": self._stream, "data": data})
+        return len(data)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection."""
+
+    def handle(self) -> None:
+        """Read the request and reply to it."""
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self._send({"error": "Malformed request", "exit_code": 2})
+            return
+
+        self._send(self.server.daemon.handle_request(request, self._send))
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        """Send a message to the client."""
+        try:
+            self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; the command still runs to completion
+            pass
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    """Unix socket server handling one command at a time."""
+
+    def __init__(self, socket_path: str, daemon: "CLIDaemon"):
+        self.daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class CLIDaemon:
+    """
+    Long-lived process serving CLI commands from one warm command handler.
+
+    Commands run one at a time, because their output is captured by
+    redirecting stdout and stderr for the duration of the command.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, command_handler: Optional[Any] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Unix socket to listen on (see get_socket_path)
+            command_handler: Command handler to run commands with (default: a new CommandHandler)
+        """
+        if command_handler is None:
+            from src.presentation.cli.command_handler import CommandHandler
+            command_handler = CommandHandler()
+
+        self.socket_path = get_socket_path(socket_path)
+        self.command_handler = command_handler
+        self.started_at = time.time()
+        self.requests_served = 0
+        self.service_environment = {name: os.environ.get(name) for name in SERVICE_ENVIRONMENT}
+        self._server: Optional[_UnixServer] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Bind the socket, replacing a stale socket file left by a previous daemon."""
+        os.makedirs(os.path.dirname(self.socket_path) or ".", mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if daemon_request("ping", self.socket_path) is not None:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+
+        # Create the socket accessible to this user only from the start
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, self)
+        finally:
+            os.umask(previous_umask)
+        global _serving
+        _serving = True
+        logger.info(f"CLI daemon listening on {self.socket_path}")
+
+    def serve_forever(self) -> None:
+        """Serve requests until stopped."""
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            global _serving
+            _serving = False
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            logger.info("CLI daemon stopped")
+
+    def stop(self) -> None:
+        """Stop serving; safe to call from a request handler."""
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the daemon status.
+
+        Returns:
+            Dictionary with the PID, socket path, uptime and number of commands served
+        """
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_path,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests_served": self.requests_served
+        }
+
+    def handle_request(self, request: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """
+        Handle one request.
+
+        Args:
+            request: Request with either "argv" (a command to run, with the
+                caller's "cwd" and "env") or "op" ('ping', 'status' or 'stop')
+            send: Function sending an output frame to the client
+
+        Returns:
+            Final message for the client
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True}
+        if op == "status":
+            return {"status": self.get_status()}
+        if op == "stop":
+            self.stop()
+            return {"ok": True}
+
+        argv = request.get("argv")
+        if not isinstance(argv, list):
+            return {"error": "Request needs an argv list", "exit_code": 2}
+        if command_name(argv) in LOCAL_ONLY_COMMANDS:
+            return {"error": f"Command '{command_name(argv)}' can't run in the daemon", "exit_code": 2}
+
+        cwd = request.get("cwd")
+        env = request.get("env")
+        if cwd is not None and not (isinstance(cwd, str) and os.path.isdir(cwd)):
+            return {"error": f"Working directory {cwd!r} doesn't exist for the daemon", "exit_code": 2}
+        if env is not None:
+            if not isinstance(env, dict) or not all(isinstance(value, str) for value in env.values()):
+                return {"error": "Request env must map names to strings", "exit_code": 2}
+            changed = [name for name, value in self.service_environment.items() if env.get(name) != value]
+            if changed:
+                return {"run_locally": f"Settings differ from the daemon's: {', '.join(changed)}"}
+
+        return {"exit_code": self.run_command(argv, send, cwd, env)}
+
+    def run_command(
+        self,
+        argv: List[str],
+        send: Callable[[Dict[str, Any]], None],
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None
+    ) -> int:
+        """
+        Run a command, streaming its output.
+
+        Args:
+            argv: Command-line arguments
+            send: Function sending an output frame to the client
+            cwd: Caller's working directory, so relative paths resolve as they would locally
+            env: Caller's environment, in effect while the command runs
+
+        Returns:
+            Exit code of the command
+        """
+        with self._lock:
+            start = time.monotonic()
+            stdout = _FrameWriter(send, "stdout")
+            stderr = _FrameWriter(send, "stderr")
+            try:
+                with _caller_context(cwd, env), \
+                        contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    exit_code = self.command_handler.handle_command(argv)
+            except SystemExit as e:
+                # argparse exits on --help and on invalid arguments
+                exit_code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+            self.requests_served += 1
+
+        logger.info(f"Served {argv[:1]} in {time.monotonic() - start:.3f}s (exit code {exit_code})")
+        return exit_code
+
+
+def _connect(socket_path: str, timeout: Optional[float]) -> Optional[socket.socket]:
+    """Connect to the daemon, or return None if it isn't running."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def forward_command(
+    argv: List[str],
+    socket_path: Optional[str] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None
+) -> Optional[int]:
+    """
+    Run a command in the daemon, writing its output as it arrives.
+
+    Args:
+        argv: Command-line arguments
+        socket_path: Daemon socket (see get_socket_path)
+        stdout: Stream for the command's standard output (default: sys.stdout)
+        stderr: Stream for the command's standard error (default: sys.stderr)
+
+    Returns:
+        Exit code of the command, or None if no daemon is running or it can't
+        run the command with the caller's settings, and the command should be
+        run locally
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+
+    sock = _connect(get_socket_path(socket_path), timeout=None)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("rwb") as stream:
+        request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+        stream.write((json.dumps(request) + "\n").encode("utf-8"))
+        stream.flush()
+
+        for line in stream:
+            message = json.loads(line)
+            if "stream" in message:
+                target = stderr if message["stream"] == "stderr" else stdout
+                target.write(message["data"])
+                target.flush()
+                continue
+            if "run_locally" in message:
+                logger.info(f"CLI daemon can't run the command: {message['run_locally']}")
+                return None
+            if "error" in message:
+                stderr.write(f"Error: {message['error']}\n")
+            return message.get("exit_code", 1)
+
+    stderr.write("Error: Connection to the daemon closed unexpectedly\n")
+    return 1
+
+
+def daemon_request(op: str, socket_path: Optional[str] = None, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+    """
+    Send a control request to the daemon.
+
+    Args:
+        op: 'ping', 'status' or 'stop'
+        socket_path: Daemon socket (see get_socket_path)
+        timeout: Seconds to wait for the daemon
+
+    Returns:
+        The daemon's reply, or None if no daemon is running
+    """
+    sock = _connect(get_socket_path(socket_path), timeout)
+    if sock is None:
+        return None
+
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write((json.dumps({"op": op}) + "\n").encode("utf-8"))
+            stream.flush()
+            line = stream.readline()
+    except OSError:
+        return None
+    return json.loads(line) if line else None
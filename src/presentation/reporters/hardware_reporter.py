@@ -6,29 +6,74 @@ This module provides an implementation of the HardwareReporter interface.
 
 import logging
 import os
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from src.domain.entities.ticket import Ticket
 from src.domain.interfaces.reporter_interfaces import HardwareReporter
+from src.domain.value_objects.analysis_frame import AnalysisFrame
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Keywords in the subject identifying the component of a ticket, checked in order.
+# This is a simplified version - in a real implementation, we would use the
+# AI service to extract the component information from the ticket content
+COMPONENT_KEYWORDS = {
+    "gpu": ["gpu", "graphics", "video card", "rtx", "gtx", "radeon"],
+    "cpu": ["cpu", "processor", "ryzen", "intel", "amd"],
+    "memory": ["memory", "ram", "dimm", "ddr"],
+    "drive": ["drive", "ssd", "hdd", "nvme", "storage"],
+    "power_supply": ["power", "psu", "supply"],
+    "motherboard": ["motherboard", "mobo", "mainboard"],
+    "cooling": ["cooling", "fan", "heat", "thermal", "temperature"],
+    "network": ["network", "ethernet", "wifi", "wireless"],
+    "other": ["case", "chassis", "keyboard", "mouse", "monitor", "display"]
+}
+
+# One pattern per component matching any of its keywords
+_COMPONENT_PATTERNS = [
+    (component, re.compile("|".join(map(re.escape, keywords))))
+    for component, keywords in COMPONENT_KEYWORDS.items()
+]
+
+# Ticket statuses left out of the recent open tickets
+CLOSED_STATUSES = ('solved', 'closed')
+
+
+def subject_component(subject: Optional[str]) -> str:
+    """
+    Get the component a ticket subject mentions.
+
+    Args:
+        subject: Ticket subject
+
+    Returns:
+        Component type, or 'unknown' if no keyword matches
+    """
+    subject = (subject or "").lower()
+    for component, pattern in _COMPONENT_PATTERNS:
+        if pattern.search(subject):
+            return component
+    return "unknown"
+
 
 class HardwareReporterImpl(HardwareReporter):
     """
     Implementation of the HardwareReporter interface.
 
     This reporter generates reports about hardware components in tickets.
+    Tickets may be given as a list or as an AnalysisFrame built once for the
+    report; the component of each ticket is added to the frame as a column.
     """
 
-    def generate_report(self, tickets: List[Ticket], **kwargs) -> str:
+    def generate_report(self, tickets: Union[List[Ticket], AnalysisFrame], **kwargs) -> str:
         """
         Generate a hardware component report.
 
         Args:
-            tickets: List of tickets to include in the report
+            tickets: Tickets to include in the report
             **kwargs: Additional arguments (title, format, etc.)
 
         Returns:
@@ -36,6 +81,7 @@ class HardwareReporterImpl(HardwareReporter):
         """
         title = kwargs.get('title', "Hardware Component Report")
         format_type = kwargs.get('format', 'text')
+        tickets = self._with_components(tickets)
 
         # Calculate component distribution
         component_distribution = self.calculate_component_distribution(tickets)
@@ -45,7 +91,43 @@ class HardwareReporterImpl(HardwareReporter):
         else:
             return self._generate_text_report(tickets, component_distribution, title)
 
-    def _generate_text_report(self, tickets: List[Ticket], component_distribution: Dict[str, int], title: str) -> str:
+    def _with_components(self, tickets: Union[List[Ticket], AnalysisFrame]) -> AnalysisFrame:
+        """
+        Get a ticket frame with a 'component' column.
+
+        Args:
+            tickets: Tickets
+
+        Returns:
+            AnalysisFrame with the component of each ticket
+        """
+        frame = AnalysisFrame.from_tickets(tickets)
+        if "component" not in frame.columns:
+            frame.add_column("component", map(subject_component, frame.values("subject")))
+        return frame
+
+    def _recent_open_tickets(self, tickets: AnalysisFrame, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the newest tickets that are not solved or closed.
+
+        Args:
+            tickets: Ticket frame with components
+            limit: Maximum number of tickets
+
+        Returns:
+            Ticket rows, newest first; tickets without a creation time come last
+        """
+        open_statuses = [
+            status for status in tickets.categories("status")
+            if status and status.lower() not in CLOSED_STATUSES
+        ]
+        open_mask = tickets.mask("status", "in", open_statuses)
+        return tickets.rows(
+            tickets.top_k("created", limit, where=open_mask),
+            ["id", "subject", "status", "created_at", "component"]
+        )
+
+    def _generate_text_report(self, tickets: AnalysisFrame, component_distribution: Dict[str, int], title: str) -> str:
         """Generate a text-formatted report."""
         # Build the report
         report = f"{title}\n"
@@ -61,44 +143,26 @@ class HardwareReporterImpl(HardwareReporter):
             report += f"  - {component.capitalize()}: {count} ({percentage:.1f}%)\n"
         report += "\n"
 
-        # Recent tickets section
-        # Check if ticket is open based on status (not solved or closed)
-        open_tickets = [t for t in tickets if t.status and t.status.lower() not in ['solved', 'closed']]
-        if open_tickets:
+        # Recent tickets section (tickets not solved or closed, newest first)
+        recent_tickets = self._recent_open_tickets(tickets)
+        if recent_tickets:
             report += "Recent Open Tickets:\n"
-            # Define a sorting function that handles different created_at formats
-            def sort_by_created_at(ticket):
-                if not ticket.created_at:
-                    return datetime.min  # Return earliest possible date for None
-                if isinstance(ticket.created_at, datetime):
-                    return ticket.created_at
-                if isinstance(ticket.created_at, str):
-                    try:
-                        # Try to parse the ISO format string
-                        return datetime.fromisoformat(ticket.created_at.replace('Z', '+00:00'))
-                    except (ValueError, AttributeError):
-                        # If parsing fails, return a default date
-                        return datetime.min
-                return datetime.min
-
-            # Sort by created_at, newest first
-            sorted_tickets = sorted(open_tickets, key=sort_by_created_at, reverse=True)[:10]
-            for ticket in sorted_tickets:
-                report += f"  - Ticket {ticket.id}: {ticket.subject}\n"
+            for ticket in recent_tickets:
+                report += f"  - Ticket {ticket['id']}: {ticket['subject']}\n"
                 # Handle the case where created_at might be a string or a datetime
-                created_at_str = ticket.created_at
-                if hasattr(ticket.created_at, 'strftime'):
-                    created_at_str = ticket.created_at.strftime('%Y-%m-%d')
-                report += f"    Status: {ticket.status}, Created: {created_at_str}\n"
+                created_at_str = ticket['created_at']
+                if hasattr(created_at_str, 'strftime'):
+                    created_at_str = created_at_str.strftime('%Y-%m-%d')
+                report += f"    Status: {ticket['status']}, Created: {created_at_str}\n"
 
         return report
 
-    def _generate_html_report(self, tickets: List[Ticket], component_distribution: Dict[str, int], title: str) -> str:
+    def _generate_html_report(self, tickets: AnalysisFrame, component_distribution: Dict[str, int], title: str) -> str:
         """Generate an HTML-formatted report."""
         # Get the view name if available
         view_name = ""
-        if tickets and hasattr(tickets[0], 'source_view_name') and tickets[0].source_view_name:
-            view_name = tickets[0].source_view_name
+        if tickets and tickets.values("view_name", [0])[0]:
+            view_name = tickets.values("view_name", [0])[0]
 
         html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -264,57 +328,23 @@ class HardwareReporterImpl(HardwareReporter):
 
         html += "        </div>\n\n"
 
-        # Recent tickets section
-        # Check if ticket is open based on status (not solved or closed)
-        open_tickets = [t for t in tickets if t.status and t.status.lower() not in ['solved', 'closed']]
-        if open_tickets:
+        # Recent tickets section (tickets not solved or closed, newest first)
+        recent_tickets = self._recent_open_tickets(tickets)
+        if recent_tickets:
             html += "        <h2>Recent Open Tickets</h2>\n"
             html += "        <div class=\"tickets-list\">\n"
 
-            # Define a sorting function that handles different created_at formats
-            def sort_by_created_at(ticket):
-                if not ticket.created_at:
-                    return datetime.min
-                if isinstance(ticket.created_at, datetime):
-                    return ticket.created_at
-                if isinstance(ticket.created_at, str):
-                    try:
-                        return datetime.fromisoformat(ticket.created_at.replace('Z', '+00:00'))
-                    except (ValueError, AttributeError):
-                        return datetime.min
-                return datetime.min
-
-            # Sort by created_at, newest first
-            sorted_tickets = sorted(open_tickets, key=sort_by_created_at, reverse=True)[:10]
-
-            for ticket in sorted_tickets:
+            for ticket in recent_tickets:
                 # Handle the case where created_at might be a string or a datetime
-                created_at_str = ticket.created_at
-                if hasattr(ticket.created_at, 'strftime'):
-                    created_at_str = ticket.created_at.strftime('%Y-%m-%d')
-
-                # Find the main component in the subject line
-                ticket_component = "unknown"
-                component_keywords = {
-                    "gpu": ["gpu", "graphics", "video card", "rtx", "gtx", "radeon"],
-                    "cpu": ["cpu", "processor", "ryzen", "intel", "amd"],
-                    "memory": ["memory", "ram", "dimm", "ddr"],
-                    "drive": ["drive", "ssd", "hdd", "nvme", "storage"],
-                    "power_supply": ["power", "psu", "supply"],
-                    "motherboard": ["motherboard", "mobo", "mainboard"],
-                    "cooling": ["cooling", "fan", "heat", "thermal", "temperature"],
-                    "network": ["network", "ethernet", "wifi", "wireless"],
-                    "other": ["case", "chassis", "keyboard", "mouse", "monitor", "display"]
-                }
-
-                for component, keywords in component_keywords.items():
-                    if any(keyword in ticket.subject.lower() for keyword in keywords):
-                        ticket_component = component
-                        break
+                created_at_str = ticket['created_at']
+                if hasattr(created_at_str, 'strftime'):
+                    created_at_str = created_at_str.strftime('%Y-%m-%d')
+
+                ticket_component = ticket['component']
 
                 status_class = ""
-                if ticket.status:
-                    lower_status = ticket.status.lower()
+                if ticket['status']:
+                    lower_status = ticket['status'].lower()
                     if lower_status == "open":
                         status_class = "status-open"
                     elif lower_status == "new":
@@ -324,10 +354,10 @@ class HardwareReporterImpl(HardwareReporter):
 
                 html += f"""            <div class="ticket">
                 <div class="ticket-header">
-                    <div class="ticket-id">Ticket {ticket.id}</div>
-                    <div class="ticket-status {status_class}">{ticket.status.capitalize() if ticket.status else "Unknown"}</div>
+                    <div class="ticket-id">Ticket {ticket['id']}</div>
+                    <div class="ticket-status {status_class}">{ticket['status'].capitalize() if ticket['status'] else "Unknown"}</div>
                 </div>
-                <div class="ticket-subject">{ticket.subject}</div>
+                <div class="ticket-subject">{ticket['subject']}</div>
                 <div class="ticket-meta">Created: {created_at_str} | Component: {ticket_component.capitalize()}</div>
             </div>
 """
@@ -338,12 +368,12 @@ class HardwareReporterImpl(HardwareReporter):
 
         return html
 
-    def generate_multi_view_report(self, tickets: List[Ticket], view_map: Dict[int, str], title: str = "Multi-View Hardware Component Report", **kwargs) -> str:
+    def generate_multi_view_report(self, tickets: Union[List[Ticket], AnalysisFrame], view_map: Dict[int, str], title: str = "Multi-View Hardware Component Report", **kwargs) -> str:
         """
         Generate a multi-view hardware component report.
 
         Args:
-            tickets: List of tickets to include in the report
+            tickets: Tickets to include in the report
             view_map: Dictionary mapping view IDs to view names
             title: Report title
             **kwargs: Additional arguments (format, etc.)
@@ -354,21 +384,18 @@ class HardwareReporterImpl(HardwareReporter):
         # Get format type from kwargs
         format_type = kwargs.get('format', 'text')
 
-        # Group tickets by view
-        tickets_by_view: Dict[int, List[Ticket]] = {}
-        for ticket in tickets:
-            if hasattr(ticket, 'source_view_id') and ticket.source_view_id is not None:
-                if ticket.source_view_id not in tickets_by_view:
-                    tickets_by_view[ticket.source_view_id] = []
-                tickets_by_view[ticket.source_view_id].append(ticket)
+        # Group the tickets of a view by view
+        tickets = self._with_components(tickets)
+        all_tickets = tickets.filter(tickets.mask("view_id", "!=", None))
+        tickets_by_view = all_tickets.group_by("view_id")
 
         # Generate the appropriate format
         if format_type == 'html':
-            return self._generate_multi_view_html_report(tickets_by_view, view_map, title)
+            return self._generate_multi_view_html_report(all_tickets, tickets_by_view, view_map, title)
         else:
-            return self._generate_multi_view_text_report(tickets_by_view, view_map, title)
+            return self._generate_multi_view_text_report(all_tickets, tickets_by_view, view_map, title)
 
-    def _generate_multi_view_text_report(self, tickets_by_view: Dict[int, List[Ticket]], view_map: Dict[int, str], title: str) -> str:
+    def _generate_multi_view_text_report(self, all_tickets: AnalysisFrame, tickets_by_view: Dict[int, AnalysisFrame], view_map: Dict[int, str], title: str) -> str:
         """Generate a text-formatted multi-view report."""
         # Build the report
         report = f"{title}\n"
@@ -378,11 +405,10 @@ class HardwareReporterImpl(HardwareReporter):
         report += f"Total views: {len(tickets_by_view)}\n"
 
         # Count total tickets
-        total_tickets = sum(len(view_tickets) for view_tickets in tickets_by_view.values())
+        total_tickets = len(all_tickets)
         report += f"Total tickets analyzed: {total_tickets}\n\n"
 
         # Overall component distribution
-        all_tickets = [ticket for tickets in tickets_by_view.values() for ticket in tickets]
         component_distribution = self.calculate_component_distribution(all_tickets)
 
         report += "Overall Component Distribution:\n"
@@ -410,13 +436,12 @@ class HardwareReporterImpl(HardwareReporter):
 
         return report
 
-    def _generate_multi_view_html_report(self, tickets_by_view: Dict[int, List[Ticket]], view_map: Dict[int, str], title: str) -> str:
+    def _generate_multi_view_html_report(self, all_tickets: AnalysisFrame, tickets_by_view: Dict[int, AnalysisFrame], view_map: Dict[int, str], title: str) -> str:
         """Generate an HTML-formatted multi-view report."""
         # Count total tickets
-        total_tickets = sum(len(view_tickets) for view_tickets in tickets_by_view.values())
+        total_tickets = len(all_tickets)
 
         # Calculate overall component distribution
-        all_tickets = [ticket for tickets in tickets_by_view.values() for ticket in tickets]
         overall_distribution = self.calculate_component_distribution(all_tickets)
 
         # Get max count for scaling bars
@@ -677,48 +702,17 @@ class HardwareReporterImpl(HardwareReporter):
 
         return html
 
-    def calculate_component_distribution(self, tickets: List[Ticket]) -> Dict[str, int]:
+    def calculate_component_distribution(self, tickets: Union[List[Ticket], AnalysisFrame]) -> Dict[str, int]:
         """
         Calculate component distribution.
 
         Args:
-            tickets: List of tickets
+            tickets: Tickets
 
         Returns:
             Dictionary mapping component types to counts
         """
-        distribution: Dict[str, int] = {}
-
-        # Extract component information from ticket tags, subject, and description
-        # This is a simplified version - in a real implementation, we would use the
-        # AI service to extract the component information from the ticket content
-
-        # For this example, we'll just check for common component keywords in the subject
-        component_keywords = {
-            "gpu": ["gpu", "graphics", "video card", "rtx", "gtx", "radeon"],
-            "cpu": ["cpu", "processor", "ryzen", "intel", "amd"],
-            "memory": ["memory", "ram", "dimm", "ddr"],
-            "drive": ["drive", "ssd", "hdd", "nvme", "storage"],
-            "power_supply": ["power", "psu", "supply"],
-            "motherboard": ["motherboard", "mobo", "mainboard"],
-            "cooling": ["cooling", "fan", "heat", "thermal", "temperature"],
-            "network": ["network", "ethernet", "wifi", "wireless"],
-            "other": ["case", "chassis", "keyboard", "mouse", "monitor", "display"]
-        }
-
-        for ticket in tickets:
-            found_component = False
-
-            for component, keywords in component_keywords.items():
-                if any(keyword in ticket.subject.lower() for keyword in keywords):
-                    distribution[component] = distribution.get(component, 0) + 1
-                    found_component = True
-                    break
-
-            if not found_component:
-                distribution["unknown"] = distribution.get("unknown", 0) + 1
-
-        return distribution
+        return self._with_components(tickets).count_by("component")
 
     def save_report(self, report: str, filename: Optional[str] = None) -> str:
         """
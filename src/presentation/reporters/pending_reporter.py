@@ -5,36 +5,44 @@ This module provides an implementation of the PendingReporter interface.
 """
 
 import logging
+import math
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Union
 
 from src.domain.entities.ticket import Ticket
 from src.domain.interfaces.reporter_interfaces import PendingReporter
+from src.domain.value_objects.analysis_frame import AnalysisFrame
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Age ranges of the age distribution, and the ages in days they end at
+AGE_RANGES = ("< 1 day", "1-2 days", "3-7 days", "1-2 weeks", "2-4 weeks", "> 4 weeks")
+AGE_RANGE_ENDS = (1, 3, 8, 15, 29)
+
 
 class PendingReporterImpl(PendingReporter):
     """
     Implementation of the PendingReporter interface.
 
-    This reporter generates reports about pending tickets.
+    This reporter generates reports about pending tickets. Tickets may be
+    given as a list or as an AnalysisFrame built once for the report.
     """
 
-    def generate_report(self, tickets: List[Ticket], **kwargs) -> str:
+    def generate_report(self, tickets: Union[List[Ticket], AnalysisFrame], **kwargs) -> str:
         """
         Generate a pending ticket report.
 
         Args:
-            tickets: List of tickets to include in the report
+            tickets: Tickets to include in the report
             **kwargs: Additional arguments (view_name, format, etc.)
 
         Returns:
             Report text
         """
         view_name = kwargs.get('view_name', "Pending Tickets")
+        tickets = AnalysisFrame.from_tickets(tickets)
 
         # Calculate age distribution
         age_distribution = self.calculate_age_distribution(tickets)
@@ -56,25 +64,28 @@ class PendingReporterImpl(PendingReporter):
         # Oldest tickets section
         if tickets:
             report += "Oldest Pending Tickets:\n"
-            # Sort by created_at, oldest first
-            for ticket in sorted(tickets, key=lambda t: t.created_at)[:10]:
-                age_days = ticket.age_in_days
-                report += f"  - Ticket {ticket.id}: {ticket.subject}\n"
-                report += f"    Age: {age_days} days, Created: {ticket.created_at.strftime('%Y-%m-%d')}\n"
+            for ticket in self._oldest_tickets(tickets, 10):
+                report += f"  - Ticket {ticket['id']}: {ticket['subject']}\n"
+                report += f"    Age: {self._format_age(ticket)}, Created: {self._format_created(ticket)}\n"
 
         return report
 
-    def generate_multi_view_report(self, tickets_by_view: Dict[str, List[Ticket]], **kwargs) -> str:
+    def generate_multi_view_report(self, tickets_by_view: Dict[str, Union[List[Ticket], AnalysisFrame]], **kwargs) -> str:
         """
         Generate a multi-view pending ticket report.
 
         Args:
-            tickets_by_view: Dictionary mapping view names to lists of tickets
+            tickets_by_view: Dictionary mapping view names to their tickets
             **kwargs: Additional arguments
 
         Returns:
             Report text
         """
+        tickets_by_view = {
+            view_name: AnalysisFrame.from_tickets(view_tickets)
+            for view_name, view_tickets in tickets_by_view.items()
+        }
+
         # Build the report
         report = "Multi-View Pending Ticket Report\n"
         report += "-------------------------------\n\n"
@@ -103,52 +114,56 @@ class PendingReporterImpl(PendingReporter):
             # Oldest tickets for this view
             if view_tickets:
                 report += "\nOldest Tickets:\n"
-                # Sort by created_at, oldest first
-                for ticket in sorted(view_tickets, key=lambda t: t.created_at)[:5]:
-                    age_days = ticket.age_in_days
-                    report += f"  - Ticket {ticket.id}: {ticket.subject}\n"
-                    report += f"    Age: {age_days} days, Created: {ticket.created_at.strftime('%Y-%m-%d')}\n"
+                for ticket in self._oldest_tickets(view_tickets, 5):
+                    report += f"  - Ticket {ticket['id']}: {ticket['subject']}\n"
+                    report += f"    Age: {self._format_age(ticket)}, Created: {self._format_created(ticket)}\n"
 
             report += "\n"
 
         return report
 
-    def calculate_age_distribution(self, tickets: List[Ticket]) -> Dict[str, int]:
+    def calculate_age_distribution(self, tickets: Union[List[Ticket], AnalysisFrame]) -> Dict[str, int]:
         """
         Calculate age distribution of pending tickets.
 
+        Tickets without a (parseable) creation time are not counted.
+
         Args:
-            tickets: List of tickets
+            tickets: Tickets
 
         Returns:
             Dictionary mapping age ranges to counts
         """
-        distribution = {
-            "< 1 day": 0,
-            "1-2 days": 0,
-            "3-7 days": 0,
-            "1-2 weeks": 0,
-            "2-4 weeks": 0,
-            "> 4 weeks": 0
-        }
+        counts = AnalysisFrame.from_tickets(tickets).histogram("age_days", AGE_RANGE_ENDS)
+        return dict(zip(AGE_RANGES, counts))
 
-        for ticket in tickets:
-            age_days = ticket.age_in_days
-
-            if age_days < 1:
-                distribution["< 1 day"] += 1
-            elif age_days < 3:
-                distribution["1-2 days"] += 1
-            elif age_days < 8:
-                distribution["3-7 days"] += 1
-            elif age_days < 15:
-                distribution["1-2 weeks"] += 1
-            elif age_days < 29:
-                distribution["2-4 weeks"] += 1
-            else:
-                distribution["> 4 weeks"] += 1
-
-        return distribution
+    def _oldest_tickets(self, tickets: AnalysisFrame, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the oldest tickets.
+
+        Args:
+            tickets: Ticket frame
+            limit: Maximum number of tickets
+
+        Returns:
+            Ticket rows, oldest first; tickets without a creation time come last
+        """
+        return tickets.rows(
+            tickets.top_k("created", limit, largest=False),
+            ["id", "subject", "created", "age_days"]
+        )
+
+    def _format_age(self, ticket: Dict[str, Any]) -> str:
+        """Format the age of a ticket row in whole days."""
+        age_days = ticket['age_days']
+        return "unknown" if math.isnan(age_days) else f"{int(age_days)} days"
+
+    def _format_created(self, ticket: Dict[str, Any]) -> str:
+        """Format the creation date (UTC) of a ticket row."""
+        created = ticket['created']
+        if math.isnan(created):
+            return "unknown"
+        return datetime.fromtimestamp(created, timezone.utc).strftime('%Y-%m-%d')
 
     def save_report(self, report: str, filename: Optional[str] = None) -> str:
         """
@@ -7,10 +7,12 @@ This module provides an implementation of the SentimentReporter interface.
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from src.domain.entities.ticket_analysis import TicketAnalysis
 from src.domain.interfaces.reporter_interfaces import SentimentReporter
+from src.domain.value_objects.analysis_frame import AnalysisFrame
+from src.domain.value_objects.sentiment_rollup import SentimentRollup
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -21,86 +23,143 @@ class SentimentReporterImpl(SentimentReporter):
     Implementation of the SentimentReporter interface.
 
     This reporter generates reports based on sentiment analysis of tickets.
+    Analyses may be given as a list or as an AnalysisFrame built once for
+    the report.
     """
 
-    def generate_report(self, analyses: List[TicketAnalysis], **kwargs) -> str:
+    def generate_report(self, analyses: Union[List[TicketAnalysis], AnalysisFrame], **kwargs) -> str:
         """
         Generate a sentiment analysis report.
 
         Args:
-            analyses: List of ticket analyses to include in the report
+            analyses: Ticket analyses to include in the report
             **kwargs: Additional arguments (title, format, etc.)
 
         Returns:
             Report text
         """
         title = kwargs.get('title', "Sentiment Analysis Report")
+        frame = AnalysisFrame.from_analyses(analyses)
 
-        # Calculate sentiment distribution
-        sentiment_distribution = self.calculate_sentiment_distribution(analyses)
+        return self._format_report(title, SentimentRollup.from_frame(frame), self._high_priority_rows(frame))
 
-        # Calculate priority distribution
-        priority_distribution = self.calculate_priority_distribution(analyses)
+    def generate_rollup_report(self, rollup: SentimentRollup, **kwargs) -> str:
+        """
+        Generate a sentiment analysis report from pre-aggregated totals.
 
-        # Calculate business impact count
-        business_impact_count = self.calculate_business_impact_count(analyses)
+        Rollups carry counts rather than tickets, so the high priority section
+        lists the tickets given as 'high_priority', or only their number if
+        none are given.
+
+        Args:
+            rollup: Aggregated sentiment totals
+            **kwargs: Additional arguments (title, high_priority analyses, etc.)
+
+        Returns:
+            Report text
+        """
+        title = kwargs.get('title', "Sentiment Analysis Report")
+        high_priority = kwargs.get('high_priority')
+        if high_priority is not None:
+            high_priority = self._high_priority_rows(AnalysisFrame.from_analyses(high_priority))
+        return self._format_report(title, rollup, high_priority)
+
+    def _high_priority_rows(self, frame: AnalysisFrame) -> List[Dict[str, Any]]:
+        """
+        Get the rows of the high priority section.
+
+        Args:
+            frame: Analyses of the report
+
+        Returns:
+            Rows of the analyses with a priority score of at least 7
+        """
+        return frame.rows(
+            frame.indices(frame.mask("priority_score", ">=", 7)),
+            ["ticket_id", "subject", "priority", "polarity", "priority_score"]
+        )
+
+    def _format_report(
+        self,
+        title: str,
+        rollup: SentimentRollup,
+        high_priority: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """
+        Format the sentiment report text.
+
+        Args:
+            title: Report title
+            rollup: Aggregated sentiment totals
+            high_priority: Optional high priority analysis rows (see
+                AnalysisFrame.rows()) to list individually
+
+        Returns:
+            Report text
+        """
+        total = rollup.total
 
         # Build the report
         report = f"{title}\n"
         report += f"{'-' * len(title)}\n\n"
 
         report += f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += f"Total tickets analyzed: {len(analyses)}\n\n"
+        report += f"Total tickets analyzed: {total}\n\n"
 
         # Sentiment distribution section
         report += "Sentiment Distribution:\n"
-        for sentiment, count in sentiment_distribution.items():
-            percentage = (count / len(analyses)) * 100 if analyses else 0
+        for sentiment, count in rollup.sentiment_distribution.items():
+            percentage = (count / total) * 100 if total else 0
             report += f"  - {sentiment.capitalize()}: {count} ({percentage:.1f}%)\n"
         report += "\n"
 
         # Priority distribution section
         report += "Priority Distribution:\n"
-        for score, count in sorted(priority_distribution.items(), reverse=True):
-            percentage = (count / len(analyses)) * 100 if analyses else 0
+        for score, count in sorted(rollup.priority_distribution.items(), reverse=True):
+            percentage = (count / total) * 100 if total else 0
             priority_level = "High" if score >= 7 else "Medium" if score >= 4 else "Low"
             report += f"  - Score {score} ({priority_level}): {count} ({percentage:.1f}%)\n"
         report += "\n"
 
         # Business impact section
-        if business_impact_count > 0:
-            percentage = (business_impact_count / len(analyses)) * 100 if analyses else 0
-            report += f"Business Impact Detected: {business_impact_count} ({percentage:.1f}%)\n\n"
+        if rollup.business_impact_count > 0:
+            percentage = (rollup.business_impact_count / total) * 100 if total else 0
+            report += f"Business Impact Detected: {rollup.business_impact_count} ({percentage:.1f}%)\n\n"
 
         # High priority tickets section
-        high_priority_analyses = [a for a in analyses if a.priority_score >= 7]
-        if high_priority_analyses:
+        if high_priority is None:
+            high_priority_count = rollup.count_at_least(7)
+            if high_priority_count:
+                report += f"High Priority Tickets: {high_priority_count}\n"
+        elif high_priority:
             report += "High Priority Tickets:\n"
-            for analysis in high_priority_analyses:
-                report += f"  - Ticket {analysis.ticket_id}: {analysis.subject}\n"
-                report += f"    Priority: {analysis.priority}, Sentiment: {analysis.sentiment.polarity}, Score: {analysis.priority_score}\n"
+            for row in high_priority:
+                report += f"  - Ticket {row['ticket_id']}: {row['subject']}\n"
+                report += f"    Priority: {row['priority']}, Sentiment: {row['polarity']}, Score: {row['priority_score']}\n"
 
         return report
 
-    def generate_multi_view_report(self, analyses: List[TicketAnalysis], view_map: Dict[int, str], title: str = "Multi-View Sentiment Analysis Report") -> str:
+    def generate_multi_view_report(
+        self,
+        analyses: Union[List[TicketAnalysis], AnalysisFrame],
+        view_map: Dict[int, str],
+        title: str = "Multi-View Sentiment Analysis Report"
+    ) -> str:
         """
         Generate a multi-view sentiment analysis report.
 
         Args:
-            analyses: List of ticket analyses to include in the report
+            analyses: Ticket analyses to include in the report
             view_map: Dictionary mapping view IDs to view names
             title: Report title
 
         Returns:
             Report text
         """
+        analyses = AnalysisFrame.from_analyses(analyses)
+
         # Group analyses by view
-        analyses_by_view: Dict[int, List[TicketAnalysis]] = {}
-        for analysis in analyses:
-            if analysis.source_view_id is not None:
-                if analysis.source_view_id not in analyses_by_view:
-                    analyses_by_view[analysis.source_view_id] = []
-                analyses_by_view[analysis.source_view_id].append(analysis)
+        analyses_by_view = analyses.group_by("view_id", where=analyses.mask("view_id", "!=", None))
 
         # Build the report
         report = f"{title}\n"
@@ -151,53 +210,48 @@ class SentimentReporterImpl(SentimentReporter):
 
         return report
 
-    def calculate_sentiment_distribution(self, analyses: List[TicketAnalysis]) -> Dict[str, int]:
+    def calculate_sentiment_distribution(self, analyses: Union[List[TicketAnalysis], AnalysisFrame]) -> Dict[str, int]:
         """
         Calculate sentiment distribution.
 
         Args:
-            analyses: List of ticket analyses
+            analyses: Ticket analyses
 
         Returns:
             Dictionary mapping sentiment polarities to counts
         """
         distribution = {"positive": 0, "negative": 0, "neutral": 0, "unknown": 0}
 
-        for analysis in analyses:
-            polarity = analysis.sentiment.polarity
-            distribution[polarity] = distribution.get(polarity, 0) + 1
+        for polarity, count in AnalysisFrame.from_analyses(analyses).count_by("polarity").items():
+            polarity = polarity or "unknown"
+            distribution[polarity] = distribution.get(polarity, 0) + count
 
         return distribution
 
-    def calculate_priority_distribution(self, analyses: List[TicketAnalysis]) -> Dict[int, int]:
+    def calculate_priority_distribution(self, analyses: Union[List[TicketAnalysis], AnalysisFrame]) -> Dict[int, int]:
         """
         Calculate priority distribution.
 
         Args:
-            analyses: List of ticket analyses
+            analyses: Ticket analyses
 
         Returns:
             Dictionary mapping priority scores to counts
         """
-        distribution: Dict[int, int] = {}
-
-        for analysis in analyses:
-            score = analysis.priority_score
-            distribution[score] = distribution.get(score, 0) + 1
-
-        return distribution
+        return AnalysisFrame.from_analyses(analyses).count_by("priority_score")
 
-    def calculate_business_impact_count(self, analyses: List[TicketAnalysis]) -> int:
+    def calculate_business_impact_count(self, analyses: Union[List[TicketAnalysis], AnalysisFrame]) -> int:
         """
         Calculate the number of tickets with business impact.
 
         Args:
-            analyses: List of ticket analyses
+            analyses: Ticket analyses
 
         Returns:
             Count of tickets with business impact
         """
-        return sum(1 for a in analyses if a.has_business_impact)
+        frame = AnalysisFrame.from_analyses(analyses)
+        return frame.count(frame.mask("business_impact", "==", 1))
 
     def save_report(self, report: str, filename: Optional[str] = None) -> str:
         """
@@ -1,12 +1,25 @@
 """
 Webhook Handler
 
-This module defines the WebhookHandler class that processes webhook requests from Zendesk.
+This module defines the WebhookHandler class that processes webhook requests from Zendesk,
+and the HTTP server that receives them and exposes the process metrics at /metrics.
 """
 
+import contextlib
+import hashlib
+import hmac
+import itertools
 import json
 import logging
-from typing import Any, Callable, Dict, Optional
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.infrastructure.utils.metrics import InMemoryMetricsCollector, metrics_collector
+from src.infrastructure.utils.profiling import ProfileSession, default_profile_path
+from src.infrastructure.utils.retry_policy import deadline
+from src.infrastructure.utils.tracing import parse_traceparent, tracer
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -20,15 +33,36 @@ class WebhookHandler:
     the appropriate handler methods.
     """
 
-    def __init__(self, service_provider: Any):
+    def __init__(
+        self,
+        service_provider: Any,
+        deadline_seconds: Optional[float] = None,
+        metrics: Optional[InMemoryMetricsCollector] = None,
+        profile_every: int = 0
+    ):
         """
         Initialize the webhook handler.
 
         Args:
-            service_provider: Provider for application services
+            service_provider: Provider for application services, or the webhook service itself
+            deadline_seconds: Optional time limit for handling one webhook; retries
+                of the calls made while handling it never wait past it
+            metrics: Collector receiving webhook metrics and exposed at /metrics
+                (default: the process-wide collector)
+            profile_every: Profile one webhook in this many (0 disables it); the
+                stack samples are saved in ZENDESK_AI_PROFILE_DIR and the stage
+                breakdown is logged
         """
         self.service_provider = service_provider
-        self.webhook_service = service_provider.get_webhook_service()
+        self.deadline_seconds = deadline_seconds
+        self.metrics = metrics if metrics is not None else metrics_collector
+        self.profile_every = profile_every
+        self._webhook_numbers = itertools.count(1)
+        if hasattr(service_provider, "get_webhook_service"):
+            self.webhook_service = service_provider.get_webhook_service()
+        else:
+            self.webhook_service = service_provider
+        self._server: Optional[ThreadingHTTPServer] = None
         self.handlers: Dict[str, Callable] = {
             "ticket.created": self._handle_ticket_created,
             "ticket.updated": self._handle_ticket_updated,
@@ -52,14 +86,22 @@ class WebhookHandler:
         handler = self.handlers.get(event_type)
         if not handler:
             logger.warning(f"No handler for event type: {event_type}")
+            self.metrics.increment("webhook.requests", tags={"event_type": "unknown", "outcome": "unknown_event"})
             return {
                 "success": False,
                 "error": f"Unknown event type: {event_type}"
             }
 
+        start = time.perf_counter()
+        outcome = "error"
         try:
-            # Call the handler
-            result = handler(payload)
+            # Call the handler within the webhook's deadline and trace span
+            with tracer.start_span("webhook.handle", {"event_type": event_type}) as span:
+                with deadline(self.deadline_seconds) if self.deadline_seconds else contextlib.nullcontext():
+                    with self._profile(event_type):
+                        result = handler(payload)
+                outcome = "ok" if result else "failed"
+                span.set_attribute("outcome", outcome)
 
             # Return the result
             return {
@@ -74,6 +116,75 @@ class WebhookHandler:
                 "error": str(e),
                 "event_type": event_type
             }
+        finally:
+            tags = {"event_type": event_type, "outcome": outcome}
+            self.metrics.increment("webhook.requests", tags=tags)
+            self.metrics.timing("webhook.request.latency", (time.perf_counter() - start) * 1000, tags)
+
+    @contextlib.contextmanager
+    def _profile(self, event_type: str) -> Iterator[None]:
+        """
+        Profile the handling of one webhook in profile_every.
+
+        The stack sampler only samples the handling thread, so concurrent
+        webhooks don't show up in the profile.
+
+        Args:
+            event_type: Type of webhook event
+        """
+        number = next(self._webhook_numbers)
+        if not self.profile_every or number % self.profile_every:
+            yield
+            return
+
+        session = ProfileSession("sample", sample_interval=0.002, all_threads=False)
+        try:
+            with session:
+                yield
+        finally:
+            path = default_profile_path(f"webhook-{event_type.replace('.', '-')}-{number}", session.extension)
+            try:
+                path = session.save(path)
+            except OSError as e:
+                logger.error(f"Failed to save webhook profile to {path}: {e}")
+            logger.info(f"Profiled webhook {number} ({path}):\n{session.format_stages(event_type)}")
+
+    def start(self, host: str = "127.0.0.1", port: int = 5000, path: str = "/webhook", debug: bool = False) -> None:
+        """
+        Serve webhooks over HTTP until stopped.
+
+        Webhooks are POSTed to the path and must carry an HMAC-SHA256 signature
+        of the body, keyed with WEBHOOK_SECRET_KEY, in the
+        X-Zendesk-Webhook-Signature header. A traceparent header continues the
+        caller's trace, and the ID of a recorded trace is returned in the
+        X-Trace-Id header. GET /metrics returns the metrics in
+        the Prometheus text format and GET /health returns the server status.
+
+        Args:
+            host: Host to listen on
+            port: Port to listen on
+            path: Webhook endpoint path
+            debug: Log every HTTP request
+        """
+        handler = self
+
+        class RequestHandler(_WebhookRequestHandler):
+            webhook_handler = handler
+            webhook_path = path
+            log_requests = debug
+
+        self._server = ThreadingHTTPServer((host, port), RequestHandler)
+        logger.info(f"Webhook server listening on http://{host}:{port}{path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        """Stop the HTTP server started by start()."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
 
     def _handle_ticket_created(self, payload: Dict[str, Any]) -> bool:
         """
@@ -122,3 +233,88 @@ class WebhookHandler:
 
         # Process the event
         return self.webhook_service.handle_comment_created(comment_data)
+
+
+def _event_type(payload: Dict[str, Any]) -> str:
+    """Get the event type of a webhook payload, accepting 'ticket_created' as 'ticket.created'."""
+    event_type = str(payload.get("event_type") or payload.get("type") or payload.get("event") or "")
+    if "." not in event_type:
+        event_type = event_type.replace("_", ".", 1)
+    return event_type
+
+
+class _WebhookRequestHandler(BaseHTTPRequestHandler):
+    """HTTP request handler of the webhook server."""
+
+    webhook_handler: WebhookHandler
+    webhook_path = "/webhook"
+    log_requests = False
+    _trace_id: Optional[str] = None
+
+    def do_GET(self) -> None:
+        """Serve the metrics and health endpoints."""
+        if self.path == "/metrics":
+            body = self.webhook_handler.metrics.render_prometheus().encode("utf-8")
+            self._respond(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        elif self.path == "/health":
+            self._respond_json(200, {"status": "ok"})
+        else:
+            self._respond_json(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:
+        """Receive a webhook."""
+        if self.path != self.webhook_path:
+            self._respond_json(404, {"error": "Not found"})
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not self._signature_valid(body):
+            self.webhook_handler.metrics.increment("webhook.requests", tags={"event_type": "unknown", "outcome": "unauthorized"})
+            self._respond_json(401, {"error": "Invalid signature"})
+            return
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self._respond_json(400, {"error": "Invalid JSON"})
+            return
+
+        # Continue the caller's trace if it sent a traceparent header
+        parent = parse_traceparent(self.headers.get("traceparent"))
+        with tracer.start_span("webhook.http", {"http.path": self.path}, parent=parent) as span:
+            result = self.webhook_handler.handle_webhook(_event_type(payload), payload)
+            status = 200 if result.get("success") else 422
+            span.set_attribute("http.status_code", status)
+            self._trace_id = span.trace_id if span.sampled else None
+            self._respond_json(status, result)
+
+    def _signature_valid(self, body: bytes) -> bool:
+        """Check the HMAC signature of a webhook body."""
+        secret_key = os.getenv("WEBHOOK_SECRET_KEY")
+        signature = self.headers.get("X-Zendesk-Webhook-Signature")
+        if not secret_key:
+            logger.warning("No webhook secret key configured, rejecting webhook")
+            return False
+        if not signature:
+            return False
+        expected = hmac.new(secret_key.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    def _respond_json(self, status: int, data: Dict[str, Any]) -> None:
+        """Send a JSON response."""
+        self._respond(status, json.dumps(data, default=str).encode("utf-8"), "application/json")
+
+    def _respond(self, status: int, body: bytes, content_type: str) -> None:
+        """Send a response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if self._trace_id:
+            self.send_header("X-Trace-Id", self._trace_id)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests through the module logger in debug mode only."""
+        if self.log_requests:
+            logger.info(format % args)
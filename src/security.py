@@ -1,57 +1,165 @@
 import hashlib
 import hmac
-import ipaddress
 import logging
 import os
+import signal
+import sqlite3
+import threading
 import time
 from functools import wraps
 
 from flask import abort, jsonify, request
 
+from src.infrastructure.utils.ip_allowlist import IPAllowlist
+from src.infrastructure.utils.rate_limiter import (
+    SQLiteRateLimiter,
+    TokenBucketRateLimiter,
+)
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 WEBHOOK_SECRET_KEY = os.getenv("WEBHOOK_SECRET_KEY", "")
 ALLOWED_IPS_RAW = os.getenv("ALLOWED_IPS", "").split(",")
 
-# Parse allowed IPs and networks
+# Optional file of further allowed IPs and networks (one or more per line,
+# comma-separated, '#' starts a comment). It is reloaded when it changes and
+# on SIGHUP, so the allowlist can be updated without restarting the server.
+ALLOWED_IPS_FILE = os.getenv("ALLOWED_IPS_FILE", "")
+ALLOWED_IPS_RELOAD_SECONDS = float(os.getenv("ALLOWED_IPS_RELOAD_SECONDS", "5"))
+
+# Parsed allowed IPs and networks, kept for callers that inspect them directly
 ALLOWED_IPS = []
 ALLOWED_NETWORKS = []
-for ip_entry in ALLOWED_IPS_RAW:
-    if ip_entry:
-        try:
-            if "/" in ip_entry:
-                # This is a network in CIDR notation
-                ALLOWED_NETWORKS.append(ipaddress.ip_network(ip_entry.strip()))
-            else:
-                # This is a single IP
-                ALLOWED_IPS.append(ipaddress.ip_address(ip_entry.strip()))
-        except ValueError as e:
-            logger.error(f"Invalid IP or network: {ip_entry} - {e}")
 
-def is_ip_allowed(client_ip):
-    """For testing, allow directly returning True via monkey patching"""
-    # Special testing mode
-    if hasattr(is_ip_allowed, "testing_mode") and is_ip_allowed.testing_mode:
-        return True
-    """Check if an IP is allowed based on the whitelist."""
+# Compiled lookup structure used by is_ip_allowed
+_ip_allowlist = IPAllowlist()
+
+# Modification time of the allowlist file when it was last loaded, and when it was last checked
+_allowlist_file_mtime = None
+_allowlist_file_checked = 0.0
+_allowlist_file_lock = threading.Lock()
+
+
+def _file_mtime(path):
+    """Get the modification time of a file, or None if it can't be read."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def read_allowed_ips_file(path):
+    """
+    Read the entries of an allowlist file.
+
+    Args:
+        path: File with IPs and CIDR networks, comma- or line-separated
+
+    Returns:
+        List of entries (empty if the file can't be read)
+    """
     try:
-        ip = ipaddress.ip_address(client_ip)
+        with open(path, encoding="utf-8") as allowlist_file:
+            lines = allowlist_file.read().splitlines()
+    except OSError as e:
+        logger.error(f"Could not read allowlist file {path}: {e}")
+        return []
+
+    entries = []
+    for line in lines:
+        entries.extend(line.split("#", 1)[0].split(","))
+    return entries
+
+
+def reload_allowed_ips(raw_entries=None):
+    """
+    Recompile the IP allowlist without restarting the server.
+
+    Args:
+        raw_entries: Comma-separated IPs and CIDR networks (defaults to the
+            ALLOWED_IPS env variable plus the entries of ALLOWED_IPS_FILE)
+    """
+    global _allowlist_file_mtime
+
+    if raw_entries is None:
+        entries = list(ALLOWED_IPS_RAW)
+        if ALLOWED_IPS_FILE:
+            _allowlist_file_mtime = _file_mtime(ALLOWED_IPS_FILE)
+            entries.extend(read_allowed_ips_file(ALLOWED_IPS_FILE))
+    else:
+        entries = raw_entries.split(",")
+
+    _ip_allowlist.reload(entries)
+
+    # Update the lists in place so existing references see the new entries
+    networks = _ip_allowlist.networks
+    ALLOWED_IPS[:] = [n.network_address for n in networks if n.prefixlen == n.max_prefixlen]
+    ALLOWED_NETWORKS[:] = [n for n in networks if n.prefixlen != n.max_prefixlen]
+
 
-        # Check if IP is directly in whitelist
-        if ip in ALLOWED_IPS:
-            return True
+def reload_allowed_ips_if_changed():
+    """
+    Reload the allowlist if ALLOWED_IPS_FILE changed.
+
+    The file is checked at most every ALLOWED_IPS_RELOAD_SECONDS, so this is
+    cheap enough to call on every request.
+
+    Returns:
+        True if the allowlist was reloaded
+    """
+    global _allowlist_file_checked
 
-        # Check if IP is in any of the allowed networks
-        for network in ALLOWED_NETWORKS:
-            if ip in network:
-                return True
+    if not ALLOWED_IPS_FILE:
+        return False
 
+    now = time.monotonic()
+    if now - _allowlist_file_checked < ALLOWED_IPS_RELOAD_SECONDS:
         return False
-    except ValueError:
-        # If we can't parse the IP, reject it
+
+    with _allowlist_file_lock:
+        if now - _allowlist_file_checked < ALLOWED_IPS_RELOAD_SECONDS:
+            return False
+        _allowlist_file_checked = now
+        if _file_mtime(ALLOWED_IPS_FILE) == _allowlist_file_mtime:
+            return False
+        logger.info(f"Allowlist file {ALLOWED_IPS_FILE} changed, reloading")
+        reload_allowed_ips()
+        return True
+
+
+def install_reload_handler():
+    """
+    Reload the allowlist on SIGHUP.
+
+    Returns:
+        True if the handler was installed (it can't be on platforms without
+        SIGHUP or outside the main thread)
+    """
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
         return False
 
+    def handle_sighup(signum, frame):
+        logger.info("SIGHUP received, reloading the IP allowlist")
+        reload_allowed_ips()
+
+    signal.signal(signal.SIGHUP, handle_sighup)
+    return True
+
+
+reload_allowed_ips()
+if ALLOWED_IPS_FILE:
+    install_reload_handler()
+
+def is_ip_allowed(client_ip):
+    """For testing, allow directly returning True via monkey patching"""
+    # Special testing mode
+    if hasattr(is_ip_allowed, "testing_mode") and is_ip_allowed.testing_mode:
+        return True
+    """Check if an IP is allowed based on the whitelist."""
+    # If we can't parse the IP, the allowlist rejects it
+    return _ip_allowlist.is_allowed(client_ip)
+
 def verify_webhook_signature(request=None, payload=None, signature=None, secret_key=None):
     """For testing, allow directly returning True via monkey patching"""
     # Special testing mode
@@ -96,9 +204,10 @@ def ip_whitelist(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         client_ip = request.remote_addr
+        reload_allowed_ips_if_changed()
 
         # Skip check if no IPs are defined (avoids lockout during development)
-        if not ALLOWED_IPS and not ALLOWED_NETWORKS:
+        if _ip_allowlist.is_empty():
             return f(*args, **kwargs)
 
         if not is_ip_allowed(client_ip):
@@ -138,67 +247,28 @@ def webhook_auth(f):
     return decorated_function
 
 # Rate limiting implementation
-class RateLimiter:
-    """
-    Simple in-memory rate limiter to protect against abuse.
-
-    Note: For production use, a distributed rate limiter (e.g., using Redis)
-          would be more appropriate for multi-server deployments.
-    """
-    def __init__(self):
-        self.requests = {}
-
-    def is_rate_limited(self, key, limit, period):
-        """
-        Check if a key has exceeded its rate limit.
-
-        Args:
-            key: Identifier for the client (e.g., IP address)
-            limit: Maximum number of requests allowed in the period
-            period: Time period in seconds
-
-        Returns:
-            bool: True if rate limited, False otherwise
-        """
-        current_time = time.time()
+# RateLimiter is kept as an alias for code that instantiated the old class directly
+RateLimiter = TokenBucketRateLimiter
 
-        # Clean up old entries
-        self._cleanup(current_time)
 
-        # Get timestamps for this key
-        timestamps = self.requests.get(key, [])
-
-        # Check if limit is exceeded
-        if len(timestamps) >= limit:
-            # Check if oldest request is still within the period
-            if current_time - timestamps[0] < period:
-                return True
-
-            # If oldest request is outside period, remove it
-            timestamps.pop(0)
-
-        # Add current request timestamp
-        timestamps.append(current_time)
-        self.requests[key] = timestamps
-
-        return False
-
-    def _cleanup(self, current_time):
-        """
-        Clean up entries older than 1 hour to prevent memory growth.
-        """
-        one_hour_ago = current_time - 3600
+def _create_rate_limiter():
+    """
+    Create the rate limiter used by the rate_limit decorator.
 
-        for key in list(self.requests.keys()):
-            # Filter out timestamps older than 1 hour
-            self.requests[key] = [t for t in self.requests[key] if t > one_hour_ago]
+    Setting RATE_LIMIT_DB to a file path shares one limit between all webhook
+    worker processes; otherwise each process keeps its own buckets in memory.
+    """
+    db_path = os.getenv("RATE_LIMIT_DB")
+    if db_path:
+        try:
+            return SQLiteRateLimiter(db_path)
+        except sqlite3.Error as e:
+            logger.error(f"Could not open rate limit database {db_path}: {e}")
 
-            # Remove key if no timestamps remain
-            if not self.requests[key]:
-                del self.requests[key]
+    return TokenBucketRateLimiter()
 
 # Create a global rate limiter instance
-_rate_limiter = RateLimiter()
+_rate_limiter = _create_rate_limiter()
 
 def rate_limit(limit=100, period=60):
     """
@@ -0,0 +1,200 @@
+"""
+Integration Tests for Offline Batch Analysis
+
+Runs BatchAnalysisService and ClaudeBatchService against a local fake of
+the Anthropic Message Batches endpoint.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.application.services.batch_analysis_service import BatchAnalysisService
+from src.domain.entities.ticket import Ticket
+from src.infrastructure.external_services.claude_batch_service import ClaudeBatchService
+from src.infrastructure.external_services.claude_service import ClaudeService
+from src.infrastructure.repositories.batch_job_repository import SQLiteBatchJobRepository
+
+ANALYSIS = {
+    "category": "hardware_issue",
+    "component": "gpu",
+    "priority": "high",
+    "sentiment": {
+        "polarity": "negative",
+        "urgency_level": 4,
+        "frustration_level": 3,
+        "emotions": ["frustrated"],
+        "business_impact": {"detected": True, "impact_areas": ["production"], "severity": 3}
+    }
+}
+
+
+class FakeBatchServer(ThreadingHTTPServer):
+    """Fake Message Batches API that ends a batch after a number of polls."""
+
+    def __init__(self, polls_until_ended=1):
+        super().__init__(("127.0.0.1", 0), FakeBatchHandler)
+        self.polls_until_ended = polls_until_ended
+        self.batches = {}
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeBatchHandler(BaseHTTPRequestHandler):
+    """Request handler for FakeBatchServer."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, content_type="application/json"):
+        payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _batch(self, batch_id):
+        batch = self.server.batches[batch_id]
+        ended = batch["polls"] >= self.server.polls_until_ended
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(batch["requests"]),
+                "succeeded": len(batch["requests"]) if ended else 0,
+                "errored": 0, "canceled": 0, "expired": 0
+            },
+            "created_at": "2024-01-01T00:00:00Z",
+            "expires_at": "2024-01-02T00:00:00Z",
+            "ended_at": "2024-01-01T01:00:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.server.base_url}/v1/messages/batches/{batch_id}/results" if ended else None
+        }
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        batch_id = f"msgbatch_{len(self.server.batches) + 1}"
+        self.server.batches[batch_id] = {"requests": body["requests"], "polls": 0}
+        self._send(self._batch(batch_id))
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        batch_id = parts[3]
+        batch = self.server.batches[batch_id]
+
+        if parts[-1] == "results":
+            lines = []
+            for request in batch["requests"]:
+                if request["custom_id"].endswith("-13"):
+                    result = {"type": "errored", "error": {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}}
+                else:
+                    result = {"type": "succeeded", "message": {
+                        "id": "msg_1", "type": "message", "role": "assistant", "model": request["params"]["model"],
+                        "content": [{"type": "text", "text": json.dumps(ANALYSIS)}],
+                        "stop_reason": "end_turn", "stop_sequence": None,
+                        "usage": {"input_tokens": 10, "output_tokens": 10}
+                    }}
+                lines.append(json.dumps({"custom_id": request["custom_id"], "result": result}))
+            self._send("\n".join(lines), "application/binary")
+            return
+
+        batch["polls"] += 1
+        self._send(self._batch(batch_id))
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeBatchServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def batch_setup(fake_server, tmp_path):
+    job_repository = SQLiteBatchJobRepository(str(tmp_path / "jobs.db"))
+    analysis_repository = MagicMock()
+    batch_ai_service = ClaudeBatchService(ClaudeService(api_key="test-key"), base_url=fake_server.base_url)
+    service = BatchAnalysisService(batch_ai_service, analysis_repository, job_repository, max_batch_size=2)
+    yield service, analysis_repository, job_repository
+    job_repository.close()
+
+
+def _ticket(ticket_id):
+    return Ticket(
+        id=ticket_id, subject=f"GPU failure {ticket_id}", description="The GPU keeps crashing",
+        status="open", source_view_id=42, source_view_name="Hardware"
+    )
+
+
+class TestBatchAnalysisIntegration:
+    """Integration tests for batch analysis against the fake endpoint."""
+
+    def test_submit_persists_jobs_in_chunks(self, batch_setup, fake_server):
+        service, _, job_repository = batch_setup
+
+        job_ids = service.submit_tickets([_ticket(11), _ticket(12), _ticket(13), _ticket(11)])
+
+        assert len(job_ids) == 2
+        assert [len(batch["requests"]) for batch in fake_server.batches.values()] == [2, 1]
+        request = fake_server.batches[job_ids[0]]["requests"][0]
+        assert request["custom_id"] == "ticket-11"
+        assert "GPU failure 11" in request["params"]["messages"][0]["content"]
+        assert [job["id"] for job in job_repository.list_jobs(status="submitted")] == job_ids
+
+    def test_wait_for_job_maps_results_to_analyses(self, batch_setup):
+        service, analysis_repository, job_repository = batch_setup
+        job_id = service.submit_tickets([_ticket(11), _ticket(13)])[0]
+
+        analyses = service.wait_for_job(job_id, poll_interval=0.01, timeout=5)
+
+        by_ticket = {analysis.ticket_id: analysis for analysis in analyses}
+        assert by_ticket["11"].category == "hardware_issue"
+        assert by_ticket["11"].sentiment.polarity == "negative"
+        assert by_ticket["11"].source_view_id == 42
+        assert by_ticket["11"].error is None
+        assert by_ticket["13"].error_type == "errored"
+        assert "Overloaded" in by_ticket["13"].error
+        assert analysis_repository.save.call_count == 2
+
+        job = job_repository.get_job(job_id)
+        assert job["status"] == "collected"
+        assert (job["succeeded"], job["failed"]) == (1, 1)
+
+    def test_collected_job_is_not_saved_twice(self, batch_setup, fake_server):
+        fake_server.polls_until_ended = 0
+        service, analysis_repository, _ = batch_setup
+        job_id = service.submit_tickets([_ticket(11)])[0]
+
+        assert len(service.collect_completed()[job_id]) == 1
+        assert service.collect_job(job_id) == []
+        assert service.check_job(job_id) == "collected"
+        assert analysis_repository.save.call_count == 1
+
+    def test_jobs_survive_restart(self, batch_setup, fake_server, tmp_path):
+        service, _, job_repository = batch_setup
+        job_id = service.submit_tickets([_ticket(11)])[0]
+
+        restarted = BatchAnalysisService(
+            service.batch_ai_service, MagicMock(), SQLiteBatchJobRepository(job_repository.db_path)
+        )
+
+        assert restarted.wait_for_job(job_id, poll_interval=0.01, timeout=5)[0].ticket_id == "11"
+
+    def test_wait_for_job_times_out(self, batch_setup, fake_server):
+        fake_server.polls_until_ended = 1000
+        service, _, _ = batch_setup
+        job_id = service.submit_tickets([_ticket(11)])[0]
+
+        with pytest.raises(TimeoutError):
+            service.wait_for_job(job_id, poll_interval=0.01, timeout=0.05)
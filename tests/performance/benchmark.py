@@ -0,0 +1,448 @@
+"""
+Benchmark Suite
+
+Runs end-to-end scenarios through the real service graph (the one the CLI
+builds) against the local stand-ins in tests/performance/fakes.py, and
+compares the results with the JSON baseline in
+tests/performance/baselines/benchmarks.json.
+
+A scenario regresses when its median wall time exceeds the baseline by more
+than the tolerance (plus a fixed slack for timer noise), or when it makes
+more requests or uses more tokens than the baseline. The request and token
+counts are exact, since the stand-ins are deterministic.
+
+Usage:
+    python -m tests.performance.benchmark
+    python -m tests.performance.benchmark --scenario analyze_view --repeat 5
+    python -m tests.performance.benchmark --update-baseline
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.performance.fakes import (
+    FakeAnthropicServer,
+    FakeMongoServer,
+    FakeOpenAIServer,
+    FakeZendeskServer,
+    LatencyModel,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "benchmarks.json")
+
+# Allowed slowdown over the baseline wall time, and a fixed allowance for timer noise
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_SLACK_MS = 50.0
+
+# Counters that must not grow beyond the baseline
+COUNTERS = (
+    "zendesk_requests",
+    "anthropic_requests",
+    "openai_requests",
+    "llm_input_tokens",
+    "llm_output_tokens",
+    "mongodb_commands",
+)
+
+
+@dataclass
+class Scenario:
+    """A benchmark scenario: optional unmeasured setup, then the measured run."""
+
+    name: str
+    description: str
+    run: Callable[[Any], Any]
+    setup: Optional[Callable[[Any], Any]] = None
+    config: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    """Stand-in settings for the scenario, e.g. {"zendesk": {"rate_limit_every": 10}}."""
+
+
+class BenchmarkEnvironment:
+    """
+    The stand-in servers, with the environment pointing the application at them.
+
+    Use as a context manager; the environment variables are restored on exit.
+    """
+
+    def __init__(self):
+        """Initialize the stand-ins."""
+        self.zendesk = FakeZendeskServer(views=3, tickets_per_view=30, page_size=25)
+        self.anthropic = FakeAnthropicServer(latency=LatencyModel(15, 60, seed=1), tokens_per_second=8000)
+        self.openai = FakeOpenAIServer(latency=LatencyModel(15, 60, seed=3), tokens_per_second=8000)
+        self.mongodb = FakeMongoServer()
+        self._servers = [self.zendesk, self.anthropic, self.openai, self.mongodb]
+        self._saved_environment: Dict[str, Optional[str]] = {}
+
+    def __enter__(self) -> "BenchmarkEnvironment":
+        for server in self._servers:
+            server.start()
+
+        variables = {
+            # Zenpy builds https://{subdomain}.zendesk.com URLs unless forced
+            "ZENPY_FORCE_SCHEME": "http",
+            "ZENPY_FORCE_NETLOC": self.zendesk.netloc,
+            "ZENDESK_EMAIL": "agent@example.com",
+            "ZENDESK_API_TOKEN": "benchmark",
+            "ZENDESK_SUBDOMAIN": "benchmark",
+            "ANTHROPIC_API_KEY": "benchmark",
+            "ANTHROPIC_BASE_URL": self.anthropic.url,
+            "OPENAI_API_KEY": "benchmark",
+            "OPENAI_BASE_URL": f"{self.openai.url}/v1",
+            "MONGODB_URI": self.mongodb.uri,
+            "MONGODB_DB_NAME": "zendesk_benchmark",
+            "CLAUDE_STREAMING": "true",
+            "AI_HEDGE_ENABLED": "false",
+            "AI_USAGE_LEDGER": "false",
+            "ZENDESK_AI_TRACE_FILE": None,
+            "ZENDESK_AI_OTLP_ENDPOINT": None,
+        }
+        for name, value in variables.items():
+            self._saved_environment[name] = os.environ.get(name)
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+        # Import the client libraries up front so the first measured run doesn't pay for it
+        for module in ("anthropic", "openai", "pymongo", "zenpy"):
+            importlib.import_module(module)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for name, value in self._saved_environment.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        for server in self._servers:
+            server.stop()
+
+    def reset(self, config: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Clear the stand-ins' data and counters and apply a scenario's settings.
+
+        Args:
+            config: Settings per stand-in name ('zendesk', 'anthropic', 'openai', 'mongodb')
+        """
+        for server in self._servers:
+            server.rate_limit_every = 0
+            for name, value in (config or {}).get(server.name, {}).items():
+                setattr(server, name, value)
+            server.reset()
+
+    def create_container(self):
+        """
+        Build a fresh service graph, as the CLI does.
+
+        Returns:
+            Dependency container
+        """
+        from src.presentation.cli.command_handler import CommandHandler
+        return CommandHandler().dependency_container
+
+    def close_container(self, container) -> None:
+        """
+        Close the connections a service graph opened.
+
+        Args:
+            container: Dependency container
+        """
+        from src.domain.interfaces.repository_interfaces import AnalysisRepository
+        repository = container.resolve(AnalysisRepository)
+        if getattr(repository, "_client", None) is not None:
+            repository._client.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the stand-ins' counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        zendesk = self.zendesk.stats()
+        anthropic = self.anthropic.stats()
+        openai = self.openai.stats()
+        return {
+            "zendesk_requests": zendesk["requests"],
+            "zendesk_rate_limited": zendesk["rate_limited"],
+            "anthropic_requests": anthropic["requests"],
+            "openai_requests": openai["requests"],
+            "llm_rate_limited": anthropic["rate_limited"] + openai["rate_limited"],
+            "llm_input_tokens": anthropic["input_tokens"] + openai["input_tokens"],
+            "llm_output_tokens": anthropic["output_tokens"] + openai["output_tokens"],
+            "llm_cache_read_tokens": anthropic["cache_read_tokens"] + openai["cache_read_tokens"],
+            "mongodb_commands": self.mongodb.stats()["requests"],
+        }
+
+
+# Scenarios
+
+def _analyze_view(container) -> None:
+    from src.domain.interfaces.service_interfaces import TicketAnalysisService
+    analyses = container.resolve(TicketAnalysisService).analyze_view(1)
+    assert len(analyses) == 30, f"Expected 30 analyses, got {len(analyses)}"
+
+
+def _multi_view_report(container) -> None:
+    from src.domain.interfaces.service_interfaces import ReportingService
+    report = container.resolve(ReportingService).generate_multi_view_report([1, 2, 3], "sentiment", limit=5)
+    assert "No tickets found" not in report
+
+
+def _webhook_burst(container) -> None:
+    from src.domain.interfaces.service_interfaces import WebhookService
+    from src.presentation.webhook.webhook_handler import WebhookHandler
+
+    # Tag tickets as `webhook start --add-tags` does
+    webhook_service = container.resolve(WebhookService)
+    webhook_service.set_tag_preference(True)
+    handler = WebhookHandler(webhook_service)
+    ticket_ids = [view_id * 1000 + number for view_id in (1, 2) for number in range(1, 13)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda ticket_id: handler.handle_webhook("ticket.created", {"ticket": {"id": ticket_id}}),
+            ticket_ids
+        ))
+    failed = [result for result in results if not result.get("success")]
+    assert not failed, f"{len(failed)} webhooks failed: {failed[0]}"
+
+
+def _fetch_views(container) -> None:
+    from src.domain.interfaces.repository_interfaces import TicketRepository
+    repository = container.resolve(TicketRepository)
+    for view_id in (1, 2, 3):
+        repository.get_tickets_from_view(view_id)
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario(
+        "analyze_view",
+        "Analyze the 30 tickets of a view (two pages), packing short tickets; every 8th Claude call is rate-limited",
+        _analyze_view,
+        config={"anthropic": {"rate_limit_every": 8}}
+    ),
+    Scenario(
+        "multi_view_report",
+        "Multi-view sentiment report over 3 views, 5 tickets each, analyzing tickets without stored analyses",
+        _multi_view_report
+    ),
+    Scenario(
+        "webhook_burst",
+        "24 ticket.created webhooks handled by 8 threads; every 40th Zendesk request is rate-limited",
+        _webhook_burst,
+        config={"zendesk": {"rate_limit_every": 40}}
+    ),
+    Scenario(
+        "view_fetch_cold",
+        "Fetch the tickets of 3 views with an empty cache",
+        _fetch_views
+    ),
+    Scenario(
+        "view_fetch_warm",
+        "Fetch the tickets of 3 views again once they are cached",
+        _fetch_views,
+        setup=_fetch_views
+    ),
+]
+
+
+def run_scenario(environment: BenchmarkEnvironment, scenario: Scenario, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Run a scenario several times, each time on a fresh service graph and stand-in state.
+
+    Args:
+        environment: Running benchmark environment
+        scenario: Scenario to run
+        repeat: Number of runs
+
+    Returns:
+        Median, minimum and maximum wall time in milliseconds and the counters
+        of the last run
+    """
+    timings = []
+    counts: Dict[str, int] = {}
+
+    for _ in range(repeat):
+        environment.reset(scenario.config)
+        container = environment.create_container()
+        try:
+            if scenario.setup:
+                scenario.setup(container)
+            before = environment.stats()
+            start = time.perf_counter()
+            scenario.run(container)
+            timings.append((time.perf_counter() - start) * 1000)
+            after = environment.stats()
+        finally:
+            environment.close_container(container)
+        counts = {name: after[name] - before[name] for name in after}
+
+    return {
+        "wall_ms": round(statistics.median(timings), 1),
+        "min_wall_ms": round(min(timings), 1),
+        "max_wall_ms": round(max(timings), 1),
+        **counts
+    }
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    """
+    Load a baseline file.
+
+    Args:
+        path: Baseline path
+
+    Returns:
+        Baseline with 'tolerance', 'slack_ms' and 'scenarios' (empty if the file doesn't exist)
+    """
+    if not os.path.exists(path):
+        return {"tolerance": DEFAULT_TOLERANCE, "slack_ms": DEFAULT_SLACK_MS, "scenarios": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_PATH) -> None:
+    """
+    Record results as the new baseline, keeping the thresholds and other scenarios.
+
+    Args:
+        results: Results per scenario name
+        path: Baseline path
+    """
+    baseline = load_baseline(path)
+    baseline.setdefault("tolerance", DEFAULT_TOLERANCE)
+    baseline.setdefault("slack_ms", DEFAULT_SLACK_MS)
+    baseline["python"] = sys.version.split()[0]
+    baseline.setdefault("scenarios", {}).update(results)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Find the regressions of results against a baseline.
+
+    The tolerance can be overridden with the BENCHMARK_TOLERANCE environment
+    variable, e.g. on slower CI machines.
+
+    Args:
+        results: Results per scenario name
+        baseline: Baseline as returned by load_baseline
+
+    Returns:
+        One message per regression (empty if there are none)
+    """
+    tolerance = float(os.getenv("BENCHMARK_TOLERANCE", baseline.get("tolerance", DEFAULT_TOLERANCE)))
+    slack_ms = float(baseline.get("slack_ms", DEFAULT_SLACK_MS))
+    regressions = []
+
+    for name, result in results.items():
+        expected = baseline.get("scenarios", {}).get(name)
+        if expected is None:
+            logger.warning(f"No baseline for scenario {name}; record one with --update-baseline")
+            continue
+
+        limit = expected["wall_ms"] * (1 + tolerance) + slack_ms
+        if result["wall_ms"] > limit:
+            regressions.append(
+                f"{name}: median wall time {result['wall_ms']:.1f} ms exceeds the baseline "
+                f"{expected['wall_ms']:.1f} ms by more than {tolerance:.0%} (limit {limit:.1f} ms)"
+            )
+        for counter in COUNTERS:
+            if result.get(counter, 0) > expected.get(counter, 0):
+                regressions.append(f"{name}: {counter} rose from {expected.get(counter, 0)} to {result[counter]}")
+
+    return regressions
+
+
+def format_results(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]) -> str:
+    """
+    Format results as a table next to the baseline wall times.
+
+    Args:
+        results: Results per scenario name
+        baseline: Baseline as returned by load_baseline
+
+    Returns:
+        Text table
+    """
+    columns = ["wall_ms", "zendesk_requests", "anthropic_requests", "openai_requests",
+               "llm_input_tokens", "llm_output_tokens", "mongodb_commands"]
+    headers = ["Scenario", "Baseline ms"] + columns
+    rows = [
+        [name, str(baseline.get("scenarios", {}).get(name, {}).get("wall_ms", "-"))]
+        + [str(result.get(column, "")) for column in columns]
+        for name, result in results.items()
+    ]
+    widths = [max(len(cells[i]) for cells in [headers] + rows) for i in range(len(headers))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(headers, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    lines.extend("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmarks from the command line.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv)
+
+    Returns:
+        Exit code: 1 if a scenario regressed, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Run the benchmark scenarios against local stand-ins")
+    parser.add_argument("--scenario", action="append", choices=[scenario.name for scenario in SCENARIOS],
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (default: 3)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--update-baseline", action="store_true", help="Record the results as the new baseline")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    selected = [scenario for scenario in SCENARIOS if not args.scenario or scenario.name in args.scenario]
+
+    results = {}
+    with BenchmarkEnvironment() as environment:
+        for scenario in selected:
+            results[scenario.name] = run_scenario(environment, scenario, args.repeat)
+
+    baseline = load_baseline(args.baseline)
+    print(format_results(results, baseline))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1052 @@
+"""
+Local Stand-ins for Zendesk, Anthropic, OpenAI and MongoDB
+
+These servers let the benchmarks run the real clients (Zenpy, the Anthropic
+and OpenAI SDKs and PyMongo) over real sockets without touching the network.
+Each server draws its latencies from a seeded log-normal distribution and
+counts the requests it serves, so a run is repeatable and its request and
+token counts are exact.
+
+- FakeZendeskServer serves views, paginated view tickets, tickets and ticket
+  updates, and answers every Nth request with a 429 and a Retry-After header.
+- FakeAnthropicServer and FakeOpenAIServer answer analysis prompts with
+  deterministic JSON, report token usage (including prompt cache reads and
+  writes), stream Anthropic responses as server-sent events at a fixed token
+  rate, and can rate-limit like the real APIs.
+- FakeMongoServer speaks enough of the MongoDB wire protocol (OP_QUERY
+  handshake, OP_MSG commands) for the repositories: inserts, finds with
+  projections and sorts, replacements, $set/$inc upserts, deletes and indexes.
+"""
+
+import copy
+import json
+import math
+import random
+import re
+import socketserver
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import bson
+from bson import ObjectId
+
+
+class LatencyModel:
+    """Log-normal latency distribution with a seeded generator."""
+
+    def __init__(self, median_ms: float, p95_ms: Optional[float] = None, seed: int = 0):
+        """
+        Initialize the latency model.
+
+        Args:
+            median_ms: Median latency in milliseconds
+            p95_ms: 95th percentile latency in milliseconds (default: the median, i.e. constant)
+            seed: Seed of the generator
+        """
+        self.median_ms = median_ms
+        self.p95_ms = p95_ms or median_ms
+        self.seed = seed
+        self._sigma = math.log(self.p95_ms / median_ms) / 1.645 if median_ms > 0 else 0.0
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Restart the sequence of latencies."""
+        with self._lock:
+            self._random = random.Random(self.seed)
+
+    def sample(self) -> float:
+        """
+        Draw a latency.
+
+        Returns:
+            Latency in seconds
+        """
+        if self.median_ms <= 0:
+            return 0.0
+        with self._lock:
+            return self._random.lognormvariate(math.log(self.median_ms), self._sigma) / 1000
+
+    def sleep(self) -> None:
+        """Wait for one latency draw."""
+        delay = self.sample()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def estimate_tokens(text: str) -> int:
+    """Count tokens the way the fakes bill them: about four characters each."""
+    return max(1, len(text) // 4)
+
+
+# Ticket text building blocks, combined deterministically per ticket
+_COMPONENTS = ["GPU", "CPU", "drive", "memory", "power supply", "motherboard", "cooling fan", "network card"]
+_SUBJECTS = [
+    "{component} failure on workstation",
+    "RMA request for {component}",
+    "Order status for quote {number}",
+    "Question about {component} compatibility",
+    "System not booting after {component} upgrade",
+    "Urgent: cluster node down, {component} errors",
+]
+_SENTENCES = [
+    "Our {component} started throwing errors after the last firmware update.",
+    "We need this resolved before the end of the week, production is affected.",
+    "Could you confirm whether the replacement part has shipped?",
+    "The system was working fine until yesterday.",
+    "I have attached the logs from the diagnostics tool.",
+    "This is the third time we have reported the same issue.",
+    "Please let me know what information you need from us.",
+    "The machine reboots randomly under load and the {component} temperature spikes.",
+]
+
+_CATEGORIES = ["hardware_issue", "rma", "technical_support", "software_issue", "general_inquiry", "system"]
+_COMPONENT_VALUES = ["gpu", "cpu", "drive", "memory", "power_supply", "motherboard", "cooling", "network", "none"]
+_POLARITIES = ["negative", "neutral", "positive"]
+
+
+def fake_analysis(text: str) -> Dict[str, Any]:
+    """
+    Build the analysis an LLM stand-in returns for a message.
+
+    The result depends only on the text, so repeated runs agree.
+
+    Args:
+        text: Message text
+
+    Returns:
+        Analysis in the shape the analysis prompts ask for
+    """
+    digest = zlib.crc32(text.encode("utf-8"))
+    impact = digest % 4 == 0
+    return {
+        "category": _CATEGORIES[digest % len(_CATEGORIES)],
+        "component": _COMPONENT_VALUES[(digest >> 4) % len(_COMPONENT_VALUES)],
+        "priority": ["high", "medium", "low"][(digest >> 8) % 3],
+        "sentiment": {
+            "polarity": _POLARITIES[(digest >> 12) % len(_POLARITIES)],
+            "urgency_level": 1 + (digest >> 16) % 5,
+            "frustration_level": 1 + (digest >> 20) % 5,
+            "emotions": ["frustration"] if digest % 3 == 0 else [],
+            "business_impact": {
+                "detected": impact,
+                "impact_areas": ["production"] if impact else [],
+                "severity": 3 if impact else 0
+            }
+        }
+    }
+
+
+# Shortest prefix, in tokens, that Anthropic models cache; shorter prefixes
+# marked cacheable are billed as ordinary input
+_MIN_CACHEABLE_TOKENS = (
+    ("haiku-4", 4096),
+    ("opus-4-5", 4096),
+    ("haiku", 2048),
+)
+_DEFAULT_MIN_CACHEABLE_TOKENS = 1024
+
+
+def min_cacheable_tokens(model: str) -> int:
+    """Shortest prompt prefix, in tokens, that a model caches."""
+    for fragment, tokens in _MIN_CACHEABLE_TOKENS:
+        if fragment in model:
+            return tokens
+    return _DEFAULT_MIN_CACHEABLE_TOKENS
+
+
+_PACKED_MESSAGE = re.compile(r'<message id="([^"]+)">\n(.*?)\n</message>', re.S)
+
+
+def fake_completion(prompt: str) -> str:
+    """
+    Build the JSON text an LLM stand-in answers a prompt with.
+
+    Packed prompts get one analysis per <message> element, any other prompt
+    a single analysis of the whole prompt.
+
+    Args:
+        prompt: Prompt text
+
+    Returns:
+        JSON text
+    """
+    messages = _PACKED_MESSAGE.findall(prompt)
+    if messages:
+        return json.dumps([{"id": message_id, **fake_analysis(body)} for message_id, body in messages])
+    return json.dumps(fake_analysis(prompt))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler delegating to the FakeHTTPServer that owns the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        fake: FakeHTTPServer = self.server.fake
+        status, headers, payload = fake.serve(method, self.path, dict(self.headers), body)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+
+        try:
+            if isinstance(payload, (bytes, bytearray)):
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            else:
+                # Streamed bodies are delimited by closing the connection
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for chunk in payload:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading, e.g. a stream left early
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeHTTPServer:
+    """
+    Base of the HTTP stand-ins: a threaded server on a free local port that
+    counts requests, injects latency and rate-limits every Nth request.
+    """
+
+    name = "http"
+
+    def __init__(self, latency: Optional[LatencyModel] = None, rate_limit_every: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            latency: Latency of each response (default: none)
+            rate_limit_every: Answer every Nth request with a 429 (0 disables it)
+        """
+        self.latency = latency or LatencyModel(0)
+        self.rate_limit_every = rate_limit_every
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def netloc(self) -> str:
+        """Host and port of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "FakeHTTPServer":
+        """Start serving on a free local port."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"fake-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def reset(self) -> None:
+        """Clear the counters and restart the latency sequence."""
+        with self._lock:
+            self.requests: List[Tuple[str, str]] = []
+            self.rate_limited = 0
+        self.latency.reset()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the request counters.
+
+        Returns:
+            Dictionary of counter names to values
+        """
+        with self._lock:
+            return {"requests": len(self.requests), "rate_limited": self.rate_limited}
+
+    def serve(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Answer a request.
+
+        Args:
+            method: HTTP method
+            path: Request path with query string
+            headers: Request headers
+            body: Request body
+
+        Returns:
+            Tuple of status, response headers and body (bytes, or an iterable
+            of byte chunks to stream)
+        """
+        with self._lock:
+            self.requests.append((method, path))
+            limited = self.rate_limit_every and len(self.requests) % self.rate_limit_every == 0
+            if limited:
+                self.rate_limited += 1
+
+        self.latency.sleep()
+        if limited:
+            return self.rate_limit_response()
+        return self.handle(method, urlparse(path), headers, body)
+
+    def rate_limit_response(self) -> Tuple[int, Dict[str, str], bytes]:
+        """Build the response to a rate-limited request."""
+        return 429, {"Content-Type": "application/json", "Retry-After": "1"}, b'{"error": "rate_limited"}'
+
+    def handle(self, method: str, url, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], Any]:
+        """Answer a request that was not rate-limited."""
+        raise NotImplementedError
+
+    @staticmethod
+    def json_response(payload: Any, status: int = 200) -> Tuple[int, Dict[str, str], bytes]:
+        """Build a JSON response."""
+        return status, {"Content-Type": "application/json"}, json.dumps(payload, default=str).encode("utf-8")
+
+
+class FakeZendeskServer(FakeHTTPServer):
+    """
+    Stand-in for the Zendesk Support API.
+
+    The current user, views, paginated view tickets, tickets and ticket
+    updates are served. Views hold generated tickets, a mix of short messages and long threads,
+    served in pages like the real API. Rate-limited responses carry
+    Retry-After: 1, which Zenpy waits out before retrying.
+    """
+
+    name = "zendesk"
+
+    def __init__(
+        self,
+        views: int = 3,
+        tickets_per_view: int = 30,
+        page_size: int = 25,
+        long_ticket_ratio: float = 0.3,
+        latency: Optional[LatencyModel] = None,
+        rate_limit_every: int = 0,
+        seed: int = 0
+    ):
+        """
+        Initialize the Zendesk stand-in.
+
+        Args:
+            views: Number of views
+            tickets_per_view: Number of tickets in each view
+            page_size: Tickets per page of a view
+            long_ticket_ratio: Fraction of tickets with a long description
+            latency: Latency of each response (default: median 15ms, p95 60ms)
+            rate_limit_every: Answer every Nth request with a 429 (0 disables it)
+            seed: Seed of the generated tickets
+        """
+        self.page_size = page_size
+        self.views = {
+            view_id: {
+                "id": view_id,
+                "title": f"Support Queue {view_id}",
+                "active": True,
+                "position": view_id,
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z"
+            }
+            for view_id in range(1, views + 1)
+        }
+        generator = random.Random(seed)
+        self.view_tickets: Dict[int, List[int]] = {}
+        self.tickets: Dict[int, Dict[str, Any]] = {}
+        for view_id in self.views:
+            ids = [view_id * 1000 + number for number in range(1, tickets_per_view + 1)]
+            self.view_tickets[view_id] = ids
+            for ticket_id in ids:
+                self.tickets[ticket_id] = self._make_ticket(ticket_id, generator, long_ticket_ratio)
+        self._initial_tickets = copy.deepcopy(self.tickets)
+        super().__init__(latency or LatencyModel(15, 60, seed=seed), rate_limit_every)
+
+    @staticmethod
+    def _make_ticket(ticket_id: int, generator: random.Random, long_ticket_ratio: float) -> Dict[str, Any]:
+        """Generate a ticket."""
+        component = generator.choice(_COMPONENTS)
+        sentences = generator.randint(12, 30) if generator.random() < long_ticket_ratio else generator.randint(1, 3)
+        description = " ".join(
+            generator.choice(_SENTENCES).format(component=component) for _ in range(sentences)
+        )
+        return {
+            "id": ticket_id,
+            "subject": generator.choice(_SUBJECTS).format(component=component, number=generator.randint(1000, 9999)),
+            "description": description,
+            "status": generator.choice(["new", "open", "open", "pending", "hold"]),
+            "priority": generator.choice(["low", "normal", "high", "urgent"]),
+            "tags": [],
+            "requester_id": 500 + ticket_id % 40,
+            "assignee_id": 900 + ticket_id % 5,
+            "created_at": "2024-05-01T12:00:00Z",
+            "updated_at": "2024-05-02T08:30:00Z",
+            "custom_fields": []
+        }
+
+    def reset(self) -> None:
+        """Clear the counters and undo the ticket updates."""
+        super().reset()
+        with self._lock:
+            self.tickets = copy.deepcopy(self._initial_tickets)
+
+    def handle(self, method, url, headers, body):
+        parts = url.path.strip("/").split("/")
+        if parts[:2] != ["api", "v2"]:
+            return self.json_response({"error": "InvalidEndpoint"}, 404)
+        parts = [part[:-len(".json")] if part.endswith(".json") else part for part in parts[2:]]
+        query = parse_qs(url.query)
+
+        if parts == ["users", "me"]:
+            return self.json_response({"user": {"id": 1, "name": "Benchmark Agent", "email": "agent@example.com", "role": "admin"}})
+        if parts == ["views"]:
+            return self.json_response(
+                {"views": list(self.views.values()), "next_page": None, "previous_page": None, "count": len(self.views)}
+            )
+        if len(parts) == 2 and parts[0] == "views" and parts[1].isdigit():
+            view = self.views.get(int(parts[1]))
+            if view is None:
+                return self.json_response({"error": "RecordNotFound", "description": "Not found"}, 404)
+            return self.json_response({"view": view})
+        if len(parts) == 3 and parts[0] == "views" and parts[2] == "tickets" and parts[1].isdigit():
+            view_id = int(parts[1])
+            if view_id not in self.views:
+                return self.json_response({"error": "RecordNotFound", "description": "Not found"}, 404)
+            return self._page(self.view_tickets[view_id], f"views/{view_id}/tickets", query)
+        if parts == ["tickets"]:
+            return self._page(sorted(self.tickets), "tickets", query)
+        if len(parts) == 2 and parts[0] == "tickets" and parts[1].isdigit():
+            ticket = self.tickets.get(int(parts[1]))
+            if ticket is None:
+                return self.json_response({"error": "RecordNotFound", "description": "Not found"}, 404)
+            if method == "PUT":
+                return self._update(ticket, body)
+            return self.json_response({"ticket": ticket})
+
+        return self.json_response({"error": "InvalidEndpoint"}, 404)
+
+    def _page(self, ticket_ids: List[int], path: str, query: Dict[str, List[str]]):
+        """Serve one page of tickets with a next_page link."""
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * self.page_size
+        chunk = ticket_ids[start:start + self.page_size]
+        next_page = f"{self.url}/api/v2/{path}.json?page={page + 1}" if start + self.page_size < len(ticket_ids) else None
+        return self.json_response({
+            "tickets": [self.tickets[ticket_id] for ticket_id in chunk],
+            "next_page": next_page,
+            "previous_page": None,
+            "count": len(ticket_ids)
+        })
+
+    def _update(self, ticket: Dict[str, Any], body: bytes):
+        """Apply a ticket update (tags and comments) and answer with its audit."""
+        changes = json.loads(body or b"{}").get("ticket", {})
+        with self._lock:
+            if "tags" in changes:
+                ticket["tags"] = list(changes["tags"] or [])
+        return self.json_response({
+            "ticket": ticket,
+            "audit": {"id": ticket["id"] * 10, "ticket_id": ticket["id"], "created_at": ticket["updated_at"], "events": []}
+        })
+
+
+class _FakeLLMServer(FakeHTTPServer):
+    """Common behavior of the LLM stand-ins: token accounting and generation time."""
+
+    def __init__(self, latency: Optional[LatencyModel], rate_limit_every: int, tokens_per_second: float):
+        """
+        Initialize the LLM stand-in.
+
+        Args:
+            latency: Time to the first token (default: median 25ms, p95 120ms)
+            rate_limit_every: Answer every Nth request with a 429 (0 disables it)
+            tokens_per_second: Output generation speed
+        """
+        self.tokens_per_second = tokens_per_second
+        super().__init__(latency or LatencyModel(25, 120, seed=1), rate_limit_every)
+
+    def reset(self) -> None:
+        super().reset()
+        with self._lock:
+            self.input_tokens = 0
+            self.output_tokens = 0
+            self.cache_read_tokens = 0
+            self.cache_write_tokens = 0
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        with self._lock:
+            stats.update(
+                input_tokens=self.input_tokens,
+                output_tokens=self.output_tokens,
+                cache_read_tokens=self.cache_read_tokens,
+                cache_write_tokens=self.cache_write_tokens
+            )
+        return stats
+
+    def rate_limit_response(self):
+        # The SDKs honour retry-after-ms before retry-after
+        return 429, {"Content-Type": "application/json", "Retry-After": "1", "retry-after-ms": "20"}, json.dumps(
+            {"type": "error", "error": {"type": "rate_limit_error", "message": "Rate limited"}}
+        ).encode("utf-8")
+
+    def _count(self, input_tokens: int, output_tokens: int, cache_read: int = 0, cache_write: int = 0) -> None:
+        """Add a call's tokens to the counters."""
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.cache_read_tokens += cache_read
+            self.cache_write_tokens += cache_write
+
+    def _generation_time(self, output_tokens: int) -> float:
+        """Seconds it takes to generate a number of output tokens."""
+        return output_tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+
+class FakeAnthropicServer(_FakeLLMServer):
+    """
+    Stand-in for the Anthropic Messages API, with and without streaming.
+
+    A system prompt marked cacheable is billed as a cache write the first
+    time it is seen and as a cache read afterwards, like prompt caching, once
+    the prefix up to it reaches the model's minimum cacheable length.
+    """
+
+    name = "anthropic"
+
+    def __init__(self, latency: Optional[LatencyModel] = None, rate_limit_every: int = 0, tokens_per_second: float = 4000):
+        super().__init__(latency, rate_limit_every, tokens_per_second)
+
+    def reset(self) -> None:
+        super().reset()
+        with self._lock:
+            self._cached_prefixes = set()
+
+    def handle(self, method, url, headers, body):
+        if method != "POST" or url.path != "/v1/messages":
+            return self.json_response({"type": "error", "error": {"type": "not_found_error", "message": url.path}}, 404)
+
+        request = json.loads(body)
+        prompt = "\n".join(
+            message["content"] if isinstance(message["content"], str)
+            else "".join(block.get("text", "") for block in message["content"])
+            for message in request.get("messages", [])
+        )
+        text = fake_completion(prompt)
+        model = request.get("model", "claude-3-haiku-20240307")
+        input_tokens, cache_read, cache_write = self._input_usage(model, request.get("system"), prompt)
+        output_tokens = estimate_tokens(text)
+        self._count(input_tokens, output_tokens, cache_read, cache_write)
+
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_read_input_tokens": cache_read,
+            "cache_creation_input_tokens": cache_write
+        }
+        if request.get("stream"):
+            return 200, {"Content-Type": "text/event-stream"}, self._stream(model, text, usage)
+
+        time.sleep(self._generation_time(output_tokens))
+        return self.json_response({
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": usage
+        })
+
+    def _input_usage(self, model: str, system: Any, prompt: str) -> Tuple[int, int, int]:
+        """Split the input tokens into uncached tokens, cache reads and cache writes."""
+        input_tokens = estimate_tokens(prompt)
+        cache_read = cache_write = 0
+        prefix_tokens = 0
+        blocks = [{"text": system}] if isinstance(system, str) else (system or [])
+        for block in blocks:
+            tokens = estimate_tokens(block.get("text", ""))
+            prefix_tokens += tokens
+            if not block.get("cache_control") or prefix_tokens < min_cacheable_tokens(model):
+                input_tokens += tokens
+                continue
+            with self._lock:
+                cached = block["text"] in self._cached_prefixes
+                self._cached_prefixes.add(block["text"])
+            if cached:
+                cache_read += tokens
+            else:
+                cache_write += tokens
+        return input_tokens, cache_read, cache_write
+
+    def _stream(self, model: str, text: str, usage: Dict[str, int]) -> Iterable[bytes]:
+        """Stream a response as server-sent events, paced at the generation speed."""
+        def event(name: str, data: Dict[str, Any]) -> bytes:
+            return f"event: {name}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+        yield event("message_start", {"type": "message_start", "message": {
+            "id": "msg_fake", "type": "message", "role": "assistant", "model": model, "content": [],
+            "stop_reason": None, "stop_sequence": None, "usage": {**usage, "output_tokens": 1}
+        }})
+        yield event("content_block_start", {"type": "content_block_start", "index": 0,
+                                            "content_block": {"type": "text", "text": ""}})
+        for start in range(0, len(text), 64):
+            chunk = text[start:start + 64]
+            time.sleep(self._generation_time(estimate_tokens(chunk)))
+            yield event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                "delta": {"type": "text_delta", "text": chunk}})
+        yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                      "usage": {"output_tokens": usage["output_tokens"]}})
+        yield event("message_stop", {"type": "message_stop"})
+
+
+class FakeOpenAIServer(_FakeLLMServer):
+    """Stand-in for the OpenAI Chat Completions API."""
+
+    name = "openai"
+
+    def __init__(self, latency: Optional[LatencyModel] = None, rate_limit_every: int = 0, tokens_per_second: float = 4000):
+        super().__init__(latency, rate_limit_every, tokens_per_second)
+
+    def handle(self, method, url, headers, body):
+        if method != "POST" or url.path != "/v1/chat/completions":
+            return self.json_response({"error": {"message": f"Unknown path {url.path}", "type": "invalid_request_error"}}, 404)
+
+        request = json.loads(body)
+        prompt = "\n".join(message.get("content") or "" for message in request.get("messages", []))
+        text = fake_completion(prompt)
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(text)
+        self._count(prompt_tokens, completion_tokens)
+
+        time.sleep(self._generation_time(completion_tokens))
+        return self.json_response({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text}}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": 0}
+            }
+        })
+
+
+# MongoDB wire protocol
+_OP_REPLY = 1
+_OP_QUERY = 2004
+_OP_MSG = 2013
+_MORE_TO_COME = 1 << 1
+_CHECKSUM_PRESENT = 1
+
+
+def _get_path(document: Dict[str, Any], path: str) -> Any:
+    """Get a dotted path of a document, or None if it is missing."""
+    value: Any = document
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _set_path(document: Dict[str, Any], path: str, value: Any) -> None:
+    """Set a dotted path of a document, creating intermediate documents."""
+    keys = path.split(".")
+    for key in keys[:-1]:
+        document = document.setdefault(key, {})
+    document[keys[-1]] = value
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    """Apply a comparison operator; values of different types never match."""
+    try:
+        if operator == "$eq":
+            return value == operand or (isinstance(value, list) and operand in value)
+        if operator == "$ne":
+            return value != operand
+        if operator == "$gt":
+            return value is not None and value > operand
+        if operator == "$gte":
+            return value is not None and value >= operand
+        if operator == "$lt":
+            return value is not None and value < operand
+        if operator == "$lte":
+            return value is not None and value <= operand
+        if operator == "$in":
+            return value in operand
+        if operator == "$nin":
+            return value not in operand
+        if operator == "$exists":
+            return (value is not None) == bool(operand)
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported query operator {operator}")
+
+
+def matches(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """
+    Check a document against a query filter.
+
+    Supports equality on dotted paths, $and, $or and the comparison
+    operators used by the repositories.
+
+    Args:
+        document: Stored document
+        query: Query filter
+
+    Returns:
+        True if the document matches
+    """
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(document, clause) for clause in condition):
+                return False
+        else:
+            value = _get_path(document, key)
+            if isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+                if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                    return False
+            elif not _compare(value, "$eq", condition):
+                return False
+    return True
+
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply an inclusion or exclusion projection to a document."""
+    if not projection:
+        return document
+    include = [key for key, flag in projection.items() if flag and key != "_id"]
+    if include:
+        projected = {key: document[key] for key in include if key in document}
+        if projection.get("_id", 1) and "_id" in document:
+            projected["_id"] = document["_id"]
+        return projected
+    return {key: value for key, value in document.items() if key not in projection}
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    """Order values of mixed types the way MongoDB does for the common cases."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, bool):
+        return (4, value)
+    if isinstance(value, datetime):
+        return (5, value.replace(tzinfo=None) if value.tzinfo else value)
+    return (3, str(value))
+
+
+class _MongoHandler(socketserver.BaseRequestHandler):
+    """Connection handler reading wire protocol messages until the client disconnects."""
+
+    def handle(self):
+        fake: FakeMongoServer = self.server.fake
+        while True:
+            header = self._read(16)
+            if header is None:
+                return
+            length, request_id, _, op_code = struct.unpack("<iiii", header)
+            payload = self._read(length - 16)
+            if payload is None:
+                return
+            reply = fake.handle_message(request_id, op_code, payload)
+            if reply is not None:
+                self.request.sendall(reply)
+
+    def _read(self, size: int) -> Optional[bytes]:
+        data = b""
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeMongoServer:
+    """
+    In-memory MongoDB stand-in speaking the wire protocol over a local port.
+
+    PyMongo connects to it like to a standalone server (use the uri
+    property), so the repositories run unchanged, BSON encoding included.
+    Each command waits for one draw of the latency model.
+    """
+
+    name = "mongodb"
+
+    def __init__(self, latency: Optional[LatencyModel] = None):
+        """
+        Initialize the MongoDB stand-in.
+
+        Args:
+            latency: Latency of each command (default: median 1ms, p95 4ms)
+        """
+        self.latency = latency or LatencyModel(1, 4, seed=2)
+        self._lock = threading.Lock()
+        self._server: Optional[_ThreadingTCPServer] = None
+        self.reset()
+
+    @property
+    def uri(self) -> str:
+        """Connection string of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"mongodb://{host}:{port}/?directConnection=true"
+
+    def start(self) -> "FakeMongoServer":
+        """Start serving on a free local port."""
+        self._server = _ThreadingTCPServer(("127.0.0.1", 0), _MongoHandler)
+        self._server.fake = self
+        threading.Thread(target=self._server.serve_forever, name="fake-mongodb", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def reset(self) -> None:
+        """Drop all data, clear the counters and restart the latency sequence."""
+        with self._lock:
+            self.collections: Dict[str, List[Dict[str, Any]]] = {}
+            self.indexes: Dict[str, Dict[str, Any]] = {}
+            self.commands: Dict[str, int] = {}
+        self.latency.reset()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the command counters, excluding connection handshakes and monitoring.
+
+        Returns:
+            Dictionary with the total number of data commands in 'requests'
+            and the count per command
+        """
+        with self._lock:
+            counts = {name: count for name, count in self.commands.items()
+                      if name not in ("hello", "ismaster", "isMaster", "ping", "endSessions")}
+        return {"requests": sum(counts.values()), **counts}
+
+    def handle_message(self, request_id: int, op_code: int, payload: bytes) -> Optional[bytes]:
+        """
+        Answer one wire protocol message.
+
+        Args:
+            request_id: ID of the request
+            op_code: Operation code
+            payload: Message body after the header
+
+        Returns:
+            Reply message, or None if the client expects no reply
+        """
+        if op_code == _OP_QUERY:
+            # Legacy handshake: flags, collection name, skip, limit, query
+            end = payload.index(b"\x00", 4)
+            query_start = end + 1 + 8
+            size = struct.unpack_from("<i", payload, query_start)[0]
+            command = bson.decode(payload[query_start:query_start + size])
+            reply = bson.encode(self._run(command))
+            body = struct.pack("<iqii", 0, 0, 0, 1) + reply
+            return struct.pack("<iiii", 16 + len(body), 0, request_id, _OP_REPLY) + body
+
+        if op_code != _OP_MSG:
+            raise ValueError(f"Unsupported wire protocol operation {op_code}")
+
+        flags = struct.unpack_from("<I", payload)[0]
+        end = len(payload) - (4 if flags & _CHECKSUM_PRESENT else 0)
+        offset = 4
+        command: Dict[str, Any] = {}
+        sequences: Dict[str, List[Dict[str, Any]]] = {}
+        while offset < end:
+            kind = payload[offset]
+            offset += 1
+            size = struct.unpack_from("<i", payload, offset)[0]
+            if kind == 0:
+                command = bson.decode(payload[offset:offset + size])
+            else:
+                name_end = payload.index(b"\x00", offset + 4)
+                identifier = payload[offset + 4:name_end].decode("utf-8")
+                sequences[identifier] = bson.decode_all(payload[name_end + 1:offset + size])
+            offset += size
+        command.update(sequences)
+
+        result = self._run(command)
+        if flags & _MORE_TO_COME:
+            return None
+        body = struct.pack("<IB", 0, 0) + bson.encode(result)
+        return struct.pack("<iiii", 16 + len(body), 0, request_id, _OP_MSG) + body
+
+    def _run(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a command document and build its reply document."""
+        name = next(iter(command))
+        with self._lock:
+            self.commands[name] = self.commands.get(name, 0) + 1
+
+        if name in ("hello", "ismaster", "isMaster"):
+            return {
+                "ismaster": True, "isWritablePrimary": True, "helloOk": True,
+                "maxBsonObjectSize": 16 * 1024 * 1024, "maxMessageSizeBytes": 48000000,
+                "maxWriteBatchSize": 100000, "localTime": datetime.now(timezone.utc),
+                "logicalSessionTimeoutMinutes": 30, "connectionId": 1,
+                "minWireVersion": 0, "maxWireVersion": 17, "readOnly": False, "ok": 1.0
+            }
+        if name in ("ping", "endSessions", "killCursors"):
+            return {"ok": 1.0}
+
+        self.latency.sleep()
+        database = command.get("$db", "test")
+        namespace = f"{database}.{command[name]}"
+        handler = getattr(self, f"_cmd_{name}", None)
+        if handler is None:
+            return {"ok": 0.0, "errmsg": f"no such command: '{name}'", "code": 59, "codeName": "CommandNotFound"}
+        with self._lock:
+            return handler(namespace, command)
+
+    def _cmd_insert(self, namespace, command):
+        documents = self.collections.setdefault(namespace, [])
+        for document in command.get("documents", []):
+            document.setdefault("_id", ObjectId())
+            documents.append(document)
+        return {"n": len(command.get("documents", [])), "ok": 1.0}
+
+    def _cmd_find(self, namespace, command):
+        found = [document for document in self.collections.get(namespace, []) if matches(document, command.get("filter") or {})]
+        for key, direction in reversed(list((command.get("sort") or {}).items())):
+            found.sort(key=lambda document: _sort_key(_get_path(document, key)), reverse=direction < 0)
+        skip = command.get("skip") or 0
+        limit = abs(command.get("limit") or 0)
+        found = found[skip:skip + limit] if limit else found[skip:]
+        batch = [_project(document, command.get("projection")) for document in found]
+        return {"cursor": {"firstBatch": batch, "id": 0, "ns": namespace}, "ok": 1.0}
+
+    def _cmd_update(self, namespace, command):
+        documents = self.collections.setdefault(namespace, [])
+        matched = modified = 0
+        upserted = []
+        for index, statement in enumerate(command.get("updates", [])):
+            query, update = statement.get("q") or {}, statement.get("u") or {}
+            targets = [document for document in documents if matches(document, query)]
+            if not statement.get("multi"):
+                targets = targets[:1]
+            if not targets and statement.get("upsert"):
+                document = {key: value for key, value in query.items()
+                            if not key.startswith("$") and not isinstance(value, dict)}
+                self._apply_update(document, update, inserting=True)
+                document.setdefault("_id", ObjectId())
+                documents.append(document)
+                upserted.append({"index": index, "_id": document["_id"]})
+                continue
+            for document in targets:
+                self._apply_update(document, update, inserting=False)
+            matched += len(targets)
+            modified += len(targets)
+        reply: Dict[str, Any] = {"n": matched + len(upserted), "nModified": modified, "ok": 1.0}
+        if upserted:
+            reply["upserted"] = upserted
+        return reply
+
+    @staticmethod
+    def _apply_update(document: Dict[str, Any], update: Dict[str, Any], inserting: bool) -> None:
+        """Apply an update document or replacement in place."""
+        if not any(key.startswith("$") for key in update):
+            document_id = document.get("_id")
+            document.clear()
+            document.update(update)
+            if document_id is not None:
+                document["_id"] = document_id
+            return
+        for operator, fields in update.items():
+            for path, value in fields.items():
+                if operator == "$set" or (operator == "$setOnInsert" and inserting):
+                    _set_path(document, path, value)
+                elif operator == "$inc":
+                    _set_path(document, path, (_get_path(document, path) or 0) + value)
+                elif operator == "$unset":
+                    parent = _get_path(document, path.rpartition(".")[0]) if "." in path else document
+                    if isinstance(parent, dict):
+                        parent.pop(path.rpartition(".")[2], None)
+                elif operator != "$setOnInsert":
+                    raise ValueError(f"Unsupported update operator {operator}")
+
+    def _cmd_delete(self, namespace, command):
+        documents = self.collections.setdefault(namespace, [])
+        removed = 0
+        for statement in command.get("deletes", []):
+            targets = [document for document in documents if matches(document, statement.get("q") or {})]
+            if statement.get("limit"):
+                targets = targets[:1]
+            for document in targets:
+                documents.remove(document)
+            removed += len(targets)
+        return {"n": removed, "ok": 1.0}
+
+    def _cmd_createIndexes(self, namespace, command):
+        indexes = self.indexes.setdefault(namespace, {"_id_": {"v": 2, "key": {"_id": 1}, "name": "_id_"}})
+        before = len(indexes)
+        for index in command.get("indexes", []):
+            indexes[index["name"]] = {"v": 2, **index}
+        return {"numIndexesBefore": before, "numIndexesAfter": len(indexes), "ok": 1.0}
+
+    def _cmd_listIndexes(self, namespace, command):
+        indexes = self.indexes.get(namespace, {"_id_": {"v": 2, "key": {"_id": 1}, "name": "_id_"}})
+        return {"cursor": {"firstBatch": list(indexes.values()), "id": 0, "ns": namespace}, "ok": 1.0}
@@ -0,0 +1,187 @@
+"""
+Memory Benchmark
+
+Measures the memory held per Ticket entity converted from Zenpy tickets and
+per TicketAnalysis entity loaded from stored analyses, and the time each
+conversion takes, at a given scale. The tickets are generated like those of
+the Zendesk stand-in (tests/performance/fakes.py).
+
+Usage:
+    python -m tests.performance.memory_benchmark
+    python -m tests.performance.memory_benchmark --count 10000 --count 100000 --format json
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.performance.fakes import FakeZendeskServer, fake_analysis
+
+DEFAULT_COUNTS = (10_000, 100_000)
+
+
+def zenpy_tickets(count: int, seed: int = 0) -> List[Any]:
+    """
+    Generate Zenpy ticket objects as the Zenpy client returns them.
+
+    Args:
+        count: Number of tickets
+        seed: Seed of the generated tickets
+
+    Returns:
+        List of zenpy Ticket objects
+    """
+    from zenpy.lib.api_objects import Ticket as ZenpyTicket
+
+    generator = random.Random(seed)
+    tickets = []
+    for number in range(count):
+        data = FakeZendeskServer._make_ticket(1000 + number, generator, 0.3)
+        data["custom_fields"] = [{"id": 360001, "value": generator.choice(["rma", "warranty", None])}]
+        data["tags"] = generator.sample(["hardware", "gpu", "rma", "vip", "escalated", "billing"], 2)
+        # Decoded from JSON, like API responses: no strings shared between tickets
+        tickets.append(ZenpyTicket(api=None, **json.loads(json.dumps(data))))
+    return tickets
+
+
+def analysis_documents(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate stored analysis documents as MongoDB returns them.
+
+    Args:
+        count: Number of documents
+        seed: Seed of the generated documents
+
+    Returns:
+        List of analysis documents
+    """
+    from datetime import datetime, timedelta
+
+    generator = random.Random(seed)
+    start = datetime(2024, 5, 1)
+    documents = []
+    for number in range(count):
+        analysis = json.loads(json.dumps(fake_analysis(f"ticket {number} {generator.random()}")))
+        documents.append({
+            "ticket_id": str(1000 + number),
+            "subject": f"Ticket {number}",
+            "category": analysis["category"],
+            "component": analysis["component"],
+            "priority": analysis["priority"],
+            "sentiment": analysis["sentiment"],
+            "timestamp": start + timedelta(seconds=number),
+            "source_view_id": 1 + number % 3,
+            "source_view_name": f"Support Queue {1 + number % 3}",
+            "confidence": 0.9
+        })
+    return documents
+
+
+def _measure(make_sources, convert) -> Dict[str, float]:
+    """
+    Measure the memory held by converted entities once their sources are gone.
+
+    Args:
+        make_sources: Function returning the source objects
+        convert: Function converting one source object
+
+    Returns:
+        Count, bytes held per entity and conversion time per entity in microseconds
+    """
+    # Time the conversion untraced, as tracing slows allocation down
+    sources = make_sources()
+    start = time.perf_counter()
+    entities = [convert(source) for source in sources]
+    elapsed = time.perf_counter() - start
+    del sources, entities
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        sources = make_sources()
+        entities = [convert(source) for source in sources]
+        del sources
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    count = len(entities)
+    return {"count": count, "bytes_each": round(held / count, 1), "convert_us_each": round(elapsed / count * 1e6, 2)}
+
+
+def measure_tickets(count: int) -> Dict[str, float]:
+    """
+    Measure Ticket entities converted from Zenpy tickets.
+
+    Args:
+        count: Number of tickets
+
+    Returns:
+        Count, bytes held per ticket and conversion time per ticket in microseconds
+    """
+    from src.domain.entities.ticket import Ticket
+
+    # Import everything the conversion uses before measuring
+    Ticket.from_zendesk_ticket(zenpy_tickets(1)[0])
+    return _measure(lambda: zenpy_tickets(count), Ticket.from_zendesk_ticket)
+
+
+def measure_analyses(count: int) -> Dict[str, float]:
+    """
+    Measure TicketAnalysis entities loaded from stored analyses.
+
+    Args:
+        count: Number of analyses
+
+    Returns:
+        Count, bytes held per analysis and conversion time per analysis in microseconds
+    """
+    from src.infrastructure.repositories.mongodb_repository import MongoDBRepository
+
+    repository = MongoDBRepository(mongo_client=object())
+    repository._dict_to_entity(analysis_documents(1)[0])
+    return _measure(lambda: analysis_documents(count), repository._dict_to_entity)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the memory benchmark from the command line.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv)
+
+    Returns:
+        Exit code
+    """
+    parser = argparse.ArgumentParser(description="Measure the memory held per ticket and analysis entity")
+    parser.add_argument("--count", type=int, action="append",
+                        help="Number of entities (repeatable; default: 10000 and 100000)")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in args.count or DEFAULT_COUNTS:
+        results.append({"entity": "Ticket", **measure_tickets(count)})
+        results.append({"entity": "TicketAnalysis", **measure_analyses(count)})
+
+    if args.format == "json":
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'Entity':<16} {'Count':>8} {'Bytes each':>11} {'Convert us':>11}")
+        for result in results:
+            print(f"{result['entity']:<16} {result['count']:>8} {result['bytes_each']:>11.1f} {result['convert_us_each']:>11.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
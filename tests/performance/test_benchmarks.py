@@ -0,0 +1,152 @@
+"""
+Benchmark Regression Tests
+
+Runs the benchmark scenarios (tests/performance/benchmark.py) against the
+local stand-ins and fails on a regression against the recorded baseline.
+Also tests the stand-ins themselves with the real client libraries.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+import requests
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.performance.benchmark import (
+    SCENARIOS,
+    BenchmarkEnvironment,
+    compare_to_baseline,
+    load_baseline,
+    run_scenario,
+)
+from tests.performance.fakes import (
+    FakeAnthropicServer,
+    FakeMongoServer,
+    FakeZendeskServer,
+    LatencyModel,
+    fake_completion,
+)
+
+pytestmark = pytest.mark.performance
+
+
+@pytest.fixture(scope="module")
+def environment():
+    """Running stand-ins with the environment pointing at them."""
+    with BenchmarkEnvironment() as environment:
+        yield environment
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=[scenario.name for scenario in SCENARIOS])
+def test_scenario_has_not_regressed(environment, scenario):
+    """Test that a scenario is no slower and makes no more calls than its baseline."""
+    result = run_scenario(environment, scenario)
+
+    regressions = compare_to_baseline({scenario.name: result}, load_baseline())
+
+    assert not regressions, "\n".join(regressions)
+
+
+class TestBaselineComparison:
+    """Test suite for the baseline comparison."""
+
+    BASELINE = {
+        "tolerance": 0.25,
+        "slack_ms": 50.0,
+        "scenarios": {"analyze_view": {"wall_ms": 1000.0, "anthropic_requests": 13, "llm_input_tokens": 4000}}
+    }
+
+    def test_within_tolerance(self):
+        """Test that a slowdown within the tolerance and slack passes."""
+        result = {"wall_ms": 1290.0, "anthropic_requests": 13, "llm_input_tokens": 4000}
+
+        assert compare_to_baseline({"analyze_view": result}, self.BASELINE) == []
+
+    def test_slower_and_more_calls(self):
+        """Test that a slowdown and any extra call or token are regressions."""
+        result = {"wall_ms": 1400.0, "anthropic_requests": 14, "llm_input_tokens": 4001}
+
+        regressions = compare_to_baseline({"analyze_view": result}, self.BASELINE)
+
+        assert len(regressions) == 3
+        assert "wall time" in regressions[0]
+
+    def test_tolerance_override(self, monkeypatch):
+        """Test that BENCHMARK_TOLERANCE overrides the baseline tolerance."""
+        monkeypatch.setenv("BENCHMARK_TOLERANCE", "1.0")
+        result = {"wall_ms": 1900.0, "anthropic_requests": 13, "llm_input_tokens": 4000}
+
+        assert compare_to_baseline({"analyze_view": result}, self.BASELINE) == []
+
+
+class TestFakeServers:
+    """Test suite for the stand-in servers."""
+
+    def test_zendesk_pages_and_rate_limits(self):
+        """Test that views are paged and every Nth request gets a 429 with Retry-After."""
+        with FakeZendeskServer(views=1, tickets_per_view=30, page_size=25,
+                               latency=LatencyModel(0), rate_limit_every=3) as server:
+            first = requests.get(f"{server.url}/api/v2/views/1/tickets.json").json()
+            second = requests.get(first["next_page"]).json()
+            limited = requests.get(f"{server.url}/api/v2/views/1/tickets.json")
+
+            assert len(first["tickets"]) == 25
+            assert len(second["tickets"]) == 5 and second["next_page"] is None
+            assert limited.status_code == 429 and limited.headers["Retry-After"] == "1"
+            assert server.stats() == {"requests": 3, "rate_limited": 1}
+
+    def test_zendesk_reset_undoes_updates(self):
+        """Test that resetting restores the generated tickets."""
+        with FakeZendeskServer(views=1, tickets_per_view=1, latency=LatencyModel(0)) as server:
+            url = f"{server.url}/api/v2/tickets/1001.json"
+            requests.put(url, json={"ticket": {"tags": ["vip"]}})
+            server.reset()
+
+            assert requests.get(url).json()["ticket"]["tags"] == []
+
+    def test_pymongo_round_trip(self):
+        """Test inserts, queries and upserts through PyMongo."""
+        from pymongo import MongoClient
+
+        with FakeMongoServer(latency=LatencyModel(0)) as server:
+            client = MongoClient(server.uri, serverSelectionTimeoutMS=2000)
+            try:
+                collection = client["bench"]["analyses"]
+                collection.insert_many([{"ticket_id": str(i), "score": i} for i in range(5)])
+                collection.update_one({"_id": "rollup"}, {"$inc": {"count": 2}}, upsert=True)
+
+                found = list(collection.find({"score": {"$gte": 3}}, {"_id": 0}).sort("score", -1))
+
+                assert found == [{"ticket_id": "4", "score": 4}, {"ticket_id": "3", "score": 3}]
+                assert collection.find_one({"_id": "rollup"})["count"] == 2
+            finally:
+                client.close()
+
+    def test_anthropic_caches_only_long_prefixes(self):
+        """Test that a cacheable system prompt below the model's minimum length is billed as input."""
+        def usage(server, model, words):
+            system = [{"type": "text", "text": "word " * words, "cache_control": {"type": "ephemeral"}}]
+            request = {"model": model, "max_tokens": 10, "system": system, "messages": [{"role": "user", "content": "Hi"}]}
+            return requests.post(f"{server.url}/v1/messages", json=request).json()["usage"]
+
+        with FakeAnthropicServer(latency=LatencyModel(0), tokens_per_second=0) as server:
+            short = [usage(server, "claude-3-haiku-20240307", 500) for _ in range(2)]
+            long = [usage(server, "claude-3-haiku-20240307", 5000) for _ in range(2)]
+
+        assert [call["cache_creation_input_tokens"] + call["cache_read_input_tokens"] for call in short] == [0, 0]
+        assert short[1]["input_tokens"] == short[0]["input_tokens"]
+        assert long[0]["cache_creation_input_tokens"] > 0 and long[0]["cache_read_input_tokens"] == 0
+        assert long[1]["cache_read_input_tokens"] == long[0]["cache_creation_input_tokens"]
+
+    def test_packed_completion(self):
+        """Test that a packed prompt is answered with one analysis per message id."""
+        prompt = '<message id="a">\nRefund please\n</message>\n<message id="b">\nServer is down\n</message>'
+
+        answer = json.loads(fake_completion(prompt))
+
+        assert [analysis["id"] for analysis in answer] == ["a", "b"]
+        assert answer == json.loads(fake_completion(prompt))
@@ -0,0 +1,68 @@
+"""
+IP Allowlist Performance Test
+
+Micro-benchmark comparing the compiled IPAllowlist against the linear scan
+previously used by security.is_ip_allowed.
+"""
+
+import ipaddress
+import logging
+import random
+import timeit
+
+import pytest
+
+from src.infrastructure.utils.ip_allowlist import IPAllowlist
+
+logger = logging.getLogger(__name__)
+
+
+def _linear_scan_is_allowed(client_ip, allowed_ips, allowed_networks):
+    """Reference implementation of the original per-request scan."""
+    try:
+        ip = ipaddress.ip_address(client_ip)
+        if ip in allowed_ips:
+            return True
+        for network in allowed_networks:
+            if ip in network:
+                return True
+        return False
+    except ValueError:
+        return False
+
+
+@pytest.mark.performance
+def test_compiled_allowlist_faster_than_linear_scan():
+    """The compiled lookup should beat the scan on a realistic allowlist."""
+    rng = random.Random(42)
+
+    # Zendesk egress ranges plus office/VPN CIDRs and a few single hosts
+    entries = [f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.0/24" for _ in range(60)]
+    entries += [f"2001:db8:{i:x}::/48" for i in range(20)]
+    entries += [f"198.51.100.{i}" for i in range(20)]
+
+    allowed_networks = [ipaddress.ip_network(e) for e in entries if "/" in e]
+    allowed_ips = [ipaddress.ip_address(e) for e in entries if "/" not in e]
+    allowlist = IPAllowlist(entries)
+
+    probes = [f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}" for _ in range(500)]
+    probes += [str(network.network_address + 1) for network in allowed_networks[:100]]
+
+    # Both implementations must agree before timing them
+    for probe in probes:
+        assert allowlist.is_allowed(probe) == _linear_scan_is_allowed(probe, allowed_ips, allowed_networks)
+
+    linear_time = min(timeit.repeat(
+        lambda: [_linear_scan_is_allowed(p, allowed_ips, allowed_networks) for p in probes],
+        number=5, repeat=3
+    ))
+    compiled_time = min(timeit.repeat(
+        lambda: [allowlist.is_allowed(p) for p in probes],
+        number=5, repeat=3
+    ))
+
+    lookups = len(probes) * 5
+    logger.info(f"Linear scan: {linear_time / lookups * 1e6:.2f} us/lookup")
+    logger.info(f"Compiled allowlist: {compiled_time / lookups * 1e6:.2f} us/lookup")
+
+    assert compiled_time < linear_time
@@ -0,0 +1,39 @@
+"""
+Entity Memory Tests
+
+Checks the memory held per Ticket and TicketAnalysis entity against a budget
+with the memory benchmark (tests/performance/memory_benchmark.py).
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.performance.memory_benchmark import measure_analyses, measure_tickets
+
+COUNT = 2000
+
+# Bytes per entity, with some headroom over the slotted entities
+# (before them: about 1630 per ticket and 1270 per analysis)
+TICKET_BUDGET = 1450
+ANALYSIS_BUDGET = 1000
+
+
+class TestEntityMemory:
+    """Test suite for the memory held per entity."""
+
+    def test_ticket_memory(self):
+        """Test that tickets converted from Zenpy stay within the budget."""
+        result = measure_tickets(COUNT)
+
+        assert result["count"] == COUNT
+        assert result["bytes_each"] < TICKET_BUDGET
+
+    def test_analysis_memory(self):
+        """Test that analyses loaded from storage stay within the budget."""
+        result = measure_analyses(COUNT)
+
+        assert result["count"] == COUNT
+        assert result["bytes_each"] < ANALYSIS_BUDGET
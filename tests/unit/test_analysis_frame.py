@@ -0,0 +1,217 @@
+"""
+Unit Tests for the Analysis Frame
+
+Tests the columnar AnalysisFrame with and without NumPy, and the reports
+aggregated from it.
+"""
+
+import math
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.entities.ticket import Ticket
+from src.domain.entities.ticket_analysis import SentimentAnalysis, TicketAnalysis
+from src.domain.value_objects import analysis_frame
+from src.domain.value_objects.analysis_frame import AnalysisFrame
+from src.domain.value_objects.sentiment_rollup import SentimentRollup
+from src.presentation.reporters.hardware_reporter import HardwareReporterImpl, subject_component
+from src.presentation.reporters.pending_reporter import PendingReporterImpl
+from src.presentation.reporters.sentiment_reporter import SentimentReporterImpl
+
+NOW = datetime(2024, 6, 1)
+
+
+@pytest.fixture(params=["array", "numpy"])
+def backend(request, monkeypatch):
+    """Run a test with array.array columns and, if installed, NumPy columns."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(analysis_frame, "_numpy", lambda: None)
+    return request.param
+
+
+def _analysis(ticket_id, polarity="negative", priority="high", view_id=1, urgency=3, impact=False, component="gpu"):
+    return TicketAnalysis(
+        ticket_id=str(ticket_id),
+        subject=f"Ticket {ticket_id}",
+        category="hardware_issue",
+        component=component,
+        priority=priority,
+        sentiment=SentimentAnalysis(
+            polarity=polarity,
+            urgency_level=urgency,
+            business_impact={"detected": impact, "severity": 4 if impact else 0}
+        ),
+        source_view_id=view_id
+    )
+
+
+def _analyses():
+    return [
+        _analysis(1, polarity="neutral", priority="low", view_id=2),
+        _analysis(2, urgency=5, impact=True),
+        _analysis(3, polarity="positive", priority="medium", view_id=None, component=None),
+        _analysis(4, view_id=2),
+        _analysis(5, polarity=None, priority="low", urgency=1),
+    ]
+
+
+def _ticket(ticket_id, created_at, status="pending", subject="Help", view_id=None):
+    return Ticket(id=ticket_id, subject=subject, status=status, created_at=created_at, source_view_id=view_id)
+
+
+class TestAnalysisFrame:
+    """Test suite for AnalysisFrame."""
+
+    def test_columns_match_analyses(self, backend):
+        """Test that the columns hold the values and scores of the analyses."""
+        analyses = _analyses()
+        frame = AnalysisFrame.from_analyses(analyses)
+
+        assert len(frame) == 5
+        assert frame.values("ticket_id") == ["1", "2", "3", "4", "5"]
+        assert frame.values("view_id") == [2, 1, None, 2, 1]
+        assert frame.values("polarity") == ["neutral", "negative", "positive", "negative", None]
+        assert frame.values("priority_score") == [analysis.priority_score for analysis in analyses]
+        assert frame.values("business_impact") == [0, 1, 0, 0, 0]
+        assert AnalysisFrame.from_analyses(frame) is frame
+
+    def test_count_by_orders_by_first_appearance(self, backend):
+        """Test that counts are in order of first appearance, including within a selection."""
+        frame = AnalysisFrame.from_analyses(_analyses())
+
+        assert frame.count_by("polarity") == {"neutral": 1, "negative": 2, "positive": 1, None: 1}
+        assert frame.count_by("priority_score") == {
+            score: frame.values("priority_score").count(score)
+            for score in dict.fromkeys(frame.values("priority_score"))
+        }
+        assert frame.count_by("polarity", where=frame.mask("view_id", "==", 1)) == {"negative": 1, None: 1}
+        assert frame.count_by("polarity", where=frame.mask("view_id", "==", 3)) == {}
+
+    def test_mask_and_filter(self, backend):
+        """Test masks on category and number columns and the frames they select."""
+        frame = AnalysisFrame.from_analyses(_analyses())
+
+        assert frame.indices(frame.mask("priority_score", ">=", 7)) == [1, 3]
+        assert frame.count(frame.mask("view_id", "!=", None)) == 4
+        assert frame.indices(frame.mask("priority", "in", ["low", "medium"])) == [0, 2, 4]
+
+        selected = frame.filter(frame.mask("view_id", "==", 2))
+        assert selected.values("ticket_id") == ["1", "4"]
+        assert selected.values("polarity") == ["neutral", "negative"]
+        assert selected.rows([1], ["ticket_id", "priority"]) == [{"ticket_id": "4", "priority": "high"}]
+
+    def test_mask_errors(self, backend):
+        """Test that unknown columns, object columns and ordering labels are rejected."""
+        frame = AnalysisFrame.from_analyses(_analyses())
+
+        with pytest.raises(KeyError):
+            frame.mask("unknown", "==", 1)
+        with pytest.raises(ValueError):
+            frame.mask("subject", "==", "Ticket 1")
+        with pytest.raises(ValueError):
+            frame.mask("priority", "<", "high")
+        with pytest.raises(ValueError):
+            frame.add_column("short", [1, 2], "integer")
+
+    def test_group_by(self, backend):
+        """Test that groups keep their rows in order and come in order of first appearance."""
+        frame = AnalysisFrame.from_analyses(_analyses())
+
+        groups = frame.group_by("view_id", where=frame.mask("view_id", "!=", None))
+
+        assert list(groups) == [2, 1]
+        assert groups[2].values("ticket_id") == ["1", "4"]
+        assert groups[1].values("ticket_id") == ["2", "5"]
+        assert groups[1].count_by("polarity") == {"negative": 1, None: 1}
+
+    def test_histogram_skips_nan(self, backend):
+        """Test that values are binned by edge and missing ones are not counted."""
+        tickets = [
+            _ticket(1, "2024-05-31T12:00:00Z"),
+            _ticket(2, "2024-05-30T00:00:00Z"),
+            _ticket(3, datetime(2024, 5, 20)),
+            _ticket(4, None),
+            _ticket(5, "not a date"),
+        ]
+        frame = AnalysisFrame.from_tickets(tickets, now=NOW)
+
+        ages = frame.values("age_days")
+        assert ages[:3] == [0.5, 2.0, 12.0]
+        assert math.isnan(ages[3]) and math.isnan(ages[4])
+        assert frame.histogram("age_days", [1, 3, 8]) == [1, 1, 0, 1]
+
+    def test_top_k_ties_and_nan(self, backend):
+        """Test that ties keep row order and missing values rank last either way."""
+        tickets = [
+            _ticket(1, "2024-05-30T00:00:00Z"),
+            _ticket(2, None),
+            _ticket(3, "2024-05-31T00:00:00Z"),
+            _ticket(4, "2024-05-30T00:00:00Z"),
+        ]
+        frame = AnalysisFrame.from_tickets(tickets, now=NOW)
+
+        assert frame.top_k("created", 4) == [2, 0, 3, 1]
+        assert frame.top_k("created", 2, largest=False) == [0, 3]
+        assert frame.top_k("created", 4, largest=False) == [0, 3, 2, 1]
+        assert frame.top_k("created", 5, where=frame.mask("created", "<", frame.values("created")[2])) == [0, 3]
+
+
+class TestFrameReports:
+    """Test suite for reports aggregated from a frame."""
+
+    def test_rollup_from_frame_matches_analyses(self, backend):
+        """Test that a rollup from a frame equals one from the analyses."""
+        analyses = _analyses()
+
+        assert vars(SentimentRollup.from_frame(AnalysisFrame.from_analyses(analyses))) == \
+            vars(SentimentRollup.from_analyses(analyses))
+
+    def test_sentiment_report_from_frame(self, backend):
+        """Test that the sentiment report is the same for a list and a frame."""
+        reporter = SentimentReporterImpl()
+        analyses = _analyses()
+
+        assert reporter.calculate_sentiment_distribution(AnalysisFrame.from_analyses(analyses)) == \
+            reporter.calculate_sentiment_distribution(analyses)
+        report = reporter.generate_report(AnalysisFrame.from_analyses(analyses))
+        assert "Ticket 2" in report
+        assert report.split("\n")[4:] == reporter.generate_report(analyses).split("\n")[4:]
+
+    def test_hardware_components(self, backend):
+        """Test that components are taken from subject keywords in order."""
+        tickets = [
+            _ticket(1, "2024-05-31T00:00:00Z", status="open", subject="GPU fan noise", view_id=1),
+            _ticket(2, "2024-05-30T00:00:00Z", status="solved", subject="RAM error", view_id=2),
+            _ticket(3, "2024-05-29T00:00:00Z", status="open", subject=None, view_id=1),
+        ]
+
+        distribution = HardwareReporterImpl().calculate_component_distribution(tickets)
+
+        assert distribution == {"gpu": 1, "memory": 1, "unknown": 1}
+        assert subject_component("Video card overheating") == "gpu"
+        assert subject_component("Thermal paste") == "cooling"
+
+    def test_pending_report_with_string_dates(self, backend):
+        """Test that the pending report reads the ISO dates of Zendesk tickets."""
+        tickets = [
+            _ticket(1, "2024-05-31T12:00:00Z"),
+            _ticket(2, "2024-04-01T00:00:00Z"),
+            _ticket(3, None),
+        ]
+        reporter = PendingReporterImpl()
+
+        distribution = reporter.calculate_age_distribution(AnalysisFrame.from_tickets(tickets, now=NOW))
+        report = reporter.generate_report(AnalysisFrame.from_tickets(tickets, now=NOW))
+
+        assert sum(distribution.values()) == 2
+        assert "Ticket 2: Help" in report
+        assert "Age: 61 days, Created: 2024-04-01" in report
+        assert report.index("Ticket 2") < report.index("Ticket 1")
@@ -0,0 +1,284 @@
+"""
+Unit Tests for Analysis Rollups
+
+Tests the rollup value object, the rollup repositories and rollup-based
+sentiment reports.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.application.services.reporting_service import ReportingServiceImpl
+from src.domain.entities.ticket_analysis import SentimentAnalysis, TicketAnalysis
+from src.domain.value_objects.sentiment_rollup import (
+    DAY,
+    HOUR,
+    RAW,
+    SentimentRollup,
+    split_period,
+)
+from src.infrastructure.repositories.analysis_rollup_repository import (
+    InMemoryAnalysisRollupRepository,
+    MongoDBAnalysisRollupRepository,
+)
+from src.presentation.reporters.sentiment_reporter import SentimentReporterImpl
+
+
+def _analysis(ticket_id, timestamp, polarity="negative", priority="high", view_id=1, impact=False):
+    return TicketAnalysis(
+        ticket_id=str(ticket_id),
+        subject=f"Ticket {ticket_id}",
+        category="hardware_issue",
+        component="gpu",
+        priority=priority,
+        sentiment=SentimentAnalysis(
+            polarity=polarity,
+            business_impact={"detected": impact, "severity": 2 if impact else 0}
+        ),
+        timestamp=timestamp,
+        source_view_id=view_id
+    )
+
+
+class TestSplitPeriod:
+    """Test suite for split_period."""
+
+    def test_whole_days_use_daily_buckets(self):
+        ranges = split_period(datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 4, 5, 15))
+
+        assert ranges == [
+            (RAW, datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 11)),
+            (HOUR, datetime(2024, 1, 1, 11), datetime(2024, 1, 2)),
+            (DAY, datetime(2024, 1, 2), datetime(2024, 1, 4)),
+            (HOUR, datetime(2024, 1, 4), datetime(2024, 1, 4, 5)),
+            (RAW, datetime(2024, 1, 4, 5), datetime(2024, 1, 4, 5, 15)),
+        ]
+
+    def test_short_period_uses_hourly_buckets(self):
+        ranges = split_period(datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 2, 3, 0))
+
+        assert ranges == [
+            (RAW, datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 11)),
+            (HOUR, datetime(2024, 1, 1, 11), datetime(2024, 1, 2, 3, 0)),
+        ]
+
+    def test_period_within_an_hour_is_raw(self):
+        assert split_period(datetime(2024, 1, 1, 10, 10), datetime(2024, 1, 1, 10, 50)) == [
+            (RAW, datetime(2024, 1, 1, 10, 10), datetime(2024, 1, 1, 10, 50))
+        ]
+
+    def test_aligned_period_has_no_hourly_edges(self):
+        assert split_period(datetime(2024, 1, 1), datetime(2024, 1, 8)) == [
+            (DAY, datetime(2024, 1, 1), datetime(2024, 1, 8))
+        ]
+
+
+class TestInMemoryAnalysisRollupRepository:
+    """Test suite for InMemoryAnalysisRollupRepository."""
+
+    def test_record_counts_hour_and_day_buckets(self):
+        repo = InMemoryAnalysisRollupRepository()
+        repo.record(_analysis(1, datetime(2024, 1, 1, 10, 5)))
+        repo.record(_analysis(2, datetime(2024, 1, 1, 10, 50)))
+        repo.record(_analysis(3, datetime(2024, 1, 1, 11, 5)))
+
+        hourly = repo.get_rollups(HOUR, datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11))
+        daily = repo.get_rollups(DAY, datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+        assert [row["count"] for row in hourly] == [2]
+        assert [row["count"] for row in daily] == [3]
+        assert daily[0]["polarity"] == "negative"
+        assert daily[0]["component"] == "gpu"
+
+    def test_negative_delta_removes_analysis(self):
+        repo = InMemoryAnalysisRollupRepository()
+        analysis = _analysis(1, datetime(2024, 1, 1, 10))
+        repo.record(analysis)
+        repo.record(analysis, -1)
+
+        assert repo.is_empty()
+
+    def test_view_filter_and_rebuild(self):
+        repo = InMemoryAnalysisRollupRepository()
+        processed = repo.rebuild([
+            _analysis(1, datetime(2024, 1, 1), view_id=1),
+            _analysis(2, datetime(2024, 1, 1), view_id=2),
+        ])
+
+        rows = repo.get_rollups(DAY, datetime(2024, 1, 1), datetime(2024, 1, 2), view_id=2)
+        assert processed == 2
+        assert len(rows) == 1
+        assert rows[0]["view_id"] == 2
+
+
+class TestMongoDBAnalysisRollupRepository:
+    """Test suite for MongoDBAnalysisRollupRepository."""
+
+    def test_record_issues_inc_upserts(self):
+        database = MagicMock()
+        repo = MongoDBAnalysisRollupRepository(database, collection_name="rollups")
+
+        repo.record(_analysis(1, datetime(2024, 1, 1, 10, 5)))
+
+        operations = database["rollups"].bulk_write.call_args[0][0]
+        assert len(operations) == 2
+        documents = [operation._doc for operation in operations]
+        filters = [operation._filter for operation in operations]
+        assert all(document == {"$inc": {"count": 1}} for document in documents)
+        assert {f["bucket"] for f in filters} == {datetime(2024, 1, 1, 10), datetime(2024, 1, 1)}
+        assert all(operation._upsert for operation in operations)
+
+    def test_get_rollups_queries_bucket_range(self):
+        database = MagicMock()
+        repo = MongoDBAnalysisRollupRepository(database, collection_name="rollups")
+        database["rollups"].find.return_value = [{"polarity": "positive", "count": 4}]
+
+        rows = repo.get_rollups(DAY, datetime(2024, 1, 1), datetime(2024, 1, 8), view_id=3)
+
+        query = database["rollups"].find.call_args[0][0]
+        assert query["granularity"] == DAY
+        assert query["bucket"] == {"$gte": datetime(2024, 1, 1), "$lt": datetime(2024, 1, 8)}
+        assert query["view_id"] == 3
+        assert rows == [{"polarity": "positive", "count": 4}]
+
+
+class TestRollupSentimentReport:
+    """Test suite for sentiment reports composed from rollups."""
+
+    @pytest.fixture
+    def analyses(self):
+        now = datetime.utcnow()
+        return [
+            _analysis(1, now - timedelta(hours=1)),
+            _analysis(2, now - timedelta(days=3), polarity="positive", priority="low", impact=True),
+            _analysis(3, now - timedelta(days=20), polarity="neutral", priority="medium"),
+            _analysis(4, now - timedelta(days=45)),
+        ]
+
+    def _service(self, analyses, rollup_repository=None):
+        analysis_repository = MagicMock()
+        analysis_repository.find_between_dates.side_effect = lambda start, end: [
+            a for a in analyses if start <= a.timestamp <= end
+        ]
+        analysis_repository.find_high_priority.side_effect = lambda min_score, start, end: [
+            a for a in analyses if start <= a.timestamp < end and a.priority_score >= min_score
+        ]
+        view_repository = MagicMock()
+        view_repository.get_view_by_id.return_value = {"title": "Support"}
+        service = ReportingServiceImpl(
+            ticket_repository=MagicMock(),
+            analysis_repository=analysis_repository,
+            view_repository=view_repository,
+            sentiment_reporter=SentimentReporterImpl(),
+            hardware_reporter=MagicMock(),
+            pending_reporter=MagicMock(),
+            rollup_repository=rollup_repository
+        )
+        return service, analysis_repository
+
+    def test_rollup_totals_match_raw_analyses(self, analyses):
+        rollups = InMemoryAnalysisRollupRepository()
+        rollups.rebuild(analyses)
+        service, analysis_repository = self._service(analyses, rollups)
+
+        rollup = service._compose_rollup(datetime.utcnow() - timedelta(days=30), datetime.utcnow())
+        expected = SentimentRollup.from_analyses(analyses[:3])
+
+        assert rollup.total == 3
+        assert rollup.sentiment_distribution == expected.sentiment_distribution
+        assert rollup.priority_distribution == expected.priority_distribution
+        assert rollup.business_impact_count == 1
+
+    def test_report_reads_only_partial_hours_and_high_priority(self, analyses):
+        analyses.append(_analysis(5, datetime.utcnow() - timedelta(days=2), impact=True))
+        rollups = InMemoryAnalysisRollupRepository()
+        rollups.rebuild(analyses)
+        service, analysis_repository = self._service(analyses, rollups)
+
+        report = service.generate_sentiment_report("month", view_id=1)
+
+        for call in analysis_repository.find_between_dates.call_args_list:
+            start, end = call[0]
+            assert end - start <= timedelta(hours=1)
+        assert report.endswith(
+            "High Priority Tickets:\n"
+            "  - Ticket 5: Ticket 5\n"
+            "    Priority: high, Sentiment: negative, Score: 7\n"
+        )
+        assert "Total tickets analyzed: 4" in report
+        assert "Sentiment Analysis Report - Last 30 days - Support" in report
+        assert "Business Impact Detected: 2 (50.0%)" in report
+
+    def test_partial_hours_clipped_to_period(self):
+        analyses = [
+            _analysis(1, datetime(2024, 1, 1, 10, 10)),
+            _analysis(2, datetime(2024, 1, 1, 10, 40)),
+            _analysis(3, datetime(2024, 1, 1, 11, 30)),
+            _analysis(4, datetime(2024, 1, 1, 12, 10)),
+            _analysis(5, datetime(2024, 1, 1, 12, 20)),
+        ]
+        rollups = InMemoryAnalysisRollupRepository()
+        rollups.rebuild(analyses)
+        service, analysis_repository = self._service(analyses, rollups)
+
+        rollup = service._compose_rollup(datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 12, 15))
+
+        assert rollup.total == 3
+
+    def test_report_matches_raw_report_distribution(self, analyses):
+        rollups = InMemoryAnalysisRollupRepository()
+        rollups.rebuild(analyses)
+        rollup_report = self._service(analyses, rollups)[0].generate_sentiment_report("week")
+        raw_report = self._service(analyses)[0].generate_sentiment_report("week")
+
+        def section(report):
+            return report.split("Sentiment Distribution:")[1].split("High Priority")[0]
+
+        assert section(rollup_report) == section(raw_report)
+
+
+class TestMongoDBRepositoryRollups:
+    """Test suite for rollup maintenance in MongoDBRepository."""
+
+    def test_save_records_rollups_once_enabled(self):
+        from src.infrastructure.repositories.mongodb_repository import MongoDBRepository
+
+        repository = MongoDBRepository(mongo_client=MagicMock())
+        rollups = InMemoryAnalysisRollupRepository()
+        repository.collection.find.return_value = []
+        repository.enable_rollups(rollups)
+
+        repository.save(_analysis(1, datetime(2024, 1, 1, 10)))
+
+        assert rollups.get_rollups(DAY, datetime(2024, 1, 1), datetime(2024, 1, 2))[0]["count"] == 1
+
+    def test_enable_backfills_empty_rollups(self):
+        from src.infrastructure.repositories.mongodb_repository import MongoDBRepository
+
+        repository = MongoDBRepository(mongo_client=MagicMock())
+        existing = _analysis(1, datetime(2024, 1, 1, 10))
+        repository.collection.find.return_value = [repository._entity_to_dict(existing)]
+
+        rollups = repository.enable_rollups(InMemoryAnalysisRollupRepository())
+
+        assert not rollups.is_empty()
+
+    def test_update_moves_rollups_from_replaced_version(self):
+        from src.infrastructure.repositories.mongodb_repository import MongoDBRepository
+
+        repository = MongoDBRepository(mongo_client=MagicMock())
+        repository.collection.find.return_value = []
+        rollups = repository.enable_rollups(InMemoryAnalysisRollupRepository())
+        repository.save(_analysis(1, datetime(2024, 1, 1, 10)))
+        replaced = _analysis(1, datetime(2024, 1, 1, 10))
+        repository.collection.find_one_and_replace.return_value = repository._entity_to_dict(replaced)
+
+        assert repository.update(_analysis(1, datetime(2024, 1, 1, 10), polarity="positive")) is True
+
+        repository.collection.find_one.assert_not_called()
+        repository.collection.replace_one.assert_not_called()
+        assert repository.collection.find_one_and_replace.call_args[1]["return_document"] is False
+        days = rollups.get_rollups(DAY, datetime(2024, 1, 1), datetime(2024, 1, 2))
+        assert {day["polarity"]: day["count"] for day in days if day["count"]} == {"positive": 1}
@@ -4,6 +4,8 @@ Test CLI Commands
 This module contains unit tests for the CLI commands.
 """
 
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -289,13 +291,16 @@ class TestGenerateReportCommand(unittest.TestCase):
         # Mock generate_sentiment_report to return a report
         self.mock_generate_report_use_case.generate_sentiment_report.return_value = "Sentiment report content"
         
-        # Execute command
-        with patch('builtins.print') as mock_print:
+        # Execute command, saving the report to a temporary reports directory
+        with tempfile.TemporaryDirectory() as reports_dir, \
+                patch.dict(os.environ, {"REPORTS_DIR": reports_dir}), \
+                patch('builtins.print') as mock_print:
             result = self.command.execute(args)
             
             # Assertions
             self.assertTrue(result["success"])
             self.assertEqual(result["report_type"], "sentiment")
+            self.assertEqual(os.path.dirname(result["output_file"]), os.path.realpath(reports_dir))
             self.mock_generate_report_use_case.generate_sentiment_report.assert_called_once()
             mock_print.assert_called()
 
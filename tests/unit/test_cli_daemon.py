@@ -0,0 +1,161 @@
+"""
+Unit Tests for the CLI Daemon
+
+Tests forwarding commands to the daemon over its Unix socket, streaming of
+their output, the caller's working directory and environment, control
+requests and the fallback when no daemon runs.
+"""
+
+import io
+import os
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.presentation.cli.daemon import (
+    CLIDaemon,
+    command_name,
+    daemon_request,
+    forward_command,
+)
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets required")
+
+
+class FakeCommandHandler:
+    """Command handler printing its arguments and counting its calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def handle_command(self, argv):
+        self.calls.append(argv)
+        if argv == ["--help"]:
+            raise SystemExit(0)
+        if argv[0] == "report":
+            # Writes a relative path and reads a setting, like --output and REPORTS_DIR
+            with open(argv[1], "w") as report:
+                report.write(os.environ.get("REPORTS_DIR", "unset"))
+            return 0
+        print(f"ran {' '.join(argv)}")
+        print("warning", file=sys.stderr)
+        return 0 if argv[0] == "views" else 1
+
+
+@pytest.fixture
+def daemon():
+    """Run a daemon with a fake command handler in a background thread."""
+    directory = tempfile.mkdtemp()  # Short path: socket paths are length-limited
+    daemon = CLIDaemon(os.path.join(directory, "d.sock"), command_handler=FakeCommandHandler())
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.stop()
+    thread.join(timeout=5)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class TestCLIDaemon:
+    """Test suite for CLIDaemon and its client."""
+
+    def test_forward_command_streams_output(self, daemon):
+        """Test that output and exit code of a forwarded command reach the client."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        exit_code = forward_command(["views", "--flat"], daemon.socket_path, stdout, stderr)
+
+        assert exit_code == 0
+        assert stdout.getvalue() == "ran views --flat\n"
+        assert stderr.getvalue() == "warning\n"
+
+    def test_handler_reused_across_commands(self, daemon):
+        """Test that every command runs on the same warm command handler."""
+        out = io.StringIO()
+
+        assert forward_command(["views"], daemon.socket_path, out, out) == 0
+        assert forward_command(["generatereport"], daemon.socket_path, out, out) == 1
+
+        assert daemon.command_handler.calls == [["views"], ["generatereport"]]
+        assert daemon_request("status", daemon.socket_path)["status"]["requests_served"] == 2
+
+    def test_argparse_exit_returned_as_exit_code(self, daemon):
+        """Test that a command exiting through argparse doesn't stop the daemon."""
+        assert forward_command(["--help"], daemon.socket_path, io.StringIO(), io.StringIO()) == 0
+        assert daemon_request("ping", daemon.socket_path) == {"ok": True}
+
+    def test_local_only_commands_rejected(self, daemon):
+        """Test that terminal and server commands are not run in the daemon."""
+        stderr = io.StringIO()
+
+        exit_code = forward_command(["--log-level", "DEBUG", "interactive"], daemon.socket_path, io.StringIO(), stderr)
+
+        assert exit_code == 2
+        assert "interactive" in stderr.getvalue()
+        assert daemon.command_handler.calls == []
+
+    def test_no_daemon_returns_none(self):
+        """Test that the client reports a missing daemon so the command runs locally."""
+        missing = os.path.join(tempfile.gettempdir(), "no-such-daemon.sock")
+
+        assert forward_command(["views"], missing) is None
+        assert daemon_request("status", missing) is None
+
+    def test_runs_in_callers_directory(self, daemon, tmp_path, monkeypatch):
+        """Test that relative paths resolve against the caller's working directory."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("REPORTS_DIR", "caller-reports")
+
+        assert forward_command(["report", "out.txt"], daemon.socket_path, io.StringIO(), io.StringIO()) == 0
+
+        assert (tmp_path / "out.txt").read_text() == "caller-reports"
+
+    def test_callers_environment_applied_and_restored(self, daemon, tmp_path):
+        """Test that the caller's environment is in effect for the command only."""
+        env = {name: value for name, value in os.environ.items() if name != "REPORTS_DIR"}
+        env["REPORTS_DIR"] = "caller-reports"
+        cwd, reports_dir = os.getcwd(), os.environ.get("REPORTS_DIR")
+
+        reply = daemon.handle_request({"argv": ["report", str(tmp_path / "out.txt")], "cwd": str(tmp_path), "env": env}, print)
+
+        assert reply == {"exit_code": 0}
+        assert (tmp_path / "out.txt").read_text() == "caller-reports"
+        assert os.getcwd() == cwd
+        assert os.environ.get("REPORTS_DIR") == reports_dir
+
+    def test_other_service_settings_run_locally(self, daemon, monkeypatch):
+        """Test that a caller with other credentials runs the command itself."""
+        monkeypatch.setenv("ZENDESK_SUBDOMAIN", "another-account")
+
+        assert forward_command(["views"], daemon.socket_path, io.StringIO(), io.StringIO()) is None
+        assert daemon.command_handler.calls == []
+
+    def test_missing_directory_rejected(self, daemon):
+        """Test that a working directory the daemon can't enter is an error."""
+        reply = daemon.handle_request({"argv": ["views"], "cwd": "/no/such/directory"}, print)
+
+        assert reply["exit_code"] == 2
+        assert daemon.command_handler.calls == []
+
+    def test_socket_private(self, daemon):
+        """Test that the socket is only accessible to its owner."""
+        assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+
+    def test_second_daemon_refused(self, daemon):
+        """Test that a running daemon's socket isn't taken over."""
+        with pytest.raises(RuntimeError):
+            CLIDaemon(daemon.socket_path, command_handler=MagicMock()).start()
+
+    def test_command_name(self):
+        """Test that global option values aren't taken for the command."""
+        assert command_name(["--log-level", "DEBUG", "views", "--flat"]) == "views"
+        assert command_name(["--help"]) is None
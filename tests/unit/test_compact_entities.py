@@ -0,0 +1,152 @@
+"""
+Unit Tests for Compact Entities
+
+Tests the slotted Ticket and TicketAnalysis entities, their shared labels and
+the conversion of Zendesk tickets.
+"""
+
+import json
+import os
+import sys
+from dataclasses import asdict, fields
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.entities.slots import intern_label, intern_labels
+from src.domain.entities.ticket import Ticket
+from src.domain.entities.ticket_analysis import SentimentAnalysis, TicketAnalysis
+
+
+def _decoded(value):
+    """Get a copy of a value as decoded from JSON, sharing no strings with it."""
+    return json.loads(json.dumps(value))
+
+
+class TestSlottedEntities:
+    """Test suite for slotted entities."""
+
+    @pytest.mark.parametrize("entity", [
+        Ticket(id=1, subject="GPU fails"),
+        SentimentAnalysis(polarity="negative"),
+        TicketAnalysis(ticket_id="1", subject="GPU fails", category="hardware_issue",
+                       component="gpu", priority="high", sentiment=SentimentAnalysis(polarity="negative"))
+    ])
+    def test_no_instance_dict(self, entity):
+        """Test that entities have slots and no per-instance dictionary."""
+        assert not hasattr(entity, "__dict__")
+        assert type(entity).__slots__ == tuple(field.name for field in fields(entity))
+        with pytest.raises(AttributeError):
+            entity.unknown = True
+
+    def test_dataclass_behaviour_kept(self):
+        """Test that defaults, equality, repr and asdict still work."""
+        ticket = Ticket(id=1, subject="GPU fails")
+        other = Ticket(id=1, subject="GPU fails")
+
+        assert ticket == other
+        assert ticket.tags == [] and ticket.tags is not other.tags
+        assert ticket.status == "new"
+        assert repr(ticket).startswith("Ticket(id=1, subject='GPU fails'")
+        assert asdict(ticket)["custom_fields"] == {}
+
+    def test_labels_are_shared(self):
+        """Test that equal labels decoded separately share one string."""
+        first = Ticket(id=1, subject="a", status=_decoded("open"), tags=_decoded(["gpu", "rma"]))
+        second = Ticket(id=2, subject="b", status=_decoded("open"), tags=_decoded(["gpu"]))
+
+        assert first.status is second.status
+        assert first.tags[0] is second.tags[0]
+
+        sentiment = [SentimentAnalysis(polarity=_decoded("negative"), emotions=_decoded(["angry"])) for _ in range(2)]
+        analyses = [
+            TicketAnalysis(ticket_id=str(number), subject="GPU fails", category=_decoded("hardware_issue"),
+                           component=_decoded("gpu"), priority=_decoded("high"), sentiment=sentiment[number])
+            for number in range(2)
+        ]
+
+        assert sentiment[0].polarity is sentiment[1].polarity
+        assert sentiment[0].emotions[0] is sentiment[1].emotions[0]
+        assert analyses[0].category is analyses[1].category
+        assert analyses[0].component is analyses[1].component
+
+    def test_intern_label_leaves_other_values(self):
+        """Test that only strings are interned."""
+        assert intern_label(None) is None
+        assert intern_label(3) == 3
+        assert intern_labels(None) == []
+
+
+class TestFromZendeskTicket:
+    """Test suite for converting Zendesk tickets."""
+
+    def test_converts_fields(self):
+        """Test that the Zendesk ticket fields are converted."""
+        zendesk_ticket = SimpleNamespace(
+            id=42, subject=None, description="The GPU fails", status="open", priority="high",
+            tags=("gpu", "rma"), created_at="2024-05-01T10:00:00Z", updated_at="2024-05-02T10:00:00Z",
+            requester_id=7, assignee_id=8,
+            custom_fields=[{"id": 360001, "value": "rma"}, {"id": 360002, "value": None}]
+        )
+
+        ticket = Ticket.from_zendesk_ticket(zendesk_ticket)
+
+        assert ticket.id == 42
+        assert ticket.subject == "No Subject"
+        assert ticket.description == "The GPU fails"
+        assert ticket.status == "open"
+        assert ticket.priority == "high"
+        assert ticket.tags == ["gpu", "rma"]
+        assert ticket.created_at == "2024-05-01T10:00:00Z"
+        assert ticket.requester_id == 7
+        assert ticket.assignee_id == 8
+        assert ticket.custom_fields == {360001: "rma"}
+
+    def test_missing_fields_keep_defaults(self):
+        """Test that fields missing from the Zendesk ticket keep their defaults."""
+        ticket = Ticket.from_zendesk_ticket(SimpleNamespace(id=1, subject="GPU fails"))
+
+        assert ticket == Ticket(id=1, subject="GPU fails")
+
+    def test_description_not_copied_into_comments(self):
+        """Test that a ticket without comments has none, rather than a copy of its description."""
+        ticket = Ticket.from_zendesk_ticket(SimpleNamespace(id=1, subject="GPU fails", description="The GPU fails"))
+
+        assert ticket.comments == []
+        assert ticket.full_content.count("The GPU fails") == 1
+
+    def test_converts_comments(self):
+        """Test that comments are converted when the Zendesk ticket has them."""
+        comment = SimpleNamespace(id=5, body="Still failing", author_id=7, created_at="2024-05-01T11:00:00Z", public=True)
+
+        ticket = Ticket.from_zendesk_ticket(SimpleNamespace(id=1, subject="GPU fails", comments=[comment]))
+
+        assert ticket.comments == [
+            {"id": 5, "body": "Still failing", "author_id": 7, "created_at": "2024-05-01T11:00:00Z", "public": True}
+        ]
+
+    @pytest.mark.parametrize("custom_fields", [
+        [SimpleNamespace(id=360001, value="rma"), SimpleNamespace(id=360002, value=None)],
+        {360001: "rma", 360002: None},
+    ])
+    def test_custom_field_shapes(self, custom_fields):
+        """Test that custom fields given as objects or as a mapping are converted."""
+        ticket = Ticket.from_zendesk_ticket(SimpleNamespace(id=1, subject="GPU fails", custom_fields=custom_fields))
+
+        assert ticket.custom_fields == {360001: "rma"}
+
+    def test_zenpy_ticket(self):
+        """Test that a zenpy Ticket object is converted."""
+        zenpy_objects = pytest.importorskip("zenpy.lib.api_objects")
+        zendesk_ticket = zenpy_objects.Ticket(api=None, **_decoded({
+            "id": 9, "subject": "GPU fails", "status": "pending", "tags": ["gpu"],
+            "custom_fields": [{"id": 360001, "value": "warranty"}]
+        }))
+
+        ticket = Ticket.from_zendesk_ticket(zendesk_ticket)
+
+        assert (ticket.id, ticket.status, ticket.tags) == (9, "pending", ["gpu"])
+        assert ticket.custom_fields == {360001: "warranty"}
@@ -0,0 +1,90 @@
+"""
+Unit Tests for the Content Window
+
+Tests that ticket content sent for analysis stays within the token budget
+while keeping the subject, first message and most recent comments.
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.application.services.ticket_analysis_service import ticket_content
+from src.domain.entities.ticket import Ticket
+from src.domain.value_objects.content_window import (
+    TRUNCATION_MARKER,
+    ContentWindow,
+    estimate_tokens,
+)
+
+
+def _thread(comment_count, body_size=40):
+    """Build a ticket whose first comment is its description."""
+    comments = [{"id": 0, "body": "GPU fails under load", "public": True}]
+    comments += [
+        {"id": i, "body": f"reply {i} " + "x" * body_size, "public": i % 2 == 0}
+        for i in range(1, comment_count)
+    ]
+    return Ticket(id=1, subject="RMA request", description="GPU fails under load", comments=comments)
+
+
+class TestContentWindow:
+    """Test suite for ContentWindow."""
+
+    def test_short_ticket_keeps_subject_and_description(self):
+        """Test that a ticket without replies builds the plain content."""
+        ticket = Ticket(id=1, subject="SO released", description="Order 42 released to warehouse")
+
+        assert ticket_content(ticket) == "Subject: SO released\n\nDescription: Order 42 released to warehouse"
+
+    def test_description_comment_not_repeated(self):
+        """Test that the first comment is skipped when it is the description."""
+        content = ContentWindow().build(_thread(3))
+
+        assert content.count("GPU fails under load") == 1
+        assert "Comment 2 (Private):\nreply 1" in content
+        assert "Comment 3 (Public):\nreply 2" in content
+
+    def test_keeps_most_recent_comments(self):
+        """Test that only the most recent N comments are included."""
+        content = ContentWindow(recent_comments=2).build(_thread(10))
+
+        assert "reply 8 " in content and "reply 9 " in content
+        assert "reply 7 " not in content
+        assert "Comments (7 earlier omitted):" in content
+        assert content.index("reply 8 ") < content.index("reply 9 ")
+
+    def test_long_thread_stays_within_budget(self):
+        """Test that long threads are bounded by the token budget."""
+        window = ContentWindow(max_tokens=500, recent_comments=50)
+        ticket = _thread(200, body_size=400)
+
+        content = window.build(ticket)
+
+        assert estimate_tokens(content) <= window.max_tokens + 10
+        assert content.startswith("Subject: RMA request")
+        assert "GPU fails under load" in content
+        assert "reply 199 " in content
+
+    def test_oversized_description_is_truncated(self):
+        """Test that a huge first message is cut with a marker."""
+        ticket = Ticket(id=1, subject="Logs", description="log line\n" * 5000)
+
+        content = ContentWindow(max_tokens=200).build(ticket)
+
+        assert content.endswith(TRUNCATION_MARKER)
+        assert estimate_tokens(content) <= 200
+
+    def test_full_content_format_unchanged(self):
+        """Test that Ticket.full_content still lists every comment."""
+        ticket = Ticket(
+            id=1, subject="S", description="D",
+            comments=[{"body": "a", "public": True}, {"body": "b", "public": False}]
+        )
+
+        assert ticket.full_content == (
+            "Subject: S\n\nDescription:\nD\n\nComments:\n"
+            "Comment 1 (Public):\na\n\nComment 2 (Private):\nb\n\n"
+        )
@@ -0,0 +1,72 @@
+"""
+Unit Tests for CronExpression
+
+Tests parsing and next-run calculation of five-field cron schedules.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.domain.value_objects.cron_expression import CronExpression
+
+
+class TestCronExpression:
+    """Test suite for CronExpression."""
+
+    def test_every_fifteen_minutes(self):
+        cron = CronExpression("*/15 * * * *")
+
+        assert cron.next_after(datetime(2024, 1, 1, 10, 7, 30)) == datetime(2024, 1, 1, 10, 15)
+        assert cron.next_after(datetime(2024, 1, 1, 10, 45)) == datetime(2024, 1, 1, 11, 0)
+
+    def test_next_after_is_strictly_later(self):
+        cron = CronExpression.daily(9, 0)
+
+        assert cron.next_after(datetime(2024, 1, 1, 9, 0)) == datetime(2024, 1, 2, 9, 0)
+
+    def test_weekdays_range_and_names(self):
+        cron = CronExpression("30 8 * * mon-fri")
+
+        # Friday evening rolls over to Monday morning
+        assert cron.next_after(datetime(2024, 1, 5, 18, 0)) == datetime(2024, 1, 8, 8, 30)
+        assert cron == CronExpression("30 8 * * 1-5")
+
+    def test_weekly_and_sunday_aliases(self):
+        assert CronExpression.weekly("sunday", 6, 0) == CronExpression("0 6 * * 7")
+        assert CronExpression("0 6 * * 0").next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7, 6, 0)
+
+    def test_day_of_month_or_weekday(self):
+        # Fires on the 1st and on every Monday
+        cron = CronExpression("0 0 1 * mon")
+
+        assert cron.next_after(datetime(2024, 1, 1, 12, 0)) == datetime(2024, 1, 8, 0, 0)
+        assert cron.next_after(datetime(2024, 1, 29, 12, 0)) == datetime(2024, 2, 1, 0, 0)
+
+    def test_day_of_month_step_and_weekday(self):
+        # A field starting with '*' is not restricted: fires on Mondays that fall on odd days
+        cron = CronExpression("0 0 */2 * 1")
+
+        assert cron.next_after(datetime(2024, 2, 1, 12, 0)) == datetime(2024, 2, 5, 0, 0)
+        assert cron.next_after(datetime(2024, 2, 5, 12, 0)) == datetime(2024, 2, 19, 0, 0)
+
+    def test_month_names_and_leap_day(self):
+        cron = CronExpression("0 12 29 feb *")
+
+        assert cron.next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29, 12, 0)
+
+    @pytest.mark.parametrize("expression", [
+        "* * * *",
+        "60 * * * *",
+        "* 24 * * *",
+        "*/0 * * * *",
+        "5-1 * * * *",
+        "* * * foo *",
+    ])
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(ValueError):
+            CronExpression(expression)
+
+    def test_never_matching_expression(self):
+        with pytest.raises(ValueError):
+            CronExpression("0 0 30 feb *").next_after(datetime(2024, 1, 1))
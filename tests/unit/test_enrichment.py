@@ -0,0 +1,90 @@
+"""
+Unit Tests for Combined Enrichment
+
+Tests that ClaudeService returns several facets from one API call and caches
+each facet separately.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.infrastructure.external_services.claude_service import (
+    ENRICHMENT_SYSTEM_PROMPT,
+    ClaudeService,
+)
+
+RESPONSE = {
+    "business_impact": {"detected": True, "impact_areas": ["production"], "severity": 4},
+    "extraction": {"entities": ["ACME"], "product_mentions": ["RTX 4090"], "request_type": "support"},
+    "response_suggestion": "Sorry to hear about the GPU failure, we'll start an RMA."
+}
+
+
+@pytest.fixture
+def service():
+    """Create a ClaudeService whose API call returns the combined response."""
+    service = ClaudeService(api_key="test-key")
+    service._call_api = MagicMock(return_value=json.dumps(RESPONSE))
+    return service
+
+
+class TestEnrich:
+    """Test suite for ClaudeService.enrich."""
+
+    def test_single_call_returns_all_facets(self, service):
+        """Test that all requested facets come from one call with the static system prompt."""
+        result = service.enrich("GPU fails", ["business_impact", "extraction", "response_suggestion"])
+
+        assert result["business_impact"]["severity"] == 4
+        assert result["extraction"]["product_mentions"] == ["RTX 4090"]
+        assert result["response_suggestion"].startswith("Sorry")
+        service._call_api.assert_called_once()
+        prompt = service._call_api.call_args.args[0]
+        assert prompt.startswith("Facets: business_impact, extraction, response_suggestion")
+        assert service._call_api.call_args.kwargs["system"] == ENRICHMENT_SYSTEM_PROMPT
+
+    def test_cached_facets_not_requested_again(self, service):
+        """Test that a later call only asks for facets not yet cached."""
+        service.enrich("GPU fails", ["business_impact"])
+        service._call_api.reset_mock()
+
+        result = service.enrich("GPU fails", ["business_impact", "extraction"])
+
+        prompt = service._call_api.call_args.args[0]
+        assert prompt.startswith("Facets: extraction\n")
+        assert result["business_impact"]["confidence"] == 0.95
+
+        service._call_api.reset_mock()
+        service.enrich("GPU fails", ["extraction", "business_impact"])
+        service._call_api.assert_not_called()
+
+    def test_cache_returns_copies(self, service):
+        """Test that callers can't modify cached facets."""
+        service.enrich("GPU fails", ["extraction"])["extraction"]["entities"].append("changed")
+
+        assert service.enrich("GPU fails", ["extraction"])["extraction"]["entities"] == ["ACME"]
+
+    def test_missing_facet_reported_and_not_cached(self, service):
+        """Test that a facet absent from the response gets an error result."""
+        result = service.enrich("GPU fails", ["sentiment", "extraction"])
+
+        assert result["sentiment"]["error_type"] == "AIServiceError"
+        assert result["sentiment"]["polarity"] == "unknown"
+
+        service._call_api.reset_mock()
+        service.enrich("GPU fails", ["sentiment", "extraction"])
+        assert service._call_api.call_args.args[0].startswith("Facets: sentiment\n")
+
+    def test_unknown_facet_rejected(self, service):
+        """Test that unknown facets raise a ValueError without calling the API."""
+        with pytest.raises(ValueError):
+            service.enrich("GPU fails", ["horoscope"])
+
+        service._call_api.assert_not_called()
@@ -0,0 +1,142 @@
+"""
+Unit Tests for Hedged AI Requests
+
+Tests that slow calls are hedged after the latency percentile, that the first
+valid response wins, and that the hedge budget caps duplicated calls.
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.interfaces.ai_service_interfaces import AIService, AIServiceError
+from src.infrastructure.external_services.hedged_ai_service import HedgedAIService
+
+
+def _service(delay=0.0, result=None, error=None):
+    """Create a mock AI service answering after a delay."""
+    def analyze(content):
+        time.sleep(delay)
+        if error:
+            raise error
+        return result or {"category": "general_inquiry", "source": content}
+
+    service = MagicMock(spec=AIService)
+    service.analyze_content.side_effect = analyze
+    return service
+
+
+def _hedged(primary, hedge=None, **kwargs):
+    """Create a hedged service with a short fixed hedge delay."""
+    kwargs.setdefault("budget", 1.0)
+    kwargs.setdefault("initial_delay", 0.05)
+    kwargs.setdefault("min_delay", 0.0)
+    return HedgedAIService(primary, hedge=hedge, **kwargs)
+
+
+class TestHedgedAIService:
+    """Test suite for HedgedAIService."""
+
+    def test_fast_call_not_hedged(self):
+        """Test that calls finishing before the delay are not duplicated."""
+        hedge = _service()
+        service = _hedged(_service(), hedge)
+
+        service.analyze_content("a")
+
+        hedge.analyze_content.assert_not_called()
+        assert service.get_hedge_stats()["hedged"] == 0
+
+    def test_slow_call_hedged_and_hedge_wins(self):
+        """Test that a slow primary is hedged and the faster hedge wins."""
+        service = _hedged(_service(delay=0.5, result={"from": "primary"}), _service(result={"from": "hedge"}))
+
+        started = time.monotonic()
+        result = service.analyze_content("a")
+
+        assert result == {"from": "hedge"}
+        assert time.monotonic() - started < 0.4
+        stats = service.get_hedge_stats()
+        assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+
+    def test_failed_hedge_falls_back_to_primary(self):
+        """Test that an invalid hedge response waits for the primary."""
+        service = _hedged(
+            _service(delay=0.15, result={"from": "primary"}),
+            _service(result={"error": "boom", "error_type": "APIError"})
+        )
+
+        assert service.analyze_content("a") == {"from": "primary"}
+        assert service.get_hedge_stats()["hedge_wins"] == 0
+
+    def test_both_failing_raises_primary_error(self):
+        """Test that the primary's error is raised when neither request succeeds."""
+        service = _hedged(_service(delay=0.1, error=AIServiceError("primary")), _service(error=AIServiceError("hedge")))
+
+        with pytest.raises(AIServiceError, match="primary"):
+            service.analyze_content("a")
+
+    def test_budget_caps_hedge_rate(self):
+        """Test that no more than the budgeted share of calls is hedged."""
+        service = _hedged(_service(delay=0.06), _service(), budget=0.25)
+
+        for _ in range(8):
+            service.analyze_content("a")
+
+        stats = service.get_hedge_stats()
+        assert stats["hedged"] == 2
+        assert stats["hedge_rate"] == pytest.approx(0.25)
+
+    def test_delay_follows_latency_percentile(self):
+        """Test that the hedge delay is the percentile of recent primary latencies."""
+        service = _hedged(_service(), min_samples=10, percentile=0.9)
+        for latency in range(1, 11):
+            service._record_latency(float(latency))
+
+        assert service.hedge_delay() == 9.0
+
+    def test_metrics_reported(self):
+        """Test that hedges and wins are counted in the metrics collector."""
+        metrics = MagicMock()
+        service = _hedged(_service(delay=0.3), _service(), metrics=metrics)
+
+        service.analyze_content("a")
+
+        metrics.increment.assert_any_call("ai_hedge.hedged")
+        metrics.increment.assert_any_call("ai_hedge.wins")
+
+    def test_primaries_not_capped_by_hedge_pool(self):
+        """Test that primary calls run concurrently beyond the hedge pool size."""
+        release = threading.Event()
+        running = []
+
+        def analyze(content):
+            running.append(content)
+            release.wait(1.0)
+            return {"source": content}
+
+        primary = MagicMock(spec=AIService)
+        primary.analyze_content.side_effect = analyze
+        hedge = _service()
+        service = _hedged(primary, hedge, max_workers=1, budget=0.0, initial_delay=10.0)
+
+        callers = [threading.Thread(target=service.analyze_content, args=(str(i),)) for i in range(4)]
+        for caller in callers:
+            caller.start()
+        deadline = time.monotonic() + 1.0
+        while len(running) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        concurrent = len(running)
+        release.set()
+        for caller in callers:
+            caller.join()
+
+        assert concurrent == 4
+        assert service.get_hedge_stats()["hedged"] == 0
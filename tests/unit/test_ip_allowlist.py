@@ -0,0 +1,152 @@
+"""
+Unit Tests for IP Allowlist
+
+Tests the compiled IP allowlist in ip_allowlist.py and its reload from the
+allowlist file in security.py.
+"""
+
+import os
+import signal
+
+import pytest
+
+from src.infrastructure.utils.ip_allowlist import IPAllowlist
+
+
+class TestIPAllowlist:
+    """Test suite for IPAllowlist."""
+
+    @pytest.fixture
+    def allowlist(self):
+        return IPAllowlist([
+            "192.161.151.10",
+            "10.0.0.0/8",
+            "216.198.0.0/18",
+            "2620:10c:d000::/44",
+            "not-an-ip",
+            ""
+        ])
+
+    @pytest.mark.parametrize("address", [
+        "192.161.151.10",
+        "10.0.0.1",
+        "10.255.255.255",
+        "216.198.63.255",
+        "2620:10c:d00f::1",
+        "::ffff:10.1.2.3"
+    ])
+    def test_allowed(self, allowlist, address):
+        assert allowlist.is_allowed(address) is True
+
+    @pytest.mark.parametrize("address", [
+        "192.161.151.11",
+        "11.0.0.0",
+        "216.198.64.0",
+        "2620:10c:d010::1",
+        "::1",
+        "garbage",
+        ""
+    ])
+    def test_rejected(self, allowlist, address):
+        assert allowlist.is_allowed(address) is False
+
+    def test_invalid_entries_are_skipped(self, allowlist):
+        assert len(allowlist) == 4
+
+    def test_overlapping_ranges_are_merged(self):
+        allowlist = IPAllowlist(["10.0.0.0/24", "10.0.0.128/25", "10.0.1.0/24", "10.0.3.0/24"])
+
+        assert len(allowlist._tables[4]) == 2
+        assert allowlist.is_allowed("10.0.1.200") is True
+        assert allowlist.is_allowed("10.0.2.1") is False
+
+    def test_reload_replaces_entries(self, allowlist):
+        allowlist.reload(["172.16.0.0/12"])
+
+        assert allowlist.is_allowed("10.0.0.1") is False
+        assert allowlist.is_allowed("172.20.1.1") is True
+
+    def test_host_bits_rejected(self):
+        allowlist = IPAllowlist(["10.0.0.5/8", "192.168.1.0/24"])
+
+        assert len(allowlist) == 1
+        assert allowlist.is_allowed("10.1.2.3") is False
+
+    def test_empty(self):
+        allowlist = IPAllowlist()
+
+        assert allowlist.is_empty() is True
+        assert allowlist.is_allowed("127.0.0.1") is False
+
+
+@pytest.fixture
+def security(tmp_path, monkeypatch):
+    """The security module reading its allowlist from a file in a temporary directory."""
+    pytest.importorskip("flask")
+    from src import security
+
+    path = tmp_path / "allowed_ips.txt"
+    path.write_text("192.168.1.0/24  # office\n")
+    monkeypatch.setattr(security, "ALLOWED_IPS_RAW", ["10.0.0.1"])
+    monkeypatch.setattr(security, "ALLOWED_IPS_FILE", str(path))
+    monkeypatch.setattr(security, "ALLOWED_IPS_RELOAD_SECONDS", 0)
+    security.reload_allowed_ips()
+    yield security, path
+    monkeypatch.undo()
+    security.reload_allowed_ips()
+
+
+def _rewrite(path, text):
+    """Write a file and make sure its modification time changes."""
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 1_000_000_000, mtime + 1_000_000_000))
+
+
+class TestAllowlistReload:
+    """Test suite for reloading the webhook allowlist."""
+
+    def test_file_entries_loaded(self, security):
+        security, _ = security
+
+        assert security.is_ip_allowed("10.0.0.1") is True
+        assert security.is_ip_allowed("192.168.1.77") is True
+        assert security.is_ip_allowed("172.16.0.1") is False
+
+    def test_changed_file_reloaded(self, security):
+        security, path = security
+        assert security.reload_allowed_ips_if_changed() is False
+
+        _rewrite(path, "172.16.0.0/12\n10.0.0.5/8\n")
+
+        assert security.reload_allowed_ips_if_changed() is True
+        assert security.is_ip_allowed("172.20.1.1") is True
+        assert security.is_ip_allowed("192.168.1.77") is False
+        assert security.is_ip_allowed("10.1.2.3") is False
+
+    def test_reload_checked_on_requests(self, security):
+        security, path = security
+        import flask
+
+        app = flask.Flask(__name__)
+        endpoint = security.ip_whitelist(lambda: "ok")
+        _rewrite(path, "172.16.0.0/12\n")
+
+        with app.test_request_context(environ_base={"REMOTE_ADDR": "172.20.1.1"}):
+            assert endpoint() == "ok"
+        with app.test_request_context(environ_base={"REMOTE_ADDR": "192.168.1.77"}):
+            assert endpoint()[1] == 403
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="SIGHUP required")
+    def test_sighup_reloads(self, security):
+        security, path = security
+        previous = signal.getsignal(signal.SIGHUP)
+        try:
+            assert security.install_reload_handler() is True
+            _rewrite(path, "172.16.0.0/12\n")
+
+            os.kill(os.getpid(), signal.SIGHUP)
+
+            assert security.is_ip_allowed("172.20.1.1") is True
+        finally:
+            signal.signal(signal.SIGHUP, previous)
@@ -0,0 +1,134 @@
+"""
+Unit Tests for Streaming JSON Parsing
+
+Tests the incremental JSON scanner, the repair of truncated or fenced
+responses, and the streaming response path of ClaudeService.
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.interfaces.ai_service_interfaces import AIServiceError
+from src.infrastructure.external_services.claude_service import ClaudeService
+from src.infrastructure.utils.json_stream import (
+    IncrementalJSONParser,
+    parse_json_response,
+)
+
+
+class TestIncrementalJSONParser:
+    """Test suite for IncrementalJSONParser."""
+
+    def test_detects_completion_across_chunks(self):
+        """Test that completion is reported on the chunk closing the value."""
+        parser = IncrementalJSONParser()
+
+        assert not parser.feed('Sure! ```json\n{"a": {"b"')
+        assert not parser.feed(': "} ]"')
+        assert parser.feed('}} and some trailing prose {')
+
+        assert parser.value() == {"a": {"b": "} ]"}}
+
+    def test_escaped_quotes_in_strings(self):
+        """Test that escaped quotes don't end a string."""
+        parser = IncrementalJSONParser()
+        parser.feed('{"text": "say \\"hi\\" {", "n": 1}')
+
+        assert parser.complete
+        assert parser.value() == {"text": 'say "hi" {', "n": 1}
+
+
+class TestParseJSONResponse:
+    """Test suite for parse_json_response."""
+
+    def test_plain_and_fenced(self):
+        """Test that plain and fenced JSON parse without repair."""
+        assert parse_json_response('{"a": 1}') == {"a": 1}
+        assert parse_json_response('```json\n{"a": 1}\n```') == {"a": 1}
+        assert parse_json_response('Here you go:\n```\n[1, 2]\n```') == [1, 2]
+
+    def test_truncated_object_closed_at_last_member(self):
+        """Test that a cut-off object keeps its complete members."""
+        result = parse_json_response('{"category": "rma", "sentiment": {"polarity": "negative", "urgency_level": 4, "emo')
+
+        assert result == {"category": "rma", "sentiment": {"polarity": "negative", "urgency_level": 4}}
+
+    def test_truncated_string_value_kept(self):
+        """Test that a cut-off string value is closed rather than dropped."""
+        result = parse_json_response('{"response_suggestion": "Thanks for reaching out, we will')
+
+        assert result == {"response_suggestion": "Thanks for reaching out, we will"}
+
+    def test_no_json_raises(self):
+        """Test that text without a JSON value raises a ValueError."""
+        with pytest.raises(ValueError):
+            parse_json_response("This is not valid JSON")
+
+
+def _event(event_type, **kwargs):
+    """Build a streaming event."""
+    return SimpleNamespace(type=event_type, **kwargs)
+
+
+class TestClaudeStreaming:
+    """Test suite for the streaming path of ClaudeService."""
+
+    def _service(self, chunks):
+        """Create a streaming ClaudeService whose stream yields the given text chunks."""
+        events = [_event("message_start", message=SimpleNamespace(usage=SimpleNamespace(
+            input_tokens=120, output_tokens=1, cache_creation_input_tokens=0, cache_read_input_tokens=80
+        )))]
+        events += [_event("content_block_delta", delta=SimpleNamespace(type="text_delta", text=chunk)) for chunk in chunks]
+        self.consumed = []
+
+        def iterate():
+            for event in events:
+                self.consumed.append(event)
+                yield event
+
+        stream = MagicMock()
+        stream.__enter__.return_value.__iter__.side_effect = lambda: iterate()
+        service = ClaudeService(api_key="test-key", streaming=True)
+        service._client = MagicMock()
+        service._client.messages.stream.return_value = stream
+        return service
+
+    def test_stops_reading_once_json_complete(self):
+        """Test that the stream is left as soon as the JSON value closes."""
+        analysis = {"category": "rma", "component": "gpu", "priority": "high",
+                    "sentiment": {"polarity": "negative"}}
+        text = json.dumps(analysis)
+        service = self._service([text[:20], text[20:], "\n\nLet me know if you need more!", " more"])
+
+        result = service.analyze_content("GPU died")
+
+        assert result["category"] == "rma"
+        assert len(self.consumed) == 3
+        service._client.messages.create.assert_not_called()
+        assert service.last_usage["input_tokens"] == 120
+        assert service.last_usage["cache_read_input_tokens"] == 80
+
+    def test_response_suggestion_not_streamed(self):
+        """Test that plain-text responses use the regular call."""
+        service = self._service([])
+        service._client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(text="Hello")], usage=None
+        )
+
+        assert service.generate_response_suggestion("help") == "Hello"
+        service._client.messages.stream.assert_not_called()
+
+    def test_unparseable_response_raises(self):
+        """Test that a response without JSON still raises an AIServiceError."""
+        service = ClaudeService(api_key="test-key")
+
+        with pytest.raises(AIServiceError):
+            service._process_response("no json here")
@@ -0,0 +1,130 @@
+"""
+Unit Tests for Lazy Service Construction
+
+Tests that the CLI builds no services at startup and that each command
+creates only the clients it needs.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add the project root to the path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
+
+from src.domain.interfaces.repository_interfaces import (
+    AnalysisRepository,
+    TicketRepository,
+    ViewRepository,
+)
+from src.infrastructure.repositories.mongodb_repository import MongoDBRepository
+from src.presentation.cli.command_handler import CommandHandler
+
+# Generates a sentiment report against mocked Zendesk and MongoDB clients and
+# prints the outcome and the AI SDK modules that were imported
+REPORT_SCRIPT = """
+import json
+import sys
+from unittest.mock import patch
+
+from src.presentation.cli.command_handler import CommandHandler
+
+with patch("zenpy.Zenpy") as zenpy, patch("pymongo.MongoClient"):
+    use_case = CommandHandler().dependency_container.resolve("generate_report_use_case")
+    result = use_case.execute(report_type="sentiment", time_period="week")
+
+print(json.dumps({
+    "success": result["success"],
+    "report": result["report"]["content"],
+    "zenpy_called": zenpy.called,
+    "ai_modules": sorted(name for name in sys.modules if name.split(".")[0] in ("anthropic", "openai"))
+}))
+"""
+
+
+@pytest.fixture
+def clients():
+    """Patch every external client constructor."""
+    with patch("zenpy.Zenpy") as zenpy, \
+            patch("pymongo.MongoClient") as mongo, \
+            patch("anthropic.Anthropic") as anthropic, \
+            patch("openai.OpenAI") as openai:
+        yield {"zenpy": zenpy, "mongo": mongo, "anthropic": anthropic, "openai": openai}
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    """Provide dummy credentials so clients can be created."""
+    monkeypatch.setenv("ZENDESK_EMAIL", "agent@example.com")
+    monkeypatch.setenv("ZENDESK_API_TOKEN", "token")
+    monkeypatch.setenv("ZENDESK_SUBDOMAIN", "example")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+class TestLazyStartup:
+    """Test suite for on-demand service construction."""
+
+    def test_startup_creates_no_clients(self, clients):
+        """Test that creating the command handler connects to nothing."""
+        start = time.perf_counter()
+        CommandHandler()
+        elapsed = time.perf_counter() - start
+
+        for client in clients.values():
+            client.assert_not_called()
+        assert elapsed < 1.0
+
+    def test_views_touch_no_mongo_or_ai(self, clients):
+        """Test that listing views only creates the Zendesk client."""
+        handler = CommandHandler()
+
+        view_repository = handler.dependency_container.resolve(ViewRepository)
+        view_repository.client
+
+        clients["zenpy"].assert_called_once()
+        clients["mongo"].assert_not_called()
+        clients["anthropic"].assert_not_called()
+        clients["openai"].assert_not_called()
+        assert view_repository is handler.dependency_container.resolve(TicketRepository)
+
+    def test_report_touches_no_ai_sdk(self):
+        """Test that generating a sentiment report imports no AI SDK."""
+        # Run in a fresh interpreter, since other tests import the SDKs into this one
+        result = subprocess.run(
+            [sys.executable, "-c", REPORT_SCRIPT],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        output = json.loads(result.stdout.splitlines()[-1])
+
+        assert output["success"] is True
+        assert output["report"].startswith("Sentiment Analysis Report - Last 7 days")
+        assert output["zenpy_called"] is False
+        assert output["ai_modules"] == []
+
+    def test_repository_connects_on_first_use(self):
+        """Test that the MongoDB repository connects and enables rollups on first use."""
+        with patch.object(MongoDBRepository, "_create_mongo_client") as create_client:
+            repository = MongoDBRepository(rollups=True)
+            create_client.assert_not_called()
+
+            with patch.object(MongoDBRepository, "enable_rollups") as enable_rollups:
+                repository.collection
+                repository.collection
+
+        create_client.assert_called_once()
+        enable_rollups.assert_called_once()
+
+    def test_factories_resolve_once(self, clients):
+        """Test that a service created on demand is shared by later resolves."""
+        handler = CommandHandler()
+        container = handler.dependency_container
+
+        assert container.resolve(AnalysisRepository) is container.resolve(AnalysisRepository)
+        clients["mongo"].assert_not_called()
@@ -0,0 +1,255 @@
+"""
+Unit Tests for Metrics
+
+Tests the in-memory metrics collector, its Prometheus exposition, the
+instrumented decorator, the webhook server's /metrics endpoint and the
+sources the metrics command reads.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.infrastructure.utils.metrics import InMemoryMetricsCollector, instrumented
+from src.presentation.cli.commands.metrics_command import MetricsCommand
+from src.presentation.webhook.webhook_handler import WebhookHandler
+
+
+class Instrumented:
+    """Object with an instrumented method."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @instrumented("zendesk.request", error_kind=lambda e: "rate_limited" if "429" in str(e) else "error", endpoint="get_ticket")
+    def get_ticket(self, fail=None):
+        if fail:
+            raise RuntimeError(fail)
+        return "ticket"
+
+
+class TestInMemoryMetricsCollector:
+    """Test suite for InMemoryMetricsCollector."""
+
+    def test_counters_per_tag_set(self):
+        """Test that counters are kept per tag set."""
+        collector = InMemoryMetricsCollector()
+
+        collector.increment("ai.tokens", 100, {"type": "input", "model": "m"})
+        collector.increment("ai.tokens", 50, {"model": "m", "type": "input"})
+        collector.increment("ai.tokens", 20, {"model": "m", "type": "output"})
+
+        counters = {tuple(sorted(c["tags"].items())): c["value"] for c in collector.snapshot()["counters"]}
+        assert counters == {
+            (("model", "m"), ("type", "input")): 150,
+            (("model", "m"), ("type", "output")): 20,
+        }
+
+    def test_histogram_buckets(self):
+        """Test that histogram buckets are cumulative and end with +Inf."""
+        collector = InMemoryMetricsCollector(buckets={"latency": [10, 100]})
+
+        for value in (5, 10, 50, 500):
+            collector.timing("latency", value)
+
+        histogram = collector.snapshot()["histograms"][0]
+        assert histogram["buckets"] == {"10": 2, "100": 3, "+Inf": 4}
+        assert histogram["count"] == 4
+        assert histogram["sum"] == 565
+
+    def test_render_prometheus(self):
+        """Test the Prometheus text exposition."""
+        collector = InMemoryMetricsCollector(buckets={"webhook.request.latency": [100]})
+        collector.increment("retry.attempts", tags={"error": 'say "hi"\n'})
+        collector.gauge("quota.remaining", 2.5)
+        collector.timing("webhook.request.latency", 42)
+
+        text = collector.render_prometheus()
+
+        assert "# TYPE zendesk_ai_retry_attempts_total counter" in text
+        assert 'zendesk_ai_retry_attempts_total{error="say \\"hi\\"\\n"} 1' in text
+        assert "zendesk_ai_quota_remaining 2.5" in text
+        assert "# TYPE zendesk_ai_webhook_request_latency histogram" in text
+        assert 'zendesk_ai_webhook_request_latency_bucket{le="100"} 1' in text
+        assert 'zendesk_ai_webhook_request_latency_bucket{le="+Inf"} 1' in text
+        assert "zendesk_ai_webhook_request_latency_sum 42" in text
+        assert "zendesk_ai_webhook_request_latency_count 1" in text
+        assert text.endswith("\n")
+
+    def test_reset(self):
+        """Test that reset forgets all series."""
+        collector = InMemoryMetricsCollector()
+        collector.increment("a")
+        collector.reset()
+
+        assert collector.render_prometheus() == ""
+
+
+class TestInstrumented:
+    """Test suite for the instrumented decorator."""
+
+    def test_records_latency(self):
+        """Test that calls are timed with the decorator's tags."""
+        collector = InMemoryMetricsCollector()
+
+        assert Instrumented(collector).get_ticket() == "ticket"
+
+        histogram = collector.snapshot()["histograms"][0]
+        assert histogram["name"] == "zendesk.request.latency"
+        assert histogram["tags"] == {"endpoint": "get_ticket"}
+        assert histogram["count"] == 1
+
+    def test_counts_errors_by_kind(self):
+        """Test that errors are counted by kind and re-raised."""
+        collector = InMemoryMetricsCollector()
+        service = Instrumented(collector)
+
+        for message in ("429 Too Many Requests", "boom"):
+            with pytest.raises(RuntimeError):
+                service.get_ticket(fail=message)
+
+        errors = {c["tags"]["error"]: c["value"] for c in collector.snapshot()["counters"]}
+        assert errors == {"rate_limited": 1, "error": 1}
+
+    def test_no_collector(self):
+        """Test that nothing is recorded without a collector."""
+        assert Instrumented(None).get_ticket() == "ticket"
+
+
+class TestWebhookMetrics:
+    """Test suite for the webhook metrics and the /metrics endpoint."""
+
+    @pytest.fixture
+    def server(self):
+        """Run the webhook server on a free port in a background thread."""
+        service = MagicMock(spec=["handle_ticket_created"])
+        service.handle_ticket_created.return_value = True
+        handler = WebhookHandler(service, metrics=InMemoryMetricsCollector())
+
+        thread = threading.Thread(target=handler.start, kwargs={"port": 0}, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while handler._server is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        host, port = handler._server.server_address[:2]
+        yield handler, f"http://{host}:{port}"
+        handler.stop()
+        thread.join(timeout=5)
+
+    def test_handle_webhook_records_metrics(self):
+        """Test that handled webhooks are counted and timed."""
+        service = MagicMock(spec=["handle_ticket_created"])
+        service.handle_ticket_created.return_value = True
+        collector = InMemoryMetricsCollector()
+
+        WebhookHandler(service, metrics=collector).handle_webhook("ticket.created", {"ticket": {"id": 1}})
+
+        counter = collector.snapshot()["counters"][0]
+        assert counter["name"] == "webhook.requests"
+        assert counter["tags"] == {"event_type": "ticket.created", "outcome": "ok"}
+
+    def test_metrics_endpoint(self, server):
+        """Test that a signed webhook is handled and shows up at /metrics."""
+        handler, url = server
+        body = json.dumps({"event_type": "ticket.created", "ticket": {"id": 1}}).encode()
+        signature = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+        with patch.dict(os.environ, {"WEBHOOK_SECRET_KEY": "secret"}):
+            request = Request(f"{url}/webhook", data=body, headers={"X-Zendesk-Webhook-Signature": signature})
+            with urlopen(request, timeout=5) as response:
+                assert json.loads(response.read())["success"] is True
+
+        with urlopen(f"{url}/metrics", timeout=5) as response:
+            text = response.read().decode()
+
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert 'zendesk_ai_webhook_requests_total{event_type="ticket.created",outcome="ok"} 1' in text
+
+    def test_unsigned_webhook_rejected(self, server):
+        """Test that webhooks without a valid signature are rejected."""
+        handler, url = server
+
+        with patch.dict(os.environ, {"WEBHOOK_SECRET_KEY": "secret"}):
+            with pytest.raises(HTTPError) as error:
+                urlopen(Request(f"{url}/webhook", data=b"{}"), timeout=5)
+
+        assert error.value.code == 401
+        handler.webhook_service.handle_ticket_created.assert_not_called()
+
+    def test_command_reads_local_webhook_server(self, server, monkeypatch, capsys):
+        """Test that without --url or a daemon the command reads the webhook server's metrics."""
+        handler, url = server
+        handler.metrics.increment("webhook.requests", tags={"event_type": "ticket.created", "outcome": "ok"})
+        monkeypatch.setenv("ZENDESK_AI_METRICS_URL", f"{url}/metrics")
+        monkeypatch.setattr(MetricsCommand, "_in_daemon", staticmethod(lambda: False))
+        monkeypatch.setattr(MetricsCommand, "_from_daemon", lambda self, output_format: None)
+
+        result = MetricsCommand(MagicMock()).execute({"format": "prometheus"})
+
+        assert result["success"] is True
+        assert "zendesk_ai_webhook_requests_total" in capsys.readouterr().out
+
+
+class TestMetricsCommand:
+    """Test suite for the metrics sources of the metrics command."""
+
+    @pytest.fixture(autouse=True)
+    def cli_process(self, monkeypatch):
+        """Run the command as in a CLI process, not in the daemon."""
+        monkeypatch.setattr(MetricsCommand, "_in_daemon", staticmethod(lambda: False))
+
+    @pytest.fixture
+    def no_daemon(self, monkeypatch):
+        monkeypatch.setattr(MetricsCommand, "_from_daemon", lambda self, output_format: None)
+
+    def test_no_source_is_an_error(self, no_daemon, monkeypatch, capsys):
+        """Test that the command fails clearly instead of printing this process's empty metrics."""
+        monkeypatch.setenv("ZENDESK_AI_METRICS_URL", "http://127.0.0.1:9/metrics")
+
+        result = MetricsCommand(MagicMock()).execute({"format": "prometheus"})
+
+        assert result["success"] is False
+        assert "--url" in result["error"]
+        assert "no CLI daemon is running" in capsys.readouterr().out
+
+    def test_json_needs_daemon(self, no_daemon):
+        """Test that JSON metrics without a daemon point to the daemon."""
+        result = MetricsCommand(MagicMock()).execute({"format": "json"})
+
+        assert result["success"] is False
+        assert "CLI daemon" in result["error"]
+
+    def test_daemon_metrics(self, monkeypatch, capsys):
+        """Test that the daemon's metrics are shown when it is running."""
+        monkeypatch.setattr(MetricsCommand, "_from_daemon", lambda self, output_format: '{"counters": []}\n')
+
+        result = MetricsCommand(MagicMock()).execute({"format": "json"})
+
+        assert result["success"] is True
+        assert capsys.readouterr().out == '{"counters": []}\n'
+
+    def test_in_daemon_uses_own_collector(self, monkeypatch, capsys):
+        """Test that in the daemon the command renders the daemon's collector."""
+        collector = InMemoryMetricsCollector()
+        collector.increment("ai.requests")
+        container = MagicMock()
+        container.resolve.return_value = collector
+        monkeypatch.setattr(MetricsCommand, "_in_daemon", staticmethod(lambda: True))
+
+        result = MetricsCommand(container).execute({"format": "json"})
+
+        assert result["success"] is True
+        assert json.loads(capsys.readouterr().out)["counters"][0]["name"] == "ai.requests"
@@ -0,0 +1,146 @@
+"""
+Unit Tests for Packed Ticket Analysis
+
+Tests that ClaudeService packs short contents into shared requests, validates
+the keyed responses and falls back to single-content analysis.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.application.services.ticket_analysis_service import TicketAnalysisServiceImpl
+from src.domain.entities.ticket import Ticket
+from src.domain.interfaces.ai_service_interfaces import AIServiceError
+from src.infrastructure.external_services.claude_service import ClaudeService
+
+
+def _analysis(content_id=None, category="so_released_to_warehouse"):
+    """Build an analysis entry as returned by the model."""
+    entry = {
+        "category": category,
+        "component": "none",
+        "priority": "low",
+        "sentiment": {
+            "polarity": "neutral",
+            "urgency_level": 1,
+            "frustration_level": 1,
+            "emotions": [],
+            "business_impact": {"detected": False, "impact_areas": [], "severity": 0}
+        }
+    }
+    if content_id is not None:
+        entry["id"] = content_id
+    return entry
+
+
+@pytest.fixture
+def service():
+    """Claude service with the API call and single-content analysis mocked."""
+    claude = ClaudeService(api_key="test-key", pack_token_budget=100, max_pack_size=3)
+    claude._call_api = MagicMock()
+    claude.analyze_content = MagicMock(side_effect=lambda content: _analysis(category="single"))
+    return claude
+
+
+class TestPackedAnalysis:
+    """Test suite for packed analysis."""
+
+    def test_short_contents_share_one_request(self, service):
+        """Test that short contents are analyzed with a single call."""
+        service._call_api.return_value = json.dumps([_analysis("1"), _analysis(2), _analysis("3")])
+
+        results = service.analyze_contents({"1": "SO released", "2": "SO released", 3: "WO released"})
+
+        assert service._call_api.call_count == 1
+        service.analyze_content.assert_not_called()
+        assert set(results) == {"1", "2", "3"}
+        assert all(result["category"] == "so_released_to_warehouse" for result in results.values())
+        assert all(result["confidence"] == 0.95 for result in results.values())
+        assert all("id" not in result for result in results.values())
+
+        prompt = service._call_api.call_args[0][0]
+        system = service._call_api.call_args[1]["system"]
+        assert system.count('"category": "[system/') == 1
+        assert '"category"' not in prompt
+        assert '<message id="3">' in prompt
+
+    def test_missing_and_malformed_entries_fall_back(self, service):
+        """Test that entries not returned or missing keys are analyzed alone."""
+        malformed = _analysis("2")
+        del malformed["sentiment"]
+        service._call_api.return_value = json.dumps([_analysis("1"), malformed, _analysis("99")])
+
+        results = service.analyze_contents({"1": "a", "2": "b", "3": "c"})
+
+        assert results["1"]["category"] == "so_released_to_warehouse"
+        assert results["2"]["category"] == "single"
+        assert results["3"]["category"] == "single"
+        assert "99" not in results
+        assert service.analyze_content.call_count == 2
+
+    def test_unparseable_response_falls_back_for_whole_pack(self, service):
+        """Test that a pack whose response cannot be parsed is analyzed alone."""
+        service._call_api.return_value = "not json"
+
+        results = service.analyze_contents({"1": "a", "2": "b"})
+
+        assert service.analyze_content.call_count == 2
+        assert {result["category"] for result in results.values()} == {"single"}
+
+    def test_packs_respect_size_and_token_budget(self, service):
+        """Test that packs are closed by the pack size and the token budget."""
+        items = [(str(i), "x" * 40) for i in range(7)]
+        packs = service._pack_contents(items)
+        assert [len(pack) for pack in packs] == [3, 3, 1]
+
+        items = [(str(i), "x" * 200) for i in range(4)]
+        packs = service._pack_contents(items)
+        assert [len(pack) for pack in packs] == [1, 1, 1, 1]
+
+    def test_long_contents_are_analyzed_alone(self, service):
+        """Test that contents above the short threshold are never packed."""
+        service._call_api.return_value = json.dumps([_analysis("1"), _analysis("2")])
+
+        results = service.analyze_contents({"1": "short", "2": "short", "3": "long " * 200})
+
+        assert service._call_api.call_count == 1
+        assert service.analyze_content.call_count == 1
+        assert results["3"]["category"] == "single"
+
+    def test_single_analysis_errors_become_failed_results(self, service):
+        """Test that errors from fallback analysis are reported per content."""
+        service.pack_token_budget = 0
+        service.analyze_content.side_effect = AIServiceError("boom")
+
+        results = service.analyze_contents({"1": "a"})
+
+        assert results["1"]["error"] == "boom"
+        assert results["1"]["error_type"] == "AIServiceError"
+
+
+class TestPackedTicketAnalysis:
+    """Test suite for packed analysis of view tickets."""
+
+    def test_analyze_view_uses_packed_service(self, service):
+        """Test that view analysis sends all tickets to analyze_contents."""
+        tickets = [
+            Ticket(id=i, subject="SO released", description="Order released", status="open")
+            for i in (1, 2)
+        ]
+        ticket_repository = MagicMock()
+        ticket_repository.get_tickets_from_view.return_value = tickets
+        analysis_repository = MagicMock()
+        service._call_api.return_value = json.dumps([_analysis("1"), _analysis("2")])
+
+        analyses = TicketAnalysisServiceImpl(ticket_repository, analysis_repository, service).analyze_view(42)
+
+        assert [analysis.ticket_id for analysis in analyses] == ["1", "2"]
+        assert analysis_repository.save.call_count == 2
+        assert service._call_api.call_count == 1
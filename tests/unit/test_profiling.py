@@ -0,0 +1,186 @@
+"""
+Unit Tests for Profiling
+
+Tests exclusive stage timing, the cProfile and sampling profile sessions,
+the --profile CLI option and the profiling of one webhook in N.
+"""
+
+import os
+import pstats
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.application.services.instrumentation import timed_stage
+from src.infrastructure.utils.metrics import instrumented
+from src.infrastructure.utils.profiling import (
+    ContextStageTimer,
+    ProfileSession,
+    stage,
+    stage_for,
+)
+from src.infrastructure.utils.tracing import traced
+from src.presentation.cli.command import Command
+from src.presentation.cli.command_handler import CommandHandler
+from src.presentation.webhook.webhook_handler import WebhookHandler
+
+
+class FakeRepository:
+    """Repository with an instrumented Zendesk call."""
+
+    metrics = None
+
+    @instrumented("zendesk.request", endpoint="get_ticket")
+    def get_ticket(self, ticket_id):
+        time.sleep(0.02)
+        return {"id": ticket_id}
+
+
+@traced("analysis.analyze_ticket")
+def analyze_ticket(repository, ticket_id):
+    """Fetch a ticket, then 'analyze' it."""
+    ticket = repository.get_ticket(ticket_id)
+    time.sleep(0.03)
+    return ticket
+
+
+def _rows(session):
+    return {row["stage"]: row for row in session.stages.rows(session.wall, session.cpu)}
+
+
+class TestStages:
+    """Test suite for stage timing."""
+
+    def test_stage_for_names(self):
+        """Test that calls are assigned a stage by name prefix."""
+        assert stage_for("zendesk.request") == "fetch"
+        assert stage_for("anthropic.messages.create") == "analyze"
+        assert stage_for("mongodb.operation") == "persist"
+        assert stage_for("webhook.handle") is None
+
+    def test_nested_stages_are_exclusive(self):
+        """Test that time in a nested stage is not counted in the enclosing one."""
+        with ProfileSession("sample") as session:
+            analyze_ticket(FakeRepository(), 1)
+
+        rows = _rows(session)
+        assert rows["fetch"]["calls"] == 1
+        assert rows["fetch"]["wall"] >= 0.015
+        assert rows["analyze"]["wall"] >= 0.025
+        assert rows["fetch"]["wall"] + rows["analyze"]["wall"] <= session.wall
+
+    def test_same_stage_nested_counts_once(self):
+        """Test that a block nested in the same stage is one call."""
+        with ProfileSession("sample") as session:
+            with stage("fetch"):
+                FakeRepository().get_ticket(1)
+
+        assert _rows(session)["fetch"]["calls"] == 1
+
+    def test_nothing_recorded_outside_a_session(self):
+        """Test that stages outside a profile session are not timed."""
+        with stage("fetch"):
+            pass
+        with ProfileSession("sample") as session:
+            pass
+
+        assert list(_rows(session)) == ["other"]
+
+    def test_injected_stage_timer(self):
+        """Test that services time stages only through an injected stage timer."""
+        with ProfileSession("sample") as session:
+            with timed_stage(ContextStageTimer(), "render"):
+                time.sleep(0.01)
+            with timed_stage(None, "render"):
+                time.sleep(0.01)
+
+        assert _rows(session)["render"]["calls"] == 1
+
+
+class TestProfileSession:
+    """Test suite for profile sessions."""
+
+    def test_cprofile_saves_pstats(self, tmp_path):
+        """Test that a cProfile session saves a loadable pstats file."""
+        with ProfileSession("cprofile") as session:
+            analyze_ticket(FakeRepository(), 1)
+
+        path = session.save(str(tmp_path / "run.pstats"))
+
+        functions = {function for _, _, function in pstats.Stats(path).stats}
+        assert "analyze_ticket" in functions
+        assert "fetch" in session.format_stages()
+
+    def test_sample_saves_collapsed_stacks(self, tmp_path):
+        """Test that a sampling session saves 'frame;frame count' lines."""
+        with ProfileSession("sample", sample_interval=0.001) as session:
+            analyze_ticket(FakeRepository(), 1)
+
+        path = session.save(str(tmp_path / "run.collapsed"))
+
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert any("analyze_ticket (" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_unknown_mode(self):
+        """Test that an unknown mode is rejected."""
+        with pytest.raises(ValueError):
+            ProfileSession("perf")
+
+
+class SlowCommand(Command):
+    """Command fetching one ticket."""
+
+    name = "slow"
+    description = "Fetch a ticket"
+
+    def add_arguments(self, parser):
+        pass
+
+    def execute(self, args):
+        FakeRepository().get_ticket(1)
+        return {"success": True}
+
+
+class TestProfileOption:
+    """Test suite for the --profile CLI option."""
+
+    def test_profile_command(self, tmp_path, capsys):
+        """Test that --profile saves the profile and prints the stage breakdown to stderr."""
+        handler = CommandHandler()
+        handler.register_command(SlowCommand)
+        output = tmp_path / "slow.collapsed"
+
+        exit_code = handler.handle_command(
+            ["--profile", "--profile-mode", "sample", "--profile-output", str(output), "slow"]
+        )
+
+        assert exit_code == 0
+        assert output.exists()
+        stderr = capsys.readouterr().err
+        assert "Profile of 'slow'" in stderr
+        assert "fetch" in stderr
+
+
+class TestWebhookProfiling:
+    """Test suite for profiling one webhook in N."""
+
+    def test_profiles_one_in_n(self, tmp_path, monkeypatch):
+        """Test that every Nth webhook is profiled and saved."""
+        monkeypatch.setenv("ZENDESK_AI_PROFILE_DIR", str(tmp_path))
+        service = MagicMock()
+        service.handle_ticket_created.return_value = True
+        handler = WebhookHandler(service, metrics=MagicMock(), profile_every=2)
+
+        for ticket_id in range(4):
+            assert handler.handle_webhook("ticket.created", {"ticket": {"id": ticket_id}})["success"]
+
+        names = os.listdir(tmp_path)
+        assert all(name.startswith("webhook-ticket-created-") and name.endswith(".collapsed") for name in names)
+        assert sorted(int(name.split("-")[3]) for name in names) == [2, 4]
@@ -0,0 +1,147 @@
+"""
+Unit Tests for the AI Quota Manager
+
+Tests the per-model requests-per-minute and tokens-per-minute buckets, the
+reconciliation of estimates with actual usage, and the AI service hooks.
+"""
+
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.interfaces.ai_service_interfaces import RateLimitError
+from src.infrastructure.external_services.claude_service import ClaudeService
+from src.infrastructure.utils.quota_manager import AIQuotaManager, ModelQuota
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAIQuotaManager:
+    """Test suite for AIQuotaManager."""
+
+    def test_models_without_quota_are_not_limited(self):
+        """Test that unknown providers never wait."""
+        manager = AIQuotaManager({"openai": ModelQuota(requests_per_minute=1)})
+
+        for _ in range(10):
+            assert manager.acquire("anthropic", "claude", 100_000) == 0.0
+
+    def test_request_bucket_exhaustion_and_refill(self):
+        """Test that requests beyond the per-minute limit wait for a refill."""
+        clock = FakeClock()
+        manager = AIQuotaManager({"anthropic": ModelQuota(requests_per_minute=2)}, clock=clock)
+
+        manager.acquire("anthropic", "claude", 10)
+        manager.acquire("anthropic", "claude", 10)
+        with pytest.raises(RateLimitError):
+            manager.acquire("anthropic", "claude", 10, timeout=0)
+
+        clock.now += 30  # half a minute refills one request
+        manager.acquire("anthropic", "claude", 10, timeout=0)
+        assert manager.get_utilization()["anthropic/claude"]["requests"] == pytest.approx(1.0)
+
+    def test_model_quota_overrides_provider_quota(self):
+        """Test that 'provider/model' quotas take precedence."""
+        clock = FakeClock()
+        manager = AIQuotaManager({
+            "anthropic": ModelQuota(requests_per_minute=1),
+            "anthropic/big": ModelQuota(requests_per_minute=3)
+        }, clock=clock)
+
+        for _ in range(3):
+            manager.acquire("anthropic", "big", 10, timeout=0)
+        manager.acquire("anthropic", "small", 10, timeout=0)
+        with pytest.raises(RateLimitError):
+            manager.acquire("anthropic", "small", 10, timeout=0)
+
+    def test_reconcile_returns_overestimated_tokens(self):
+        """Test that unused reserved tokens become available again."""
+        clock = FakeClock()
+        manager = AIQuotaManager({"anthropic": ModelQuota(tokens_per_minute=1000)}, clock=clock)
+
+        manager.acquire("anthropic", "claude", 900, timeout=0)
+        with pytest.raises(RateLimitError):
+            manager.acquire("anthropic", "claude", 500, timeout=0)
+
+        manager.reconcile("anthropic", "claude", 900, 300)
+        manager.acquire("anthropic", "claude", 500, timeout=0)
+        assert manager.get_utilization()["anthropic/claude"]["tokens"] == pytest.approx(0.8)
+
+    def test_acquire_blocks_until_tokens_refill(self):
+        """Test that a caller waits instead of failing when tokens are short."""
+        manager = AIQuotaManager({"openai": ModelQuota(tokens_per_minute=6000)})
+
+        manager.acquire("openai", "gpt", 6000)
+        started = time.monotonic()
+        waited = manager.acquire("openai", "gpt", 30)  # 100 tokens/s refill
+
+        assert waited > 0.2
+        assert time.monotonic() - started < 2
+
+    def test_throttle_holds_calls(self):
+        """Test that a provider rate limit holds every caller of the model."""
+        manager = AIQuotaManager()
+
+        manager.throttle("anthropic", "claude", 0.2)
+
+        assert manager.acquire("anthropic", "claude", 10) >= 0.15
+        assert manager.acquire("anthropic", "other", 10) == 0.0
+
+    def test_metrics_published(self):
+        """Test that utilization gauges and waits are reported."""
+        metrics = MagicMock()
+        manager = AIQuotaManager({"anthropic": ModelQuota(requests_per_minute=4)}, metrics=metrics)
+
+        manager.acquire("anthropic", "claude", 10)
+
+        metrics.gauge.assert_any_call(
+            "ai_quota.requests_utilization", pytest.approx(0.25, abs=0.01),
+            {"provider": "anthropic", "model": "claude"}
+        )
+
+    def test_from_env(self, monkeypatch):
+        """Test that provider quotas are read from the environment."""
+        monkeypatch.setenv("AI_QUOTA_ANTHROPIC_RPM", "50")
+        monkeypatch.delenv("AI_QUOTA_ANTHROPIC_TPM", raising=False)
+        monkeypatch.delenv("AI_QUOTA_OPENAI_RPM", raising=False)
+        monkeypatch.delenv("AI_QUOTA_OPENAI_TPM", raising=False)
+
+        manager = AIQuotaManager.from_env()
+
+        assert manager.quotas == {"anthropic": ModelQuota(requests_per_minute=50)}
+
+
+class TestClaudeQuotaIntegration:
+    """Test suite for the quota hooks of ClaudeService."""
+
+    def test_call_reserves_and_reconciles(self):
+        """Test that a call reserves an estimate and settles with actual usage."""
+        quota_manager = MagicMock()
+        service = ClaudeService(api_key="test-key", quota_manager=quota_manager)
+        service._client = MagicMock()
+        service._client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(text=json.dumps({"ok": True}))],
+            usage=SimpleNamespace(input_tokens=30, output_tokens=20,
+                                  cache_creation_input_tokens=0, cache_read_input_tokens=0)
+        )
+
+        service._call_api("x" * 400, max_tokens=500)
+
+        quota_manager.acquire.assert_called_once_with("anthropic", service.model, 101 + 500)
+        quota_manager.reconcile.assert_called_once_with("anthropic", service.model, 601, 50)
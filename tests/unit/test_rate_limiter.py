@@ -0,0 +1,111 @@
+"""
+Unit Tests for Rate Limiters
+
+Tests the token-bucket rate limiters in rate_limiter.py.
+"""
+
+import pytest
+
+from src.infrastructure.utils.rate_limiter import (
+    SQLiteRateLimiter,
+    TokenBucketRateLimiter,
+)
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def limiter(request, clock, tmp_path):
+    if request.param == "memory":
+        yield TokenBucketRateLimiter(clock=clock)
+    else:
+        sqlite_limiter = SQLiteRateLimiter(str(tmp_path / "limits.db"), clock=clock)
+        yield sqlite_limiter
+        sqlite_limiter.close()
+
+
+class TestRateLimiters:
+    """Behaviour shared by both rate limiter backends."""
+
+    def test_allows_up_to_limit_then_limits(self, limiter):
+        assert limiter.is_rate_limited("1.2.3.4", 3, 60) is False
+        assert limiter.is_rate_limited("1.2.3.4", 3, 60) is False
+        assert limiter.is_rate_limited("1.2.3.4", 3, 60) is False
+        assert limiter.is_rate_limited("1.2.3.4", 3, 60) is True
+
+    def test_keys_are_independent(self, limiter):
+        assert limiter.is_rate_limited("a", 1, 60) is False
+        assert limiter.is_rate_limited("a", 1, 60) is True
+        assert limiter.is_rate_limited("b", 1, 60) is False
+
+    def test_tokens_refill_over_time(self, limiter, clock):
+        for _ in range(2):
+            limiter.is_rate_limited("a", 2, 10)
+        assert limiter.is_rate_limited("a", 2, 10) is True
+
+        # One token comes back every period / limit seconds
+        clock.advance(5)
+        assert limiter.is_rate_limited("a", 2, 10) is False
+        assert limiter.is_rate_limited("a", 2, 10) is True
+
+    def test_reset(self, limiter):
+        limiter.is_rate_limited("a", 1, 60)
+        limiter.reset("a")
+        assert limiter.is_rate_limited("a", 1, 60) is False
+
+        limiter.reset()
+        assert limiter.is_rate_limited("a", 1, 60) is False
+
+
+class TestTokenBucketRateLimiter:
+    """Tests specific to the in-memory limiter."""
+
+    def test_memory_is_bounded(self, clock):
+        limiter = TokenBucketRateLimiter(max_keys=100, clock=clock)
+        for i in range(1000):
+            limiter.is_rate_limited(f"10.0.{i // 256}.{i % 256}", 5, 60)
+
+        assert len(limiter) == 100
+
+
+class TestSQLiteRateLimiter:
+    """Tests specific to the SQLite-backed limiter."""
+
+    def test_limit_is_shared_between_instances(self, clock, tmp_path):
+        path = str(tmp_path / "shared.db")
+        first = SQLiteRateLimiter(path, clock=clock)
+        second = SQLiteRateLimiter(path, clock=clock)
+
+        assert first.is_rate_limited("a", 2, 60) is False
+        assert second.is_rate_limited("a", 2, 60) is False
+        assert first.is_rate_limited("a", 2, 60) is True
+
+        first.close()
+        second.close()
+
+    def test_idle_buckets_are_purged(self, clock, tmp_path):
+        limiter = SQLiteRateLimiter(str(tmp_path / "purge.db"), cleanup_interval=2, clock=clock)
+        limiter.is_rate_limited("idle", 2, 10)
+
+        clock.advance(60)
+        limiter.is_rate_limited("active", 2, 10)
+
+        rows = limiter._connection.execute("SELECT key FROM rate_limits").fetchall()
+        assert rows == [("active",)]
+        limiter.close()
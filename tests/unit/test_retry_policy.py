@@ -0,0 +1,265 @@
+"""
+Unit Tests for Retry Policies
+
+Tests exception classification, the shared retry budget, deadline
+propagation, async support and per-cause retry counts, and the errors the
+AI services raise for requests that cannot succeed.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.interfaces.ai_service_interfaces import (
+    AIServiceError,
+    ContentFilterError,
+    InvalidRequestError,
+    RateLimitError,
+    ResponseFormatError,
+)
+from src.infrastructure.external_services.claude_service import ClaudeService
+from src.infrastructure.external_services.openai_service import OpenAIService
+from src.infrastructure.utils.retry_policy import (
+    AI_ERROR_CLASSIFIER,
+    RetryBudget,
+    RetryPolicy,
+    deadline,
+    remaining_time,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _policy(**kwargs):
+    """Create an AI retry policy that records its sleeps instead of sleeping."""
+    sleeps = []
+    kwargs.setdefault("jitter", False)
+    policy = RetryPolicy(AI_ERROR_CLASSIFIER, sleep=sleeps.append, **kwargs)
+    return policy, sleeps
+
+
+class TestRetryPolicy:
+    """Test suite for RetryPolicy."""
+
+    @pytest.mark.parametrize("error", [
+        ContentFilterError("blocked"), ResponseFormatError("not JSON"), KeyError("polarity")
+    ])
+    def test_non_retryable_errors_fail_fast(self, error):
+        """Test that content, format and programming errors are not retried."""
+        policy, sleeps = _policy()
+        func = MagicMock(side_effect=error)
+
+        with pytest.raises(type(error)):
+            policy.execute(func)
+
+        assert func.call_count == 1
+        assert sleeps == []
+        assert policy.get_retry_stats()["give_ups"] == {"non_retryable": 1}
+
+    def test_retryable_errors_back_off(self):
+        """Test that transient provider errors are retried with exponential backoff."""
+        policy, sleeps = _policy(base_delay=1.0)
+        func = MagicMock(side_effect=[AIServiceError("timeout"), AIServiceError("overloaded"), "ok"])
+
+        assert policy.execute(func) == "ok"
+        assert sleeps == [1.0, 2.0]
+        assert policy.get_retry_stats()["retries"] == {"AIServiceError": 2}
+
+    def test_retry_after_delay_used(self):
+        """Test that rate limits wait the delay the provider asked for."""
+        policy, sleeps = _policy()
+        func = MagicMock(side_effect=[RateLimitError("slow down", retry_after=7.5), "ok"])
+
+        assert policy.execute(func) == "ok"
+        assert sleeps == [7.5]
+
+    def test_max_retries(self):
+        """Test that a call gives up after the maximum number of retries."""
+        policy, sleeps = _policy(max_retries=2, base_delay=0.0)
+        func = MagicMock(side_effect=AIServiceError("down"))
+
+        with pytest.raises(AIServiceError):
+            policy.execute(func)
+
+        assert func.call_count == 3
+        assert policy.get_retry_stats()["give_ups"] == {"max_retries": 1}
+
+    def test_budget_shared_between_calls(self):
+        """Test that an exhausted budget stops retries across calls."""
+        policy, _ = _policy(base_delay=0.0, budget=RetryBudget(max_retries=2, clock=FakeClock()))
+        func = MagicMock(side_effect=AIServiceError("down"))
+
+        with pytest.raises(AIServiceError):
+            policy.execute(func)
+        with pytest.raises(AIServiceError):
+            policy.execute(func)
+
+        assert func.call_count == 4  # 2 retries on the first call, none on the second
+        assert policy.get_retry_stats()["give_ups"] == {"budget": 2}
+
+    def test_budget_window_slides(self):
+        """Test that retries become available again after the window."""
+        clock = FakeClock()
+        budget = RetryBudget(max_retries=1, window_seconds=60, clock=clock)
+
+        assert budget.try_acquire()
+        assert not budget.try_acquire()
+        clock.now += 60
+        assert budget.try_acquire()
+
+    def test_deadline_stops_retries(self):
+        """Test that a retry is not made when its delay passes the deadline."""
+        policy, sleeps = _policy()
+        func = MagicMock(side_effect=RateLimitError("slow down", retry_after=30))
+
+        with deadline(5):
+            with pytest.raises(RateLimitError):
+                policy.execute(func)
+
+        assert sleeps == []
+        assert policy.get_retry_stats()["give_ups"] == {"deadline": 1}
+
+    def test_nested_deadline_only_shortens(self):
+        """Test that an inner deadline can't extend the outer one."""
+        with deadline(1):
+            with deadline(100):
+                assert remaining_time() <= 1
+        assert remaining_time() is None
+
+    def test_async_functions(self):
+        """Test that decorated coroutines are retried."""
+        policy, _ = _policy(base_delay=0.0)
+        attempts = []
+
+        @policy
+        async def call():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise AIServiceError("timeout")
+            return "ok"
+
+        assert asyncio.run(call()) == "ok"
+        assert len(attempts) == 2
+
+    def test_metrics_per_cause(self):
+        """Test that retries are counted per cause in the metrics collector."""
+        metrics = MagicMock()
+        policy, _ = _policy(base_delay=0.0, metrics=metrics, name="ai")
+
+        policy.execute(MagicMock(side_effect=[RateLimitError("x"), "ok"]))
+
+        metrics.increment.assert_called_once_with("retry.attempts", tags={"policy": "ai", "cause": "RateLimitError"})
+
+
+def _bad_request(sdk):
+    """Create an SDK error for a 400 response that is neither a token limit nor a content filter."""
+    response = SimpleNamespace(status_code=400, headers={}, request=SimpleNamespace(method="POST", url="https://api.example.com"))
+    return sdk.BadRequestError("invalid request: unknown field", response=response, body=None)
+
+
+def _status_error(sdk, status_code):
+    """Create an SDK error for a response with the given status code."""
+    response = SimpleNamespace(status_code=status_code, headers={}, request=SimpleNamespace(method="POST", url="https://api.example.com"))
+    return sdk.APIStatusError(f"error {status_code}", response=response, body=None)
+
+
+def _claude(create):
+    service = ClaudeService(api_key="test-key")
+    service._client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    return service
+
+
+def _openai(create):
+    service = OpenAIService(api_key="test-key")
+    service._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return service
+
+
+class TestServiceErrors:
+    """Test suite for the errors AI services raise for requests that cannot succeed."""
+
+    @pytest.mark.parametrize("sdk_name, build", [("anthropic", _claude), ("openai", _openai)])
+    def test_bad_request_not_retried(self, sdk_name, build):
+        """Test that a malformed-request 400 is attempted exactly once."""
+        sdk = pytest.importorskip(sdk_name)
+        create = MagicMock(side_effect=_bad_request(sdk))
+        service = build(create)
+        policy, sleeps = _policy()
+
+        with pytest.raises(InvalidRequestError):
+            policy.execute(service._call_api, "prompt")
+
+        assert create.call_count == 1
+        assert sleeps == []
+
+    @pytest.mark.parametrize("status_code", [401, 404])
+    @pytest.mark.parametrize("sdk_name, build", [("anthropic", _claude), ("openai", _openai)])
+    def test_rejected_request_not_retried(self, sdk_name, build, status_code):
+        """Test that an authentication or unknown-model error is attempted exactly once."""
+        sdk = pytest.importorskip(sdk_name)
+        create = MagicMock(side_effect=_status_error(sdk, status_code))
+        policy, sleeps = _policy()
+
+        with pytest.raises(InvalidRequestError, match=str(status_code)):
+            policy.execute(build(create)._call_api, "prompt")
+
+        assert create.call_count == 1
+        assert sleeps == []
+
+    @pytest.mark.parametrize("sdk_name, build", [("anthropic", _claude), ("openai", _openai)])
+    def test_server_error_retried(self, sdk_name, build):
+        """Test that a server error is retried."""
+        sdk = pytest.importorskip(sdk_name)
+        create = MagicMock(side_effect=_status_error(sdk, 503))
+        policy, sleeps = _policy(base_delay=1.0, max_retries=1)
+
+        with pytest.raises(AIServiceError) as error:
+            policy.execute(build(create)._call_api, "prompt")
+
+        assert type(error.value) is AIServiceError
+
+        assert create.call_count == 2
+        assert sleeps == [1.0]
+
+    @pytest.mark.parametrize("build", [_claude, _openai])
+    def test_unexpected_error_not_retried(self, build):
+        """Test that an unexpected client error is attempted exactly once."""
+        create = MagicMock(side_effect=TypeError("unexpected keyword"))
+        policy, sleeps = _policy()
+
+        with pytest.raises(InvalidRequestError):
+            policy.execute(build(create)._call_api, "prompt")
+
+        assert create.call_count == 1
+        assert sleeps == []
+
+    @pytest.mark.parametrize("sdk_name, service_class", [("anthropic", ClaudeService), ("openai", OpenAIService)])
+    def test_missing_package_not_retried(self, monkeypatch, sdk_name, service_class):
+        """Test that a missing SDK package is attempted exactly once."""
+        monkeypatch.setitem(sys.modules, sdk_name, None)
+        service = service_class(api_key="test-key")
+        call_api = MagicMock(side_effect=service._call_api)
+        policy, sleeps = _policy()
+
+        with pytest.raises(InvalidRequestError, match="not installed"):
+            policy.execute(call_api, "prompt")
+
+        assert call_api.call_count == 1
+        assert sleeps == []
+        with pytest.raises(InvalidRequestError):
+            service.client
@@ -0,0 +1,267 @@
+"""
+Unit Tests for Provider Routing
+
+Tests the circuit breaker states and the failover of RoutingAIService between
+AI providers, including result normalization.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.domain.interfaces.ai_service_interfaces import (
+    AIService,
+    AIServiceError,
+    PackedAIService,
+    ProviderUnavailableError,
+    TokenLimitError,
+)
+from src.infrastructure.external_services.routing_ai_service import (
+    RoutingAIService,
+    normalize_analysis,
+)
+from src.infrastructure.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+from src.infrastructure.utils.retry_policy import AI_ERROR_CLASSIFIER, RetryPolicy
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+ANALYSIS = {
+    "category": "hardware_issue",
+    "component": "gpu",
+    "priority": "high",
+    "confidence": 0.9,
+    "sentiment": {"polarity": "negative", "urgency_level": 4, "frustration_level": 3,
+                  "emotions": ["anger"], "business_impact": {"detected": False}}
+}
+
+
+def _breaker(clock, **kwargs):
+    """Create a breaker that evaluates after two calls."""
+    kwargs.setdefault("minimum_calls", 2)
+    kwargs.setdefault("open_seconds", 30)
+    kwargs.setdefault("half_open_probes", 1)
+    return lambda name: CircuitBreaker(name, clock=clock, **kwargs)
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker."""
+
+    def test_opens_on_failure_rate(self):
+        """Test that the breaker opens once the failure rate reaches the threshold."""
+        breaker = CircuitBreaker("claude", minimum_calls=4, clock=FakeClock())
+
+        breaker.record_success(0.1)
+        breaker.record_failure(0.1)
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED
+
+        breaker.record_failure(0.1)
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+    def test_opens_on_slow_calls(self):
+        """Test that mostly slow successful calls open the breaker."""
+        breaker = CircuitBreaker("claude", slow_call_seconds=5, minimum_calls=2, clock=FakeClock())
+
+        breaker.record_success(6)
+        breaker.record_success(7)
+
+        assert breaker.state == OPEN
+        assert breaker.get_stats()["slow_call_rate"] == 1.0
+
+    def test_half_open_probes_close_breaker(self):
+        """Test that successful probes after the cool-down close the breaker."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("claude", minimum_calls=1, open_seconds=30, half_open_probes=2, clock=clock)
+        breaker.record_failure(0.1)
+
+        clock.now += 30
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request() and breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED
+        assert breaker.get_stats()["calls"] == 0
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe starts a new cool-down."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("claude", minimum_calls=1, open_seconds=30, clock=clock)
+        breaker.record_failure(0.1)
+
+        clock.now += 30
+        assert breaker.allow_request()
+        breaker.record_failure(0.1)
+
+        assert breaker.state == OPEN
+        assert breaker.get_stats()["times_opened"] == 2
+
+
+class TestRoutingAIService:
+    """Test suite for RoutingAIService."""
+
+    def test_primary_used_when_healthy(self):
+        """Test that the first provider serves calls while it succeeds."""
+        claude, openai = MagicMock(spec=AIService), MagicMock(spec=AIService)
+        claude.analyze_content.return_value = dict(ANALYSIS)
+        service = RoutingAIService([("claude", claude), ("openai", openai)])
+
+        result = service.analyze_content("GPU fails")
+
+        assert result["provider"] == "claude"
+        openai.analyze_content.assert_not_called()
+
+    def test_fails_over_and_skips_open_provider(self):
+        """Test that failures fail over and an open circuit skips the provider."""
+        clock = FakeClock()
+        claude, openai = MagicMock(spec=AIService), MagicMock(spec=AIService)
+        claude.analyze_content.side_effect = AIServiceError("overloaded")
+        openai.analyze_content.return_value = dict(ANALYSIS)
+        service = RoutingAIService([("claude", claude), ("openai", openai)], breaker_factory=_breaker(clock))
+
+        for _ in range(3):
+            assert service.analyze_content("GPU fails")["provider"] == "openai"
+
+        assert claude.analyze_content.call_count == 2
+        assert service.get_provider_stats()["claude"]["state"] == OPEN
+
+    def test_providers_not_retried_before_failover(self):
+        """Test that a failing provider's retry policy is skipped so the call fails over at once."""
+        sleeps = []
+        policy = RetryPolicy(AI_ERROR_CLASSIFIER, jitter=False, sleep=sleeps.append)
+        attempts = []
+
+        class RetryingService(AIService):
+            analyze_sentiment = MagicMock()
+            categorize_ticket = MagicMock()
+
+            @policy
+            def analyze_content(self, content):
+                attempts.append(content)
+                raise AIServiceError("overloaded")
+
+        openai = MagicMock(spec=AIService)
+        openai.analyze_content.return_value = dict(ANALYSIS)
+        service = RoutingAIService([("claude", RetryingService()), ("openai", openai)])
+
+        assert service.analyze_content("GPU fails")["provider"] == "openai"
+        assert attempts == ["GPU fails"]
+        assert sleeps == []
+        assert policy.get_retry_stats()["give_ups"] == {"single_attempt": 1}
+
+        # Called directly, the provider still retries
+        with pytest.raises(AIServiceError):
+            RetryingService().analyze_content("GPU fails")
+        assert len(attempts) == 5
+        assert len(sleeps) == 3
+
+    def test_recovers_after_probe(self):
+        """Test that the primary takes over again after a successful probe."""
+        clock = FakeClock()
+        claude, openai = MagicMock(spec=AIService), MagicMock(spec=AIService)
+        claude.analyze_content.side_effect = [AIServiceError("down"), AIServiceError("down"), dict(ANALYSIS)]
+        openai.analyze_content.return_value = dict(ANALYSIS)
+        service = RoutingAIService([("claude", claude), ("openai", openai)], breaker_factory=_breaker(clock))
+        service.analyze_content("a")
+        service.analyze_content("b")
+
+        clock.now += 30
+
+        assert service.analyze_content("c")["provider"] == "claude"
+        assert service.get_provider_stats()["claude"]["state"] == CLOSED
+
+    def test_error_result_counts_as_failure(self):
+        """Test that a swallowed error result fails over to the next provider."""
+        claude, openai = MagicMock(spec=AIService), MagicMock(spec=AIService)
+        claude.analyze_content.return_value = {"error": "boom", "error_type": "APIError"}
+        openai.analyze_content.return_value = dict(ANALYSIS)
+        service = RoutingAIService([("claude", claude), ("openai", openai)])
+
+        assert service.analyze_content("GPU fails")["provider"] == "openai"
+        assert service.get_provider_stats()["claude"]["failure_rate"] == 1.0
+
+    def test_content_errors_not_failed_over(self):
+        """Test that token-limit errors are raised without trying other providers."""
+        claude, openai = MagicMock(spec=AIService), MagicMock(spec=AIService)
+        claude.analyze_content.side_effect = TokenLimitError("too long")
+        service = RoutingAIService([("claude", claude), ("openai", openai)])
+
+        with pytest.raises(TokenLimitError):
+            service.analyze_content("x")
+
+        openai.analyze_content.assert_not_called()
+        assert service.get_provider_stats()["claude"]["failure_rate"] == 0.0
+
+    def test_all_circuits_open(self):
+        """Test that a ProviderUnavailableError is raised when every circuit is open."""
+        clock = FakeClock()
+        claude = MagicMock(spec=AIService)
+        claude.analyze_content.side_effect = AIServiceError("down")
+        service = RoutingAIService([("claude", claude)], breaker_factory=_breaker(clock, minimum_calls=1))
+
+        with pytest.raises(AIServiceError):
+            service.analyze_content("a")
+        with pytest.raises(ProviderUnavailableError):
+            service.analyze_content("b")
+
+    def test_packed_failover_for_failed_entries(self):
+        """Test that entries the packing provider failed are routed individually."""
+        class PackedService(AIService, PackedAIService):
+            analyze_content = MagicMock()
+            analyze_sentiment = MagicMock()
+            categorize_ticket = MagicMock()
+            analyze_contents = MagicMock()
+
+        claude = PackedService()
+        claude.analyze_contents.return_value = {
+            "1": dict(ANALYSIS),
+            "2": {"error": "missing", "error_type": "AIServiceError"}
+        }
+        claude.analyze_content.side_effect = AIServiceError("down")
+        openai = MagicMock(spec=AIService)
+        openai.analyze_content.return_value = dict(ANALYSIS)
+        service = RoutingAIService([("claude", claude), ("openai", openai)])
+
+        results = service.analyze_contents({1: "a", 2: "b"})
+
+        assert results["1"]["provider"] == "claude"
+        assert results["2"]["provider"] == "openai"
+
+
+class TestNormalizeAnalysis:
+    """Test suite for result normalization."""
+
+    def test_fills_and_clamps_fields(self):
+        """Test that partial provider results get the full schema."""
+        result = normalize_analysis({
+            "category": "Hardware_Issue",
+            "priority": "URGENT",
+            "sentiment": {"polarity": "Negative", "urgency_level": 9}
+        })
+
+        assert result["category"] == "hardware_issue"
+        assert result["priority"] == "low"
+        assert result["sentiment"]["polarity"] == "negative"
+        assert result["sentiment"]["urgency_level"] == 5
+        assert result["sentiment"]["business_impact"] == {"detected": False, "impact_areas": [], "severity": 0}
@@ -0,0 +1,62 @@
+"""
+Unit Tests for SQLiteScheduleRepository
+
+Tests persistence of scheduled tasks and their run history.
+"""
+
+import pytest
+
+from src.infrastructure.repositories.schedule_repository import SQLiteScheduleRepository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repo = SQLiteScheduleRepository(str(tmp_path / "schedules.db"), max_history=3)
+    yield repo
+    repo.close()
+
+
+class TestSQLiteScheduleRepository:
+    """Test suite for SQLiteScheduleRepository."""
+
+    def test_save_and_get_task(self, repository):
+        task = {"id": "abc", "task": "sentiment-report", "cron": "0 9 * * *", "next_run": 1.5}
+
+        assert repository.save_task(task)
+        assert repository.get_task("abc") == task
+        assert repository.get_task("missing") is None
+
+    def test_save_replaces_existing_task(self, repository):
+        repository.save_task({"id": "abc", "next_run": 1.0})
+        repository.save_task({"id": "abc", "next_run": 2.0})
+
+        assert repository.list_tasks() == [{"id": "abc", "next_run": 2.0}]
+
+    def test_tasks_survive_reopen(self, tmp_path):
+        path = str(tmp_path / "schedules.db")
+        first = SQLiteScheduleRepository(path)
+        first.save_task({"id": "abc", "next_run": 1.0})
+        first.record_run("abc", {"success": True})
+        first.close()
+
+        second = SQLiteScheduleRepository(path)
+        try:
+            assert second.get_task("abc") == {"id": "abc", "next_run": 1.0}
+            assert second.get_run_history("abc") == [{"success": True}]
+        finally:
+            second.close()
+
+    def test_run_history_is_newest_first_and_trimmed(self, repository):
+        for run in range(5):
+            repository.record_run("abc", {"run": run})
+
+        assert repository.get_run_history("abc") == [{"run": 4}, {"run": 3}, {"run": 2}]
+        assert repository.get_run_history("abc", limit=1) == [{"run": 4}]
+
+    def test_delete_task_removes_history(self, repository):
+        repository.save_task({"id": "abc"})
+        repository.record_run("abc", {"run": 1})
+
+        assert repository.delete_task("abc")
+        assert not repository.delete_task("abc")
+        assert repository.get_run_history("abc") == []
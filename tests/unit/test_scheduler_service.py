@@ -0,0 +1,299 @@
+"""
+Unit Tests for Scheduler Service
+
+Tests the event-driven SchedulerServiceImpl.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.application.services.scheduler_service import SchedulerServiceImpl
+from src.infrastructure.repositories.schedule_repository import SQLiteScheduleRepository
+
+
+@pytest.fixture
+def scheduler():
+    service = SchedulerServiceImpl(max_workers=2)
+    yield service
+    if service.running:
+        service.stop()
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _try_lock(lock, timeout=1.0):
+    if lock.acquire(timeout=timeout):
+        lock.release()
+        return True
+    return False
+
+
+class TestSchedulerServiceImpl:
+    """Test suite for SchedulerServiceImpl."""
+
+    def test_task_runs_on_executor_thread(self, scheduler):
+        ran_on = []
+        scheduler.schedule_task("report", 60, lambda: ran_on.append(threading.current_thread().name))
+
+        scheduler.start()
+
+        assert _wait_for(lambda: ran_on)
+        assert ran_on[0].startswith("scheduler-task")
+        assert ran_on[0] != scheduler.scheduler_thread.name
+
+    def test_scheduler_sleeps_until_next_due_task(self, scheduler):
+        due = time.time() + 0.2
+        ran_at = []
+        scheduler.schedule_task("later", 60, lambda: ran_at.append(time.time()))
+        scheduler.tasks["later"]["next_run"] = due
+
+        scheduler.start()
+
+        assert _wait_for(lambda: ran_at)
+        assert ran_at[0] >= due
+        # Woken by the deadline, not a polling tick
+        assert ran_at[0] - due < 0.2
+
+    def test_lateness_is_recorded(self, scheduler):
+        scheduler.schedule_task("report", 60, lambda: None)
+        scheduler.start()
+
+        assert _wait_for(lambda: scheduler.list_tasks()[0]["run_count"] == 1)
+        task = scheduler.list_tasks()[0]
+        assert task["last_lateness"] is not None
+        assert task["last_lateness"] >= 0
+        assert "func" not in task
+
+    def test_slow_task_does_not_block_others(self, scheduler):
+        release = threading.Event()
+        fast_runs = []
+        scheduler.schedule_task("slow", 60, release.wait)
+        scheduler.schedule_task("fast", 60, lambda: fast_runs.append(1))
+
+        scheduler.start()
+
+        assert _wait_for(lambda: fast_runs)
+        release.set()
+
+    def test_running_task_does_not_overlap(self, scheduler):
+        release = threading.Event()
+        scheduler.schedule_task("slow", 60, release.wait)
+        scheduler.start()
+        assert _wait_for(lambda: scheduler.tasks["slow"]["is_executing"])
+
+        # Force the next run to come due while the first is still executing
+        with scheduler.lock:
+            scheduler.tasks["slow"]["next_run"] = time.time()
+            scheduler._schedule_next_run("slow")
+
+        assert _wait_for(lambda: scheduler.tasks["slow"]["skipped_runs"] == 1)
+        assert scheduler.tasks["slow"]["run_count"] == 1
+        release.set()
+
+    def test_next_run_advances_from_scheduled_time(self, scheduler):
+        scheduler.schedule_task("report", 1, lambda: None)
+        scheduled = scheduler.tasks["report"]["next_run"]
+
+        scheduler.start()
+
+        assert _wait_for(lambda: scheduler.tasks["report"]["run_count"] == 1)
+        assert scheduler.tasks["report"]["next_run"] == pytest.approx(scheduled + 60)
+
+    def test_removed_task_does_not_run(self, scheduler):
+        runs = []
+        scheduler.schedule_task("report", 60, lambda: runs.append(1))
+        scheduler.tasks["report"]["next_run"] = time.time() + 0.1
+        scheduler.start()
+        scheduler.remove_task("report")
+
+        time.sleep(0.2)
+        assert runs == []
+
+    def test_non_positive_interval_rejected(self, scheduler):
+        with pytest.raises(ValueError):
+            scheduler.schedule_task("report", 0, lambda: None)
+        with pytest.raises(ValueError):
+            scheduler.schedule_interval_task("analyze-all", -5)
+        assert scheduler.list_tasks() == []
+
+    def test_stop_joins_scheduler_thread(self, scheduler):
+        scheduler.start()
+        thread = scheduler.scheduler_thread
+
+        scheduler.stop()
+
+        assert not thread.is_alive()
+        assert scheduler.running is False
+
+
+class TestSchedulerPersistence:
+    """Test suite for persisted schedules and missed-run catch-up."""
+
+    @pytest.fixture
+    def repository(self, tmp_path):
+        repo = SQLiteScheduleRepository(str(tmp_path / "schedules.db"))
+        yield repo
+        repo.close()
+
+    def _restart_after_outage(self, repository, policy, **kwargs):
+        """Persist an every-minute task that missed the last five minutes and reload it."""
+        first = SchedulerServiceImpl(schedule_repository=repository)
+        task_id = first.schedule_cron_task("report", "* * * * *", {"view_id": 1}, catch_up_policy=policy)
+        task = repository.get_task(task_id)
+        task["next_run"] = time.time() - 300
+        repository.save_task(task)
+
+        runs = []
+        second = SchedulerServiceImpl(schedule_repository=repository, **kwargs)
+        second.register_task_handler("report", runs.append)
+        return second, task_id, runs
+
+    def test_tasks_are_reloaded(self, repository):
+        first = SchedulerServiceImpl(schedule_repository=repository)
+        task_id = first.schedule_daily_task("sentiment-report", 9, 30, {"view_id": 5})
+        first.disable_task(task_id)
+
+        second = SchedulerServiceImpl(schedule_repository=repository)
+        task = second.list_tasks()[0]
+
+        assert task["id"] == task_id
+        assert task["task"] == "sentiment-report"
+        assert task["schedule"] == "daily at 09:30"
+        assert task["parameters"] == {"view_id": 5}
+        assert task["enabled"] is False
+        assert task["next_run"] == first.tasks[task_id]["next_run"]
+
+    def test_skip_policy_moves_to_next_run(self, repository):
+        scheduler, task_id, runs = self._restart_after_outage(repository, "skip")
+        scheduler.start()
+        try:
+            time.sleep(0.2)
+            assert runs == []
+            assert scheduler.tasks[task_id]["next_run"] > time.time()
+        finally:
+            scheduler.stop()
+
+    def test_run_once_policy_runs_single_catch_up(self, repository):
+        scheduler, task_id, runs = self._restart_after_outage(repository, "run_once")
+        scheduler.start()
+        try:
+            assert _wait_for(lambda: runs)
+            time.sleep(0.2)
+            assert runs == [{"view_id": 1}]
+            assert scheduler.tasks[task_id]["next_run"] > time.time()
+        finally:
+            scheduler.stop()
+
+    def test_run_all_policy_replays_missed_runs_up_to_cap(self, repository):
+        scheduler, task_id, runs = self._restart_after_outage(repository, "run_all", max_catch_up_runs=3)
+        scheduler.start()
+        try:
+            assert _wait_for(lambda: len(runs) == 3)
+            time.sleep(0.2)
+            assert len(runs) == 3
+        finally:
+            scheduler.stop()
+
+    def test_catch_up_runs_are_jittered(self, repository):
+        scheduler, task_id, runs = self._restart_after_outage(repository, "run_once", jitter_seconds=60)
+        start = time.time()
+        scheduler.start()
+        try:
+            assert start <= scheduler.tasks[task_id]["next_run"] <= start + 61
+        finally:
+            scheduler.stop()
+
+    def test_run_history_is_recorded(self, repository):
+        scheduler = SchedulerServiceImpl(schedule_repository=repository)
+        scheduler.register_task_handler("report", lambda parameters: {"output": "done"})
+        task_id = scheduler.schedule_cron_task("report", "0 9 * * *")
+
+        assert scheduler.run_task(task_id) == {"output": "done"}
+
+        history = scheduler.get_run_history(task_id)
+        assert len(history) == 1
+        assert history[0]["success"] is True
+        assert repository.get_task(task_id)["run_count"] == 1
+
+    def test_failed_run_is_recorded_and_raised(self, repository):
+        scheduler = SchedulerServiceImpl(schedule_repository=repository)
+        task_id = scheduler.schedule_cron_task("unknown", "0 9 * * *")
+
+        with pytest.raises(KeyError):
+            scheduler.run_task(task_id)
+
+        history = scheduler.get_run_history(task_id)
+        assert history[0]["success"] is False
+        assert "No handler registered" in history[0]["error"]
+
+    def test_remove_task_deletes_persisted_task(self, repository):
+        scheduler = SchedulerServiceImpl(schedule_repository=repository)
+        task_id = scheduler.schedule_weekly_task("weekly-summary", "monday", 8, 0)
+
+        assert scheduler.remove_task(task_id)
+        assert repository.list_tasks() == []
+
+    def test_invalid_catch_up_policy(self):
+        with pytest.raises(ValueError):
+            SchedulerServiceImpl(catch_up_policy="sometimes")
+
+    def test_interval_tasks_are_reloaded(self, repository):
+        first = SchedulerServiceImpl(schedule_repository=repository)
+        task_id = first.schedule_interval_task("analyze-all", 30, {"view_id": 7})
+
+        runs = []
+        second = SchedulerServiceImpl(schedule_repository=repository)
+        second.register_task_handler("analyze-all", runs.append)
+        task = second.list_tasks()[0]
+
+        assert task["id"] == task_id
+        assert task["schedule"] == "every 30 minutes"
+        assert task["interval_seconds"] == 1800
+
+        second.start()
+        try:
+            assert _wait_for(lambda: repository.get_task(task_id)["run_count"] == 1)
+            assert runs == [{"view_id": 7}]
+        finally:
+            second.stop()
+
+    def test_function_tasks_rejected_with_repository(self, repository):
+        scheduler = SchedulerServiceImpl(schedule_repository=repository)
+
+        with pytest.raises(ValueError):
+            scheduler.schedule_task("report", 60, lambda: None)
+        assert scheduler.list_tasks() == []
+
+    def test_repository_written_outside_lock(self, repository):
+        scheduler = SchedulerServiceImpl(schedule_repository=repository)
+        locked_writes = []
+        save_task = repository.save_task
+
+        def save_and_check_lock(task):
+            # Another thread can only take the lock if this one does not hold it
+            probe = threading.Thread(target=lambda: locked_writes.append(not _try_lock(scheduler.lock)))
+            probe.start()
+            probe.join()
+            return save_task(task)
+
+        repository.save_task = save_and_check_lock
+        scheduler.register_task_handler("report", lambda parameters: None)
+        task_id = scheduler.schedule_interval_task("report", 60)
+        scheduler.start()
+        try:
+            assert _wait_for(lambda: repository.get_task(task_id)["run_count"] == 1)
+            scheduler.disable_task(task_id)
+        finally:
+            scheduler.stop()
+
+        assert len(locked_writes) >= 3
+        assert not any(locked_writes)
@@ -0,0 +1,249 @@
+"""
+Unit Tests for Tracing
+
+Tests parent/child spans, trace context propagation, sampling, the JSONL
+and OTLP exporters, and the spans recorded along the webhook pipeline.
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.application.services.ticket_analysis_service import TicketAnalysisServiceImpl
+from src.application.services.webhook_service import WebhookServiceImpl
+from src.domain.entities.ticket import Ticket
+from src.domain.interfaces.ai_service_interfaces import RateLimitError
+from src.domain.interfaces.utility_interfaces import SpanExporter
+from src.infrastructure.utils.retry_policy import AI_ERROR_CLASSIFIER, RetryPolicy
+from src.infrastructure.utils.tracing import (
+    JsonlSpanExporter,
+    OTLPSpanExporter,
+    current_trace_id,
+    parse_traceparent,
+    tracer,
+)
+from src.presentation.webhook.webhook_handler import WebhookHandler
+
+
+class ListExporter(SpanExporter):
+    """Exporter keeping finished spans in a list."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+    def shutdown(self):
+        pass
+
+    def by_name(self):
+        return {span["name"]: span for span in self.spans}
+
+
+@pytest.fixture
+def exporter():
+    """Record every trace of the process-wide tracer while the test runs."""
+    exporter = ListExporter()
+    tracer.configure([exporter], sample_rate=1.0)
+    yield exporter
+    tracer.configure([], sample_rate=1.0)
+
+
+class TestTracer:
+    """Test suite for the tracer."""
+
+    def test_parent_child_spans(self, exporter):
+        """Test that nested spans form a tree within one trace."""
+        with tracer.start_span("parent") as parent:
+            with tracer.start_span("child", {"key": "value"}):
+                assert current_trace_id() == parent.trace_id
+
+        spans = exporter.by_name()
+        assert spans["child"]["parent_id"] == spans["parent"]["span_id"]
+        assert spans["child"]["trace_id"] == spans["parent"]["trace_id"]
+        assert spans["parent"]["parent_id"] is None
+        assert spans["child"]["attributes"] == {"key": "value"}
+        assert current_trace_id() is None
+
+    def test_context_follows_copied_context_into_threads(self, exporter):
+        """Test that spans started in a thread with a copied context join the trace."""
+        def work():
+            with tracer.start_span("worker"):
+                pass
+
+        with tracer.start_span("request"):
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(work,))
+            thread.start()
+            thread.join()
+
+        spans = exporter.by_name()
+        assert spans["worker"]["parent_id"] == spans["request"]["span_id"]
+
+    def test_exception_marks_span_failed(self, exporter):
+        """Test that an exception leaving a span is recorded on it."""
+        with pytest.raises(ValueError):
+            with tracer.start_span("failing"):
+                raise ValueError("bad input")
+
+        span = exporter.spans[0]
+        assert span["status"] == "error"
+        assert span["status_message"] == "ValueError: bad input"
+        assert span["events"][0]["name"] == "exception"
+
+    def test_unsampled_trace_records_nothing(self, exporter):
+        """Test that a trace not picked by the sample rate exports no spans."""
+        tracer.configure([exporter], sample_rate=0.0)
+
+        with tracer.start_span("root"):
+            with tracer.start_span("child") as child:
+                child.set_attribute("ignored", True)
+                assert current_trace_id() is None
+
+        assert exporter.spans == []
+
+    def test_disabled_without_exporters(self):
+        """Test that tracing without exporters hands out a span that records nothing."""
+        with tracer.start_span("root") as span:
+            assert not span.sampled
+            assert current_trace_id() is None
+
+    def test_remote_parent(self, exporter):
+        """Test that a traceparent header continues the caller's trace."""
+        parent = parse_traceparent("00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01")
+
+        with tracer.start_span("webhook.http", parent=parent):
+            pass
+
+        span = exporter.spans[0]
+        assert span["trace_id"] == "0af7651916cd43dd8448eb211c80319c"
+        assert span["parent_id"] == "b7ad6b7169203331"
+
+    def test_parse_traceparent_rejects_invalid(self):
+        """Test that malformed traceparent headers are ignored."""
+        assert parse_traceparent(None) is None
+        assert parse_traceparent("00-xyz-b7ad6b7169203331-01") is None
+        assert parse_traceparent("00-" + "0" * 32 + "-b7ad6b7169203331-01") is None
+
+    def test_retry_sleep_span(self, exporter):
+        """Test that the time spent waiting between retries shows up as a span."""
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RateLimitError("slow down", retry_after=2)
+            return "ok"
+
+        policy = RetryPolicy(AI_ERROR_CLASSIFIER, jitter=False, sleep=lambda delay: None)
+        with tracer.start_span("call"):
+            assert policy.execute(flaky) == "ok"
+
+        spans = exporter.by_name()
+        assert spans["retry.sleep"]["attributes"]["delay_seconds"] == 2
+        assert spans["retry.sleep"]["attributes"]["error"] == "RateLimitError"
+        assert spans["retry.sleep"]["parent_id"] == spans["call"]["span_id"]
+
+
+class TestExporters:
+    """Test suite for the span exporters."""
+
+    def test_jsonl_exporter(self, tmp_path):
+        """Test that each span is appended as one JSON line."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        exporter = JsonlSpanExporter(str(path))
+        tracer.configure([exporter])
+        try:
+            with tracer.start_span("outer"):
+                with tracer.start_span("inner"):
+                    pass
+        finally:
+            tracer.configure([])
+            exporter.shutdown()
+
+        spans = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [span["name"] for span in spans] == ["inner", "outer"]
+        assert spans[0]["duration_ms"] >= 0
+
+    def test_otlp_exporter_batches(self):
+        """Test that spans are sent as OTLP JSON once a batch is full and at shutdown."""
+        exporter = OTLPSpanExporter("http://collector:4318", batch_size=2)
+        span = {
+            "trace_id": "a" * 32, "span_id": "b" * 16, "parent_id": None, "name": "op",
+            "start_time_ns": 1, "end_time_ns": 2, "attributes": {"count": 3, "ok": True},
+            "events": [], "status": "error", "status_message": "boom"
+        }
+
+        with patch("urllib.request.urlopen") as urlopen:
+            exporter.export([span])
+            assert urlopen.call_count == 0
+            exporter.export([span])
+            assert urlopen.call_count == 1
+            exporter.export([span])
+            exporter.shutdown()
+
+        assert urlopen.call_count == 2
+        request = urlopen.call_args_list[0][0][0]
+        assert request.full_url == "http://collector:4318/v1/traces"
+        body = json.loads(request.data)
+        encoded = body["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        assert encoded["traceId"] == "a" * 32
+        assert encoded["status"] == {"code": 2, "message": "boom"}
+        assert {"key": "count", "value": {"intValue": "3"}} in encoded["attributes"]
+        assert "parentSpanId" not in encoded
+
+
+class TestWebhookPipelineTracing:
+    """Test suite for the spans recorded while handling a webhook."""
+
+    def test_spans_across_pipeline(self, exporter):
+        """Test that one webhook yields one trace from handler to AI call."""
+        ticket_repository = MagicMock()
+        ticket_repository.get_ticket.return_value = Ticket(id=7, subject="Broken", description="It broke", status="open")
+        ai_service = MagicMock()
+        ai_service.analyze_content.return_value = {"sentiment": {"polarity": "negative"}}
+        analysis_service = TicketAnalysisServiceImpl(ticket_repository, MagicMock(), ai_service, tracer=tracer)
+        webhook_service = WebhookServiceImpl(ticket_repository, MagicMock(), analysis_service, tracer=tracer)
+
+        result = WebhookHandler(webhook_service).handle_webhook("ticket.created", {"ticket": {"id": 7}})
+
+        assert result["success"] is True
+        spans = exporter.by_name()
+        assert spans["webhook.handle"]["attributes"] == {"event_type": "ticket.created", "outcome": "ok"}
+        assert spans["webhook_service.ticket_created"]["parent_id"] == spans["webhook.handle"]["span_id"]
+        analysis = spans["analysis.analyze_ticket_content"]
+        assert analysis["parent_id"] == spans["webhook_service.ticket_created"]["span_id"]
+        assert analysis["attributes"]["ticket_id"] == "7"
+        assert len({span["trace_id"] for span in exporter.spans}) == 1
+
+    def test_handled_failure_recorded(self, exporter):
+        """Test that a failure swallowed by the webhook service still marks its span."""
+        ticket_repository = MagicMock()
+        ticket_repository.get_ticket.side_effect = RuntimeError("Zendesk down")
+        webhook_service = WebhookServiceImpl(ticket_repository, MagicMock(), MagicMock(), tracer=tracer)
+
+        WebhookHandler(webhook_service).handle_webhook("ticket.created", {"ticket": {"id": 7}})
+
+        spans = exporter.by_name()
+        assert spans["webhook_service.ticket_created"]["status"] == "error"
+        assert spans["webhook.handle"]["attributes"]["outcome"] == "failed"
+
+    def test_services_untraced_without_tracer(self, exporter):
+        """Test that services created without a tracer record no spans of their own."""
+        ticket_repository = MagicMock()
+        ticket_repository.get_ticket.return_value = Ticket(id=7, subject="Broken", description="It broke", status="open")
+        ai_service = MagicMock()
+        ai_service.analyze_content.return_value = {"sentiment": {"polarity": "negative"}}
+        analysis_service = TicketAnalysisServiceImpl(ticket_repository, MagicMock(), ai_service)
+
+        WebhookServiceImpl(ticket_repository, MagicMock(), analysis_service).handle_ticket_created({"id": 7})
+
+        assert exporter.spans == []
@@ -0,0 +1,241 @@
+"""
+Unit Tests for the AI Usage Ledger
+
+Tests usage attribution, cost estimation, the SQLite usage repository, the
+ledger entries written by the AI services and the usage command.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.application.services.ticket_analysis_service import TicketAnalysisServiceImpl
+from src.domain.entities.ticket import Ticket
+from src.domain.interfaces.repository_interfaces import UsageRepository
+from src.infrastructure.external_services.claude_service import ClaudeService
+from src.infrastructure.external_services.openai_service import OpenAIService
+from src.infrastructure.repositories.usage_repository import SQLiteUsageRepository
+from src.infrastructure.utils.dependency_injection import DependencyContainer
+from src.infrastructure.utils.usage import (
+    ContextUsageAttribution,
+    current_attribution,
+    estimate_cost,
+    usage_attribution,
+    usage_entry,
+)
+from src.presentation.cli.commands.usage_command import UsageCommand
+
+ANALYSIS = {"sentiment": {"polarity": "neutral"}, "category": "general_inquiry"}
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Usage repository backed by a temporary database."""
+    repository = SQLiteUsageRepository(str(tmp_path / "usage.db"))
+    yield repository
+    repository.close()
+
+
+def _entry(timestamp, view_id, input_tokens=100, output_tokens=50, latency_ms=200.0):
+    """Build a ledger entry for a claude-3-haiku call."""
+    return {
+        **usage_entry("anthropic", "claude-3-haiku-20240307", "analyze_content",
+                      input_tokens, output_tokens, 0, 0, latency_ms, "ok"),
+        "timestamp": timestamp.replace(tzinfo=timezone.utc).timestamp(),
+        "view_id": view_id
+    }
+
+
+class TestUsageAccounting:
+    """Test suite for usage attribution and pricing."""
+
+    def test_attribution_nests(self):
+        """Test that nested blocks add to the enclosing attribution and restore it on exit."""
+        with usage_attribution(command="generatereport"):
+            with usage_attribution(view_id=123, ticket_id=None):
+                assert current_attribution() == {"command": "generatereport", "view_id": "123"}
+            assert current_attribution() == {"command": "generatereport"}
+        assert current_attribution() == {}
+
+    def test_entry_is_attributed(self):
+        """Test that an entry carries the attribution of the running work."""
+        with usage_attribution(ticket_id=7, task_id="daily"):
+            entry = usage_entry("anthropic", "claude-3-haiku-20240307", "categorize_ticket", 10, 5, 0, 0, 12.34, "ok")
+
+        assert entry["ticket_id"] == "7"
+        assert entry["task_id"] == "daily"
+        assert entry["view_id"] is None
+        assert entry["latency_ms"] == 12.3
+
+    def test_estimate_cost_uses_longest_prefix(self):
+        """Test that models are priced by their longest matching prefix."""
+        assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 1_000_000) == pytest.approx(0.75)
+        assert estimate_cost("gpt-4o-2024-08-06", 1_000_000, 0) == pytest.approx(2.50)
+
+    def test_estimate_cost_prices_cache_tokens(self):
+        """Test that cache reads and writes use their own prices."""
+        cost = estimate_cost("claude-3-5-sonnet-20241022", 0, 0, cache_read_tokens=1_000_000, cache_write_tokens=1_000_000)
+        assert cost == pytest.approx(0.30 + 3.75)
+
+    def test_estimate_cost_unknown_model(self):
+        """Test that calls to unknown models are left unpriced."""
+        assert estimate_cost("local-llama", 1000, 1000) is None
+
+
+class TestSQLiteUsageRepository:
+    """Test suite for the SQLite usage repository."""
+
+    def test_summarize_by_day_and_view(self, repository):
+        """Test that calls are aggregated per day and view."""
+        day = datetime(2024, 5, 1, 12, 0)
+        repository.record(_entry(day, "10", latency_ms=100.0))
+        repository.record(_entry(day, "10", latency_ms=300.0))
+        repository.record(_entry(day, "20"))
+        repository.record(_entry(day + timedelta(days=1), "10"))
+
+        rows = repository.summarize(datetime(2024, 5, 1), datetime(2024, 5, 3))
+
+        assert [(row["day"], row["view_id"], row["calls"]) for row in rows] == [
+            ("2024-05-01", "10", 2), ("2024-05-01", "20", 1), ("2024-05-02", "10", 1)
+        ]
+        assert rows[0]["input_tokens"] == 200
+        assert rows[0]["avg_latency_ms"] == 200.0
+        assert rows[0]["max_latency_ms"] == 300.0
+        assert rows[0]["cost_usd"] == pytest.approx(2 * (100 * 0.25 + 50 * 1.25) / 1_000_000)
+
+    def test_summarize_excludes_calls_outside_range(self, repository):
+        """Test that the end of the range is exclusive."""
+        repository.record(_entry(datetime(2024, 5, 1, 12, 0), "10"))
+        repository.record(_entry(datetime(2024, 5, 3, 0, 0), "10"))
+
+        rows = repository.summarize(datetime(2024, 5, 1), datetime(2024, 5, 3), group_by=["model"])
+
+        assert rows == [{
+            "model": "claude-3-haiku-20240307", "calls": 1, "input_tokens": 100, "output_tokens": 50,
+            "cache_read_tokens": 0, "cache_write_tokens": 0, "cost_usd": pytest.approx(0.0000875),
+            "avg_latency_ms": 200.0, "max_latency_ms": 200.0
+        }]
+
+    def test_summarize_rejects_unknown_column(self, repository):
+        """Test that only known columns can be grouped by."""
+        with pytest.raises(ValueError):
+            repository.summarize(datetime(2024, 5, 1), datetime(2024, 5, 2), group_by=["day; DROP TABLE ai_usage"])
+
+
+class TestServiceLedgerEntries:
+    """Test suite for the ledger entries written by the AI services."""
+
+    def test_claude_records_call(self):
+        """Test that a Claude call is recorded with its operation, cache tokens and attribution."""
+        ledger = MagicMock(spec=UsageRepository)
+        service = ClaudeService(api_key="test-key", usage_repository=ledger)
+        service._client = MagicMock()
+        service._client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(text=json.dumps(ANALYSIS))],
+            usage=SimpleNamespace(input_tokens=30, output_tokens=20,
+                                  cache_creation_input_tokens=0, cache_read_input_tokens=400)
+        )
+
+        with usage_attribution(ticket_id=42, view_id=9):
+            service.analyze_content("My order has not arrived")
+
+        entry = ledger.record.call_args[0][0]
+        assert entry["provider"] == "anthropic"
+        assert entry["operation"] == "analyze_content"
+        assert (entry["input_tokens"], entry["output_tokens"], entry["cache_read_tokens"]) == (30, 20, 400)
+        assert (entry["ticket_id"], entry["view_id"]) == ("42", "9")
+        assert entry["outcome"] == "ok"
+        assert entry["cost_usd"] > 0
+
+    def test_failing_ledger_does_not_fail_call(self):
+        """Test that a ledger error is logged rather than raised."""
+        ledger = MagicMock(spec=UsageRepository)
+        ledger.record.side_effect = RuntimeError("disk full")
+        service = ClaudeService(api_key="test-key", usage_repository=ledger)
+        service._client = MagicMock()
+        service._client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(text=json.dumps({"ok": True}))],
+            usage=SimpleNamespace(input_tokens=30, output_tokens=20,
+                                  cache_creation_input_tokens=0, cache_read_input_tokens=0)
+        )
+
+        assert service._call_api("hello") == json.dumps({"ok": True})
+
+    def test_analysis_service_attributes_calls(self):
+        """Test that the analysis service attributes AI calls through the injected hook."""
+        attributions = []
+        ai_service = MagicMock()
+        ai_service.analyze_content.side_effect = lambda content: attributions.append(current_attribution()) or ANALYSIS
+        ticket = Ticket(id=7, subject="Broken", description="It broke", status="open", source_view_id=3)
+
+        TicketAnalysisServiceImpl(MagicMock(), MagicMock(), ai_service).analyze_ticket_content(ticket)
+        TicketAnalysisServiceImpl(
+            MagicMock(), MagicMock(), ai_service, usage_attribution=ContextUsageAttribution()
+        ).analyze_ticket_content(ticket)
+
+        assert attributions == [{}, {"ticket_id": "7", "view_id": "3"}]
+
+    def test_openai_splits_cached_prompt_tokens(self):
+        """Test that cached prompt tokens are recorded as cache reads."""
+        ledger = MagicMock(spec=UsageRepository)
+        service = OpenAIService(api_key="test-key", usage_repository=ledger)
+        service._client = MagicMock()
+        service._client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(ANALYSIS)))],
+            usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=100, total_tokens=1100,
+                                  prompt_tokens_details=SimpleNamespace(cached_tokens=768))
+        )
+
+        service._call_api("prompt", operation="analyze_sentiment")
+
+        entry = ledger.record.call_args[0][0]
+        assert (entry["input_tokens"], entry["cache_read_tokens"], entry["output_tokens"]) == (232, 768, 100)
+        assert entry["operation"] == "analyze_sentiment"
+
+
+class TestUsageCommand:
+    """Test suite for the usage command."""
+
+    def _command(self, repository):
+        container = DependencyContainer()
+        container.register_instance(UsageRepository, repository)
+        return UsageCommand(container)
+
+    def test_json_report(self, repository, capsys):
+        """Test that the JSON report lists the groups and their totals."""
+        now = datetime.utcnow()
+        repository.record(_entry(now, "10"))
+        repository.record(_entry(now, "20"))
+
+        result = self._command(repository).execute({"days": 7, "group_by": "view_id", "format": "json"})
+
+        assert result["success"] is True
+        report = json.loads(capsys.readouterr().out)
+        assert [row["view_id"] for row in report["rows"]] == ["10", "20"]
+        assert report["totals"]["calls"] == 2
+        assert report["totals"]["input_tokens"] == 200
+
+    def test_text_report(self, repository, capsys):
+        """Test that the text report shows one line per group and a total."""
+        repository.record(_entry(datetime.utcnow(), "10"))
+
+        self._command(repository).execute({"days": 1, "group_by": "day,view_id", "format": "text"})
+
+        output = capsys.readouterr().out
+        assert "View" in output
+        assert output.splitlines()[-1].startswith("TOTAL")
+
+    def test_disabled_ledger(self, capsys):
+        """Test that the command reports a disabled ledger."""
+        result = self._command(None).execute({})
+
+        assert result["success"] is False
+        assert "disabled" in result["error"]
@@ -0,0 +1,59 @@
+"""
+Unit Tests for the Webhook Service
+
+Tests the comment and tag preferences applied to analyzed tickets.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.application.services.webhook_service import WebhookServiceImpl
+from src.domain.entities.ticket import Ticket
+from src.domain.entities.ticket_analysis import SentimentAnalysis, TicketAnalysis
+
+
+def _service():
+    ticket_repository = MagicMock()
+    ticket_repository.get_ticket.return_value = Ticket(id=7, subject="Broken", description="It broke", status="open")
+    analysis_service = MagicMock()
+    analysis_service.analyze_ticket_content.return_value = TicketAnalysis(
+        ticket_id="7",
+        subject="Broken",
+        category="hardware_issue",
+        component="gpu",
+        priority="high",
+        sentiment=SentimentAnalysis(polarity="negative", urgency_level=4)
+    )
+    return WebhookServiceImpl(ticket_repository, MagicMock(), analysis_service), ticket_repository
+
+
+class TestWebhookPreferences:
+    """Test suite for the webhook service preferences."""
+
+    def test_tags_not_added_by_default(self):
+        """Test that analyzed tickets are not tagged unless tags are enabled."""
+        service, ticket_repository = _service()
+
+        assert service.handle_ticket_created({"id": 7}) is True
+
+        ticket_repository.add_ticket_tags.assert_not_called()
+        ticket_repository.add_ticket_comment.assert_not_called()
+
+    def test_tag_preference_adds_tags(self):
+        """Test that enabled tags are added to created, updated and commented tickets."""
+        service, ticket_repository = _service()
+        service.set_tag_preference(True)
+
+        service.handle_ticket_created({"id": 7})
+        service.handle_ticket_updated({"id": 7, "changes": {"subject": "Still broken"}})
+        service.handle_comment_created({"ticket_id": 7, "body": "Any news?", "author_id": 3})
+
+        assert ticket_repository.add_ticket_tags.call_count == 3
+        tags = ticket_repository.add_ticket_tags.call_args[0][1]
+        assert "sentiment:negative" in tags
+        assert "high-urgency" in tags
+        ticket_repository.add_ticket_comment.assert_not_called()